@@ -0,0 +1,367 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+from PIL.Image import Image
+
+from benchmarks.synthetic import (
+    CHARACTER,
+    DEFAULT_FONT,
+    KINDS,
+    SyntheticFrames,
+    SyntheticSample,
+    read_dataset,
+)
+from config.const import LIGHT_CONE, RELIC
+from enums.increment_type import IncrementType
+from enums.ocr_field import OcrField
+from models.const import (
+    CHAR_ASCENSION,
+    CHAR_LEVEL,
+    CHAR_NAME,
+    CHAR_PATH,
+    CHAR_TRACES,
+    EIDOLON_IMAGES,
+    TRACES_LEVELS,
+    TRACES_UNLOCKS,
+)
+from models.game_data import GameData
+from models.scan_session import ScanSession
+from services.scanner.parsers.character_parser import CharacterParser
+from services.scanner.parsers.parse_strategy import BaseParseStrategy
+from services.scanner.parsers.light_cone_strategy import LightConeStrategy
+from services.scanner.parsers.relic_strategy import RelicStrategy
+from services.scanner.relic_validator import RelicValidator, build_relic_table
+from utils.capture import ReplayCapture
+from utils.crop_store import CropStore
+from utils.log_sink import LogSink
+from utils.ocr import image_to_string
+from utils.progress import ScanProgress
+from utils.result_feed import ResultFeed
+from utils.screenshot import Screenshot
+
+DEFAULT_SIZES = (1000, 10000, 50000)
+
+# Captured items that may wait for a parse thread before capturing blocks
+MAX_PENDING_PER_WORKER = 4
+
+
+class ReplayPipeline:
+    """ReplayPipeline class runs the capture and parse pipeline of a scan on
+    replayed frames
+
+    Frames are captured on the calling thread and parsed on worker threads like
+    in a scan. Navigation, and the pixel probes the scanner reads with
+    pyautogui, are not replayed: character ascension and trace unlocks are
+    taken from the ground truth.
+    """
+
+    def __init__(self, game_data: GameData, workers: int = 1) -> None:
+        """Constructor
+
+        :param game_data: The GameData class instance
+        :param workers: The number of parse threads, defaults to 1
+        """
+        self._capture = ReplayCapture()
+        self._log_sink = LogSink()
+        self._screenshot = Screenshot(self._capture, self._log_sink)
+        self._progress = ScanProgress()
+        self._results = ResultFeed()
+        self._crops = CropStore()
+        args = (
+            game_data,
+            ScanSession(),
+            self._log_sink,
+            self._progress,
+            asyncio.Event(),
+        )
+        self._strategies = {
+            RELIC: RelicStrategy(*args),
+            LIGHT_CONE: LightConeStrategy(*args),
+        }
+        self._char_parser = CharacterParser(*args)
+        self._executor = ThreadPoolExecutor(workers)
+        self._max_pending = workers * MAX_PENDING_PER_WORKER
+
+    def run(self, samples: Iterable[SyntheticSample]) -> dict:
+        """Capture and parse samples, and score the results against the ground
+        truth
+
+        :param samples: The samples
+        :return: The report
+        """
+        pending = deque()
+        accuracy = {}
+        relics = []
+        items = 0
+        capture_seconds = 0.0
+        start = time.perf_counter()
+        for sample in samples:
+            capture_start = time.perf_counter()
+            job = self._capture_sample(sample, items)
+            capture_seconds += time.perf_counter() - capture_start
+            # only the ground truth is kept, the frames are released here
+            pending.append((sample.kind, sample.expected, self._executor.submit(*job)))
+            items += 1
+
+            # bound the captured crops that wait for a parse thread
+            while len(pending) > self._max_pending:
+                self._collect(pending.popleft(), accuracy, relics)
+            # the log is never shown, so keep the buffer from filling up
+            if items % 256 == 0:
+                self._log_sink.drain()
+
+        while pending:
+            self._collect(pending.popleft(), accuracy, relics)
+        seconds = time.perf_counter() - start
+        self._log_sink.drain()
+
+        validator = RelicValidator()
+        invalid = len(validator.validate(build_relic_table(relics), relics))
+
+        return {
+            "items": items,
+            "seconds": round(seconds, 3),
+            "items_per_second": round(items / seconds, 2) if seconds else None,
+            "capture_ms_per_item": (
+                round(capture_seconds * 1000 / items, 3) if items else None
+            ),
+            "peak_rss_mb": _peak_rss_mb(),
+            "crops_stored": len(self._crops),
+            "invalid_relics": invalid,
+            "accuracy": {
+                kind: field_accuracy(counts) for kind, counts in accuracy.items()
+            },
+        }
+
+    def _collect(self, job: tuple, accuracy: dict, relics: list[dict]) -> None:
+        """Wait for a parse job and score its result
+
+        :param job: The kind, the ground truth and the future of the parse job
+        :param accuracy: The field match counts per kind
+        :param relics: The parsed relics, for validation
+        """
+        kind, expected, future = job
+        result = future.result()
+        score_result(accuracy.setdefault(kind, Counter()), expected, result)
+        if kind == RELIC and result:
+            relics.append(result)
+
+    def close(self) -> None:
+        """Stop the parse threads"""
+        self._executor.shutdown()
+
+    def _capture_sample(self, sample: SyntheticSample, item_id: int) -> tuple:
+        """Capture the crops of a sample like the scanner does
+
+        :param sample: The sample
+        :param item_id: The position of the item
+        :return: The parse function and its arguments
+        """
+        if sample.kind == CHARACTER:
+            return self._parse_character, self._capture_character(sample)
+
+        strategy = self._strategies[sample.kind]
+        self._capture.show(sample.frames[0])
+        stats_dict, stats_img = self._screenshot.screenshot_stats(strategy.SCAN_TYPE)
+        return self._parse_item, strategy, stats_dict, item_id, stats_img
+
+    def _capture_character(self, sample: SyntheticSample) -> dict:
+        """Capture the details, traces and eidolons pages of a character
+
+        :param sample: The sample
+        :return: The stats dict
+        """
+        self._capture.show(sample.frames[0])
+        name = image_to_string(
+            self._screenshot.screenshot_character_name(),
+            "ABCDEFGHIJKLMNOPQRSTUVWXYZ abcdefghijklmnopqrstuvwxyz/7&",
+            7,
+            field=OcrField.CHARACTER_NAME,
+        )
+        path, name = (name.split("/") + [""])[:2]
+        try:
+            name, path = self._char_parser.get_closest_name_and_path(
+                name.strip(), path.strip(), False
+            )
+        except Exception:
+            name, path = "", ""
+        level = self._screenshot.screenshot_character_level()
+
+        self._capture.show(sample.frames[1])
+        path_key = (path or sample.expected[CHAR_PATH]).split(" ")[-1].lower()
+        traces = self._screenshot.screenshot_character_traces(path_key)
+
+        self._capture.show(sample.frames[2])
+        eidolons = self._screenshot.screenshot_character_eidolons()
+
+        return {
+            CHAR_NAME: name,
+            CHAR_PATH: path,
+            CHAR_ASCENSION: sample.expected[CHAR_ASCENSION],
+            CHAR_LEVEL: level,
+            CHAR_TRACES: {TRACES_LEVELS: traces, TRACES_UNLOCKS: {}},
+            EIDOLON_IMAGES: eidolons,
+        }
+
+    def _parse_item(
+        self,
+        strategy: BaseParseStrategy,
+        stats_dict: dict,
+        item_id: int,
+        stats_img: Image,
+    ) -> dict:
+        """Parse an inventory item like HSRScanner._parse_item
+
+        :param strategy: The strategy to use
+        :param stats_dict: The stats dictionary
+        :param item_id: The position of the item
+        :param stats_img: The screenshot of the stats panel
+        :return: The parsed item
+        """
+        uid = f"{strategy.UID_PREFIX}_{item_id}"
+        self._crops.put(uid, stats_img)
+        result = strategy.parse(stats_dict, item_id)
+        if result:
+            self._results.push(strategy.SCAN_TYPE, result)
+        else:
+            self._results.push_error(uid, "Failed to parse.")
+        return result
+
+    def _parse_character(self, stats_dict: dict) -> dict:
+        """Parse a character like HSRScanner._parse_character
+
+        :param stats_dict: The stats dictionary
+        :return: The parsed character
+        """
+        result = self._char_parser.parse(stats_dict) if stats_dict[CHAR_NAME] else {}
+        if result:
+            self._results.push(IncrementType.CHARACTER_ADD, result)
+        else:
+            self._results.push_error(stats_dict[CHAR_NAME], "Failed to parse.")
+        return result
+
+
+def replay(
+    game_data: GameData, samples: Iterable[SyntheticSample], workers: int = 1
+) -> dict:
+    """Replay samples through a new pipeline
+
+    :param game_data: The GameData class instance
+    :param samples: The samples
+    :param workers: The number of parse threads, defaults to 1
+    :return: The report
+    """
+    pipeline = ReplayPipeline(game_data, workers)
+    try:
+        return pipeline.run(samples)
+    finally:
+        pipeline.close()
+
+
+def score_result(counts: Counter, expected: dict, result: dict) -> None:
+    """Count the fields of a result that match the ground truth
+
+    :param counts: The counts of matching fields and of items
+    :param expected: The ground truth
+    :param result: The parse result, empty if parsing failed
+    """
+    matches = {field: result.get(field) == value for field, value in expected.items()}
+    counts.update(matches)
+    counts["_items"] += 1
+    counts["parsed"] += bool(result)
+    counts["all_fields"] += bool(result) and all(matches.values())
+
+
+def field_accuracy(counts: Counter) -> dict[str, float]:
+    """Get the share of items each field matched the ground truth on
+
+    :param counts: The counts of score_result
+    :return: The accuracy of each field, from 0 to 1
+    """
+    return {
+        field: round(counts[field] / counts["_items"], 4)
+        for field in counts
+        if field != "_items"
+    }
+
+
+def _peak_rss_mb() -> float | None:
+    """Get the peak resident set size of the process
+
+    :return: The peak RSS in MB, None where the resource module is unavailable
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, KB elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay a synthetic inventory through the capture and parse "
+        "pipeline and report throughput, memory and field accuracy. Run from the "
+        "src directory with python -m benchmarks.replay."
+    )
+    parser.add_argument(
+        "--dataset",
+        help="A dataset written by benchmarks.synthetic, rendered on the fly if "
+        "not given",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="The inventory sizes to replay when rendering on the fly, defaults to "
+        + " ".join(map(str, DEFAULT_SIZES)),
+    )
+    parser.add_argument(
+        "--kinds",
+        nargs="+",
+        choices=KINDS,
+        default=[RELIC, LIGHT_CONE],
+        help="The kinds of samples when rendering on the fly, defaults to relic "
+        "light_cone",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="The seed, defaults to 0")
+    parser.add_argument(
+        "--noise", type=float, default=0.0, help="The pixel noise, defaults to 0"
+    )
+    parser.add_argument(
+        "--bleed", type=float, default=0.0, help="The background bleed, defaults to 0"
+    )
+    parser.add_argument(
+        "--font",
+        default=DEFAULT_FONT,
+        help=f"The TrueType font to render with, defaults to {DEFAULT_FONT}",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="The parse threads, defaults to 1"
+    )
+    args = parser.parse_args()
+
+    game_data = GameData()
+    if args.dataset:
+        reports = [replay(game_data, read_dataset(args.dataset), args.workers)]
+    else:
+        frames = SyntheticFrames(
+            game_data, args.seed, args.noise, args.bleed, args.font
+        )
+        reports = [
+            replay(game_data, frames.samples(args.kinds, size), args.workers)
+            for size in args.sizes
+        ]
+    print(json.dumps(reports, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Time from launching the interpreter until the main window is shown
+STARTUP_BUDGET_MS = 800
+
+# Modules that must not be imported before the window is shown
+DEFERRED_MODULES = (
+    "cv2",
+    "Levenshtein",
+    "pyautogui",
+    "pytesseract",
+    "requests",
+    "vgamepad",
+)
+
+
+def measure_imports() -> dict[str, tuple[float, float, int]]:
+    """Import the main module with -X importtime
+
+    :return: The self and cumulative import time in ms and the nesting depth
+        of each imported module
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    res = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        res[name.strip()] = (int(self_us) / 1000, int(cumulative_us) / 1000, depth)
+    return res
+
+
+def measure_window_shown() -> float:
+    """Launch the app and time until the main window is shown
+
+    :return: The time in ms
+    """
+    env = dict(os.environ)
+    env["HSR_SCANNER_EXIT_ON_SHOW"] = "1"
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "main.py"], cwd=SRC_DIR, env=env, check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the startup time of the app against a time budget."
+    )
+    parser.add_argument(
+        "--runs", type=int, default=5, help="The number of launches, defaults to 5"
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=STARTUP_BUDGET_MS,
+        help=f"The time-to-interactive budget, defaults to {STARTUP_BUDGET_MS} ms",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=15,
+        help="The number of slowest imports of main to list, defaults to 15",
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="Print the report as JSON instead of text"
+    )
+    args = parser.parse_args()
+
+    imports = measure_imports()
+    shown = [measure_window_shown() for _ in range(args.runs)]
+    deferred = sorted(
+        name for name in imports if name.split(".")[0] in DEFERRED_MODULES
+    )
+    slowest = sorted(
+        ((name, v[1]) for name, v in imports.items() if v[2] == 1),
+        key=lambda x: x[1],
+        reverse=True,
+    )[: args.top]
+
+    report = {
+        "window_shown_ms": round(statistics.median(shown), 1),
+        "budget_ms": args.budget_ms,
+        "import_main_ms": round(imports.get("main", (0, 0, 0))[1], 1),
+        "slowest_imports": {name: round(ms, 1) for name, ms in slowest},
+        "deferred_modules_imported": deferred,
+    }
+    passed = report["window_shown_ms"] <= args.budget_ms and not deferred
+
+    if args.json:
+        print(json.dumps(report, indent=4))
+    else:
+        print(
+            f"Window shown: {report['window_shown_ms']} ms (median of {args.runs}, "
+            f"budget {args.budget_ms} ms)"
+        )
+        print(f"Import main: {report['import_main_ms']} ms")
+        print("Slowest imports of main:")
+        for name, ms in report["slowest_imports"].items():
+            print(f"  {ms:8.1f} ms  {name}")
+        if deferred:
+            print("Imported before the window is shown: " + ", ".join(deferred))
+        print("PASS" if passed else "FAIL")
+
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,925 @@
+import argparse
+import asyncio
+import copy
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Callable, Iterable
+
+import numpy as np
+from PIL.Image import Image
+
+from benchmarks.replay import field_accuracy, replay, score_result
+from benchmarks.synthetic import (
+    CHARACTER,
+    DEFAULT_FONT,
+    KINDS,
+    SyntheticFrames,
+    SyntheticSample,
+)
+from config.const import EQUIPPED, EQUIPPED_AVATAR, LIGHT_CONE, RELIC
+from enums.ocr_field import OcrField
+from models.const import (
+    CHAR_ASCENSION,
+    CHAR_LEVEL,
+    CHAR_NAME,
+    CHAR_PATH,
+    CHAR_TRACES,
+    EIDOLON_IMAGES,
+    LC_LEVEL,
+    LC_LOCATION,
+    LC_NAME,
+    LC_SUPERIMPOSITION,
+    RELIC_LEVEL,
+    RELIC_LOCATION,
+    RELIC_MAINSTAT,
+    RELIC_NAME,
+    RELIC_SUBSTAT_NAMES,
+    RELIC_SUBSTAT_VALUES,
+    TRACES_LEVELS,
+    TRACES_UNLOCKS,
+)
+from models.game_data import GameData
+from models.scan_session import ScanSession
+from services.scanner.parsers.character_parser import CharacterParser
+from services.scanner.parsers.light_cone_strategy import LightConeStrategy
+from services.scanner.parsers.relic_strategy import RelicStrategy
+from utils.capture import ReplayCapture
+from utils.conversion import SroKeyMap, convert_to_sro
+from utils.export import ScanFormat, SroFormat, export
+from utils.lexicon import Lexicon
+from utils.log_sink import LogSink
+from utils.name_index import NameIndex
+from utils.ocr import (
+    image_to_string,
+    preprocess_char_count_img,
+    preprocess_equipped_img,
+    preprocess_img,
+    preprocess_lc_level_img,
+    preprocess_main_stat_img,
+    preprocess_sub_stat_img,
+    preprocess_superimposition_img,
+    preprocess_trace_img,
+    preprocess_uid_img,
+    use_lexicon,
+)
+from utils.progress import ScanProgress
+from utils.screenshot import Screenshot
+from utils.substat_reader import read_substats
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINES_FILE = os.path.join(BENCHMARKS_DIR, "baselines.json")
+SAMPLE_OUTPUT_FILE = os.path.join(BENCHMARKS_DIR, "..", "..", "sample_output.json")
+
+# A case regresses if its median latency grows by more than this share of the
+# baseline, or its accuracy drops by more than this many points
+DEFAULT_LATENCY_TOLERANCE = 0.25
+DEFAULT_ACCURACY_TOLERANCE = 0.01
+
+# Latency changes below this are timer noise, even if over the tolerance
+MIN_LATENCY_DELTA_MS = 0.05
+
+DEFAULT_SAMPLES = 20
+DEFAULT_REPLAY_ITEMS = 200
+
+# Typos applied to each target of the closest match cases
+CLOSEST_MATCH_TYPOS = 3
+
+# Field: kind, crop key, whitelist, psm, force preprocess, preprocess function,
+# remove newline and lexicon field, as the parsers call image_to_string.
+# TRACES_LEVELS stands for every trace level crop of a character.
+OCR_FIELDS = {
+    "relic_name": (
+        RELIC,
+        RELIC_NAME,
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZ 'abcedfghijklmnopqrstuvwxyz-",
+        6,
+        False,
+        preprocess_img,
+        True,
+        OcrField.RELIC_NAME,
+    ),
+    "relic_level": (
+        RELIC,
+        RELIC_LEVEL,
+        "0123456789S",
+        7,
+        True,
+        preprocess_img,
+        True,
+        OcrField.RELIC_LEVEL,
+    ),
+    "relic_mainstat": (
+        RELIC,
+        RELIC_MAINSTAT,
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZ abcedfghijklmnopqrstuvwxyz",
+        7,
+        True,
+        preprocess_main_stat_img,
+        True,
+        OcrField.RELIC_MAIN_STAT,
+    ),
+    "relic_substat_names": (
+        RELIC,
+        RELIC_SUBSTAT_NAMES,
+        " ABCDEFGHIKMPRSTacefikrt",
+        6,
+        True,
+        preprocess_sub_stat_img,
+        False,
+        OcrField.RELIC_SUB_STAT_NAMES,
+    ),
+    "relic_substat_values": (
+        RELIC,
+        RELIC_SUBSTAT_VALUES,
+        "0123456789S.%,",
+        6,
+        True,
+        preprocess_sub_stat_img,
+        False,
+        OcrField.RELIC_SUB_STAT_VALUES,
+    ),
+    "relic_equipped": (
+        RELIC,
+        EQUIPPED,
+        "Equiped",
+        7,
+        True,
+        preprocess_equipped_img,
+        True,
+        None,
+    ),
+    "light_cone_name": (
+        LIGHT_CONE,
+        LC_NAME,
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZ 'abcedfghijklmnopqrstuvwxyz-",
+        6,
+        False,
+        preprocess_img,
+        True,
+        OcrField.LIGHT_CONE_NAME,
+    ),
+    "light_cone_level": (
+        LIGHT_CONE,
+        LC_LEVEL,
+        "0123456789S/",
+        7,
+        True,
+        preprocess_lc_level_img,
+        True,
+        OcrField.LIGHT_CONE_LEVEL,
+    ),
+    "light_cone_superimposition": (
+        LIGHT_CONE,
+        LC_SUPERIMPOSITION,
+        "12345S",
+        10,
+        True,
+        preprocess_superimposition_img,
+        True,
+        None,
+    ),
+    "character_name": (
+        CHARACTER,
+        CHAR_NAME,
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZ abcdefghijklmnopqrstuvwxyz/7&",
+        7,
+        False,
+        preprocess_img,
+        True,
+        OcrField.CHARACTER_NAME,
+    ),
+    "character_level": (
+        CHARACTER,
+        CHAR_LEVEL,
+        "0123456789",
+        7,
+        True,
+        preprocess_img,
+        True,
+        OcrField.CHARACTER_LEVEL,
+    ),
+    "trace_level": (
+        CHARACTER,
+        TRACES_LEVELS,
+        "0123456789/",
+        6,
+        True,
+        preprocess_trace_img,
+        True,
+        OcrField.TRACE_LEVEL,
+    ),
+}
+
+# Preprocess function: the kind and crop key it is timed on. The synthetic
+# frames have no uid or character count, so those run on similar digit crops.
+PREPROCESS_FUNCS = {
+    preprocess_img: (RELIC, RELIC_NAME),
+    preprocess_char_count_img: (CHARACTER, CHAR_LEVEL),
+    preprocess_lc_level_img: (LIGHT_CONE, LC_LEVEL),
+    preprocess_trace_img: (CHARACTER, TRACES_LEVELS),
+    preprocess_equipped_img: (RELIC, EQUIPPED),
+    preprocess_main_stat_img: (RELIC, RELIC_MAINSTAT),
+    preprocess_sub_stat_img: (RELIC, RELIC_SUBSTAT_VALUES),
+    preprocess_superimposition_img: (LIGHT_CONE, LC_SUPERIMPOSITION),
+    preprocess_uid_img: (RELIC, RELIC_LEVEL),
+}
+
+
+class BenchmarkSuite:
+    """BenchmarkSuite class times the parse steps of a scan on synthetic frames
+    and scores them against the ground truth
+
+    Every case is measured on the same captured crops, so latency and accuracy
+    stay comparable between runs with the same seed.
+    """
+
+    def __init__(
+        self,
+        game_data: GameData,
+        frames: SyntheticFrames,
+        samples: int = DEFAULT_SAMPLES,
+        replay_items: int = DEFAULT_REPLAY_ITEMS,
+    ) -> None:
+        """Constructor
+
+        :param game_data: The GameData class instance
+        :param frames: The synthetic frames to render samples with
+        :param samples: The samples of each kind, defaults to DEFAULT_SAMPLES
+        :param replay_items: The items of the replay case, defaults to
+            DEFAULT_REPLAY_ITEMS
+        """
+        self._game_data = game_data
+        self._frames = frames
+        self._replay_items = replay_items
+        self._capture = ReplayCapture()
+        self._log_sink = LogSink()
+        self._screenshot = Screenshot(self._capture, self._log_sink)
+        args = (
+            game_data,
+            ScanSession(),
+            self._log_sink,
+            ScanProgress(),
+            asyncio.Event(),
+        )
+        self._strategies = {
+            RELIC: RelicStrategy(*args),
+            LIGHT_CONE: LightConeStrategy(*args),
+        }
+        self._char_parser = CharacterParser(*args)
+
+        # the crops of each sample, captured once like the scanner does
+        self._captured = {
+            kind: [
+                (sample, self._capture_sample(sample))
+                for sample in frames.samples([kind], samples)
+            ]
+            for kind in KINDS
+        }
+
+    def cases(self) -> dict[str, Callable[[], dict]]:
+        """Get the benchmark cases
+
+        :return: The function that runs each case, by case name
+        """
+        cases = {}
+        for field in OCR_FIELDS:
+            cases[f"ocr.{field}"] = lambda field=field: self._ocr_case(field)
+        cases["ocr.relic_substats"] = self._substats_case
+        cases["name_index.relic"] = lambda: self._name_index_case(RELIC, RELIC_NAME)
+        cases["name_index.light_cone"] = lambda: self._name_index_case(
+            LIGHT_CONE, LC_NAME
+        )
+        for func in PREPROCESS_FUNCS:
+            cases[f"preprocess.{func.__name__}"] = (
+                lambda func=func: self._preprocess_case(func)
+            )
+        cases["parse.relic"] = lambda: self._parse_case(RELIC)
+        cases["parse.light_cone"] = lambda: self._parse_case(LIGHT_CONE)
+        cases["parse.character"] = self._character_case
+        cases["game_data.get_equipped_character"] = self._equipped_character_case
+        for name, targets in self._closest_match_targets().items():
+            cases[f"game_data.{name}"] = (
+                lambda name=name, targets=targets: self._closest_match_case(
+                    name, targets
+                )
+            )
+        cases["conversion.convert_to_sro"] = self._convert_case
+        cases["export.scan_and_sro"] = self._export_case
+        cases["replay.throughput"] = self._replay_case
+        return cases
+
+    def run(self, selected: Iterable[str] | None = None) -> dict[str, dict]:
+        """Run the benchmark cases
+
+        :param selected: Substrings of the case names to run, defaults to all
+        :return: The measurement of each case, by case name
+        """
+        selected = list(selected or [])
+        results = {}
+        for name, case in self.cases().items():
+            if selected and not any(s in name for s in selected):
+                continue
+            results[name] = case()
+            self._log_sink.drain()
+        return results
+
+    def _capture_sample(self, sample: SyntheticSample) -> dict:
+        """Capture the crops of a sample
+
+        :param sample: The sample
+        :return: The crops by stats or character rect key. Character crops hold
+            the trace levels under TRACES_LEVELS and the eidolons under
+            EIDOLON_IMAGES.
+        """
+        self._capture.show(sample.frames[0])
+        if sample.kind != CHARACTER:
+            strategy = self._strategies[sample.kind]
+            return self._screenshot.screenshot_stats(strategy.SCAN_TYPE)[0]
+
+        crops = {
+            CHAR_NAME: self._screenshot.screenshot_character_name(),
+            CHAR_LEVEL: self._screenshot.screenshot_character_level(),
+        }
+        self._capture.show(sample.frames[1])
+        path_key = sample.expected[CHAR_PATH].split(" ")[-1].lower()
+        crops[TRACES_LEVELS] = self._screenshot.screenshot_character_traces(path_key)
+        self._capture.show(sample.frames[2])
+        crops[EIDOLON_IMAGES] = self._screenshot.screenshot_character_eidolons()
+        return crops
+
+    def _crops(self, kind: str, key: str) -> list[tuple[Image, str]]:
+        """Get the crops of a field and the text drawn in them
+
+        :param kind: The kind of samples
+        :param key: The crop key, TRACES_LEVELS for every trace level
+        :return: The crops and their texts, empty if nothing was drawn
+        """
+        res = []
+        for sample, crops in self._captured[kind]:
+            if key == TRACES_LEVELS:
+                res.extend(
+                    (img, sample.texts.get(k, "")) for k, img in crops[key].items()
+                )
+            else:
+                res.append((crops[key], sample.texts.get(key, "")))
+        return res
+
+    def _ocr_case(self, field: str) -> dict:
+        """Time image_to_string on a field and score the text it reads
+
+        :param field: The field in OCR_FIELDS
+        :return: The measurement
+        """
+        kind, key, whitelist, psm, force, preprocess, remove_newline, ocr_field = (
+            OCR_FIELDS[field]
+        )
+        crops = self._crops(kind, key)
+        times, texts = _time_calls(
+            lambda img: image_to_string(
+                img, whitelist, psm, force, preprocess, remove_newline, ocr_field
+            ),
+            [img for img, _ in crops],
+        )
+        matches = [
+            _normalize(text, whitelist) == _normalize(expected, whitelist)
+            for text, (_, expected) in zip(texts, crops)
+        ]
+        return _measurement(times, _share(matches))
+
+    def _substats_case(self) -> dict:
+        """Time read_substats on the substat block and score the rows it reads
+
+        :return: The measurement
+        """
+        captured = self._captured[RELIC]
+        times, results = _time_calls(
+            lambda crops: read_substats(
+                crops[RELIC_SUBSTAT_NAMES], crops[RELIC_SUBSTAT_VALUES]
+            ),
+            [crops for _, crops in captured],
+        )
+        matches = []
+        for rows, (sample, _) in zip(results, captured):
+            expected = zip(
+                sample.texts[RELIC_SUBSTAT_NAMES].split("\n"),
+                sample.texts[RELIC_SUBSTAT_VALUES].split("\n"),
+            )
+            matches.append(rows == [row for row in expected if row[0]])
+        return _measurement(times, _share(matches))
+
+    def _name_index_case(self, kind: str, key: str) -> dict:
+        """Time NameIndex lookups of name crops, the first crop of each name
+        being added, and score the names it recognizes
+
+        :param kind: RELIC or LIGHT_CONE
+        :param key: The name crop key
+        :return: The measurement
+        """
+        crops = self._crops(kind, key)
+        index = NameIndex()
+        added = set()
+        for img, name in crops:
+            if name not in added:
+                index.add(img, name)
+                added.add(name)
+        times, names = _time_calls(index.lookup, [img for img, _ in crops])
+        matches = [name == expected for name, (_, expected) in zip(names, crops)]
+        return _measurement(times, _share(matches))
+
+    def _preprocess_case(self, func: Callable[[Image], Image]) -> dict:
+        """Time a preprocess function
+
+        :param func: The preprocess function
+        :return: The measurement
+        """
+        kind, key = PREPROCESS_FUNCS[func]
+        times, _ = _time_calls(func, [img for img, _ in self._crops(kind, key)])
+        return _measurement(times)
+
+    def _parse_case(self, kind: str) -> dict:
+        """Time the parse of a strategy and score its results
+
+        :param kind: RELIC or LIGHT_CONE
+        :return: The measurement
+        """
+        strategy = self._strategies[kind]
+        captured = self._captured[kind]
+        times, results = _time_calls(
+            lambda args: strategy.parse(*args),
+            [(dict(crops), i) for i, (_, crops) in enumerate(captured)],
+        )
+        return self._scored_measurement(times, captured, results)
+
+    def _character_case(self) -> dict:
+        """Time the character parser and score its results
+
+        The name and path are taken from the ground truth, they are read by the
+        scanner before parsing and timed by the character name OCR case.
+
+        :return: The measurement
+        """
+        captured = self._captured[CHARACTER]
+        stats_dicts = [
+            {
+                CHAR_NAME: sample.expected[CHAR_NAME],
+                CHAR_PATH: sample.expected[CHAR_PATH],
+                CHAR_ASCENSION: sample.expected[CHAR_ASCENSION],
+                CHAR_LEVEL: crops[CHAR_LEVEL],
+                CHAR_TRACES: {
+                    TRACES_LEVELS: dict(crops[TRACES_LEVELS]),
+                    TRACES_UNLOCKS: {},
+                },
+                EIDOLON_IMAGES: crops[EIDOLON_IMAGES],
+            }
+            for sample, crops in captured
+        ]
+        times, results = _time_calls(self._char_parser.parse, stats_dicts)
+        return self._scored_measurement(times, captured, results)
+
+    def _equipped_character_case(self) -> dict:
+        """Time the equipped character lookup and score it against the location
+
+        :return: The measurement
+        """
+        inputs = []
+        for kind, location_key in ((RELIC, RELIC_LOCATION), (LIGHT_CONE, LC_LOCATION)):
+            inputs.extend(
+                (crops[EQUIPPED_AVATAR], sample.expected[location_key])
+                for sample, crops in self._captured[kind]
+                if sample.expected[location_key]
+            )
+        times, results = _time_calls(
+            self._game_data.get_equipped_character, [img for img, _ in inputs]
+        )
+        matches = [res[0] == location for res, (_, location) in zip(results, inputs)]
+        return _measurement(times, _share(matches))
+
+    def _closest_match_targets(self) -> dict[str, list[str]]:
+        """Get the names each closest match function is timed on
+
+        :return: The names by function name
+        """
+        game_data = self._game_data
+        return {
+            "get_closest_relic_name": list(game_data.RELIC_META_DATA),
+            "get_closest_light_cone_name": list(game_data.LIGHT_CONE_META_DATA),
+            "get_closest_relic_sub_stat": _sample_texts(self._captured[RELIC], True),
+            "get_closest_relic_main_stat": _sample_texts(self._captured[RELIC], False),
+            "get_closest_character_name": [
+                s.expected[CHAR_NAME] for s, _ in self._captured[CHARACTER]
+            ],
+            "get_closest_path_name": [
+                s.expected[CHAR_PATH] for s, _ in self._captured[CHARACTER]
+            ],
+        }
+
+    def _closest_match_case(self, name: str, targets: list[str]) -> dict:
+        """Time a closest match function on names with typos, and score whether
+        the original name is found
+
+        :param name: The name of the GameData function
+        :param targets: The names to add typos to
+        :return: The measurement
+        """
+        rng = np.random.default_rng(0)
+        inputs = [
+            (_typo(target, rng), target)
+            for target in targets
+            for _ in range(CLOSEST_MATCH_TYPOS)
+        ]
+        times, results = _time_calls(
+            getattr(self._game_data, name), [typo for typo, _ in inputs]
+        )
+        # the character keys hold the outfit after a #
+        matches = [
+            res[0].split("#")[-1] == target for res, (_, target) in zip(results, inputs)
+        ]
+        return _measurement(times, _share(matches))
+
+    def _convert_case(self) -> dict:
+        """Time the SRO conversion of the sample output
+
+        :return: The measurement
+        """
+        with open(SAMPLE_OUTPUT_FILE, "r") as f:
+            data = json.load(f)
+        key_map = SroKeyMap.from_game_data(self._game_data)
+        times, _ = _time_calls(
+            lambda d: convert_to_sro(d, self._game_data, key_map),
+            [copy.deepcopy(data) for _ in range(DEFAULT_SAMPLES)],
+        )
+        return _measurement(times)
+
+    def _export_case(self) -> dict:
+        """Time writing the sample output in the HSR-Scanner and SRO formats
+
+        :return: The measurement
+        """
+        with open(SAMPLE_OUTPUT_FILE, "r") as f:
+            data = json.load(f)
+        formats = [ScanFormat(), SroFormat(SroKeyMap.from_game_data(self._game_data))]
+        with tempfile.TemporaryDirectory() as directory:
+            times, _ = _time_calls(
+                lambda d: export(d, formats, directory), [data] * DEFAULT_SAMPLES
+            )
+        return _measurement(times)
+
+    def _replay_case(self) -> dict:
+        """Replay a mixed inventory through the whole pipeline
+
+        :return: The measurement, the latency being the time per item
+        """
+        report = replay(
+            self._game_data, self._frames.samples(KINDS, self._replay_items)
+        )
+        ms_per_item = 1000 / report["items_per_second"]
+        # every kind counts the same, whatever its share of the items
+        accuracy = [a["all_fields"] for a in report["accuracy"].values()]
+        return {
+            "runs": report["items"],
+            "median_ms": round(ms_per_item, 4),
+            "p95_ms": None,
+            "accuracy": round(float(np.mean(accuracy)), 4) if accuracy else None,
+            "fields": report["accuracy"],
+            "peak_rss_mb": report["peak_rss_mb"],
+        }
+
+    def _scored_measurement(
+        self, times: list[float], captured: list[tuple], results: list[dict]
+    ) -> dict:
+        """Build the measurement of a parse case with its field accuracy
+
+        :param times: The time of each call in ms
+        :param captured: The samples and their crops
+        :param results: The parse results
+        :return: The measurement, its accuracy being the share of items with all
+            fields right
+        """
+        counts = Counter()
+        for (sample, _), result in zip(captured, results):
+            score_result(counts, sample.expected, result or {})
+        fields = field_accuracy(counts)
+        measurement = _measurement(times, fields.get("all_fields"))
+        measurement["fields"] = fields
+        return measurement
+
+
+def compare(
+    results: dict[str, dict],
+    baselines: dict[str, dict],
+    latency_tolerance: float = DEFAULT_LATENCY_TOLERANCE,
+    accuracy_tolerance: float = DEFAULT_ACCURACY_TOLERANCE,
+) -> bool:
+    """Compare measurements to their baselines, adding the baseline and a status
+    to each
+
+    The status is "ok", "regressed" with the reasons listed, or "new" without a
+    baseline. A new case fails too, as nothing gates it until its baseline is
+    stored with --update-baselines.
+
+    :param results: The measurements by case name
+    :param baselines: The baseline measurements by case name
+    :param latency_tolerance: The share the median latency may grow by,
+        defaults to DEFAULT_LATENCY_TOLERANCE
+    :param accuracy_tolerance: The points the accuracy may drop by, defaults to
+        DEFAULT_ACCURACY_TOLERANCE
+    :return: True if every case has a baseline and none regressed
+    """
+    passed = True
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if baseline is None:
+            result["status"] = "new"
+            result["reasons"] = ["no baseline, store one with --update-baselines"]
+            passed = False
+            continue
+
+        result["baseline"] = {
+            k: baseline.get(k) for k in ("median_ms", "accuracy", "commit")
+        }
+        reasons = []
+        limit = baseline["median_ms"] * (1 + latency_tolerance)
+        if (
+            result["median_ms"] > limit
+            and result["median_ms"] - baseline["median_ms"] > MIN_LATENCY_DELTA_MS
+        ):
+            reasons.append(f"median {result['median_ms']} ms over {round(limit, 4)} ms")
+        if baseline.get("accuracy") is not None and (
+            result["accuracy"] is None
+            or result["accuracy"] < baseline["accuracy"] - accuracy_tolerance
+        ):
+            reasons.append(
+                f"accuracy {result['accuracy']} under "
+                f"{round(baseline['accuracy'] - accuracy_tolerance, 4)}"
+            )
+
+        result["status"] = "regressed" if reasons else "ok"
+        if reasons:
+            result["reasons"] = reasons
+            passed = False
+    return passed
+
+
+def load_baselines(path: str) -> dict[str, dict]:
+    """Load stored baselines
+
+    :param path: The baselines file
+    :return: The baseline measurements by case name, empty if there is no file
+    """
+    if not os.path.isfile(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_baselines(path: str, results: dict[str, dict], commit: str | None) -> None:
+    """Store measurements as the new baselines, keeping the baselines of cases
+    that did not run
+
+    :param path: The baselines file
+    :param results: The measurements by case name
+    :param commit: The commit the measurements were taken on
+    """
+    baselines = load_baselines(path)
+    for name, result in results.items():
+        baselines[name] = {
+            "median_ms": result["median_ms"],
+            "accuracy": result["accuracy"],
+            "commit": commit,
+        }
+    with open(path, "w") as f:
+        json.dump(baselines, f, indent=4, sort_keys=True)
+
+
+def _time_calls(func: Callable, inputs: list) -> tuple[list[float], list]:
+    """Call a function on each input and time every call
+
+    :param func: The function
+    :param inputs: The inputs
+    :return: The time of each call in ms, and the outputs
+    """
+    times = []
+    outputs = []
+    for arg in inputs:
+        start = time.perf_counter()
+        outputs.append(func(arg))
+        times.append((time.perf_counter() - start) * 1000)
+    return times, outputs
+
+
+def _measurement(times: list[float], accuracy: float | None = None) -> dict:
+    """Summarize the times of a case
+
+    :param times: The time of each call in ms
+    :param accuracy: The accuracy from 0 to 1, None if the case is not scored
+    :return: The measurement
+    """
+    if not times:
+        return {"runs": 0, "median_ms": 0.0, "p95_ms": 0.0, "accuracy": accuracy}
+    return {
+        "runs": len(times),
+        "median_ms": round(float(np.median(times)), 4),
+        "p95_ms": round(float(np.percentile(times, 95)), 4),
+        "accuracy": accuracy,
+    }
+
+
+def _share(matches: list[bool]) -> float | None:
+    """Get the share of matches
+
+    :param matches: The matches
+    :return: The share from 0 to 1, None if there are none
+    """
+    return round(sum(matches) / len(matches), 4) if matches else None
+
+
+def _normalize(text: str, whitelist: str) -> str:
+    """Normalize a text for comparison, dropping the characters OCR can not
+    read and collapsing whitespace
+
+    :param text: The text
+    :param whitelist: The characters OCR reads
+    :return: The normalized text
+    """
+    return " ".join("".join(c for c in text if c in whitelist or c.isspace()).split())
+
+
+def _sample_texts(captured: list[tuple], substats: bool) -> list[str]:
+    """Get the relic stat names drawn in the samples
+
+    :param captured: The relic samples and their crops
+    :param substats: True for the substat names, False for the main stats
+    :return: The stat names
+    """
+    if substats:
+        return [
+            name
+            for sample, _ in captured
+            for name in sample.texts[RELIC_SUBSTAT_NAMES].split("\n")
+            if name
+        ]
+    return [sample.texts[RELIC_MAINSTAT] for sample, _ in captured]
+
+
+def _typo(text: str, rng: np.random.Generator) -> str:
+    """Add an OCR-like typo to a text, dropping, doubling or swapping a letter
+
+    :param text: The text
+    :param rng: The random generator
+    :return: The text with a typo
+    """
+    if len(text) < 2:
+        return text
+    i = int(rng.integers(len(text) - 1))
+    op = int(rng.integers(3))
+    if op == 0:
+        return text[:i] + text[i + 1 :]
+    if op == 1:
+        return text[: i + 1] + text[i:]
+    return text[:i] + text[i + 1] + text[i] + text[i + 2 :]
+
+
+def _git_commit() -> str | None:
+    """Get the commit of the working tree
+
+    :return: The commit hash, None outside a git checkout
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=BENCHMARKS_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time the parse steps of a scan on synthetic frames, score "
+        "them against the ground truth and fail on regressions against the stored "
+        "baselines. Run from the src directory with python -m benchmarks.suite."
+    )
+    parser.add_argument(
+        "--cases",
+        nargs="+",
+        help="Substrings of the case names to run, defaults to all",
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=DEFAULT_SAMPLES,
+        help=f"The samples of each kind, defaults to {DEFAULT_SAMPLES}",
+    )
+    parser.add_argument(
+        "--replay-items",
+        type=int,
+        default=DEFAULT_REPLAY_ITEMS,
+        help=f"The items of the replay case, defaults to {DEFAULT_REPLAY_ITEMS}",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="The seed, defaults to 0")
+    parser.add_argument(
+        "--noise", type=float, default=0.0, help="The pixel noise, defaults to 0"
+    )
+    parser.add_argument(
+        "--bleed", type=float, default=0.0, help="The background bleed, defaults to 0"
+    )
+    parser.add_argument(
+        "--font",
+        default=DEFAULT_FONT,
+        help=f"The TrueType font to render with, defaults to {DEFAULT_FONT}",
+    )
+    parser.add_argument(
+        "--baselines",
+        default=BASELINES_FILE,
+        help="The baselines file, defaults to benchmarks/baselines.json",
+    )
+    parser.add_argument(
+        "--update-baselines",
+        action="store_true",
+        help="Store the measurements as the new baselines instead of failing, "
+        "required on the first run of a case",
+    )
+    parser.add_argument(
+        "--latency-tolerance",
+        type=float,
+        default=DEFAULT_LATENCY_TOLERANCE,
+        help="The share the median latency of a case may grow by, defaults to "
+        f"{DEFAULT_LATENCY_TOLERANCE}",
+    )
+    parser.add_argument(
+        "--accuracy-tolerance",
+        type=float,
+        default=DEFAULT_ACCURACY_TOLERANCE,
+        help="The points the accuracy of a case may drop by, defaults to "
+        f"{DEFAULT_ACCURACY_TOLERANCE}",
+    )
+    parser.add_argument(
+        "--lexicon",
+        action="store_true",
+        help="Bias OCR towards the game data lexicon instead of reading with the "
+        "whitelists only, to measure what the lexicon gains",
+    )
+    parser.add_argument("--report", help="Write the JSON report to this file")
+    parser.add_argument(
+        "--history",
+        help="Append the report as a line to this JSON lines file, for plotting "
+        "over time",
+    )
+    args = parser.parse_args()
+
+    game_data = GameData()
+    use_lexicon(Lexicon(game_data) if args.lexicon else None)
+    frames = SyntheticFrames(game_data, args.seed, args.noise, args.bleed, args.font)
+    suite = BenchmarkSuite(game_data, frames, args.samples, args.replay_items)
+    results = suite.run(args.cases)
+
+    commit = _git_commit()
+    passed = compare(
+        results,
+        load_baselines(args.baselines),
+        args.latency_tolerance,
+        args.accuracy_tolerance,
+    )
+    if args.update_baselines:
+        save_baselines(args.baselines, results, commit)
+        passed = True
+
+    report = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "samples": args.samples,
+        "noise": args.noise,
+        "bleed": args.bleed,
+        "lexicon": args.lexicon,
+        "passed": passed,
+        "cases": results,
+    }
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=4)
+    if args.history:
+        with open(args.history, "a") as f:
+            f.write(json.dumps(report) + "\n")
+
+    print(json.dumps(report, indent=4))
+    for name, result in results.items():
+        for reason in result.get("reasons", []):
+            print(f"{name}: {reason}", file=sys.stderr)
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
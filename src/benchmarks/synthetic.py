@@ -0,0 +1,809 @@
+import argparse
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+import cv2
+import numpy as np
+from PIL import Image as PILImage
+from PIL import ImageDraw, ImageFont
+from PIL.Image import Image
+
+from config.const import (
+    ASPECT_16_9,
+    EQUIPPED,
+    EQUIPPED_AVATAR,
+    LIGHT_CONE,
+    LOCK,
+    RELIC,
+    STATS,
+)
+from models.const import (
+    BASIC,
+    CHAR_ASCENSION,
+    CHAR_EIDOLON,
+    CHAR_ID,
+    CHAR_LEVEL,
+    CHAR_MEMOSPRITE,
+    CHAR_NAME,
+    CHAR_PATH,
+    CHAR_SKILLS,
+    CHAR_TRACES,
+    LC_ASCENSION,
+    LC_ID,
+    LC_LEVEL,
+    LC_LOCATION,
+    LC_LOCK,
+    LC_NAME,
+    LC_SUPERIMPOSITION,
+    LOCK_ICON_PATH,
+    RELIC_DISCARD,
+    RELIC_LEVEL,
+    RELIC_LOCATION,
+    RELIC_MAINSTAT,
+    RELIC_NAME,
+    RELIC_RARITY,
+    RELIC_SET,
+    RELIC_SET_ID,
+    RELIC_SLOT,
+    RELIC_SUBSTAT_NAME,
+    RELIC_SUBSTAT_NAMES,
+    RELIC_SUBSTAT_ORDER,
+    RELIC_SUBSTAT_VALUE,
+    RELIC_SUBSTAT_VALUES,
+    RELIC_SUBSTATS,
+    SKILL,
+    TALENT,
+    ULT,
+)
+from models.game_data import GameData
+from models.substat_vals import SUBSTAT_ROLL_VALS
+from services.scanner.relic_validator import MAX_SUBSTATS
+from utils.data import resource_path
+from utils.roi import REFERENCE_HEIGHT, REFERENCE_WIDTH, CompiledROIs, compile_rois
+
+CHARACTER = "character"
+KINDS = (RELIC, LIGHT_CONE, CHARACTER)
+
+GROUND_TRUTH_FILE = "ground_truth.json"
+
+# Font the text is rendered with unless another one is given. The game font is
+# not redistributable, so the parsers see a different but similar sans-serif.
+DEFAULT_FONT = "arial.ttf" if os.name == "nt" else "DejaVuSans.ttf"
+
+# Number of background textures that samples pick from
+BACKGROUND_COUNT = 4
+
+PANEL_COLOUR = (24, 26, 36)
+TEXT_COLOUR = (235, 235, 235)
+
+# Relic main stats each slot can roll, Head and Hands are fixed
+RELIC_MAIN_STATS_BY_SLOT = {
+    "Head": ["HP"],
+    "Hands": ["ATK"],
+    "Body": [
+        "HP",
+        "ATK",
+        "DEF",
+        "Effect Hit Rate",
+        "Outgoing Healing Boost",
+        "CRIT Rate",
+        "CRIT DMG",
+    ],
+    "Feet": ["HP", "ATK", "DEF", "SPD"],
+    "Planar Sphere": [
+        "HP",
+        "ATK",
+        "DEF",
+        "Physical DMG Boost",
+        "Fire DMG Boost",
+        "Ice DMG Boost",
+        "Wind DMG Boost",
+        "Lightning DMG Boost",
+        "Quantum DMG Boost",
+        "Imaginary DMG Boost",
+    ],
+    "Link Rope": ["HP", "ATK", "DEF", "Break Effect", "Energy Regeneration Rate"],
+}
+
+# Trailblazer needs the icon detectors and the scan session, which do not
+# apply to a single synthetic page
+TRAILBLAZER_NAMES = {"Trailblazer", "Stelle", "Caelus"}
+
+
+@dataclass
+class SyntheticSample:
+    """A rendered inventory item or character and its expected parse result"""
+
+    # RELIC, LIGHT_CONE or CHARACTER
+    kind: str
+    # Frames of the whole client area, one per page the scanner reads from.
+    # Characters have a details, a traces and an eidolons page.
+    frames: list[Image]
+    # The screen rect of each frame that holds content, the rest is background
+    boxes: list[tuple[int, int, int, int]]
+    # The parse result the pipeline should produce
+    expected: dict
+    # The text drawn in each OCR field, by stats or character rect key
+    texts: dict[str, str] = field(default_factory=dict)
+
+
+class SyntheticFrames:
+    """SyntheticFrames class renders relic and light cone stats panels and
+    character pages at 1920x1080 with the layout of `config/screenshot.py`
+
+    Names come from the game data, relic substats only take legal values from
+    SUBSTAT_ROLL_VALS. Every sample is seeded by its index, so the same seed
+    always renders the same inventory.
+    """
+
+    def __init__(
+        self,
+        game_data: GameData,
+        seed: int = 0,
+        noise: float = 0.0,
+        bleed: float = 0.0,
+        font_path: str = DEFAULT_FONT,
+    ) -> None:
+        """Constructor
+
+        :param game_data: The GameData class instance
+        :param seed: The seed of the inventory, defaults to 0
+        :param noise: The standard deviation of the Gaussian pixel noise,
+            defaults to 0.0
+        :param bleed: How much of the background shows through the stats
+            panel, from 0 to 1, defaults to 0.0
+        :param font_path: The path or name of the TrueType font, defaults to
+            DEFAULT_FONT
+        """
+        self._game_data = game_data
+        self._seed = seed
+        self._noise = noise
+        self._bleed = bleed
+        self._font_path = font_path
+        self._fonts = {}
+        self._rois = compile_rois(ASPECT_16_9, 0, 0, REFERENCE_WIDTH, REFERENCE_HEIGHT)
+
+        self._relic_names = sorted(game_data.RELIC_META_DATA)
+        self._light_cone_names = sorted(game_data.LIGHT_CONE_META_DATA)
+        self._characters = sorted(
+            (name, path)
+            for name, paths in game_data.CHARACTER_META_DATA.items()
+            if name not in TRAILBLAZER_NAMES
+            for path in paths
+        )
+        self._avatar_ids = sorted(
+            char_id for char_id in game_data.EQUIPPED_ICONS if "#" not in char_id
+        )
+        self._lock_icon = PILImage.open(resource_path(LOCK_ICON_PATH)).convert("RGB")
+        self._discard_icon = PILImage.open(
+            resource_path("assets/images/discard.png")
+        ).convert("RGB")
+
+        rng = np.random.default_rng(seed)
+        self._backgrounds = [_background(rng) for _ in range(BACKGROUND_COUNT)]
+
+    @property
+    def rois(self) -> CompiledROIs:
+        """The regions of interest of the rendered frames"""
+        return self._rois
+
+    def sample(self, kind: str, index: int) -> SyntheticSample:
+        """Render one sample
+
+        :param kind: RELIC, LIGHT_CONE or CHARACTER
+        :param index: The index of the sample
+        :raises ValueError: Thrown if the kind is invalid
+        :return: The sample
+        """
+        rng = np.random.default_rng([self._seed, KINDS.index(kind), index])
+        match kind:
+            case "relic":
+                return self._render_relic(rng)
+            case "light_cone":
+                return self._render_light_cone(rng)
+            case "character":
+                return self._render_character(rng)
+            case _:
+                raise ValueError(f"Invalid kind: {kind}.")
+
+    def samples(self, kinds: Iterable[str], count: int) -> Iterator[SyntheticSample]:
+        """Render samples of the kinds in turn
+
+        :param kinds: The kinds
+        :param count: The total number of samples
+        :return: The samples
+        """
+        kinds = list(kinds)
+        for i in range(count):
+            yield self.sample(kinds[i % len(kinds)], i // len(kinds))
+
+    def _render_relic(self, rng: np.random.Generator) -> SyntheticSample:
+        """Render a relic stats panel
+
+        :param rng: The random generator of the sample
+        :return: The sample
+        """
+        name = str(rng.choice(self._relic_names))
+        metadata = self._game_data.get_relic_meta_data(name)
+        slot = metadata[RELIC_SLOT]
+        rarity = int(rng.integers(2, 6))
+        level = int(rng.integers(0, rarity * 3 + 1))
+        main_stat = str(rng.choice(RELIC_MAIN_STATS_BY_SLOT[slot]))
+
+        # a substat is never the same stat as the main stat, which is flat on
+        # Head, Hands and for SPD and a percentage otherwise
+        flat = slot in ("Head", "Hands") or main_stat == "SPD"
+        main_key = main_stat if flat else f"{main_stat}_"
+        table = SUBSTAT_ROLL_VALS[str(rarity)]
+        keys = [k for k in table if k != main_key]
+
+        # roll the substats like the game, so the relics pass validation: the
+        # initial substats, then one new substat or roll every 3 levels
+        count = int(rng.integers(max(rarity - 2, 0), min(rarity - 1, MAX_SUBSTATS) + 1))
+        rolls = dict.fromkeys(
+            (str(k) for k in rng.choice(keys, count, replace=False)), 1
+        )
+        for _ in range(level // 3):
+            if len(rolls) < MAX_SUBSTATS:
+                rolls[str(rng.choice([k for k in keys if k not in rolls]))] = 1
+                continue
+            upgradable = [k for k in rolls if _legal_values(table[k], rolls[k] + 1)]
+            if not upgradable:
+                break
+            rolls[str(rng.choice(upgradable))] += 1
+
+        substats = []
+        for key, n in rolls.items():
+            value = str(rng.choice(_legal_values(table[key], n)))
+            substats.append(
+                {
+                    RELIC_SUBSTAT_NAME: key,
+                    RELIC_SUBSTAT_VALUE: (
+                        float(value) if key.endswith("_") else int(float(value))
+                    ),
+                }
+            )
+        substats.sort(key=lambda x: RELIC_SUBSTAT_ORDER.index(x[RELIC_SUBSTAT_NAME]))
+
+        lock = bool(rng.random() < 0.5)
+        discard = bool(not lock and rng.random() < 0.2)
+        location = self._pick_location(rng)
+
+        substat_names = [s[RELIC_SUBSTAT_NAME].rstrip("_") for s in substats]
+        substat_values = [
+            (
+                f"{s[RELIC_SUBSTAT_VALUE]:.1f}%"
+                if s[RELIC_SUBSTAT_NAME].endswith("_")
+                else str(s[RELIC_SUBSTAT_VALUE])
+            )
+            for s in substats
+        ]
+        texts = {
+            RELIC_NAME: name,
+            RELIC_LEVEL: f"+{level}",
+            RELIC_MAINSTAT: main_stat,
+            RELIC_SUBSTAT_NAMES: "\n".join(substat_names),
+            RELIC_SUBSTAT_VALUES: "\n".join(substat_values),
+        }
+
+        rects = self._rois.stats_rects[RELIC]
+        panel, draw = self._panel(rng)
+        for key in (RELIC_NAME, RELIC_LEVEL, RELIC_MAINSTAT):
+            self._text(draw, rects[key], texts[key], rng)
+        self._lines(draw, rects[RELIC_SUBSTAT_NAMES], substat_names, rng)
+        self._lines(
+            draw, rects[RELIC_SUBSTAT_VALUES], substat_values, rng, align_right=True
+        )
+        draw.rectangle(
+            rects[RELIC_RARITY],
+            fill=tuple(int(c) for c in self._game_data.COLOURS[rarity - 1]),
+        )
+        if lock:
+            _paste(panel, self._lock_icon, rects[LOCK])
+        if discard:
+            _paste(panel, self._discard_icon, rects[RELIC_DISCARD])
+        self._equip(panel, draw, rects, location, rng, texts)
+
+        return self._stats_sample(
+            RELIC,
+            panel,
+            rng,
+            {
+                RELIC_SET_ID: str(metadata[RELIC_SET_ID]),
+                RELIC_NAME: metadata[RELIC_SET],
+                RELIC_SLOT: slot,
+                RELIC_RARITY: rarity,
+                RELIC_LEVEL: level,
+                RELIC_MAINSTAT: main_stat,
+                RELIC_SUBSTATS: substats,
+                RELIC_LOCATION: location,
+                LOCK: lock,
+                RELIC_DISCARD: discard,
+            },
+            texts,
+        )
+
+    def _render_light_cone(self, rng: np.random.Generator) -> SyntheticSample:
+        """Render a light cone stats panel
+
+        :param rng: The random generator of the sample
+        :return: The sample
+        """
+        name = str(rng.choice(self._light_cone_names))
+        ascension = int(rng.integers(0, 7))
+        max_level = 20 + 10 * ascension
+        level = int(rng.integers(max(max_level - 10, 1), max_level + 1))
+        superimposition = int(rng.integers(1, 6))
+        lock = bool(rng.random() < 0.5)
+        location = self._pick_location(rng)
+
+        texts = {
+            LC_NAME: name,
+            LC_LEVEL: f"{level}/{max_level}",
+            LC_SUPERIMPOSITION: str(superimposition),
+        }
+
+        rects = self._rois.stats_rects[LIGHT_CONE]
+        panel, draw = self._panel(rng)
+        for key, text in texts.items():
+            self._text(draw, rects[key], text, rng)
+        if lock:
+            _paste(panel, self._lock_icon, rects[LOCK])
+        self._equip(panel, draw, rects, location, rng, texts)
+
+        return self._stats_sample(
+            LIGHT_CONE,
+            panel,
+            rng,
+            {
+                LC_ID: str(self._game_data.get_light_cone_meta_data(name)[LC_ID]),
+                LC_NAME: name,
+                LC_LEVEL: level,
+                LC_ASCENSION: ascension,
+                LC_SUPERIMPOSITION: superimposition,
+                LC_LOCATION: location,
+                LC_LOCK: lock,
+            },
+            texts,
+        )
+
+    def _render_character(self, rng: np.random.Generator) -> SyntheticSample:
+        """Render the details, traces and eidolons pages of a character
+
+        :param rng: The random generator of the sample
+        :return: The sample
+        """
+        name, path = self._characters[int(rng.integers(len(self._characters)))]
+        metadata = self._game_data.get_character_meta_data(name, path)
+        ascension = int(rng.integers(0, 7))
+        max_level = 20 + 10 * ascension
+        level = int(rng.integers(max(max_level - 10, 1), max_level + 1))
+        eidolon = int(rng.integers(0, 7))
+
+        # trace levels as parsed, the page shows them with the eidolon bonuses
+        skills = {
+            BASIC: int(rng.integers(1, 7)),
+            SKILL: int(rng.integers(1, 11)),
+            ULT: int(rng.integers(1, 11)),
+            TALENT: int(rng.integers(1, 11)),
+        }
+        memosprite = None
+        if path == "Remembrance":
+            memosprite = {
+                SKILL: int(rng.integers(1, 7)),
+                TALENT: int(rng.integers(1, 7)),
+            }
+        shown = {k: v for k, v in skills.items()}
+        shown.update(
+            {f"{CHAR_MEMOSPRITE}_{k}": v for k, v in (memosprite or {}).items()}
+        )
+        for e in (3, 5):
+            if eidolon < e:
+                continue
+            for k, v in metadata[f"e{e}"].items():
+                if k == CHAR_MEMOSPRITE:
+                    for k2, v2 in v.items():
+                        shown[f"{CHAR_MEMOSPRITE}_{k2}"] += v2
+                else:
+                    shown[k] += v
+
+        background = self._backgrounds[int(rng.integers(BACKGROUND_COUNT))]
+        character_rects = self._rois.character_rects
+        frames = []
+        boxes = []
+
+        # details page
+        texts = {CHAR_NAME: f"{path} / {name}", CHAR_LEVEL: str(level)}
+        frame = background.copy()
+        draw = ImageDraw.Draw(frame)
+        for key, text in texts.items():
+            self._text(draw, character_rects[key], text, rng)
+        boxes.append(_union([character_rects[CHAR_NAME], character_rects[CHAR_LEVEL]]))
+        frames.append(self._add_noise(frame, boxes[-1], rng))
+
+        # traces page
+        path_key = path.split(" ")[-1].lower()
+        frame = background.copy()
+        draw = ImageDraw.Draw(frame)
+        trace_rects = self._rois.trace_level_rects[path_key]
+        for k, rect in trace_rects.items():
+            max_shown = 6 if k == BASIC or k.startswith(CHAR_MEMOSPRITE) else 10
+            texts[k] = f"{shown[k]}/{max_shown}"
+            self._text(draw, rect, texts[k], rng)
+        boxes.append(_union(trace_rects.values()))
+        frames.append(self._add_noise(frame, boxes[-1], rng))
+
+        # eidolons page
+        frame = background.copy()
+        for i, rect in enumerate(self._rois.eidolon_rects):
+            _paste(frame, _eidolon(rect, i < eidolon, rng), rect)
+        boxes.append(_union(self._rois.eidolon_rects))
+        frames.append(self._add_noise(frame, boxes[-1], rng))
+
+        expected = {
+            CHAR_ID: str(metadata[CHAR_ID]),
+            CHAR_NAME: name,
+            CHAR_PATH: path,
+            CHAR_LEVEL: level,
+            CHAR_ASCENSION: ascension,
+            CHAR_EIDOLON: eidolon,
+            CHAR_SKILLS: skills,
+            CHAR_TRACES: {},
+        }
+        if memosprite is not None:
+            expected[CHAR_MEMOSPRITE] = memosprite
+        return SyntheticSample(CHARACTER, frames, boxes, expected, texts)
+
+    def _pick_location(self, rng: np.random.Generator) -> str:
+        """Pick the character an item is equipped on
+
+        :param rng: The random generator of the sample
+        :return: The character id, empty if the item is not equipped
+        """
+        if not self._avatar_ids or rng.random() < 0.6:
+            return ""
+        return str(rng.choice(self._avatar_ids))
+
+    def _panel(self, rng: np.random.Generator) -> tuple[Image, ImageDraw.ImageDraw]:
+        """Create an empty stats panel, mixed with the background by the bleed
+
+        :param rng: The random generator of the sample
+        :return: The panel and a drawing context on it
+        """
+        width, height = self._rois.stats_size
+        panel = np.empty((height, width, 3), dtype=np.float32)
+        panel[:] = PANEL_COLOUR
+        if self._bleed > 0:
+            background = self._backgrounds[int(rng.integers(BACKGROUND_COUNT))]
+            left, top = self._rois.rects[STATS][:2]
+            behind = np.asarray(
+                background.crop((left, top, left + width, top + height)),
+                dtype=np.float32,
+            )
+            panel = (1 - self._bleed) * panel + self._bleed * behind
+        panel = PILImage.fromarray(panel.astype(np.uint8))
+        return panel, ImageDraw.Draw(panel)
+
+    def _stats_sample(
+        self,
+        kind: str,
+        panel: Image,
+        rng: np.random.Generator,
+        expected: dict,
+        texts: dict[str, str],
+    ) -> SyntheticSample:
+        """Place a stats panel on a frame
+
+        :param kind: RELIC or LIGHT_CONE
+        :param panel: The stats panel
+        :param rng: The random generator of the sample
+        :param expected: The expected parse result
+        :param texts: The text drawn in each field
+        :return: The sample
+        """
+        frame = self._backgrounds[int(rng.integers(BACKGROUND_COUNT))].copy()
+        box = self._rois.rects[STATS]
+        frame.paste(panel, box[:2])
+        return SyntheticSample(
+            kind, [self._add_noise(frame, box, rng)], [box], expected, texts
+        )
+
+    def _equip(
+        self,
+        panel: Image,
+        draw: ImageDraw.ImageDraw,
+        rects: dict,
+        location: str,
+        rng: np.random.Generator,
+        texts: dict[str, str],
+    ) -> None:
+        """Draw the equipped label and avatar of an item
+
+        :param panel: The stats panel
+        :param draw: The drawing context of the panel
+        :param rects: The stats rects of the item
+        :param location: The character id, empty if the item is not equipped
+        :param rng: The random generator of the sample
+        :param texts: The text drawn in each field, the label is added to it
+        """
+        if not location:
+            return
+        texts[EQUIPPED] = "Equipped"
+        self._text(draw, rects[EQUIPPED], texts[EQUIPPED], rng)
+        avatar = PILImage.fromarray(self._game_data.EQUIPPED_ICONS[location])
+        _paste(panel, avatar.convert("RGB"), rects[EQUIPPED_AVATAR])
+
+    def _text(
+        self,
+        draw: ImageDraw.ImageDraw,
+        rect: tuple[int, int, int, int],
+        text: str,
+        rng: np.random.Generator,
+        align_right: bool = False,
+    ) -> None:
+        """Draw one line of text fitted into a rect with a small random offset
+
+        :param draw: The drawing context
+        :param rect: The rect
+        :param text: The text
+        :param rng: The random generator of the sample
+        :param align_right: Whether to align the text to the right, defaults to
+            False
+        """
+        left, top, right, bottom = rect
+        size = max(int((bottom - top) * 0.65), 8)
+        font = self._font(size)
+        while size > 8 and draw.textlength(text, font=font) > right - left - 4:
+            size -= 1
+            font = self._font(size)
+
+        width = draw.textlength(text, font=font)
+        x = right - 2 - width if align_right else left + 2
+        x += int(rng.integers(-1, 2))
+        y = top + (bottom - top - size) // 2 + int(rng.integers(-1, 2))
+        draw.text((x, y), text, fill=TEXT_COLOUR, font=font)
+
+    def _lines(
+        self,
+        draw: ImageDraw.ImageDraw,
+        rect: tuple[int, int, int, int],
+        lines: list[str],
+        rng: np.random.Generator,
+        align_right: bool = False,
+    ) -> None:
+        """Draw up to four lines of text evenly spaced in a rect
+
+        :param draw: The drawing context
+        :param rect: The rect
+        :param lines: The lines
+        :param rng: The random generator of the sample
+        :param align_right: Whether to align the text to the right, defaults to
+            False
+        """
+        left, top, right, bottom = rect
+        line_height = (bottom - top) / 4
+        for i, line in enumerate(lines):
+            line_top = int(top + i * line_height)
+            self._text(
+                draw,
+                (left, line_top, right, int(line_top + line_height)),
+                line,
+                rng,
+                align_right,
+            )
+
+    def _font(self, size: int) -> ImageFont.FreeTypeFont:
+        """Get the font at a size
+
+        :param size: The font size in pixels
+        :return: The font
+        """
+        font = self._fonts.get(size)
+        if font is None:
+            font = self._fonts[size] = ImageFont.truetype(self._font_path, size)
+        return font
+
+    def _add_noise(
+        self, frame: Image, box: tuple[int, int, int, int], rng: np.random.Generator
+    ) -> Image:
+        """Add Gaussian noise to the content of a frame
+
+        :param frame: The frame
+        :param box: The rect of the frame that holds content
+        :param rng: The random generator of the sample
+        :return: The frame
+        """
+        if self._noise <= 0:
+            return frame
+        region = np.asarray(frame.crop(box), dtype=np.float32)
+        region += rng.standard_normal(region.shape, dtype=np.float32) * self._noise
+        frame.paste(
+            PILImage.fromarray(np.clip(region, 0, 255).astype(np.uint8)), box[:2]
+        )
+        return frame
+
+
+def write_dataset(samples: Iterable[SyntheticSample], out_dir: str) -> int:
+    """Write samples and their ground truth to a directory
+
+    Only the content of each frame is written, the reader places it back on a
+    black frame.
+
+    :param samples: The samples
+    :param out_dir: The output directory
+    :return: The number of samples written
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    ground_truth = []
+    for i, sample in enumerate(samples):
+        files = []
+        for page, (frame, box) in enumerate(zip(sample.frames, sample.boxes)):
+            file_name = f"{sample.kind}_{i:06d}_{page}.png"
+            frame.crop(box).save(os.path.join(out_dir, file_name))
+            files.append({"file": file_name, "box": list(box)})
+        ground_truth.append(
+            {
+                "kind": sample.kind,
+                "frames": files,
+                "expected": sample.expected,
+                "texts": sample.texts,
+            }
+        )
+
+    with open(os.path.join(out_dir, GROUND_TRUTH_FILE), "w") as f:
+        json.dump(ground_truth, f)
+    return len(ground_truth)
+
+
+def read_dataset(
+    in_dir: str, width: int = REFERENCE_WIDTH, height: int = REFERENCE_HEIGHT
+) -> Iterator[SyntheticSample]:
+    """Read samples written by write_dataset
+
+    :param in_dir: The dataset directory
+    :param width: The width of the frames, defaults to REFERENCE_WIDTH
+    :param height: The height of the frames, defaults to REFERENCE_HEIGHT
+    :return: The samples
+    """
+    with open(os.path.join(in_dir, GROUND_TRUTH_FILE), "r") as f:
+        ground_truth = json.load(f)
+
+    for entry in ground_truth:
+        frames = []
+        boxes = []
+        for page in entry["frames"]:
+            frame = PILImage.new("RGB", (width, height))
+            with PILImage.open(os.path.join(in_dir, page["file"])) as content:
+                frame.paste(content.convert("RGB"), tuple(page["box"][:2]))
+            frames.append(frame)
+            boxes.append(tuple(page["box"]))
+        yield SyntheticSample(
+            entry["kind"], frames, boxes, entry["expected"], entry.get("texts", {})
+        )
+
+
+def _background(rng: np.random.Generator) -> Image:
+    """Render a background texture, a dark gradient with soft blotches
+
+    :param rng: The random generator
+    :return: The background
+    """
+    blotches = rng.integers(0, 90, (REFERENCE_HEIGHT // 16, REFERENCE_WIDTH // 16, 3))
+    blotches = cv2.resize(  # type: ignore
+        blotches.astype(np.uint8),
+        (REFERENCE_WIDTH, REFERENCE_HEIGHT),
+        interpolation=cv2.INTER_CUBIC,
+    )
+    gradient = np.linspace(0.4, 1.0, REFERENCE_WIDTH, dtype=np.float32)[None, :, None]
+    return PILImage.fromarray((blotches * gradient).astype(np.uint8))
+
+
+def _eidolon(
+    rect: tuple[int, int, int, int], activated: bool, rng: np.random.Generator
+) -> Image:
+    """Render an eidolon icon. Activated eidolons are sharp and bright, the
+    rest are dark and flat.
+
+    :param rect: The screen rect of the eidolon
+    :param activated: Whether the eidolon is activated
+    :param rng: The random generator of the sample
+    :return: The icon
+    """
+    width, height = rect[2] - rect[0], rect[3] - rect[1]
+    if activated:
+        pattern = rng.random((height, width)) < 0.5
+        icon = np.where(pattern, 230, 30).astype(np.uint8)
+        icon = np.repeat(icon[:, :, None], 3, axis=2)
+    else:
+        icon = np.full((height, width, 3), (40, 40, 52), dtype=np.uint8)
+    return PILImage.fromarray(icon)
+
+
+def _legal_values(values: dict, rolls: int) -> list[str]:
+    """Get the values a substat can show after a number of rolls
+
+    :param values: The values of the substat in SUBSTAT_ROLL_VALS
+    :param rolls: The number of rolls
+    :return: The values
+    """
+    res = []
+    for value, roll_value in values.items():
+        roll_values = roll_value if isinstance(roll_value, list) else [roll_value]
+        if any(0.8 * rolls - 1e-6 <= rv <= rolls + 1e-6 for rv in roll_values):
+            res.append(value)
+    return res
+
+
+def _paste(dest: Image, icon: Image, rect: tuple[int, int, int, int]) -> None:
+    """Paste an icon resized to a rect
+
+    :param dest: The image to paste on
+    :param icon: The icon
+    :param rect: The rect
+    """
+    dest.paste(icon.resize((rect[2] - rect[0], rect[3] - rect[1])), rect[:2])
+
+
+def _union(rects: Iterable[tuple[int, int, int, int]]) -> tuple[int, int, int, int]:
+    """Get the bounding rect of rects
+
+    :param rects: The rects
+    :return: The bounding rect
+    """
+    rects = list(rects)
+    return (
+        min(r[0] for r in rects),
+        min(r[1] for r in rects),
+        max(r[2] for r in rects),
+        max(r[3] for r in rects),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Render a synthetic inventory with ground truth for the replay "
+        "benchmarks. Run from the src directory with python -m benchmarks.synthetic."
+    )
+    parser.add_argument("out_dir", help="The output directory")
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=1000,
+        help="The number of samples, defaults to 1000",
+    )
+    parser.add_argument(
+        "--kinds",
+        nargs="+",
+        choices=KINDS,
+        default=list(KINDS),
+        help="The kinds of samples, rendered in turn, defaults to all",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="The seed, defaults to 0")
+    parser.add_argument(
+        "--noise",
+        type=float,
+        default=0.0,
+        help="The standard deviation of the pixel noise, defaults to 0",
+    )
+    parser.add_argument(
+        "--bleed",
+        type=float,
+        default=0.0,
+        help="How much background shows through the stats panel, defaults to 0",
+    )
+    parser.add_argument(
+        "--font",
+        default=DEFAULT_FONT,
+        help=f"The TrueType font to render with, defaults to {DEFAULT_FONT}",
+    )
+    args = parser.parse_args()
+
+    frames = SyntheticFrames(GameData(), args.seed, args.noise, args.bleed, args.font)
+    count = write_dataset(frames.samples(args.kinds, args.count), args.out_dir)
+    print(f"Wrote {count} samples to {args.out_dir}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,11 @@ from config.const import (
     ERUDITION,
     HARMONY,
     HUNT,
+    MAX_ORANGE_PIXELS,
+    MIN_SHARPNESS,
     NIHILITY,
+    ORANGE_LOWER,
+    ORANGE_UPPER,
     PRESERVATION,
     REMEMBRANCE,
     TRACES,
@@ -31,7 +35,6 @@ from models.const import (
     STAT_9,
 )
 
-
 CHARACTER_NAV_DATA = {
     ASPECT_16_9: {
         ASCENSION_START: (0.78125, 0.203),
@@ -163,3 +166,13 @@ CHARACTER_NAV_DATA = {
         },
     }
 }
+
+# Eidolon state thresholds for the masked 81x81 eidolon crops
+EIDOLON_CALIBRATION = {
+    # Variance of the Laplacian, locked eidolons are too dark to pass
+    MIN_SHARPNESS: 10000,
+    # Unlocked but not activated eidolons have more orange pixels than this
+    ORANGE_LOWER: (127, 104, 51),
+    ORANGE_UPPER: (210, 175, 100),
+    MAX_ORANGE_PIXELS: 200,
+}
@@ -28,6 +28,13 @@ EQUIPPED_AVATAR = "equipped_avatar"
 EQUIPPED_AVATAR_OFFSET = "equipped_avatar_trailblazer"
 EQUIPPED = "equipped"
 LOCK = "lock"
+DATABANK = "databank"
+
+# Eidolon calibration keys
+MIN_SHARPNESS = "min_sharpness"
+ORANGE_LOWER = "orange_lower"
+ORANGE_UPPER = "orange_upper"
+MAX_ORANGE_PIXELS = "max_orange_pixels"
 
 # Paths
 HUNT = "hunt"
@@ -5,6 +5,7 @@ from config.const import (
     CHARACTER,
     CHEST,
     COUNT,
+    DATABANK,
     DESTRUCTION,
     EQUIPPED,
     EQUIPPED_AVATAR,
@@ -57,6 +58,8 @@ SCREENSHOT_COORDS = {
             CHEST: (0.44, 0.3315, 0.1245, 0.1037),
             CHAR_NAME: (0.0656, 0.059, 0.165, 0.0314),
             CHAR_LEVEL: (0.7975, 0.221, 0.02225, 0.031),
+            # search window of the Data Bank button in the ESC menu
+            DATABANK: (0.5, 0.1, 0.5, 0.8),
             CHAR_EIDOLONS: [
                 (0.3272416666666667, 0.17777777777777778),
                 (0.5336765, 0.16574074074074074),
@@ -0,0 +1,17 @@
+from enum import Enum
+
+
+class OcrField(Enum):
+    """OcrField enum for the fields OCR can be biased towards a lexicon for"""
+
+    RELIC_NAME = "relic_name"
+    RELIC_LEVEL = "relic_level"
+    RELIC_MAIN_STAT = "relic_main_stat"
+    RELIC_SUB_STAT_NAMES = "relic_sub_stat_names"
+    RELIC_SUB_STAT_VALUES = "relic_sub_stat_values"
+    RELIC_SUB_STATS = "relic_sub_stats"
+    LIGHT_CONE_NAME = "light_cone_name"
+    LIGHT_CONE_LEVEL = "light_cone_level"
+    CHARACTER_NAME = "character_name"
+    CHARACTER_LEVEL = "character_level"
+    TRACE_LEVEL = "trace_level"
@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class TraversalOrder(Enum):
+    """TraversalOrder enum for the order the character scan visits the tabs in"""
+
+    # One pass over the roster per tab
+    TAB_MAJOR = 0
+    # Every tab of a character before moving on to the next one
+    CHARACTER_MAJOR = 1
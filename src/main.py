@@ -1,13 +1,12 @@
 import asyncio
-import datetime
+import os
 import sys
 import traceback
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 import winsound
 
-from pynput.keyboard import Key, KeyCode, Listener
 from PyQt6 import QtGui, QtWidgets
-from PyQt6.QtCore import QSettings, QThread, QUrl, pyqtSignal
+from PyQt6.QtCore import QSettings, QThread, QTimer, QUrl, pyqtSignal
 
 from enums.increment_type import IncrementType
 from enums.log_level import LogLevel
@@ -15,6 +14,7 @@ from enums.scan_mode import ScanMode
 from models.const import (
     CHAR_FILTERS,
     CONFIG_CHARACTERS_KEY,
+    CONFIG_CPU_BUDGET,
     CONFIG_DEBUG,
     CONFIG_DEBUG_MODE,
     CONFIG_DEBUG_OUTPUT_LOCATION,
@@ -26,14 +26,19 @@ from models.const import (
     CONFIG_MIN_RELIC_LEVEL,
     CONFIG_MIN_RELIC_RARITY,
     CONFIG_NAV_DELAY,
+    CONFIG_OCR_LEXICON,
+    CONFIG_OCR_WORKERS,
     CONFIG_OUTPUT_LOCATION,
+    CONFIG_PIN_WORKERS,
     CONFIG_PLAY_SOUND,
     CONFIG_RECENT_RELICS_FIVE_STAR,
+    CONFIG_RECENT_RELICS_MERGE,
     CONFIG_RECENT_RELICS_NUM,
     CONFIG_SCAN_CHARACTERS,
     CONFIG_SCAN_DELAY,
     CONFIG_SCAN_LC,
     CONFIG_SCAN_RELICS,
+    CONFIG_SKIP_UNCHANGED_CHARS,
     CONFIG_SRO_FORMAT,
     FILTERS,
     HSR_SCANNER,
@@ -43,19 +48,29 @@ from models.const import (
     MIN_RARITY,
     RELIC_FILTERS,
 )
-from models.game_data import GameData
-from services.scanner.scanner import HSRScanner, InterruptedScanException
 from ui.hsr_scanner import Ui_MainWindow
-from utils.conversion import convert_to_sro
 from utils.data import (
-    create_debug_folder,
+    get_debug_folder_path,
     executable_path,
     resource_path,
-    save_to_json,
-    save_to_txt,
 )
+from utils.log_sink import LOG_FLUSH_INTERVAL_MS, MAX_LOG_LINES, LogSink
+from utils.progress import PROGRESS_REFRESH_INTERVAL_MS, ProgressSampler
 from utils.window import bring_window_to_foreground, flash_window
 
+# The scanner, game data, inventory store and exports pull in cv2, pyautogui,
+# vgamepad, pytesseract, Levenshtein, requests and numpy, so they are only
+# imported once they are needed instead of before the window can show.
+if TYPE_CHECKING:
+    from pynput.keyboard import Key, KeyCode
+
+    from models.game_data import GameData
+    from services.scanner.scanner import HSRScanner
+    from utils.conversion import SroKeyMap
+
+# Set by the startup benchmark to exit as soon as the window is shown
+EXIT_ON_SHOW_ENV = "HSR_SCANNER_EXIT_ON_SHOW"
+
 
 class HSRScannerUI(QtWidgets.QMainWindow, Ui_MainWindow):
     """HSRScannerUI handles the UI for the HSR Scanner application"""
@@ -68,19 +83,29 @@ class HSRScannerUI(QtWidgets.QMainWindow, Ui_MainWindow):
         self._listener = InterruptListener()
         self._is_running = False
         self._settings = QSettings(KEL_Z, HSR_SCANNER)
+        self._log_sink = LogSink()
+        self._progress_sampler = None
+        self._result_feed = None
+        self._sro_key_map = None
+        self._lexicon = None
+        self._save_result_thread = None
 
-        # fetch game data
         self._fetch_game_data_thread = FetchGameDataThread()
         self._fetch_game_data_thread.result_signal.connect(self.handle_game_data)
         self._fetch_game_data_thread.error_signal.connect(self.handle_game_data_error)
+
+    def fetch_game_data(self) -> None:
+        """Starts fetching the game data in the background"""
         self._fetch_game_data_thread.start()
 
-    def handle_game_data(self, game_data: GameData) -> None:
+    def handle_game_data(self, game_data: "GameData") -> None:
         """Handle on game data loaded
 
         :param game_data: The game data
         """
         self.game_data = game_data
+        self._sro_key_map = None
+        self._lexicon = None
         self.log("Loaded database version: " + self.game_data.version)
 
         try:
@@ -141,6 +166,18 @@ class HSRScannerUI(QtWidgets.QMainWindow, Ui_MainWindow):
         self.pushButtonOpenLocation.clicked.connect(self.open_output_location)
         self.pushButtonRestoreDefaults.clicked.connect(self.reset_settings)
 
+        # log lines are batched and appended on a timer
+        self.textEditLog.setMaximumBlockCount(MAX_LOG_LINES)
+        self._log_timer = QTimer(MainWindow)
+        self._log_timer.timeout.connect(self.flush_log)
+        self._log_timer.start(LOG_FLUSH_INTERVAL_MS)
+
+        # scan progress is sampled instead of signalled per item
+        self._progress_timer = QTimer(MainWindow)
+        self._progress_timer.timeout.connect(self.update_progress)
+        self._progress_timer.timeout.connect(self.flush_results)
+        self._progress_timer.start(PROGRESS_REFRESH_INTERVAL_MS)
+
         self.load_settings()
 
     def change_output_location(self) -> None:
@@ -188,6 +225,9 @@ class HSRScannerUI(QtWidgets.QMainWindow, Ui_MainWindow):
         self.spinBoxCharacterMinLevel.setValue(
             self._settings.value(CONFIG_MIN_CHAR_LEVEL, 1)
         )
+        self.checkBoxSkipUnchangedChars.setChecked(
+            self._settings.value(CONFIG_SKIP_UNCHANGED_CHARS, False) == "true"
+        )
         self.checkBoxScanLightCones.setChecked(
             self._settings.value(CONFIG_SCAN_LC, False) == "true"
         )
@@ -200,17 +240,30 @@ class HSRScannerUI(QtWidgets.QMainWindow, Ui_MainWindow):
         self.checkBoxSroFormat.setChecked(
             self._settings.value(CONFIG_SRO_FORMAT, False) == "true"
         )
+        self.checkBoxOcrLexicon.setChecked(
+            self._settings.value(CONFIG_OCR_LEXICON, False) == "true"
+        )
         self.checkBoxDebugMode.setChecked(
             self._settings.value(CONFIG_DEBUG_MODE, False) == "true"
         )
         self.spinBoxNavDelay.setValue(self._settings.value(CONFIG_NAV_DELAY, 0))
         self.spinBoxScanDelay.setValue(self._settings.value(CONFIG_SCAN_DELAY, 0))
+        self.spinBoxCpuBudget.setValue(
+            self._settings.value(CONFIG_CPU_BUDGET, 50, type=int)
+        )
+        self.checkBoxPinWorkers.setChecked(
+            self._settings.value(CONFIG_PIN_WORKERS, False) == "true"
+        )
+        self.lineEditOcrWorkers.setText(self._settings.value(CONFIG_OCR_WORKERS, ""))
         self.spinBoxRecentRelics.setValue(
             self._settings.value(CONFIG_RECENT_RELICS_NUM, 5)
         )
         self.checkBoxRecentRelicsFiveStar.setChecked(
             self._settings.value(CONFIG_RECENT_RELICS_FIVE_STAR, False) == "true"
         )
+        self.checkBoxRecentRelicsMerge.setChecked(
+            self._settings.value(CONFIG_RECENT_RELICS_MERGE, True, type=bool)
+        )
         self.checkBoxIncludeUid.setChecked(
             self._settings.value(CONFIG_INCLUDE_UID, False) == "true"
         )
@@ -243,14 +296,21 @@ class HSRScannerUI(QtWidgets.QMainWindow, Ui_MainWindow):
         self._settings.setValue(
             CONFIG_MIN_CHAR_LEVEL, self.spinBoxCharacterMinLevel.value()
         )
+        self._settings.setValue(
+            CONFIG_SKIP_UNCHANGED_CHARS, self.checkBoxSkipUnchangedChars.isChecked()
+        )
         self._settings.setValue(CONFIG_SCAN_RELICS, self.checkBoxScanRelics.isChecked())
         self._settings.setValue(
             CONFIG_SCAN_CHARACTERS, self.checkBoxScanChars.isChecked()
         )
         self._settings.setValue(CONFIG_SRO_FORMAT, self.checkBoxSroFormat.isChecked())
+        self._settings.setValue(CONFIG_OCR_LEXICON, self.checkBoxOcrLexicon.isChecked())
         self._settings.setValue(CONFIG_DEBUG_MODE, self.checkBoxDebugMode.isChecked())
         self._settings.setValue(CONFIG_NAV_DELAY, self.spinBoxNavDelay.value())
         self._settings.setValue(CONFIG_SCAN_DELAY, self.spinBoxScanDelay.value())
+        self._settings.setValue(CONFIG_CPU_BUDGET, self.spinBoxCpuBudget.value())
+        self._settings.setValue(CONFIG_PIN_WORKERS, self.checkBoxPinWorkers.isChecked())
+        self._settings.setValue(CONFIG_OCR_WORKERS, self.lineEditOcrWorkers.text())
         self._settings.setValue(
             CONFIG_RECENT_RELICS_NUM, self.spinBoxRecentRelics.value()
         )
@@ -258,6 +318,9 @@ class HSRScannerUI(QtWidgets.QMainWindow, Ui_MainWindow):
             CONFIG_RECENT_RELICS_FIVE_STAR,
             self.checkBoxRecentRelicsFiveStar.isChecked(),
         )
+        self._settings.setValue(
+            CONFIG_RECENT_RELICS_MERGE, self.checkBoxRecentRelicsMerge.isChecked()
+        )
         self._settings.setValue(CONFIG_INCLUDE_UID, self.checkBoxIncludeUid.isChecked())
         self._settings.setValue(CONFIG_PLAY_SOUND, self.checkBoxPlaySound.isChecked())
 
@@ -271,14 +334,20 @@ class HSRScannerUI(QtWidgets.QMainWindow, Ui_MainWindow):
         self._settings.setValue(CONFIG_MIN_RELIC_LEVEL, 0)
         self._settings.setValue(CONFIG_MIN_RELIC_RARITY, 2)
         self._settings.setValue(CONFIG_MIN_CHAR_LEVEL, 1)
+        self._settings.setValue(CONFIG_SKIP_UNCHANGED_CHARS, False)
         self._settings.setValue(CONFIG_SCAN_LC, False)
         self._settings.setValue(CONFIG_SCAN_RELICS, False)
         self._settings.setValue(CONFIG_SCAN_CHARACTERS, False)
         self._settings.setValue(CONFIG_SRO_FORMAT, False)
+        self._settings.setValue(CONFIG_OCR_LEXICON, False)
         self._settings.setValue(CONFIG_NAV_DELAY, 0)
         self._settings.setValue(CONFIG_SCAN_DELAY, 0)
+        self._settings.setValue(CONFIG_CPU_BUDGET, 50)
+        self._settings.setValue(CONFIG_PIN_WORKERS, False)
+        self._settings.setValue(CONFIG_OCR_WORKERS, "")
         self._settings.setValue(CONFIG_RECENT_RELICS_NUM, 8)
         self._settings.setValue(CONFIG_RECENT_RELICS_FIVE_STAR, True)
+        self._settings.setValue(CONFIG_RECENT_RELICS_MERGE, True)
         self._settings.setValue(CONFIG_DEBUG_MODE, False)
         self._settings.setValue(CONFIG_INCLUDE_UID, False)
         self._settings.setValue(CONFIG_PLAY_SOUND, True)
@@ -306,6 +375,8 @@ class HSRScannerUI(QtWidgets.QMainWindow, Ui_MainWindow):
 
         config = self.get_config()
 
+        from services.scanner.scanner import HSRScanner
+
         # initialize scanner
         try:
             if not any(
@@ -316,7 +387,16 @@ class HSRScannerUI(QtWidgets.QMainWindow, Ui_MainWindow):
                 ]
             ):
                 raise Exception("No scan options selected. Please select at least one.")
-            scanner = HSRScanner(config, self.game_data)
+            scanner = HSRScanner(
+                config,
+                self.game_data,
+                self._log_sink,
+                known_characters=(
+                    self.load_known_characters()
+                    if config[CONFIG_SCAN_CHARACTERS]
+                    else None
+                ),
+            )
         except Exception as e:
             self.log((e, LogLevel.ERROR))
             return
@@ -328,6 +408,29 @@ class HSRScannerUI(QtWidgets.QMainWindow, Ui_MainWindow):
             config[CONFIG_DEBUG_OUTPUT_LOCATION] if config[CONFIG_DEBUG] else None,
         )
 
+    def load_known_characters(self) -> list[dict]:
+        """Loads the characters of the previous scans from the inventory store,
+        so the scanner can skip the ones that did not change
+
+        :return: The characters, empty if the store could not be read
+        """
+        from services.store.inventory_store import InventoryStore
+
+        try:
+            with InventoryStore.in_output_location(
+                self.lineEditOutputLocation.text()
+            ) as store:
+                return store.find_characters()
+        except Exception:
+            self.log(
+                (
+                    "Failed to read characters from inventory store, scanning all "
+                    "characters: " + traceback.format_exc(),
+                    LogLevel.WARNING,
+                )
+            )
+            return []
+
     def start_scan_recent_relics(self) -> None:
         """Starts the scan for recent relics"""
         if self._is_running:
@@ -346,12 +449,17 @@ class HSRScannerUI(QtWidgets.QMainWindow, Ui_MainWindow):
             }
         }
 
+        from services.scanner.scanner import HSRScanner
+
         # initialize scanner
         try:
             if config[CONFIG_RECENT_RELICS_NUM] < 1:
                 raise Exception("At least one relic must be scanned.")
             scanner = HSRScanner(
-                config, self.game_data, scan_mode=ScanMode.RECENT_RELICS.value
+                config,
+                self.game_data,
+                self._log_sink,
+                scan_mode=ScanMode.RECENT_RELICS.value,
             )
         except Exception as e:
             self.log((e, LogLevel.ERROR))
@@ -366,18 +474,34 @@ class HSRScannerUI(QtWidgets.QMainWindow, Ui_MainWindow):
         )
 
     def to_scanner_thread(
-        self, scanner: HSRScanner, debug_output_location: Optional[str] = None
+        self, scanner: "HSRScanner", debug_output_location: Optional[str] = None
     ) -> None:
         """Starts the scanner thread
 
         :param scanner: The HSRScanner class instance
         :param debug_output_location: The debug output location
         """
+        from services.store.inventory_store import CHARACTERS, LIGHT_CONES, RELICS
+
         self.disable_start_scan_button()
+        self.apply_ocr_lexicon(scanner.config[CONFIG_OCR_LEXICON])
+
+        if debug_output_location:
+            try:
+                os.makedirs(debug_output_location, exist_ok=True)
+                self._log_sink.open_file(os.path.join(debug_output_location, "log.txt"))
+            except OSError as e:
+                self.log((f"Failed to open debug log file: {e}", LogLevel.ERROR))
+            self.log(
+                "Debug mode enabled. Debug output will be saved to "
+                + debug_output_location
+            )
 
         # connect signals
-        scanner.log_signal.connect(self.log)
-        scanner.update_signal.connect(self.increment_progress)
+        self._progress_sampler = ProgressSampler(scanner.progress)
+        self._result_feed = scanner.results
+        self.resultsTab.clear()
+        self.resultsTab.set_crop_store(scanner.crops)
         scanner.complete_signal.connect(self._listener.stop)
         scanner.complete_signal.connect(lambda: bring_window_to_foreground(self._hwnd))
 
@@ -386,14 +510,25 @@ class HSRScannerUI(QtWidgets.QMainWindow, Ui_MainWindow):
         self._scanner_thread.log_signal.connect(self.log)
 
         self._scanner_thread.result_signal.connect(
-            lambda data: self.handle_result(data, debug_output_location)
+            lambda data: self.handle_result(
+                data,
+                debug_output_location,
+                scanner.scan_mode,
+                {
+                    LIGHT_CONES: scanner.config[CONFIG_SCAN_LC],
+                    RELICS: scanner.config[CONFIG_SCAN_RELICS],
+                    CHARACTERS: scanner.config[CONFIG_SCAN_CHARACTERS],
+                },
+                scanner.config[CONFIG_RECENT_RELICS_MERGE],
+            )
         )
+        self._scanner_thread.result_signal.connect(self.stop_progress)
         self._scanner_thread.result_signal.connect(self._scanner_thread.deleteLater)
-        self._scanner_thread.result_signal.connect(self.enable_start_scan_button)
 
         self._scanner_thread.error_signal.connect(
             lambda msg: self.handle_error(msg, debug_output_location)
         )
+        self._scanner_thread.error_signal.connect(self.stop_progress)
         self._scanner_thread.error_signal.connect(self._scanner_thread.deleteLater)
         self._scanner_thread.error_signal.connect(self.enable_start_scan_button)
         self._scanner_thread.error_signal.connect(self._listener.stop)
@@ -404,11 +539,25 @@ class HSRScannerUI(QtWidgets.QMainWindow, Ui_MainWindow):
         self._scanner_thread.started.connect(self._listener.start)
         self._scanner_thread.start()
 
+    def apply_ocr_lexicon(self, enabled: bool) -> None:
+        """Biases OCR towards the names and stats of the game data, or reads
+        with the whitelists only
+
+        :param enabled: Whether to use the lexicon
+        """
+        from utils.lexicon import Lexicon
+        from utils.ocr import use_lexicon
+
+        if enabled and self._lexicon is None:
+            try:
+                self._lexicon = Lexicon(self.game_data)
+            except OSError as e:
+                self.log((f"Failed to write OCR lexicon: {e}", LogLevel.WARNING))
+        use_lexicon(self._lexicon if enabled else None)
+
     def get_config(self) -> dict:
         """Gets the configuration for the scan
 
-        Side effect: Creates a debug folder if debug mode is enabled
-
         :return: The configuration for the scan
         """
         # scan options
@@ -417,12 +566,16 @@ class HSRScannerUI(QtWidgets.QMainWindow, Ui_MainWindow):
         config[CONFIG_SCAN_LC] = self.checkBoxScanLightCones.isChecked()
         config[CONFIG_SCAN_RELICS] = self.checkBoxScanRelics.isChecked()
         config[CONFIG_SCAN_CHARACTERS] = self.checkBoxScanChars.isChecked()
+        config[CONFIG_SKIP_UNCHANGED_CHARS] = (
+            self.checkBoxSkipUnchangedChars.isChecked()
+        )
 
         # recent relics scan options
         config[CONFIG_RECENT_RELICS_NUM] = self.spinBoxRecentRelics.value()
         config[CONFIG_RECENT_RELICS_FIVE_STAR] = (
             self.checkBoxRecentRelicsFiveStar.isChecked()
         )
+        config[CONFIG_RECENT_RELICS_MERGE] = self.checkBoxRecentRelicsMerge.isChecked()
 
         # filters
         config[FILTERS] = {
@@ -451,56 +604,77 @@ class HSRScannerUI(QtWidgets.QMainWindow, Ui_MainWindow):
         config[CONFIG_NAV_DELAY] = self.spinBoxNavDelay.value() / 1000
         config[CONFIG_SCAN_DELAY] = self.spinBoxScanDelay.value() / 1000
 
+        # parsing while the game is navigated
+        config[CONFIG_CPU_BUDGET] = self.spinBoxCpuBudget.value() / 100
+        config[CONFIG_PIN_WORKERS] = self.checkBoxPinWorkers.isChecked()
+        config[CONFIG_OCR_WORKERS] = [
+            address.strip()
+            for address in self.lineEditOcrWorkers.text().split(",")
+            if address.strip()
+        ]
+
+        config[CONFIG_OCR_LEXICON] = self.checkBoxOcrLexicon.isChecked()
+
         # debug mode
         config[CONFIG_DEBUG] = self.checkBoxDebugMode.isChecked()
         config[CONFIG_DEBUG_OUTPUT_LOCATION] = None
 
         if config[CONFIG_DEBUG]:
-            config[CONFIG_DEBUG_OUTPUT_LOCATION] = create_debug_folder(
+            # created once the scan starts, so a rejected start leaves nothing
+            config[CONFIG_DEBUG_OUTPUT_LOCATION] = get_debug_folder_path(
                 self.lineEditOutputLocation.text()
             )
-            self.log(
-                "Debug mode enabled. Debug output will be saved to "
-                + config[CONFIG_DEBUG_OUTPUT_LOCATION]
-            )
 
         return config
 
     def handle_result(
-        self, data: dict, debug_output_location: Optional[str] = None
+        self,
+        data: dict,
+        debug_output_location: Optional[str] = None,
+        scan_mode: int = ScanMode.NORMAL.value,
+        scanned: Optional[dict[str, bool]] = None,
+        merge: bool = False,
     ) -> None:
-        """Handles the result of the scan
+        """Handles the result of the scan by saving it in a separate thread
 
         :param data: The data from the scan
         :param debug_output_location: The debug output location
+        :param scan_mode: The scan mode, defaults to ScanMode.NORMAL
+        :param scanned: Whether each category was scanned, keyed by category
+        :param merge: Whether to merge a recent relics scan into the inventory
         """
-        output_location = self.lineEditOutputLocation.text()
-        file_name = (
-            f"HSRScanData_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        )
-        save_to_json(data, output_location, file_name)
+        self._save_result_thread = SaveResultThread(
+            data,
+            self.lineEditOutputLocation.text(),
+            scan_mode,
+            scanned or {},
+            merge,
+            self.game_data if self.checkBoxSroFormat.isChecked() else None,
+            self._sro_key_map,
+        )
+        self._save_result_thread.log_signal.connect(self.log)
+        self._save_result_thread.result_signal.connect(
+            lambda sro_key_map: self.handle_saved(sro_key_map, debug_output_location)
+        )
+        self._save_result_thread.finished.connect(self._save_result_thread.deleteLater)
+        self._save_result_thread.start()
+
+    def handle_saved(
+        self,
+        sro_key_map: Optional["SroKeyMap"],
+        debug_output_location: Optional[str] = None,
+    ) -> None:
+        """Post-save operations
 
-        if self.checkBoxSroFormat.isChecked():
-            self.log("Creating accompanying export in SRO format...")
-            try:
-                file_name = f"HSRScanData_SRO_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                save_to_json(
-                    convert_to_sro(data, self.game_data), output_location, file_name
-                )
-            except Exception as e:
-                self.log(
-                    (
-                        "Failed to convert to SRO format: " + traceback.format_exc(),
-                        LogLevel.ERROR,
-                    )
-                )
-        self.log("Scan complete. Data saved to " + output_location)
+        :param sro_key_map: The compiled SRO key map, kept for the next export
+        :param debug_output_location: The debug output location
+        """
+        self._sro_key_map = sro_key_map
+        self.log("Scan complete. Data saved to " + self.lineEditOutputLocation.text())
 
         if debug_output_location:
-            self.log(f"Saving log to {debug_output_location}.")
-            save_to_txt(
-                self.textEditLog.toPlainText(), debug_output_location, "log.txt"
-            )
+            self.close_log_file(debug_output_location)
+        self.enable_start_scan_button()
         self.notify()
 
     def handle_error(
@@ -513,13 +687,19 @@ class HSRScannerUI(QtWidgets.QMainWindow, Ui_MainWindow):
         """
         self.log((msg, LogLevel.FATAL))
         if debug_output_location:
-            self.log(f"Saving log to {debug_output_location}.")
-            save_to_txt(
-                self.textEditLog.toPlainText(), debug_output_location, "log.txt"
-            )
+            self.close_log_file(debug_output_location)
         self.notify()
         bring_window_to_foreground(self._hwnd)
 
+    def close_log_file(self, debug_output_location: str) -> None:
+        """Flushes the pending log lines and closes the log file
+
+        :param debug_output_location: The debug output location
+        """
+        self.log(f"Log saved to {debug_output_location}.")
+        self.flush_log()
+        self._log_sink.close_file()
+
     def notify(self) -> None:
         """Flashes the taskbar icon and plays a sound to notify the user"""
 
@@ -527,34 +707,50 @@ class HSRScannerUI(QtWidgets.QMainWindow, Ui_MainWindow):
         if self.checkBoxPlaySound.isChecked():
             winsound.MessageBeep()
 
-    def increment_progress(self, enum: IncrementType) -> None:
-        """Increments the number on the UI based on the enum
+    def update_progress(self) -> None:
+        """Samples the scan progress and updates the counts, throughput and ETA"""
+        if not self._progress_sampler:
+            return
 
-        :param enum: The enum to increment the progress for
-        """
-        match IncrementType(enum):
-            case IncrementType.LIGHT_CONE_ADD:
-                self.labelLightConeCount.setText(
-                    str(int(self.labelLightConeCount.text()) + 1)
-                )
-            case IncrementType.RELIC_ADD:
-                self.labelRelicCount.setText(str(int(self.labelRelicCount.text()) + 1))
-            case IncrementType.CHARACTER_ADD:
-                self.labelCharacterCount.setText(
-                    str(int(self.labelCharacterCount.text()) + 1)
-                )
-            case IncrementType.LIGHT_CONE_SUCCESS:
-                self.labelLightConeProcessed.setText(
-                    str(int(self.labelLightConeProcessed.text()) + 1)
-                )
-            case IncrementType.RELIC_SUCCESS:
-                self.labelRelicProcessed.setText(
-                    str(int(self.labelRelicProcessed.text()) + 1)
-                )
-            case IncrementType.CHARACTER_SUCCESS:
-                self.labelCharacterProcessed.setText(
-                    str(int(self.labelCharacterProcessed.text()) + 1)
-                )
+        labels = {
+            IncrementType.LIGHT_CONE_ADD: (
+                "Light cones",
+                self.labelLightConeCount,
+                self.labelLightConeProcessed,
+            ),
+            IncrementType.RELIC_ADD: (
+                "Relics",
+                self.labelRelicCount,
+                self.labelRelicProcessed,
+            ),
+            IncrementType.CHARACTER_ADD: (
+                "Characters",
+                self.labelCharacterCount,
+                self.labelCharacterProcessed,
+            ),
+        }
+
+        status = []
+        for scan_type, progress in self._progress_sampler.sample().items():
+            name, count_label, processed_label = labels[scan_type]
+            count_label.setText(str(progress.captured))
+            processed_label.setText(str(progress.parsed))
+            if progress.captured and progress.eta != 0:
+                status.append(f"{name}: {progress}")
+        self.statusbar.showMessage(" | ".join(status))
+
+    def stop_progress(self) -> None:
+        """Takes the last progress sample and stops sampling"""
+        self.update_progress()
+        self._progress_sampler = None
+        self.statusbar.clearMessage()
+
+    def flush_results(self) -> None:
+        """Appends the items parsed since the last flush to the results tab"""
+        if not self._result_feed:
+            return
+
+        self.resultsTab.add_results(*self._result_feed.drain())
 
     def disable_start_scan_button(self) -> None:
         """Disables the start scan button and sets the text to Processing"""
@@ -577,7 +773,7 @@ class HSRScannerUI(QtWidgets.QMainWindow, Ui_MainWindow):
         self.pushButtonStartScanRecentRelics.setEnabled(True)
 
     def log(self, log: tuple[str | Exception, LogLevel] | str) -> None:
-        """Logs a message to the log box
+        """Queues a message for the log box
 
         :param log: The log message and log level
         """
@@ -587,9 +783,15 @@ class HSRScannerUI(QtWidgets.QMainWindow, Ui_MainWindow):
             message = log
             log_level = LogLevel.INFO
 
-        self.textEditLog.appendPlainText(
-            f"[{datetime.datetime.now().strftime('%H:%M:%S')}] [{log_level.value}] > {str(message)}"
-        )
+        self._log_sink.log(message, log_level)
+
+    def flush_log(self) -> None:
+        """Appends the pending log lines to the log box in one batch"""
+        lines = self._log_sink.drain()
+        if not lines:
+            return
+
+        self.textEditLog.appendPlainText("\n".join(lines))
         self.textEditLog.verticalScrollBar().setValue(
             self.textEditLog.verticalScrollBar().maximum()
         )
@@ -607,11 +809,120 @@ class FetchGameDataThread(QThread):
 
     def run(self) -> None:
         """Runs the fetch game data"""
+        from models.game_data import GameData
+
         try:
-            self.result_signal.emit(GameData())
-            self.quit()
+            game_data = GameData()
         except Exception as e:
             self.error_signal.emit(e)
+            return
+
+        self.result_signal.emit(game_data)
+
+        # fetched ahead of the first SRO export, which fetches them again if
+        # this fails
+        try:
+            game_data.get_sro_mappings()
+        except Exception:
+            pass
+        self.quit()
+
+
+class SaveResultThread(QThread):
+    """SaveResultThread class records the scan in the inventory store and writes
+    the exports in a separate thread"""
+
+    result_signal = pyqtSignal(object)
+    log_signal = pyqtSignal(object)
+
+    def __init__(
+        self,
+        data: dict,
+        output_location: str,
+        scan_mode: int,
+        scanned: dict[str, bool],
+        merge: bool,
+        game_data: Optional["GameData"] = None,
+        sro_key_map: Optional["SroKeyMap"] = None,
+    ) -> None:
+        """Constructor
+
+        :param data: The data from the scan
+        :param output_location: The output location
+        :param scan_mode: The scan mode
+        :param scanned: Whether each category was scanned, keyed by category
+        :param merge: Whether to merge a recent relics scan into the inventory
+        :param game_data: The game data to write an SRO export with, defaults to
+            None for no SRO export
+        :param sro_key_map: The SRO key map compiled for a previous export,
+            defaults to None
+        """
+        super().__init__()
+        self._data = data
+        self._output_location = output_location
+        self._scan_mode = scan_mode
+        self._scanned = scanned
+        self._merge = merge
+        self._game_data = game_data
+        self._sro_key_map = sro_key_map
+
+    def run(self) -> None:
+        """Records the scan and writes the exports, then emits the SRO key map"""
+        from services.store.inventory_store import InventoryStore
+        from utils.conversion import SroKeyMap
+        from utils.export import ScanFormat, SroFormat, export
+
+        data = self._data
+        try:
+            with InventoryStore.in_output_location(self._output_location) as store:
+                if self._merge and self._scan_mode == ScanMode.RECENT_RELICS.value:
+                    scan_id, res = store.record_recent_relics(data)
+                    data = store.export()
+                    self.log_signal.emit(
+                        "Merged recent relics into inventory: " + res.summary()
+                    )
+                else:
+                    scan_id = store.record_scan(data, self._scan_mode, self._scanned)
+                    data = store.export(scan_id)
+            self.log_signal.emit(f"Scan recorded in inventory store (scan {scan_id}).")
+        except Exception:
+            self.log_signal.emit(
+                (
+                    "Failed to record scan in inventory store: "
+                    + traceback.format_exc(),
+                    LogLevel.ERROR,
+                )
+            )
+
+        formats = [ScanFormat()]
+        if self._game_data is not None:
+            self.log_signal.emit("Creating accompanying export in SRO format...")
+            try:
+                if self._sro_key_map is None:
+                    self._sro_key_map = SroKeyMap.from_game_data(self._game_data)
+                formats.append(SroFormat(self._sro_key_map))
+            except Exception:
+                self.log_signal.emit(
+                    (
+                        "Failed to convert to SRO format: " + traceback.format_exc(),
+                        LogLevel.ERROR,
+                    )
+                )
+
+        # every format is written in one pass over the results
+        try:
+            _, errors = export(data, formats, self._output_location)
+        except OSError as e:
+            errors = [(fmt, e) for fmt in formats]
+        for fmt, e in errors:
+            self.log_signal.emit(
+                (
+                    f"Failed to convert to {fmt.NAME} format: "
+                    + "".join(traceback.format_exception(e)),
+                    LogLevel.ERROR,
+                )
+            )
+        self.result_signal.emit(self._sro_key_map)
 
 
 class InterruptListener(QThread):
@@ -626,6 +937,8 @@ class InterruptListener(QThread):
 
     def run(self):
         """Runs the listener"""
+        from pynput.keyboard import Listener
+
         with Listener(on_press=self.on_press) as listener:
             self._listener = listener
             listener.join()
@@ -635,11 +948,12 @@ class InterruptListener(QThread):
         if self._listener:
             self._listener.stop()
 
-    def on_press(self, key: Key | KeyCode | None):
+    def on_press(self, key: "Key | KeyCode | None"):
         """Handles the key press. If the key is enter, emit the interrupt signal
 
         :param key: The key that was pressed
         """
+        from pynput.keyboard import Key
 
         if key == Key.enter:
             self.interrupt_signal.emit()
@@ -652,7 +966,7 @@ class ScannerThread(QThread):
     error_signal = pyqtSignal(str)
     log_signal = pyqtSignal(object)
 
-    def __init__(self, scanner: HSRScanner) -> None:
+    def __init__(self, scanner: "HSRScanner") -> None:
         """Constructor
 
         :param scanner: The HSRScanner class instance
@@ -663,6 +977,8 @@ class ScannerThread(QThread):
 
     def run(self) -> None:
         """Runs the scan"""
+        from services.scanner.scanner import InterruptedScanException
+
         try:
             res = asyncio.run(self._scanner.start_scan())
             if self._interrupt_requested:
@@ -689,6 +1005,12 @@ def main():
     ui = HSRScannerUI()
     ui.setup_ui(MainWindow)
     MainWindow.show()
+    if os.environ.get(EXIT_ON_SHOW_ENV):
+        app.processEvents()
+        return
+
+    # let the window paint before the game data fetch competes for the GIL
+    QTimer.singleShot(0, ui.fetch_game_data)
     sys.exit(app.exec())
 
 
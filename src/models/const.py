@@ -2,6 +2,9 @@
 KEL_Z = "kel-z"
 HSR_SCANNER = "HSRScanner"
 IS_STELLE = "is_stelle"
+TAB_SWITCH_SECONDS = "tab_switch_seconds"
+CHARACTER_SWITCH_SECONDS = "character_switch_seconds"
+CHARACTER_PARSE_SECONDS = "character_parse_seconds"
 
 # Misc
 LEVEL = "level"
@@ -41,6 +44,13 @@ TRACES_UNLOCKS = "unlocks"
 TRACES_LEVELS = "levels"
 
 EIDOLON_IMAGES = "eidolon_images"
+ASCENSION_PROBES = "ascension_probes"
+KNOWN_CHARACTER = "known_character"
+
+# Fingerprints of the captured pages, kept with the character so the next scan
+# can skip unchanged characters
+CHAR_DETAILS_FINGERPRINT = "_details"
+CHAR_TRACES_HASH = "_traces"
 
 # Light Cone keys
 LC_ID = "id"
@@ -71,6 +81,22 @@ RELIC_SUBSTAT_VALUES = "substat_vals"
 RELIC_SUBSTAT_NAME = "key"
 RELIC_SUBSTAT_VALUE = "value"
 
+# In-game substat order, also used as the substat index for validation
+RELIC_SUBSTAT_ORDER = [
+    "HP",
+    "ATK",
+    "DEF",
+    "HP_",
+    "ATK_",
+    "DEF_",
+    "SPD",
+    "CRIT Rate_",
+    "CRIT DMG_",
+    "Effect Hit Rate_",
+    "Effect RES_",
+    "Break Effect_",
+]
+
 # Filter keys
 FILTERS = "filters"
 
@@ -100,18 +126,24 @@ CONFIG_MIN_LC_RARITY = "min_light_cone_rarity"
 CONFIG_MIN_RELIC_LEVEL = "min_relic_level"
 CONFIG_MIN_RELIC_RARITY = "min_relic_rarity"
 CONFIG_MIN_CHAR_LEVEL = "min_character_level"
+CONFIG_SKIP_UNCHANGED_CHARS = "skip_unchanged_characters"
 
 CONFIG_SCAN_LC = "scan_light_cones"
 CONFIG_SCAN_RELICS = "scan_relics"
 CONFIG_SCAN_CHARACTERS = "scan_characters"
 
 CONFIG_SRO_FORMAT = "sro_format"
+CONFIG_OCR_LEXICON = "ocr_lexicon"
 CONFIG_DEBUG_MODE = "debug_mode"
 CONFIG_NAV_DELAY = "nav_delay"
 CONFIG_SCAN_DELAY = "scan_delay"
+CONFIG_CPU_BUDGET = "cpu_budget"
+CONFIG_PIN_WORKERS = "pin_workers"
+CONFIG_OCR_WORKERS = "ocr_workers"
 
 CONFIG_RECENT_RELICS_NUM = "recent_relics_num"
 CONFIG_RECENT_RELICS_FIVE_STAR = "recent_relics_five_star"
+CONFIG_RECENT_RELICS_MERGE = "recent_relics_merge"
 
 CONFIG_INCLUDE_UID = "include_uid"
 CONFIG_PLAY_SOUND = "play_sound"
@@ -8,9 +8,6 @@ import numpy as np
 import requests
 from PIL import Image as PILImage
 from PIL.Image import Image
-from PyQt6.QtCore import QSettings
-
-from models.const import HSR_SCANNER, IS_STELLE, KEL_Z
 
 GAME_DATA_URL = "https://raw.githubusercontent.com/kel-z/HSR-Data/v5/output/min/game_data_with_icons.json"
 SRO_MAPPINGS_URL = (
@@ -73,8 +70,6 @@ class GameData:
         except requests.exceptions.RequestException:
             raise Exception("Failed to fetch game data from " + GAME_DATA_URL)
 
-        self.settings = QSettings(KEL_Z, HSR_SCANNER)
-
         self.version = data["version"]
         self.RELIC_META_DATA = data["relics"]
         self.LIGHT_CONE_META_DATA = data["light_cones"]
@@ -129,20 +124,19 @@ class GameData:
         """
         return self.LIGHT_CONE_META_DATA[name]
 
-    def get_character_meta_data(self, name: str, path: str) -> dict:
+    def get_character_meta_data(
+        self, name: str, path: str, is_stelle: bool = True
+    ) -> dict:
         """Get character meta data from name
 
         :param name: The name of the character
         :param path: The path of the character
+        :param is_stelle: Whether the Trailblazer is Stelle, defaults to True
         :return: The character meta data
         """
         try:
             if name == "Trailblazer":
-                name = (
-                    "Stelle"
-                    if self.settings.value(IS_STELLE, True) == "true"
-                    else "Caelus"
-                )
+                name = "Stelle" if is_stelle else "Caelus"
             return self.CHARACTER_META_DATA[name][path]
         except KeyError:
             raise KeyError(
@@ -154,8 +148,6 @@ class GameData:
     ) -> tuple[str, str | None]:
         """Get equipped character from equipped avatar image
 
-        Side effect: Sets the is_stelle QSetting
-
         :param equipped_avatar_img: The equipped avatar image
         :return: The character id and outfit id if applicable
         """
@@ -164,7 +156,7 @@ class GameData:
 
         # Circle mask
         mask = np.zeros(to_compare_img.shape[:2], dtype="uint8")
-        (h, w) = to_compare_img.shape[:2]
+        h, w = to_compare_img.shape[:2]
         cv2.circle(mask, (int(w / 2), int(h / 2)), 50, 255, -1)  # type: ignore
         to_compare_img = cv2.bitwise_and(  # type: ignore
             to_compare_img, to_compare_img, mask=mask
@@ -187,8 +179,6 @@ class GameData:
                     char_id.split("#", 1) if "#" in char_id else (char_id, None)
                 )
 
-        if res.startswith("8"):
-            self.settings.setValue(IS_STELLE, int(res[-1]) % 2 == 0)
         return res, outfit_id
 
     def get_closest_relic_name(self, name: str) -> tuple[str, int]:
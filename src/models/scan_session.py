@@ -0,0 +1,76 @@
+import threading
+
+from PyQt6.QtCore import QSettings
+
+from models.const import IS_STELLE
+
+# Character ids of the Trailblazer start with 8, even ids are Stelle
+TRAILBLAZER_ID_PREFIX = "8"
+
+
+class ScanSession:
+    """ScanSession class holds the facts learned during a scan in memory
+
+    Parsers on any thread read and update the session instead of QSettings, so
+    the parse loop never touches the registry. The session is loaded from and
+    saved to QSettings once per scan.
+    """
+
+    def __init__(self, is_stelle: bool = True) -> None:
+        """Constructor
+
+        :param is_stelle: Whether the Trailblazer is Stelle, defaults to True
+        """
+        self._lock = threading.Lock()
+        self._is_stelle = is_stelle
+        self._changed = False
+
+    @classmethod
+    def from_settings(cls, settings: QSettings) -> "ScanSession":
+        """Load the session from the settings of the previous scan
+
+        :param settings: The settings
+        :return: The session
+        """
+        return cls(settings.value(IS_STELLE, True, type=bool))
+
+    @property
+    def is_stelle(self) -> bool:
+        """Whether the Trailblazer is Stelle"""
+        with self._lock:
+            return self._is_stelle
+
+    @property
+    def trailblazer(self) -> str:
+        """The name of the Trailblazer, Stelle or Caelus"""
+        return "Stelle" if self.is_stelle else "Caelus"
+
+    def set_is_stelle(self, is_stelle: bool) -> None:
+        """Set the Trailblazer variant
+
+        :param is_stelle: Whether the Trailblazer is Stelle
+        """
+        with self._lock:
+            if self._is_stelle != is_stelle:
+                self._is_stelle = is_stelle
+                self._changed = True
+
+    def observe_character_id(self, char_id: str) -> None:
+        """Update the Trailblazer variant if a character id is a Trailblazer
+
+        :param char_id: The character id, e.g. of the character an item is
+            equipped on
+        """
+        if char_id.startswith(TRAILBLAZER_ID_PREFIX):
+            self.set_is_stelle(int(char_id[-1]) % 2 == 0)
+
+    def save(self, settings: QSettings) -> None:
+        """Write the session back to the settings if anything changed
+
+        :param settings: The settings
+        """
+        with self._lock:
+            if not self._changed:
+                return
+            settings.setValue(IS_STELLE, self._is_stelle)
+            self._changed = False
@@ -1,13 +1,12 @@
 from asyncio import Event
+from typing import Callable
 
-import cv2
 import numpy as np
 from PIL import Image as PILImage
 from PIL.Image import Image
-from pyautogui import locate
-from PyQt6.QtCore import QSettings, pyqtBoundSignal
 
 from enums.increment_type import IncrementType
+from enums.ocr_field import OcrField
 from enums.log_level import LogLevel
 from models.const import (
     CAELUS_ICON_PATH,
@@ -17,9 +16,6 @@ from models.const import (
     CHAR_ASCENSION,
     CHAR_EIDOLON,
     EIDOLON_IMAGES,
-    HSR_SCANNER,
-    IS_STELLE,
-    KEL_Z,
     CHAR_MEMOSPRITE,
     CHAR_LEVEL,
     CHAR_SKILLS,
@@ -31,9 +27,15 @@ from models.const import (
     ULT,
     TRACES_LEVELS,
     TRACES_UNLOCKS,
+    KNOWN_CHARACTER,
 )
 from models.game_data import GameData
+from models.scan_session import ScanSession
 from utils.data import resource_path
+from utils.eidolon_classifier import count_eidolons
+from utils.icon_detector import TRAILBLAZER_CONFIDENCE, IconDetector
+from utils.log_sink import LogSink
+from utils.progress import ScanProgress
 from utils.ocr import image_to_string, preprocess_trace_img
 
 
@@ -43,27 +45,30 @@ class CharacterParser:
     def __init__(
         self,
         game_data: GameData,
-        log_signal: pyqtBoundSignal,
-        update_signal: pyqtBoundSignal,
+        session: ScanSession,
+        log_sink: LogSink,
+        progress: ScanProgress,
         interrupt_event: Event,
         debug: bool = False,
     ) -> None:
         """Constructor
 
         :param game_data: The GameData class instance
-        :param log_signal: The log signal
-        :param update_signal: The update signal
+        :param session: The scan session
+        :param log_sink: The log sink
+        :param progress: The progress counters
         :param interrupt_event: The interrupt event
         :param debug: Whether to run in debug mode, defaults to False
         """
         self._game_data = game_data
-        self._log_signal = log_signal
-        self._update_signal = update_signal
+        self._session = session
+        self._log_sink = log_sink
+        self._progress = progress
         self._interrupt_event = interrupt_event
         self._debug = debug
-        self._trailblazer_imgs = {
-            "M": PILImage.open(resource_path(CAELUS_ICON_PATH)),
-            "F": PILImage.open(resource_path(STELLE_ICON_PATH)),
+        self._trailblazer_detectors = {
+            "M": IconDetector(PILImage.open(resource_path(CAELUS_ICON_PATH))),
+            "F": IconDetector(PILImage.open(resource_path(STELLE_ICON_PATH))),
         }
         self._is_trailblazer_scanned = False
 
@@ -80,7 +85,9 @@ class CharacterParser:
         try:
             name = stats_dict[CHAR_NAME]
             path = stats_dict[CHAR_PATH]
-            metadata = self._game_data.get_character_meta_data(name, path)
+            metadata = self._game_data.get_character_meta_data(
+                name, path, self._session.is_stelle
+            )
             char_id = str(metadata[CHAR_ID])
 
             # Output
@@ -116,6 +123,17 @@ class CharacterParser:
                     LogLevel.ERROR,
                 )
 
+            # an unchanged trace page shows the same levels, unless an eidolon
+            # bonus was added on top of them
+            known = stats_dict.get(KNOWN_CHARACTER)
+            if known and known[CHAR_EIDOLON] == character[CHAR_EIDOLON]:
+                character[CHAR_SKILLS] = dict(known[CHAR_SKILLS])
+                if CHAR_MEMOSPRITE in character:
+                    character[CHAR_MEMOSPRITE] = dict(known[CHAR_MEMOSPRITE])
+                character[CHAR_TRACES] = stats_dict[CHAR_TRACES][TRACES_UNLOCKS]
+                self._progress.increment(IncrementType.CHARACTER_SUCCESS)
+                return character
+
             for eidolon in (5, 3):
                 if character[CHAR_EIDOLON] >= eidolon:
                     e_token = f"e{eidolon}"
@@ -130,7 +148,12 @@ class CharacterParser:
             for k, v in traces_dict[TRACES_LEVELS].items():
                 try:
                     res = image_to_string(
-                        v, "0123456789/", 6, True, preprocess_trace_img
+                        v,
+                        "0123456789/",
+                        6,
+                        True,
+                        preprocess_trace_img,
+                        field=OcrField.TRACE_LEVEL,
                     )
 
                     # If the first OCR attempt failed, try again with different parameters
@@ -140,7 +163,12 @@ class CharacterParser:
                             LogLevel.DEBUG,
                         )
                         res = image_to_string(
-                            v, "0123456789/", 6, False, preprocess_trace_img
+                            v,
+                            "0123456789/",
+                            6,
+                            False,
+                            preprocess_trace_img,
+                            field=OcrField.TRACE_LEVEL,
                         )
                     if not res or "/" not in res:
                         self._log(
@@ -148,7 +176,12 @@ class CharacterParser:
                             LogLevel.DEBUG,
                         )
                         res = image_to_string(
-                            v, "0123456789/", 7, True, preprocess_trace_img
+                            v,
+                            "0123456789/",
+                            7,
+                            True,
+                            preprocess_trace_img,
+                            field=OcrField.TRACE_LEVEL,
                         )
                     if not res or "/" not in res:
                         self._log(
@@ -156,7 +189,12 @@ class CharacterParser:
                             LogLevel.DEBUG,
                         )
                         res = image_to_string(
-                            v, "0123456789/", 7, False, preprocess_trace_img
+                            v,
+                            "0123456789/",
+                            7,
+                            False,
+                            preprocess_trace_img,
+                            field=OcrField.TRACE_LEVEL,
                         )
 
                     if k.startswith(CHAR_MEMOSPRITE):
@@ -183,7 +221,7 @@ class CharacterParser:
 
             character[CHAR_TRACES] = traces_dict[TRACES_UNLOCKS]
 
-            self._update_signal.emit(IncrementType.CHARACTER_SUCCESS.value)
+            self._progress.increment(IncrementType.CHARACTER_SUCCESS)
 
             return character
         except Exception as e:
@@ -203,9 +241,13 @@ class CharacterParser:
             return level
 
         if isinstance(level, Image):
-            res = image_to_string(level, "0123456789", 7, True)
+            res = image_to_string(
+                level, "0123456789", 7, True, field=OcrField.CHARACTER_LEVEL
+            )
             if not res or not res.isdigit():
-                res = image_to_string(level, "0123456789", 6, True)
+                res = image_to_string(
+                    level, "0123456789", 6, True, field=OcrField.CHARACTER_LEVEL
+                )
 
         if not res.isdigit():
             self._log(
@@ -256,15 +298,14 @@ class CharacterParser:
     def is_trailblazer(self, character_img: Image) -> bool:
         """Check if the character is Trailblazer
 
-        Side effect: Sets the is_stelle QSetting
+        Side effect: Sets the Trailblazer variant of the scan session
 
         :param character_img: The character image
         :return: True if the character is Trailblazer, False otherwise
         """
-        for k, trailblazer_img in self._trailblazer_imgs.items():
-            trailblazer_img = trailblazer_img.resize(character_img.size)
-            if locate(character_img, trailblazer_img, confidence=0.8) is not None:
-                QSettings(KEL_Z, HSR_SCANNER).setValue(IS_STELLE, k == "F")
+        for k, detector in self._trailblazer_detectors.items():
+            if detector.detect(character_img, TRAILBLAZER_CONFIDENCE):
+                self._session.set_is_stelle(k == "F")
                 self._log(
                     f'{"Stelle" if k == "F" else "Caelus"} detected.', LogLevel.DEBUG
                 )
@@ -272,40 +313,20 @@ class CharacterParser:
 
         return False
 
-    def _process_eidolons(self, eidolon_images: list[Image]) -> int:
+    def _process_eidolons(self, eidolon_images: np.ndarray) -> int:
         """Process eidolons
 
-        :param eidolon_images: The eidolon images
+        :param eidolon_images: The stacked eidolon images
         :return: The number of eidolons unlocked
         """
-        lower_orange = np.array([127, 104, 51])
-        upper_orange = np.array([210, 175, 100])
-
-        eidolon = 0
-        for img in eidolon_images:
-            img_bw = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)  # type: ignore
-            white = cv2.Laplacian(img_bw, cv2.CV_64F).var()  # type: ignore
-
-            # Eidolon is locked if the image is too dark
-            if white < 10000:
-                break
+        return count_eidolons(eidolon_images)
 
-            mask = cv2.inRange(img, lower_orange, upper_orange)  # type: ignore
-            orange = cv2.countNonZero(mask)  # type: ignore
-
-            # Eidolon is unlocked but not activated if the image is too orange
-            if orange > 200:
-                break
-
-            eidolon += 1
-
-        return eidolon
-
-    def _log(self, msg: str, level: LogLevel = LogLevel.INFO) -> None:
+    def _log(
+        self, msg: str | Callable[[], str], level: LogLevel = LogLevel.INFO
+    ) -> None:
         """Logs a message
 
-        :param msg: The message to log
+        :param msg: The message to log, or a function building it
         :param level: The log level
         """
-        if self._debug or level in [LogLevel.INFO, LogLevel.WARNING, LogLevel.ERROR]:
-            self._log_signal.emit((msg, level))
+        self._log_sink.log(msg, level)
@@ -1,4 +1,12 @@
-from config.const import EQUIPPED, EQUIPPED_AVATAR, EQUIPPED_AVATAR_OFFSET, LOCK
+from typing import Callable
+
+from config.const import (
+    EQUIPPED,
+    EQUIPPED_AVATAR,
+    EQUIPPED_AVATAR_OFFSET,
+    LIGHT_CONE,
+    LOCK,
+)
 from models.const import (
     LC_ASCENSION,
     LC_FILTERS,
@@ -18,13 +26,16 @@ from models.const import (
 from type_defs.stats_dict import LightConeDict
 
 from PIL.Image import Image
-from pyautogui import locate
 
 from config.light_cone_scan import LIGHT_CONE_NAV_DATA
 from enums.increment_type import IncrementType
+from enums.ocr_field import OcrField
 from enums.log_level import LogLevel
 from services.scanner.parsers.parse_strategy import BaseParseStrategy
+from services.scanner.parsers.resolvers import LightConeResolver
 from utils.data import filter_images_from_dict
+from utils.icon_detector import LIGHT_CONE_LOCK_CONFIDENCE
+from utils.name_index import NAME_INDEX_MAX_OCR_DISTANCE
 from utils.ocr import (
     image_to_string,
     preprocess_equipped_img,
@@ -38,6 +49,13 @@ class LightConeStrategy(BaseParseStrategy):
 
     SCAN_TYPE = IncrementType.LIGHT_CONE_ADD
     NAV_DATA = LIGHT_CONE_NAV_DATA
+    ROI_KEY = LIGHT_CONE
+    UID_PREFIX = "light_cone"
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Constructor"""
+        super().__init__(*args, **kwargs)
+        self._resolver = LightConeResolver(self._game_data)
 
     def get_optimal_sort_method(self, filters: dict) -> str:
         """Gets the optimal sort method based on the filters
@@ -80,7 +98,12 @@ class LightConeStrategy(BaseParseStrategy):
                         LC_NAME, stats_dict[LC_NAME]
                     )
                     lc_name = stats_dict[LC_NAME]
-                    if not lc_name or not isinstance(lc_name, str):
+                    light_cone = (
+                        self._resolver.resolve(lc_name)
+                        if isinstance(lc_name, str)
+                        else {}
+                    )
+                    if not light_cone:
                         self._log(
                             f'Light Cone UID {uid}: Failed to parse name. Setting to "Void".',
                             LogLevel.ERROR,
@@ -88,11 +111,7 @@ class LightConeStrategy(BaseParseStrategy):
                         stats_dict[LC_NAME] = "Void"
                         filter_results[key] = True
                         continue
-                    stats_dict[LC_NAME], _ = (
-                        self._game_data.get_closest_light_cone_name(lc_name)
-                    )
-                    val = self._game_data.get_light_cone_meta_data(lc_name)[LC_RARITY]
-                    stats_dict[LC_RARITY] = val
+                    val = stats_dict[LC_RARITY] = light_cone[LC_RARITY]
                 elif key == MIN_LEVEL:
                     # Trivial case
                     if filters[key] <= 1:
@@ -134,17 +153,33 @@ class LightConeStrategy(BaseParseStrategy):
             return data
 
         if key == LC_NAME:
-            name, _ = self._game_data.get_closest_light_cone_name(
+            if self._name_index is not None:
+                name = self._name_index.lookup(data)
+                if name is not None:
+                    return name
+            light_cone, dist = self._resolver.match(
                 image_to_string(
                     data,
                     "ABCDEFGHIJKLMNOPQRSTUVWXYZ 'abcedfghijklmnopqrstuvwxyz-",
                     6,
+                    field=OcrField.LIGHT_CONE_NAME,
                 )
             )
-            return name
+            if (
+                light_cone
+                and dist <= NAME_INDEX_MAX_OCR_DISTANCE
+                and self._name_index is not None
+            ):
+                self._name_index.add(data, light_cone[LC_NAME])
+            return light_cone.get(LC_NAME, "")
         elif key == LC_LEVEL:
             return image_to_string(
-                data, "0123456789S/", 7, True, preprocess_lc_level_img
+                data,
+                "0123456789S/",
+                7,
+                True,
+                preprocess_lc_level_img,
+                field=OcrField.LIGHT_CONE_LEVEL,
             ).replace("S", "5")
         elif key == LC_SUPERIMPOSITION:
             return image_to_string(
@@ -171,7 +206,7 @@ class LightConeStrategy(BaseParseStrategy):
 
             (
                 self._log(
-                    f"Light Cone UID {uid}: Raw data: {filter_images_from_dict(stats_dict)}",
+                    lambda: f"Light Cone UID {uid}: Raw data: {filter_images_from_dict(stats_dict)}",
                     LogLevel.DEBUG,
                 )
                 if self._debug
@@ -191,7 +226,9 @@ class LightConeStrategy(BaseParseStrategy):
                 )
                 name = "Void"
 
-            lc_id = str(self._game_data.get_light_cone_meta_data(name)[LC_ID])
+            light_cone = self._resolver.resolve(name)
+            lc_id = light_cone[LC_ID]
+            name = light_cone[LC_NAME]
 
             # Parse level, ascension, superimposition
             try:
@@ -217,12 +254,9 @@ class LightConeStrategy(BaseParseStrategy):
                 )
                 superimposition = 1
 
-            min_dim = min(lock.size)
             try:
-                locked = self._lock_icon.resize((min_dim, min_dim))
-
                 # Check if locked by image matching
-                lock = locate(locked, lock, confidence=0.1) is not None
+                lock = self._lock_detector.detect(lock, LIGHT_CONE_LOCK_CONFIDENCE)
             except Exception:  # https://github.com/kel-z/HSR-Scanner/issues/41
                 self._log(
                     f"Light Cone UID {uid}: Failed to parse lock. Setting to False.",
@@ -245,6 +279,9 @@ class LightConeStrategy(BaseParseStrategy):
                     equipped_avatar
                 )
 
+            if location:
+                self._session.observe_character_id(location)
+
             if outfit_id:
                 self._log(
                     f"Light Cone UID {uid}: Equipped character is {location} with outfit ID {outfit_id}.",
@@ -259,10 +296,10 @@ class LightConeStrategy(BaseParseStrategy):
                 LC_SUPERIMPOSITION: int(superimposition),
                 LC_LOCATION: location,
                 LC_LOCK: lock,
-                "_uid": f"light_cone_{uid}",
+                "_uid": f"{self.UID_PREFIX}_{uid}",
             }
 
-            self._update_signal.emit(IncrementType.LIGHT_CONE_SUCCESS.value)
+            self._progress.increment(IncrementType.LIGHT_CONE_SUCCESS)
 
             return result
         except Exception as e:
@@ -272,11 +309,12 @@ class LightConeStrategy(BaseParseStrategy):
             )
             return {}
 
-    def _log(self, msg: str, level: LogLevel = LogLevel.INFO) -> None:
+    def _log(
+        self, msg: str | Callable[[], str], level: LogLevel = LogLevel.INFO
+    ) -> None:
         """Logs a message
 
-        :param msg: The message to log
+        :param msg: The message to log, or a function building it
         :param level: The log level
         """
-        if self._debug or level in [LogLevel.INFO, LogLevel.WARNING, LogLevel.ERROR]:
-            self._log_signal.emit((msg, level))
+        self._log_sink.log(msg, level)
@@ -3,12 +3,16 @@ from asyncio import Event
 
 from PIL import Image as PILImage
 from PIL.Image import Image
-from PyQt6.QtCore import pyqtBoundSignal
 
 from enums.increment_type import IncrementType
 from models.const import LOCK_ICON_PATH
 from models.game_data import GameData
+from models.scan_session import ScanSession
 from utils.data import resource_path
+from utils.icon_detector import IconDetector
+from utils.log_sink import LogSink
+from utils.name_index import NameIndex
+from utils.progress import ScanProgress
 
 
 class BaseParseStrategy(ABC):
@@ -16,29 +20,40 @@ class BaseParseStrategy(ABC):
 
     SCAN_TYPE: IncrementType
     NAV_DATA: dict
+    ROI_KEY: str
+    UID_PREFIX: str
 
     def __init__(
         self,
         game_data: GameData,
-        log_signal: pyqtBoundSignal,
-        update_signal: pyqtBoundSignal,
+        session: ScanSession,
+        log_sink: LogSink,
+        progress: ScanProgress,
         interrupt_event: Event,
         debug: bool = False,
+        name_index: NameIndex | None = None,
     ) -> None:
         """Constructor
 
         :param game_data: The GameData class instance
-        :param log_signal: The log signal
-        :param update_signal: The update signal
+        :param session: The scan session
+        :param log_sink: The log sink
+        :param progress: The progress counters
         :param interrupt_event: The interrupt event
         :param debug: Debug flag
+        :param name_index: The index of name crops resolved before, defaults to
+            None to read every name by OCR
         """
         self._game_data = game_data
-        self._log_signal = log_signal
-        self._update_signal = update_signal
+        self._session = session
+        self._log_sink = log_sink
+        self._progress = progress
         self._interrupt_event = interrupt_event
         self._debug = debug
-        self._lock_icon = PILImage.open(resource_path(LOCK_ICON_PATH))
+        self._name_index = name_index
+        self._lock_detector = IconDetector(
+            PILImage.open(resource_path(LOCK_ICON_PATH)), square=True
+        )
 
     @abstractmethod
     def get_optimal_sort_method(self, filters: dict) -> str:
@@ -1,11 +1,19 @@
+from typing import Callable
+
 import numpy as np
 from PIL import Image as PILImage
 from PIL.Image import Image
-from pyautogui import locate
 
-from config.const import EQUIPPED, EQUIPPED_AVATAR, EQUIPPED_AVATAR_OFFSET, LOCK
+from config.const import (
+    EQUIPPED,
+    EQUIPPED_AVATAR,
+    EQUIPPED_AVATAR_OFFSET,
+    LOCK,
+    RELIC,
+)
 from config.relic_scan import RELIC_NAV_DATA
 from enums.increment_type import IncrementType
+from enums.ocr_field import OcrField
 from enums.log_level import LogLevel
 from models.const import (
     FILTER_MAX,
@@ -23,23 +31,25 @@ from models.const import (
     RELIC_SET_ID,
     RELIC_SLOT,
     RELIC_SUBSTAT_NAME,
-    RELIC_SUBSTAT_VALUE,
+    RELIC_SUBSTAT_ORDER,
     RELIC_SUBSTAT_VALUES,
     RELIC_SUBSTATS,
     RELIC_SUBSTAT_NAMES,
     SORT_LV,
     SORT_RARITY,
 )
-from models.substat_vals import SUBSTAT_ROLL_VALS
 from services.scanner.parsers.parse_strategy import BaseParseStrategy
+from services.scanner.parsers.resolvers import RelicResolver
 from type_defs.stats_dict import RelicDict
 from utils.data import filter_images_from_dict, resource_path
+from utils.icon_detector import DISCARD_CONFIDENCE, LOCK_CONFIDENCE, IconDetector
+from utils.name_index import NAME_INDEX_MAX_OCR_DISTANCE
 from utils.ocr import (
     image_to_string,
     preprocess_equipped_img,
     preprocess_main_stat_img,
-    preprocess_sub_stat_img,
 )
+from utils.substat_reader import read_substats
 
 
 class RelicStrategy(BaseParseStrategy):
@@ -47,11 +57,16 @@ class RelicStrategy(BaseParseStrategy):
 
     SCAN_TYPE = IncrementType.RELIC_ADD
     NAV_DATA = RELIC_NAV_DATA
+    ROI_KEY = RELIC
+    UID_PREFIX = "relic"
 
     def __init__(self, *args, **kwargs) -> None:
         """Constructor"""
         super().__init__(*args, **kwargs)
-        self._discard_icon = PILImage.open(resource_path("assets/images/discard.png"))
+        self._resolver = RelicResolver(self._game_data)
+        self._discard_detector = IconDetector(
+            PILImage.open(resource_path("assets/images/discard.png")), square=True
+        )
 
     def get_optimal_sort_method(self, filters: dict) -> str:
         """Gets the optimal sort method based on the filters
@@ -133,11 +148,28 @@ class RelicStrategy(BaseParseStrategy):
             return data
 
         if key == RELIC_NAME:
-            return image_to_string(
-                data, "ABCDEFGHIJKLMNOPQRSTUVWXYZ 'abcedfghijklmnopqrstuvwxyz-", 6
+            if self._name_index is not None:
+                name = self._name_index.lookup(data)
+                if name is not None:
+                    return name
+            name = image_to_string(
+                data,
+                "ABCDEFGHIJKLMNOPQRSTUVWXYZ 'abcedfghijklmnopqrstuvwxyz-",
+                6,
+                field=OcrField.RELIC_NAME,
             )
+            relic, dist = self._resolver.match(name)
+            if (
+                relic
+                and dist <= NAME_INDEX_MAX_OCR_DISTANCE
+                and self._name_index is not None
+            ):
+                self._name_index.add(data, relic[RELIC_NAME])
+            return name
         elif key == RELIC_LEVEL:
-            return image_to_string(data, "0123456789S", 7, True).replace("S", "5")
+            return image_to_string(
+                data, "0123456789S", 7, True, field=OcrField.RELIC_LEVEL
+            ).replace("S", "5")
         elif key == RELIC_MAINSTAT:
             return image_to_string(
                 data,
@@ -145,6 +177,7 @@ class RelicStrategy(BaseParseStrategy):
                 7,
                 True,
                 preprocess_main_stat_img,
+                field=OcrField.RELIC_MAIN_STAT,
             )
         elif key == EQUIPPED:
             return image_to_string(data, "Equiped", 7, True, preprocess_equipped_img)
@@ -155,24 +188,6 @@ class RelicStrategy(BaseParseStrategy):
                 int(rarity_sample.shape[1] / 2)
             ]
             return self._game_data.get_closest_rarity(rarity_sample)
-        elif key == RELIC_SUBSTAT_NAMES:
-            return image_to_string(
-                data,
-                " ABCDEFGHIKMPRSTacefikrt",
-                6,
-                True,
-                preprocess_sub_stat_img,
-                False,
-            )
-        elif key == RELIC_SUBSTAT_VALUES:
-            return (
-                image_to_string(
-                    data, "0123456789S.%,", 6, True, preprocess_sub_stat_img, False
-                )
-                .replace("S", "5")
-                .replace(",", ".")
-                .replace("..", ".")
-            )
         else:
             return data
 
@@ -192,7 +207,7 @@ class RelicStrategy(BaseParseStrategy):
 
             (
                 self._log(
-                    f"Relic UID {uid}: Raw data: {filter_images_from_dict(stats_dict)}",
+                    lambda: f"Relic UID {uid}: Raw data: {filter_images_from_dict(stats_dict)}",
                     LogLevel.DEBUG,
                 )
                 if self._debug
@@ -210,7 +225,7 @@ class RelicStrategy(BaseParseStrategy):
             substat_vals = stats_dict[RELIC_SUBSTAT_VALUES]
 
             # Fix OCR errors
-            name, _ = self._game_data.get_closest_relic_name(name)  # type: ignore
+            relic = self._resolver.resolve(name)  # type: ignore
             main_stat_key, _ = self._game_data.get_closest_relic_main_stat(main_stat_key)  # type: ignore
             if not level or isinstance(level, Image):
                 self._log(
@@ -219,30 +234,26 @@ class RelicStrategy(BaseParseStrategy):
                 )
                 level = 0
             level = int(level)
-            if not name:
+            if not relic:
                 self._log(
                     f'Relic UID {uid}: Failed to extract name. Setting to "Musketeer\'s Wild Wheat Felt Hat".',
                     LogLevel.ERROR,
                 )
-                name = "Musketeer's Wild Wheat Felt Hat"
+                relic = self._resolver.resolve("Musketeer's Wild Wheat Felt Hat")
 
-            # Substats
-            while "\n\n" in substat_names:  # type: ignore
-                substat_names = substat_names.replace("\n\n", "\n")  # type: ignore
-            while "\n\n" in substat_vals:  # type: ignore
-                substat_vals = substat_vals.replace("\n\n", "\n")  # type: ignore
-            substat_names = substat_names.split("\n")  # type: ignore
-            substat_vals = substat_vals.split("\n")  # type: ignore
+            # Substats are read together so each value stays on its name's row
+            substat_rows = read_substats(substat_names, substat_vals)  # type: ignore
+            substat_names = [name for name, _ in substat_rows]
+            substat_vals = [val for _, val in substat_rows]
 
+            # Substats are validated in bulk once the scan is done
             substats_res = self._parse_substats(substat_names, substat_vals, uid)
-            self._validate_substats(substats_res, rarity, level, uid)  # type: ignore
             self._sort_substats(substats_res, uid)
 
             # Set and slot
-            metadata = self._game_data.get_relic_meta_data(name)
-            set_id = str(metadata[RELIC_SET_ID])
-            set_name = metadata[RELIC_SET]
-            slot_key = metadata[RELIC_SLOT]
+            set_id = relic[RELIC_SET_ID]
+            set_name = relic[RELIC_SET]
+            slot_key = relic[RELIC_SLOT]
             if slot_key == "Hands":
                 main_stat_key = "ATK"
             elif slot_key == "Head":
@@ -255,20 +266,16 @@ class RelicStrategy(BaseParseStrategy):
                 main_stat_key = "ATK"
 
             # Check if locked/discarded by image matching
-            min_dim = min(lock.size)
             try:
-                lock_img = self._lock_icon.resize((min_dim, min_dim))
-                lock = locate(lock_img, lock, confidence=0.3) is not None
+                lock = self._lock_detector.detect(lock, LOCK_CONFIDENCE)
             except Exception:  # https://github.com/kel-z/HSR-Scanner/issues/41
                 self._log(
                     f"Relic UID {uid}: Failed to parse lock. Setting to False.",
                     LogLevel.ERROR,
                 )
                 lock = False
-            min_dim = min(discard.size)
             try:
-                discard_img = self._discard_icon.resize((min_dim, min_dim))
-                discard = locate(discard_img, discard, confidence=0.3) is not None
+                discard = self._discard_detector.detect(discard, DISCARD_CONFIDENCE)
             except Exception:
                 self._log(
                     f"Relic UID {uid}: Failed to parse discard. Setting to False.",
@@ -291,6 +298,9 @@ class RelicStrategy(BaseParseStrategy):
                     equipped_avatar
                 )
 
+            if location:
+                self._session.observe_character_id(location)
+
             if outfit_id:
                 self._log(
                     f"Relic UID {uid}: Equipped character is {location} with outfit ID {outfit_id}.",
@@ -308,10 +318,10 @@ class RelicStrategy(BaseParseStrategy):
                 RELIC_LOCATION: location,
                 LOCK: lock,
                 RELIC_DISCARD: discard,
-                "_uid": f"relic_{uid}",
+                "_uid": f"{self.UID_PREFIX}_{uid}",
             }
 
-            self._update_signal.emit(IncrementType.RELIC_SUCCESS.value)
+            self._progress.increment(IncrementType.RELIC_SUCCESS)
 
             return result
         except Exception as e:
@@ -332,7 +342,7 @@ class RelicStrategy(BaseParseStrategy):
         :return: The parsed substats
         """
         self._log(
-            f"Relic UID {uid}: Parsing substats. Substats: {names}, Values: {vals}",
+            lambda: f"Relic UID {uid}: Parsing substats. Substats: {names}, Values: {vals}",
             LogLevel.TRACE,
         )
 
@@ -376,121 +386,27 @@ class RelicStrategy(BaseParseStrategy):
 
         return substats
 
-    def _validate_substat(self, substat: dict[str, int | float], rarity: int) -> bool:
-        """Validates the substat
-
-        :param substat: The substat
-        :param rarity: The rarity of the relic
-        :return: True if the substat is valid, False otherwise
-        """
-        try:
-            name = substat[RELIC_SUBSTAT_NAME]
-            val = substat[RELIC_SUBSTAT_VALUE]
-            if name not in SUBSTAT_ROLL_VALS[str(rarity)]:
-                return False
-            if str(val) not in SUBSTAT_ROLL_VALS[str(rarity)][name]:
-                return False
-        except KeyError:
-            return False
-
-        return True
-
-    def _validate_substats(
-        self,
-        substats: list[dict[str, int | float]],
-        rarity: int,
-        level: int,
-        uid: int,
-    ) -> None:
-        """Rudimentary substat validation on number of substats based on rarity and level
-
-        :param substats: The substats
-        :param rarity: The rarity of the relic
-        :param level: The level of the relic
-        :param uid: The relic UID
-        """
-        seen_substats = set()
-
-        # check valid number of substats
-        substats_len = len(substats)
-        min_substats = min(rarity - 2 + int(level / 3), 4)
-        if substats_len < min_substats:
-            self._log(
-                f"Relic UID {uid} has {substats_len} substat(s), but the minimum for rarity {rarity} and level {level} is {min_substats}.",
-                LogLevel.ERROR,
-            )
-            return
-
-        # check valid roll value total
-        min_roll_value = round(min_substats * 0.8, 1)
-        max_roll_value = round(rarity - 1 + int(level / 3), 1)
-        total = 0
-        for substat in substats:
-            if substat[RELIC_SUBSTAT_NAME] in seen_substats:
-                self._log(
-                    f"Relic UID {uid}: More than one substat with key {substat[RELIC_SUBSTAT_NAME]} parsed.",
-                    LogLevel.ERROR,
-                )
-                return
-            if not self._validate_substat(substat, rarity):
-                self._log(
-                    f'Relic UID {uid}: Substat {substat[RELIC_SUBSTAT_NAME]} has illegal value "{substat[RELIC_SUBSTAT_VALUE]}" for rarity {rarity}.',
-                    LogLevel.ERROR,
-                )
-                return
-
-            roll_value = SUBSTAT_ROLL_VALS[str(rarity)][
-                str(substat[RELIC_SUBSTAT_NAME])
-            ][str(substat[RELIC_SUBSTAT_VALUE])]
-            if isinstance(roll_value, list):
-                # assume minimum
-                roll_value = roll_value[0]
-            total += roll_value
-
-        total = round(total, 1)
-        if total < min_roll_value:
-            self._log(
-                f"Relic UID {uid} has a roll value of {total}, but the minimum for rarity {rarity} and level {level} is {min_roll_value}.",
-                LogLevel.ERROR,
-            )
-        elif total > max_roll_value:
-            self._log(
-                f"Relic UID {uid} has a roll value of {total}, but the maximum for rarity {rarity} and level {level} is {max_roll_value}.",
-                LogLevel.ERROR,
-            )
-
     def _sort_substats(self, substats: list[dict[str, int | float]], uid: int) -> None:
         """Sorts the substats
 
         :param substats: The substats
         :param uid: The relic UID
         """
-        SORT_ORDER = [
-            "HP",
-            "ATK",
-            "DEF",
-            "HP_",
-            "ATK_",
-            "DEF_",
-            "SPD",
-            "CRIT Rate_",
-            "CRIT DMG_",
-            "Effect Hit Rate_",
-            "Effect RES_",
-            "Break Effect_",
-        ]
         original = substats.copy()
-        substats.sort(key=lambda x: SORT_ORDER.index(str(x[RELIC_SUBSTAT_NAME])))
+        substats.sort(
+            key=lambda x: RELIC_SUBSTAT_ORDER.index(str(x[RELIC_SUBSTAT_NAME]))
+        )
         if original != substats:
             self._log(
                 f"Relic UID {uid}: Newly upgraded relic detected. Substats have been sorted.",
             )
 
-    def _log(self, msg: str, level: LogLevel = LogLevel.INFO) -> None:
+    def _log(
+        self, msg: str | Callable[[], str], level: LogLevel = LogLevel.INFO
+    ) -> None:
         """Logs a message
 
-        :param msg: The message to log
+        :param msg: The message to log, or a function building it
         :param level: The log level
         """
-        if self._debug or level in [LogLevel.INFO, LogLevel.WARNING, LogLevel.ERROR]:
-            self._log_signal.emit((msg, level))
+        self._log_sink.log(msg, level)
@@ -0,0 +1,119 @@
+import threading
+from abc import ABC, abstractmethod
+
+from models.const import (
+    LC_ID,
+    LC_NAME,
+    LC_RARITY,
+    RELIC_NAME,
+    RELIC_SET,
+    RELIC_SET_ID,
+    RELIC_SLOT,
+)
+from models.game_data import GameData
+
+
+class NameResolver(ABC):
+    """NameResolver class resolves OCR'd names into game data records
+
+    Each distinct OCR string is fuzzy matched once and the record is kept, so
+    the filter check and the parse of an item, and every item with the same
+    name, share one match. One instance is shared by all parse threads of a
+    scan. The records must not be modified.
+    """
+
+    def __init__(self, game_data: GameData) -> None:
+        """Constructor
+
+        :param game_data: The GameData class instance
+        """
+        self._game_data = game_data
+        self._lock = threading.Lock()
+        self._matches = {}
+
+    def resolve(self, text: str) -> dict:
+        """Resolve an OCR'd name
+
+        :param text: The OCR'd name, or a name that is already resolved
+        :return: The record, empty if nothing matched
+        """
+        return self.match(text)[0]
+
+    def match(self, text: str) -> tuple[dict, int]:
+        """Resolve an OCR'd name, with how far it was from the matched name
+
+        :param text: The OCR'd name, or a name that is already resolved
+        :return: The record, empty if nothing matched, and the edit distance
+            from the name
+        """
+        text = text.strip()
+        with self._lock:
+            match = self._matches.get(text)
+            if match is None:
+                match = self._matches[text] = self._resolve(text)
+            return match
+
+    @abstractmethod
+    def _resolve(self, text: str) -> tuple[dict, int]:
+        """Match an OCR'd name and build its record
+
+        :param text: The stripped OCR'd name
+        :return: The record, empty if nothing matched, and the edit distance
+            from the name
+        """
+        pass
+
+
+class LightConeResolver(NameResolver):
+    """LightConeResolver class resolves OCR'd light cone names into their id,
+    name and rarity
+    """
+
+    def _resolve(self, text: str) -> tuple[dict, int]:
+        """Match an OCR'd light cone name and build its record
+
+        :param text: The stripped OCR'd name
+        :return: The id, name and rarity, empty if nothing matched, and the
+            edit distance from the name
+        """
+        name, dist = self._game_data.get_closest_light_cone_name(text)
+        if not name:
+            return {}, dist
+
+        metadata = self._game_data.get_light_cone_meta_data(name)
+        # the record is also stored under its name, so parsing a name that
+        # was resolved in the filter check is a plain lookup
+        record = {
+            LC_ID: str(metadata[LC_ID]),
+            LC_NAME: name,
+            LC_RARITY: metadata[LC_RARITY],
+        }
+        self._matches[name] = (record, 0)
+        return record, dist
+
+
+class RelicResolver(NameResolver):
+    """RelicResolver class resolves OCR'd relic piece names into their piece
+    name, set id, set and slot
+    """
+
+    def _resolve(self, text: str) -> tuple[dict, int]:
+        """Match an OCR'd relic piece name and build its record
+
+        :param text: The stripped OCR'd name
+        :return: The piece name, set id, set and slot, empty if nothing
+            matched, and the edit distance from the name
+        """
+        name, dist = self._game_data.get_closest_relic_name(text)
+        if not name:
+            return {}, dist
+
+        metadata = self._game_data.get_relic_meta_data(name)
+        record = {
+            RELIC_NAME: name,
+            RELIC_SET_ID: str(metadata[RELIC_SET_ID]),
+            RELIC_SET: metadata[RELIC_SET],
+            RELIC_SLOT: metadata[RELIC_SLOT],
+        }
+        self._matches[name] = (record, 0)
+        return record, dist
@@ -0,0 +1,270 @@
+from functools import cache
+
+import numpy as np
+
+from models.const import (
+    RELIC_LEVEL,
+    RELIC_RARITY,
+    RELIC_SUBSTAT_NAME,
+    RELIC_SUBSTAT_ORDER,
+    RELIC_SUBSTAT_VALUE,
+    RELIC_SUBSTATS,
+)
+from models.substat_vals import SUBSTAT_ROLL_VALS
+
+MAX_SUBSTATS = 4
+MAX_RARITY = 5
+
+# Substat values have at most one decimal place, so they are stored as tenths
+VALUE_SCALE = 10
+
+EMPTY_STAT = -1
+UNKNOWN_STAT = -2
+
+# Stored for a value with more decimal places than VALUE_SCALE, so a misread
+# such as 3.24 is illegal instead of rounding onto the legal 3.2
+OFF_GRID_VALUE = -1
+
+RELIC_TABLE_DTYPE = np.dtype(
+    [
+        ("rarity", np.int8),
+        ("level", np.int8),
+        ("count", np.int8),
+        ("stat", np.int8, (MAX_SUBSTATS,)),
+        ("value", np.int32, (MAX_SUBSTATS,)),
+    ]
+)
+
+_STAT_INDEX = {k: i for i, k in enumerate(RELIC_SUBSTAT_ORDER)}
+
+
+@cache
+def _get_roll_table() -> np.ndarray:
+    """Build the numeric roll value lookup table from SUBSTAT_ROLL_VALS
+
+    The table is indexed by [rarity, stat index, value in tenths] and holds the
+    roll value of that substat value, or NaN if the value is illegal. List-valued
+    entries (SPD) resolve to their minimum.
+
+    :return: The roll value lookup table
+    """
+    max_value = 0
+    for stats in SUBSTAT_ROLL_VALS.values():
+        for vals in stats.values():
+            max_value = max(max_value, *(_to_tenths(float(v)) for v in vals))
+
+    table = np.full((MAX_RARITY + 1, len(RELIC_SUBSTAT_ORDER), max_value + 1), np.nan)
+    for rarity, stats in SUBSTAT_ROLL_VALS.items():
+        for stat, vals in stats.items():
+            for val, roll_value in vals.items():
+                if isinstance(roll_value, list):
+                    # assume minimum
+                    roll_value = roll_value[0]
+                table[int(rarity), _STAT_INDEX[stat], _to_tenths(float(val))] = (
+                    roll_value
+                )
+
+    table.setflags(write=False)
+    return table
+
+
+def _to_tenths(val: int | float) -> int:
+    """Convert a substat value to tenths
+
+    :param val: The substat value
+    :return: The value in tenths
+    """
+    return int(round(val * VALUE_SCALE))
+
+
+def _to_table_value(val: int | float) -> int:
+    """Convert a parsed substat value to tenths, keeping the precision it was
+    parsed with
+
+    :param val: The substat value
+    :return: The value in tenths, or OFF_GRID_VALUE if it has more decimal
+        places than VALUE_SCALE
+    """
+    if round(val, 1) != val:
+        return OFF_GRID_VALUE
+    return _to_tenths(val)
+
+
+def build_relic_table(relics: list[dict]) -> np.ndarray:
+    """Build a columnar relic table from parsed relics
+
+    :param relics: The parsed relics
+    :return: The relic table with one row per relic
+    """
+    n = len(relics)
+    stats = [[EMPTY_STAT] * MAX_SUBSTATS for _ in range(n)]
+    values = [[0] * MAX_SUBSTATS for _ in range(n)]
+    for i, relic in enumerate(relics):
+        for j, substat in enumerate(relic[RELIC_SUBSTATS][:MAX_SUBSTATS]):
+            stats[i][j] = _STAT_INDEX.get(
+                str(substat[RELIC_SUBSTAT_NAME]), UNKNOWN_STAT
+            )
+            values[i][j] = _to_table_value(substat[RELIC_SUBSTAT_VALUE])
+
+    table = np.empty(n, dtype=RELIC_TABLE_DTYPE)
+    table["rarity"] = [relic[RELIC_RARITY] for relic in relics]
+    table["level"] = [relic[RELIC_LEVEL] for relic in relics]
+    table["count"] = [len(relic[RELIC_SUBSTATS]) for relic in relics]
+    # reshape so an empty list still has the substat dimension
+    table["stat"] = np.reshape(stats, (n, MAX_SUBSTATS))
+    table["value"] = np.reshape(values, (n, MAX_SUBSTATS))
+
+    return table
+
+
+class RelicValidator:
+    """RelicValidator class for validating and scoring relic substats in bulk"""
+
+    def __init__(self) -> None:
+        """Constructor"""
+        self._roll_table = _get_roll_table()
+
+    def roll_values(self, table: np.ndarray) -> np.ndarray:
+        """Look up the roll value of every substat in the table
+
+        :param table: The relic table
+        :return: A (relics, 4) array of roll values, NaN for empty or illegal substats
+        """
+        rarity = table["rarity"].astype(np.intp)
+        stat = table["stat"].astype(np.intp)
+        value = table["value"].astype(np.intp)
+
+        max_value = self._roll_table.shape[2] - 1
+        lookup_ok = (
+            (stat >= 0)
+            & (value >= 0)
+            & (value <= max_value)
+            & ((rarity >= 0) & (rarity <= MAX_RARITY))[:, None]
+        )
+
+        rv = self._roll_table[
+            np.clip(rarity, 0, MAX_RARITY)[:, None],
+            np.clip(stat, 0, None),
+            np.clip(value, 0, max_value),
+        ]
+        return np.where(lookup_ok, rv, np.nan)
+
+    def validate(self, table: np.ndarray, relics: list[dict]) -> list[tuple[int, str]]:
+        """Rudimentary substat validation on legal values, duplicate keys, number
+        of substats and total roll value based on rarity and level
+
+        :param table: The relic table built from the relics
+        :param relics: The parsed relics
+        :return: The index of each invalid relic and its error message
+        """
+        n = len(table)
+        if n == 0:
+            return []
+
+        rarity = table["rarity"].astype(np.int32)
+        level = table["level"].astype(np.int32)
+        count = table["count"].astype(np.int32)
+        stat = table["stat"]
+
+        present = np.arange(MAX_SUBSTATS) < np.minimum(count, MAX_SUBSTATS)[:, None]
+        rv = self.roll_values(table)
+
+        # check valid number of substats
+        min_substats = np.minimum(rarity - 2 + level // 3, MAX_SUBSTATS)
+        too_few = count < min_substats
+        too_many = count > MAX_SUBSTATS
+
+        # check duplicate keys and illegal values
+        same = (
+            (stat[:, :, None] == stat[:, None, :])
+            & present[:, :, None]
+            & present[:, None, :]
+        )
+        duplicate = (same & np.tri(MAX_SUBSTATS, k=-1, dtype=bool)).any(axis=2)
+        illegal = present & np.isnan(rv)
+        bad = duplicate | illegal
+        has_bad = bad.any(axis=1)
+        first_bad = bad.argmax(axis=1)
+
+        # check valid roll value total
+        total = np.round(np.where(present, np.nan_to_num(rv), 0).sum(axis=1), 1)
+        min_roll_value = np.round(min_substats * 0.8, 1)
+        max_roll_value = rarity - 1 + level // 3
+        too_low = total < min_roll_value
+        too_high = total > max_roll_value
+
+        errors = []
+        failed = too_few | too_many | has_bad | too_low | too_high
+        for i in np.flatnonzero(failed):
+            r, lv = int(rarity[i]), int(level[i])
+            uid = str(relics[i]["_uid"]).split("_")[-1]
+            if too_few[i]:
+                msg = f"Relic UID {uid} has {count[i]} substat(s), but the minimum for rarity {r} and level {lv} is {min_substats[i]}."
+            elif too_many[i]:
+                msg = f"Relic UID {uid} has {count[i]} substats, but the maximum is {MAX_SUBSTATS}."
+            elif has_bad[i]:
+                substat = relics[i][RELIC_SUBSTATS][first_bad[i]]
+                if duplicate[i, first_bad[i]]:
+                    msg = f"Relic UID {uid}: More than one substat with key {substat[RELIC_SUBSTAT_NAME]} parsed."
+                else:
+                    msg = f'Relic UID {uid}: Substat {substat[RELIC_SUBSTAT_NAME]} has illegal value "{substat[RELIC_SUBSTAT_VALUE]}" for rarity {r}.'
+            elif too_low[i]:
+                msg = f"Relic UID {uid} has a roll value of {total[i]}, but the minimum for rarity {r} and level {lv} is {min_roll_value[i]}."
+            else:
+                msg = f"Relic UID {uid} has a roll value of {total[i]}, but the maximum for rarity {r} and level {lv} is {max_roll_value[i]}."
+            errors.append((int(i), msg))
+
+        return errors
+
+    def score(self, table: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Compute roll counts and quality scores for every relic
+
+        A substat with roll value v took between ceil(v) and floor(v / 0.8)
+        rolls. A relic starts with rarity - 2 or rarity - 1 substats and every
+        third level adds a roll, so its total rolls are one of those counts plus
+        level // 3, and only a count that gives the number of substats it has
+        and fits the roll values is kept. If both initial counts fit, e.g. a
+        level 15 five star relic with a roll value between 7.2 and 8.0, the one
+        whose average roll is closest to the expected 0.9 is taken, and the
+        larger one on a tie. The quality of a relic is its total roll value over
+        its total rolls, i.e. the average roll in the range [0.8, 1.0]. Relics
+        with illegal substats, or roll values no roll count fits, get no score.
+
+        :param table: The relic table
+        :return: The roll counts and quality scores, -1 and NaN where unknown
+        """
+        count = table["count"].astype(np.int32)
+        present = np.arange(MAX_SUBSTATS) < np.minimum(count, MAX_SUBSTATS)[:, None]
+        rv = self.roll_values(table)
+        legal = ~(present & np.isnan(rv)).any(axis=1) & present.any(axis=1)
+
+        rv = np.where(present, np.nan_to_num(rv), 0)
+        tenths = np.round(rv * VALUE_SCALE).astype(np.int32)
+        min_rolls = (-(-tenths // VALUE_SCALE)).sum(axis=1)
+        max_rolls = (tenths // 8).sum(axis=1)
+        total = tenths.sum(axis=1) / VALUE_SCALE
+
+        rarity = table["rarity"].astype(np.int32)
+        upgrades = table["level"].astype(np.int32) // 3
+        rolls = np.full(len(table), -1, dtype=np.int32)
+        best = np.full(len(table), np.inf)
+        # the larger initial count first, so it is kept on a tie
+        for initial in (rarity - 1, rarity - 2):
+            candidate = initial + upgrades
+            fits = (
+                (initial >= 0)
+                & (np.minimum(candidate, MAX_SUBSTATS) == count)
+                & (min_rolls <= candidate)
+                & (candidate <= max_rolls)
+            )
+            with np.errstate(invalid="ignore", divide="ignore"):
+                distance = np.abs(total / candidate - 0.9)
+            better = fits & (distance < best - 1e-9)
+            rolls = np.where(better, candidate, rolls)
+            best = np.where(better, distance, best)
+
+        known = legal & (rolls > 0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            quality = np.round(total / rolls, 3)
+
+        return np.where(known, rolls, -1), np.where(known, quality, np.nan)
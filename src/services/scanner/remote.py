@@ -0,0 +1,319 @@
+import http.client
+import json
+import math
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Callable
+
+from enums.increment_type import IncrementType
+from enums.log_level import LogLevel
+from models.const import RELIC_LOCATION
+from models.scan_session import ScanSession
+from services.scanner.parsers.parse_strategy import BaseParseStrategy
+from services.worker.ocr_worker import DEFAULT_WORKER_PORT, HEALTH_PATH, PARSE_PATH
+from utils.crop_bundle import encode_bundle
+from utils.log_sink import LogSink
+from utils.progress import ScanProgress
+
+# Time a worker may take to answer a health and a parse request
+HEALTH_TIMEOUT_SECONDS = 2
+PARSE_TIMEOUT_SECONDS = 30
+
+# Workers an item is sent to before it is parsed on this machine
+MAX_REMOTE_ATTEMPTS = 3
+
+# Time a worker that failed is skipped before items are sent to it again
+WORKER_BACKOFF_SECONDS = 10
+
+# Progress counter a parsed item increments, like the strategies do locally
+SUCCESS_TYPES = {
+    IncrementType.LIGHT_CONE_ADD: IncrementType.LIGHT_CONE_SUCCESS,
+    IncrementType.RELIC_ADD: IncrementType.RELIC_SUCCESS,
+}
+
+
+class RemoteParseExecutor:
+    """RemoteParseExecutor class sends the inventory items of a scan to OCR
+    workers on other machines
+
+    Each item is sent as one bundle of its crops to the worker with the fewest
+    requests in flight per slot. If a worker fails, the item is sent to another
+    one, and the failed worker is skipped for WORKER_BACKOFF_SECONDS. Once
+    MAX_REMOTE_ATTEMPTS workers failed, or none is left, the caller parses the
+    item locally. The log records, progress and session updates of a remote
+    parse are applied here, like a local parse would.
+    """
+
+    def __init__(
+        self,
+        addresses: list[str],
+        version: str,
+        log_sink: LogSink,
+        progress: ScanProgress,
+        session: ScanSession,
+        debug: bool = False,
+    ) -> None:
+        """Constructor
+
+        :param addresses: The host:port of each worker, the port defaulting to
+            DEFAULT_WORKER_PORT
+        :param version: The database version, workers must have the same
+        :param log_sink: The log sink
+        :param progress: The progress counters
+        :param session: The scan session
+        :param debug: Whether workers send DEBUG and TRACE records, defaults to
+            False
+        """
+        self._workers = [_RemoteWorker(address) for address in addresses]
+        self._version = version
+        self._log_sink = log_sink
+        self._progress = progress
+        self._session = session
+        self._debug = debug
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._executor = None
+        self._fallbacks = 0
+
+    @property
+    def available(self) -> bool:
+        """Whether items are sent to workers"""
+        return self._executor is not None
+
+    def connect(self) -> list[str]:
+        """Ask each worker for its database version and slots, and start a
+        thread per slot of the workers that can parse this scan
+
+        :return: The addresses of those workers
+        """
+        connected = []
+        for worker in self._workers:
+            try:
+                status, health = self._request(
+                    worker, "GET", HEALTH_PATH, None, HEALTH_TIMEOUT_SECONDS
+                )
+            except (OSError, http.client.HTTPException, ValueError) as e:
+                self._log(f"OCR worker {worker.address} is unreachable: {e}")
+                worker.retry_at = math.inf
+                continue
+            if status != HTTPStatus.OK or health.get("version") != self._version:
+                self._log(
+                    f"OCR worker {worker.address} has database version "
+                    f"{health.get('version')}, the scanner has {self._version}. "
+                    "Restart the worker to update it."
+                )
+                worker.retry_at = math.inf
+                continue
+            worker.slots = max(1, int(health.get("slots", 1)))
+            connected.append(worker.address)
+
+        slots = sum(w.slots for w in self._workers if w.retry_at == 0)
+        if slots:
+            self._executor = ThreadPoolExecutor(slots, thread_name_prefix="remote")
+        return connected
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """Run a job that sends an item to a worker on a thread of its own
+
+        :param fn: The job, calling parse
+        :param args: Its arguments
+        :return: The future of its result
+        """
+        return self._executor.submit(fn, *args)  # type: ignore
+
+    def parse(
+        self, strategy: BaseParseStrategy, stats_dict: dict, item_id: int
+    ) -> dict | None:
+        """Parse an item on a worker
+
+        :param strategy: The strategy of the item
+        :param stats_dict: The stats dictionary
+        :param item_id: The position of the item in the inventory
+        :return: The parsed item, empty if the worker failed to parse it, or
+            None if no worker answered and it has to be parsed locally
+        """
+        bundle = encode_bundle(
+            {
+                "version": self._version,
+                "kind": strategy.ROI_KEY,
+                "uid": item_id,
+                "debug": self._debug,
+            },
+            stats_dict,
+        )
+
+        tried = set()
+        for _ in range(MAX_REMOTE_ATTEMPTS):
+            worker = self._acquire(tried)
+            if worker is None:
+                break
+            tried.add(worker)
+            try:
+                status, body = self._request(
+                    worker, "POST", PARSE_PATH, bundle, PARSE_TIMEOUT_SECONDS
+                )
+            except (OSError, http.client.HTTPException, ValueError) as e:
+                self._release(worker, e)
+                continue
+            if status != HTTPStatus.OK:
+                self._release(worker, body.get("error", f"HTTP {status}"), status)
+                continue
+            self._release(worker)
+
+            for level, msg in body["logs"]:
+                self._log_sink.log(msg, LogLevel(level))
+            result = body["result"]
+            if result:
+                self._progress.increment(SUCCESS_TYPES[strategy.SCAN_TYPE])
+                # light cones keep the character they are equipped on under the
+                # same key
+                if result.get(RELIC_LOCATION):
+                    self._session.observe_character_id(result[RELIC_LOCATION])
+            return result
+
+        with self._lock:
+            self._fallbacks += 1
+        return None
+
+    def report(self) -> str:
+        """Summarize where the items of the scan were parsed
+
+        :return: The report
+        """
+        with self._lock:
+            parsed = [f"{w.parsed} on {w.address}" for w in self._workers]
+            return ", ".join(parsed + [f"{self._fallbacks} locally"])
+
+    def shutdown(self) -> None:
+        """Stop the threads once every item is sent"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def _acquire(self, tried: set) -> "_RemoteWorker | None":
+        """Pick the least loaded worker that is up
+
+        :param tried: The workers that already failed on the item
+        :return: The worker, its request counted as in flight, or None if none
+            is left
+        """
+        now = time.monotonic()
+        with self._lock:
+            workers = [w for w in self._workers if w.retry_at <= now and w not in tried]
+            if not workers:
+                return None
+            worker = min(workers, key=lambda w: (w.in_flight / w.slots, w.parsed))
+            worker.in_flight += 1
+            return worker
+
+    def _release(
+        self,
+        worker: "_RemoteWorker",
+        error: Exception | str | None = None,
+        status: int | None = None,
+    ) -> None:
+        """Count a request of a worker as answered
+
+        :param worker: The worker
+        :param error: Why the request failed, defaults to None if it did not
+        :param status: The HTTP status of the failed request, defaults to None
+        """
+        with self._lock:
+            worker.in_flight -= 1
+            if error is None:
+                worker.parsed += 1
+                return
+            # a worker on another database version can not parse this scan
+            retry_at = (
+                math.inf
+                if status == HTTPStatus.CONFLICT
+                else time.monotonic() + WORKER_BACKOFF_SECONDS
+            )
+            was_up = worker.retry_at <= time.monotonic()
+            worker.retry_at = max(worker.retry_at, retry_at)
+        if was_up:
+            self._log(
+                f"OCR worker {worker.address} failed: {error}. "
+                + (
+                    "Skipping it for the rest of the scan."
+                    if math.isinf(retry_at)
+                    else f"Retrying it in {WORKER_BACKOFF_SECONDS} seconds."
+                )
+            )
+
+    def _request(
+        self,
+        worker: "_RemoteWorker",
+        method: str,
+        path: str,
+        body: bytes | None,
+        timeout: float,
+    ) -> tuple[int, dict]:
+        """Send a request on the connection of the calling thread to a worker
+
+        :param worker: The worker
+        :param method: The HTTP method
+        :param path: The path
+        :param body: The body, defaults to None
+        :param timeout: The timeout in seconds
+        :raises OSError: Thrown if the worker can not be reached
+        :raises http.client.HTTPException: Thrown if the response is malformed
+        :raises ValueError: Thrown if the response is not JSON
+        :return: The status and the JSON body of the response
+        """
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+        connection = connections.get(worker.address)
+        if connection is None:
+            connection = http.client.HTTPConnection(worker.host, worker.port)
+            connections[worker.address] = connection
+        connection.timeout = timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+        try:
+            connection.request(
+                method,
+                path,
+                body,
+                {"Content-Type": "application/octet-stream"} if body else {},
+            )
+            response = connection.getresponse()
+            return response.status, json.loads(response.read())
+        except Exception:
+            # the connection may be half used, open a new one next time
+            connection.close()
+            del connections[worker.address]
+            raise
+
+    def _log(self, msg: str) -> None:
+        """Logs a warning
+
+        :param msg: The message to log
+        """
+        self._log_sink.log(msg, LogLevel.WARNING)
+
+
+class _RemoteWorker:
+    """_RemoteWorker class holds the address and load of a worker"""
+
+    def __init__(self, address: str) -> None:
+        """Constructor
+
+        :param address: The host:port of the worker, the port defaulting to
+            DEFAULT_WORKER_PORT
+        """
+        self.address = address.strip()
+        host, _, port = self.address.rpartition(":")
+        if not host or not port.isdigit():
+            host, port = self.address, str(DEFAULT_WORKER_PORT)
+            self.address = f"{host}:{port}"
+        self.host = host
+        self.port = int(port)
+        self.slots = 1
+        self.in_flight = 0
+        self.parsed = 0
+        # monotonic time from which items are sent again, inf once the worker
+        # is dropped for the scan
+        self.retry_at = 0.0
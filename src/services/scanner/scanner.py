@@ -1,5 +1,8 @@
 import asyncio
+import os
 import time
+from concurrent.futures import Future
+from typing import Callable
 
 import pyautogui
 import win32gui
@@ -7,42 +10,52 @@ from PIL import Image as PILImage
 from pynput.keyboard import Key
 from PyQt6.QtCore import QObject, QSettings, pyqtSignal
 
-from config.character_scan import CHARACTER_NAV_DATA
 from config.const import (
-    ASCENSION_OFFSET_X,
-    ASCENSION_START,
     ASPECT_16_9,
+    CHARACTER,
+    DATABANK,
     DETAILS_BUTTON,
     EIDOLONS_BUTTON,
     INV_TAB,
+    LIGHT_CONE,
+    RELIC,
     SORT_BUTTON,
-    TRACES,
     TRACES_BUTTON,
 )
 from enums.increment_type import IncrementType
 from enums.log_level import LogLevel
+from enums.ocr_field import OcrField
 from enums.scan_mode import ScanMode
+from enums.traversal_order import TraversalOrder
 from models.const import (
+    ASCENSION_PROBES,
+    CHAR_DETAILS_FINGERPRINT,
     CHAR_FILTERS,
     CHAR_LEVEL,
     CHAR_NAME,
     CHAR_PATH,
     CHAR_TRACES,
+    CHAR_TRACES_HASH,
     CONFIG_CHARACTERS_KEY,
+    CONFIG_CPU_BUDGET,
     CONFIG_DEBUG,
     CONFIG_DEBUG_OUTPUT_LOCATION,
     CONFIG_INCLUDE_UID,
     CONFIG_INVENTORY_KEY,
     CONFIG_NAV_DELAY,
+    CONFIG_OCR_WORKERS,
+    CONFIG_PIN_WORKERS,
     CONFIG_RECENT_RELICS_NUM,
     CONFIG_SCAN_CHARACTERS,
     CONFIG_SCAN_DELAY,
     CONFIG_SCAN_LC,
     CONFIG_SCAN_RELICS,
+    CONFIG_SKIP_UNCHANGED_CHARS,
     EIDOLON_IMAGES,
     FILTERS,
     HSR_SCANNER,
     KEL_Z,
+    KNOWN_CHARACTER,
     LEVEL,
     MIN_LEVEL,
     MIN_RARITY,
@@ -54,19 +67,55 @@ from models.const import (
     TRACES_UNLOCKS,
 )
 from models.game_data import GameData
+from models.scan_session import ScanSession
 from services.scanner.parsers.parse_strategy import BaseParseStrategy
+from services.scanner.relic_validator import RelicValidator, build_relic_table
+from utils.capture import ScreenCapture
+from utils.crop_store import CropStore
 from utils.data import resource_path
+from utils.fingerprint import character_details_key, hash_key, image_hash
+from utils.image_locator import get_image_locator
+from utils.log_sink import LogSink
+from utils.name_index import NameIndex
+from utils.progress import ScanProgress
 from utils.navigation import Navigation
 from utils.ocr import image_to_string, preprocess_char_count_img, preprocess_uid_img
+from utils.result_feed import ResultFeed
+from utils.roi import DATABANK_BUTTON_SIZE
 from utils.screenshot import Screenshot
 from utils.window import bring_window_to_foreground
 
 from .parsers.character_parser import CharacterParser
 from .parsers.light_cone_strategy import LightConeStrategy
 from .parsers.relic_strategy import RelicStrategy
+from .remote import RemoteParseExecutor
+from .scheduler import WorkerScheduler
+from .traversal import (
+    CHARACTER_SETTLE_SECONDS,
+    TAB_SETTLE_SECONDS,
+    TraversalCostModel,
+    character_tab_order,
+)
 
 SUPPORTED_ASPECT_RATIOS = [ASPECT_16_9]
 
+# Data Bank button matches below this score are not clicked
+DATABANK_CONFIDENCE = 0.6
+
+# Size the stats panel and inventory grid are reduced to when comparing the
+# frames of consecutive items
+FRAME_HASH_SIZE = (96, 96)
+
+# Times a dropped key tap is sent again, and the wait before looking at the
+# frame again, doubled on each look
+MAX_INPUT_RETRIES = 3
+INPUT_RETRY_SECONDS = 0.05
+
+# Time a key tap is given to show the next item before it is taken as dropped,
+# raised to the measured p95 settle time on a slower game. Sending it again
+# before then would skip an item when the first tap was only slow.
+MIN_INPUT_SETTLE_SECONDS = 0.4
+
 
 class InterruptedScanException(Exception):
     """Exception raised when the scan is interrupted"""
@@ -77,15 +126,26 @@ class InterruptedScanException(Exception):
 class HSRScanner(QObject):
     """HSRScanner class is responsible for scanning the game for light cones, relics, and characters"""
 
-    update_signal = pyqtSignal(int)
-    log_signal = pyqtSignal(object)
     complete_signal = pyqtSignal()
 
-    def __init__(self, config: dict, game_data: GameData, scan_mode: int = 0):
+    def __init__(
+        self,
+        config: dict,
+        game_data: GameData,
+        log_sink: LogSink,
+        scan_mode: int = 0,
+        known_characters: list[dict] | None = None,
+    ):
         """Constructor
 
         :param config: The config dict
         :param game_data: The GameData class instance
+        :param log_sink: The log sink
+        :param scan_mode: The scan mode, defaults to 0
+        :param known_characters: The characters of the previous scans, whose
+            skill levels are reused when their traces tab is unchanged, and
+            which are reused whole when their details tab is unchanged if
+            CONFIG_SKIP_UNCHANGED_CHARS is set, defaults to None
         :raises Exception: Thrown if the game is not found
         :raises Exception: Thrown if no scan options are selected
         """
@@ -111,6 +171,41 @@ class HSRScanner(QObject):
         self._config = config
         self._game_data = game_data
         self._scan_mode = scan_mode
+        known_characters = [
+            c for c in known_characters or [] if CHAR_DETAILS_FINGERPRINT in c
+        ]
+        # the details tab does not show eidolons or trace levels, so skipping
+        # the other tabs on it misses those changes and is left to the user
+        self._known_characters = (
+            {c[CHAR_DETAILS_FINGERPRINT]: c for c in known_characters}
+            if config[CONFIG_SKIP_UNCHANGED_CHARS]
+            else {}
+        )
+        self._known_by_name = {c[CHAR_NAME]: c for c in known_characters}
+        self._log_sink = log_sink
+        self._log_sink.set_debug(config[CONFIG_DEBUG])
+        self._progress = ScanProgress()
+        self._session = ScanSession.from_settings(QSettings(KEL_Z, HSR_SCANNER))
+        self._traversal_costs = TraversalCostModel.from_settings(
+            QSettings(KEL_Z, HSR_SCANNER)
+        )
+        self._results = ResultFeed()
+        self._crops = CropStore()
+        self._scheduler = WorkerScheduler(
+            config[CONFIG_CPU_BUDGET], config[CONFIG_PIN_WORKERS]
+        )
+        self._remote = RemoteParseExecutor(
+            config[CONFIG_OCR_WORKERS],
+            str(game_data.version),
+            self._log_sink,
+            self._progress,
+            self._session,
+            config[CONFIG_DEBUG],
+        )
+        self._name_indexes = {
+            kind: NameIndex.for_database(kind, str(game_data.version))
+            for kind in (LIGHT_CONE, RELIC)
+        }
 
         self._nav = Navigation(self._hwnd)
 
@@ -121,30 +216,82 @@ class HSRScanner(QObject):
             )
 
         self._screenshot = Screenshot(
-            self._hwnd,
-            self.log_signal,
+            ScreenCapture(self._hwnd),
+            self._log_sink,
             self._aspect_ratio,
             config[CONFIG_DEBUG],
             config[CONFIG_DEBUG_OUTPUT_LOCATION],
         )
-        self._databank_img = PILImage.open(resource_path("assets/images/databank.png"))
+        self._rois = self._screenshot.rois
+        self._databank_locator = get_image_locator(
+            resource_path("assets/images/databank.png"), DATABANK_BUTTON_SIZE
+        )
 
         self._interrupt_event = asyncio.Event()
 
+    @property
+    def config(self) -> dict:
+        """The config dict of the scan"""
+        return self._config
+
+    @property
+    def scan_mode(self) -> int:
+        """The scan mode of the scan"""
+        return self._scan_mode
+
+    @property
+    def progress(self) -> ScanProgress:
+        """The progress counters of the scan"""
+        return self._progress
+
+    @property
+    def results(self) -> ResultFeed:
+        """The parsed items and validation errors, streamed as they come in"""
+        return self._results
+
+    @property
+    def crops(self) -> CropStore:
+        """The source screenshots of the parsed items, keyed by their _uid"""
+        return self._crops
+
     async def start_scan(self) -> dict:
         """Starts the scan
 
         :raises InterruptedScanException: Thrown if the scan is interrupted
         :return: The scan results
         """
-        self._log("Config: " + str(self._config), LogLevel.DEBUG)
+        try:
+            return await self._scan()
+        finally:
+            self._scheduler.shutdown()
+            self._remote.shutdown()
+
+    async def _scan(self) -> dict:
+        """Scans the selected items, parsing them within the CPU budget until
+        navigation ends
+
+        :raises InterruptedScanException: Thrown if the scan is interrupted
+        :return: The scan results
+        """
+        self._log(lambda: "Config: " + str(self._config), LogLevel.DEBUG)
 
         if not self._is_en:
             self._log(
                 "Non-English game name detected. The scanner only works with English text.",
                 LogLevel.WARNING,
             )
+        if self._config[CONFIG_OCR_WORKERS]:
+            workers = self._remote.connect()
+            if workers:
+                self._log(f"Parsing items on OCR workers {', '.join(workers)}.")
+            else:
+                self._log(
+                    "No OCR worker can parse this scan. Parsing items on this PC.",
+                    LogLevel.WARNING,
+                )
+
         bring_window_to_foreground(self._hwnd)
+        self._scheduler.throttle()
 
         uid = None
         if self._config[CONFIG_INCLUDE_UID] and not self._interrupt_event.is_set():
@@ -169,10 +316,12 @@ class HSRScanner(QObject):
             light_cones = self.scan_inventory(
                 LightConeStrategy(
                     self._game_data,
-                    self.log_signal,
-                    self.update_signal,
+                    self._session,
+                    self._log_sink,
+                    self._progress,
                     self._interrupt_event,
                     self._config[CONFIG_DEBUG],
+                    self._name_indexes[LIGHT_CONE],
                 )
             )
             (
@@ -187,10 +336,12 @@ class HSRScanner(QObject):
             relics = self.scan_inventory(
                 RelicStrategy(
                     self._game_data,
-                    self.log_signal,
-                    self.update_signal,
+                    self._session,
+                    self._log_sink,
+                    self._progress,
                     self._interrupt_event,
                     self._config[CONFIG_DEBUG],
+                    self._name_indexes[RELIC],
                 )
             )
             (
@@ -209,43 +360,54 @@ class HSRScanner(QObject):
                 else None
             )
 
+        self._scheduler.release()
         if self._interrupt_event.is_set():
             await asyncio.gather(*light_cones, *relics, *characters)
+            self._session.save(QSettings(KEL_Z, HSR_SCANNER))
+            self._traversal_costs.save(QSettings(KEL_Z, HSR_SCANNER))
+            self._save_name_indexes()
             return {}
 
         self.complete_signal.emit()
         self._log("Starting OCR process. Please wait...")
 
+        light_cones = [x for x in await asyncio.gather(*light_cones) if x]
+        relics = [x for x in await asyncio.gather(*relics) if x]
+        characters = [x for x in await asyncio.gather(*characters) if x]
+        self._log(f"Timing: {self._scheduler.timing_report()}.")
+        if self._remote.available:
+            self._log(f"Items parsed: {self._remote.report()}.")
+        self._validate_relics(relics)
+        self._session.save(QSettings(KEL_Z, HSR_SCANNER))
+        self._traversal_costs.save(QSettings(KEL_Z, HSR_SCANNER))
+        self._save_name_indexes()
+
         return {
             "source": "HSR-Scanner",
             "build": "v1.4.0",
             "version": 4,
             "metadata": {
                 "uid": int(uid) if uid else None,
-                "trailblazer": (
-                    "Stelle"
-                    if QSettings(KEL_Z, HSR_SCANNER).value("is_stelle", True) == "true"
-                    else "Caelus"
-                ),
+                "trailblazer": self._session.trailblazer,
             },
-            "light_cones": [x for x in await asyncio.gather(*light_cones) if x],
-            "relics": [x for x in await asyncio.gather(*relics) if x],
-            "characters": [x for x in await asyncio.gather(*characters) if x],
+            "light_cones": light_cones,
+            "relics": relics,
+            "characters": characters,
         }
 
     def stop_scan(self) -> None:
         """Stops the scan"""
         self._interrupt_event.set()
 
-    def scan_inventory(self, strategy: BaseParseStrategy) -> set[asyncio.Task]:
+    def scan_inventory(self, strategy: BaseParseStrategy) -> list[asyncio.Future]:
         """Scans the inventory for light cones or relics
 
         :param strategy: The strategy to use
         :raises InterruptedScanException: Thrown if the scan is interrupted
         :raises ValueError: Thrown if the quantity could not be parsed
-        :return: The tasks to await
+        :return: The tasks to await, in inventory order
         """
-        nav_data = strategy.NAV_DATA[self._aspect_ratio]
+        nav_points = self._rois.nav_points[strategy.ROI_KEY]
 
         # Navigate to correct tab from cellphone menu
         self._nav_sleep(1)
@@ -258,7 +420,7 @@ class HSRScanner(QObject):
         max_retry = 5
         retry = 0
         while True:
-            self._nav.move_cursor_to(*nav_data[INV_TAB])
+            self._nav.move_cursor_to_point(nav_points[INV_TAB])
             time.sleep(0.05)
             self._nav.click()
             self._nav_sleep(1.5)
@@ -300,17 +462,30 @@ class HSRScanner(QObject):
 
         if optimal_sort_method != current_sort_method:
             self._log(f"Sorting by {optimal_sort_method} (was {current_sort_method}).")
-            self._nav.move_cursor_to(*nav_data[SORT_BUTTON])
+            self._nav.move_cursor_to_point(nav_points[SORT_BUTTON])
             time.sleep(0.05)
             self._nav.click()
             self._nav_sleep(0.5)
-            self._nav.move_cursor_to(*nav_data[optimal_sort_method])
+            self._nav.move_cursor_to_point(nav_points[optimal_sort_method])
             self._nav.click()
             current_sort_method = optimal_sort_method
             self._nav_sleep(0.5)
 
-        tasks = set()
+        tasks = []
         scanned = 0
+        recent_relics = self._scan_mode == ScanMode.RECENT_RELICS.value
+        self._progress.set_total(
+            strategy.SCAN_TYPE,
+            (
+                min(quantity, self._config[CONFIG_RECENT_RELICS_NUM])
+                if recent_relics
+                else quantity
+            ),
+        )
+
+        prev_frame = None
+        # time of the input that showed the next item
+        tapped = None
 
         def should_stop():
             if self._scan_mode == ScanMode.RECENT_RELICS.value:
@@ -324,8 +499,17 @@ class HSRScanner(QObject):
             quantity_remaining -= 1
 
             # Get stats
-            stats_dict = self._screenshot.screenshot_stats(strategy.SCAN_TYPE)
+            stats_dict, stats_img = self._screenshot.screenshot_stats(
+                strategy.SCAN_TYPE
+            )
             item_id = quantity - quantity_remaining
+            stats_dict, stats_img, prev_frame = self._wait_for_next_item(
+                strategy, stats_dict, stats_img, prev_frame, item_id, tapped
+            )
+            if tapped is not None:
+                self._scheduler.record_settle(time.perf_counter() - tapped)
+            if not recent_relics:
+                self._progress.set_position(strategy.SCAN_TYPE, item_id)
 
             # Check if item satisfies filters
             if FILTERS in self._config:
@@ -340,6 +524,7 @@ class HSRScanner(QObject):
                     and not filter_results[MIN_LEVEL]
                 ):
                     quantity_remaining = 0
+                    self._progress.set_total(strategy.SCAN_TYPE, item_id)
                     self._log(
                         f"Reached minimum level filter (got level {stats_dict[LEVEL]})."
                     )
@@ -350,6 +535,7 @@ class HSRScanner(QObject):
                     and not filter_results[MIN_RARITY]
                 ):
                     quantity_remaining = 0
+                    self._progress.set_total(strategy.SCAN_TYPE, item_id)
                     self._log(
                         f"Reached minimum rarity filter (got rarity {stats_dict[RARITY]})."
                     )
@@ -361,28 +547,114 @@ class HSRScanner(QObject):
                     and filter_results[MIN_RARITY]
                 ):
                     scanned += 1
+                    self._progress.set_position(strategy.SCAN_TYPE, scanned)
                 if not all(filter_results.values()):
                     self._nav.key_tap("d")
+                    tapped = time.perf_counter()
                     self._scan_sleep(0.05)
                     continue
 
-            # Update UI count
-            self.update_signal.emit(strategy.SCAN_TYPE.value)
+            # Update progress
+            self._progress.increment(strategy.SCAN_TYPE)
 
-            task = asyncio.to_thread(strategy.parse, stats_dict, item_id)
-            tasks.add(task)
+            tasks.append(
+                asyncio.wrap_future(
+                    self._submit_item(strategy, stats_dict, item_id, stats_img)
+                )
+            )
 
             # Next item
             self._nav.key_tap("d")
+            tapped = time.perf_counter()
             self._scan_sleep(0.05)
 
+        dropped_inputs = self._progress.dropped_inputs(strategy.SCAN_TYPE)
+        if dropped_inputs:
+            self._log(f"Sent {dropped_inputs} dropped inputs again.", LogLevel.WARNING)
+
         self._nav.key_tap(Key.esc)
         self._nav_sleep(2)
         self._nav.key_tap(Key.esc)
         self._nav_sleep(1)
         return tasks
 
-    def scan_characters(self) -> set[asyncio.Task]:
+    def _wait_for_next_item(
+        self,
+        strategy: BaseParseStrategy,
+        stats_dict: dict,
+        stats_img: PILImage.Image,
+        prev_frame: str | None,
+        item_id: int,
+        tapped: float | None,
+    ) -> tuple[dict, PILImage.Image, str]:
+        """Makes sure the captured item is not the previous item again
+
+        If the frame matches the previous one, the game was either slow to show
+        the next item or dropped the key tap. The frame is captured again with a
+        doubling wait until it changes, and only once the tap had the settle
+        time, the longer of MIN_INPUT_SETTLE_SECONDS and the p95 settle time of
+        the scan, is it sent again. The inventory grid is part of the frame, so
+        identical items next to each other are told apart by the highlighted
+        slot.
+
+        :param strategy: The strategy to use
+        :param stats_dict: The stats dictionary
+        :param stats_img: The screenshot of the stats panel
+        :param prev_frame: The frame hash of the previous item, None for the
+            first item
+        :param item_id: The position of the item in the inventory
+        :param tapped: The time the key was tapped, None for the first item
+        :raises InterruptedScanException: Thrown if the scan is interrupted
+        :return: The stats dictionary, the stats panel and the frame hash of
+            the item
+        """
+        frame = self._frame_hash(stats_img)
+        if frame != prev_frame:
+            return stats_dict, stats_img, frame
+
+        settle = max(MIN_INPUT_SETTLE_SECONDS, self._scheduler.settle_p95() or 0)
+        tapped = tapped or time.perf_counter()
+        for retry in range(MAX_INPUT_RETRIES + 1):
+            if retry:
+                self._log(
+                    f"Item {item_id} still shows the previous item. Sending input again... ({retry}/{MAX_INPUT_RETRIES})",
+                    LogLevel.DEBUG,
+                )
+                self._nav.key_tap("d")
+                tapped = time.perf_counter()
+
+            # look again until the tap had its settle time
+            wait = INPUT_RETRY_SECONDS
+            deadline = tapped + settle
+            while time.perf_counter() < deadline:
+                self._scan_sleep(min(wait, max(0, deadline - time.perf_counter())))
+                wait *= 2
+                stats_dict, stats_img = self._screenshot.screenshot_stats(
+                    strategy.SCAN_TYPE
+                )
+                frame = self._frame_hash(stats_img)
+                if frame != prev_frame:
+                    if retry:
+                        self._progress.record_dropped_input(strategy.SCAN_TYPE)
+                    return stats_dict, stats_img, frame
+
+        self._log(
+            f"Item {item_id} still shows the previous item after {MAX_INPUT_RETRIES} retries. Scanning it anyway.",
+            LogLevel.WARNING,
+        )
+        return stats_dict, stats_img, frame
+
+    def _frame_hash(self, stats_img: PILImage.Image) -> str:
+        """Hashes the stats panel and the inventory grid of the selected item
+
+        :param stats_img: The screenshot of the stats panel
+        :return: The digest
+        """
+        return image_hash(
+            (stats_img, self._screenshot.screenshot_inventory()), FRAME_HASH_SIZE
+        )
+
+    def scan_characters(self) -> set[asyncio.Future]:
         """Scans the characters
 
         :raises InterruptedScanException: Thrown if the scan is interrupted
@@ -391,12 +663,14 @@ class HSRScanner(QObject):
         """
         char_parser = CharacterParser(
             self._game_data,
-            self.log_signal,
-            self.update_signal,
+            self._session,
+            self._log_sink,
+            self._progress,
             self._interrupt_event,
             self._config[CONFIG_DEBUG],
         )
-        nav_data = CHARACTER_NAV_DATA[self._aspect_ratio]
+        # plug in the gamepad early so the game has picked it up before it is used
+        self._nav.connect_gamepad()
 
         # Assume ESC menu is open
         bring_window_to_foreground(self._hwnd)
@@ -409,17 +683,28 @@ class HSRScanner(QObject):
             try:
                 # Locate and click databank button
                 self._log("Locating Data Bank button...", LogLevel.DEBUG)
-                haystack = self._screenshot.screenshot_screen()
-                needle = self._databank_img.resize(
-                    # Scale image to match capture size
-                    (
-                        int(haystack.size[0] * 0.0296875),
-                        int(haystack.size[1] * 0.05625),
-                    )
+                # search the ESC menu first and the whole window only if it moved
+                match = self._databank_locator.locate(
+                    self._screenshot.screenshot_region,
+                    self._rois.geometry,
+                    [self._rois.character_rects[DATABANK], self._rois.window_rect],
+                    DATABANK_CONFIDENCE,
                 )
-                self._nav.move_cursor_to_image(haystack, needle)
+                if match is None or match.confidence < DATABANK_CONFIDENCE:
+                    self._log(
+                        "Failed to locate Data Bank button."
+                        + (
+                            f" Best match scored {match.confidence:.2f}."
+                            if match is not None
+                            else ""
+                        ),
+                        LogLevel.WARNING,
+                    )
+                    raise ValueError
+                self._nav.move_cursor_to_point(match.point)
                 self._log(
-                    f"Data Bank button found at {self._nav.get_mouse_position()}.",
+                    f"Data Bank button found at {self._nav.get_mouse_position()} "
+                    f"with confidence {match.confidence:.2f}.",
                     LogLevel.DEBUG,
                 )
                 time.sleep(0.05)
@@ -487,63 +772,53 @@ class HSRScanner(QObject):
         self._nav.key_tap(self._config[CONFIG_CHARACTERS_KEY])
         self._nav_sleep(1)
 
+        self._progress.set_total(IncrementType.CHARACTER_ADD, character_total)
+
+        workers = os.cpu_count() or 1
+        order = self._traversal_costs.choose(character_total, workers)
+        self._log(
+            lambda: f"Scanning characters in {order.name} order, estimated "
+            f"{self._traversal_costs.estimate(order, character_total, workers):.0f}s.",
+            LogLevel.DEBUG,
+        )
+        if order == TraversalOrder.CHARACTER_MAJOR:
+            tasks = self._scan_characters_by_character(char_parser, character_total)
+        else:
+            tasks = self._scan_characters_by_tab(char_parser, character_total)
+
+        self._nav_sleep(1)
+        self._nav.key_tap(Key.esc)
+        self._nav_sleep(2)
+        self._nav.key_tap(Key.esc)
+        self._nav_sleep(1)
+        return tasks
+
+    def _scan_characters_by_tab(
+        self, char_parser: CharacterParser, character_total: int
+    ) -> set[asyncio.Future]:
+        """Scans the characters one tab at a time: details left to right, traces
+        right to left and eidolons left to right. Each character is parsed as
+        soon as its eidolons are captured.
+
+        :param char_parser: The character parser
+        :param character_total: The number of characters
+        :raises InterruptedScanException: Thrown if the scan is interrupted
+        :return: The parse futures to await
+        """
         tasks = set()
         characters_seen = set()
-
+        unchanged = set()
         res = [{} for _ in range(character_total)]
 
         # Details tab
         i = 0
-        self._nav.move_cursor_to(*nav_data[DETAILS_BUTTON])
-        time.sleep(0.05)
-        self._nav.click()
-        self._nav_sleep(0.5)
-        self._nav.enter_gamepad()
+        self._switch_tab(DETAILS_BUTTON)
 
         prev_trailblazer = False  # https://github.com/kel-z/HSR-Scanner/issues/49#issuecomment-1936613741
-        max_retry = 3
         while i < character_total:
-            # Get name and path
-            character_name = ""
-            retry = 0
-            while retry < max_retry and (
-                not character_name or character_name in characters_seen
-            ):
-                try:
-                    (self._scan_sleep(0.7) if prev_trailblazer else None)
-                    character_name = (
-                        # this has a small delay, can basically be treated as a sleep
-                        self._get_character_name()
-                    )
-                    character_img = self._screenshot.screenshot_character()
-
-                    # Trailblazer is the most prone to errors, need to ensure
-                    # that all the elements have loaded before taking screenshots
-                    # at the cost of small delay on Trailblazer
-                    is_trailblazer = char_parser.is_trailblazer(character_img)
-                    if is_trailblazer:
-                        self._scan_sleep(0.7)
-
-                    path, character_name = map(str.strip, character_name.split("/")[:2])
-                    character_name, path = char_parser.get_closest_name_and_path(
-                        character_name, path, is_trailblazer
-                    )
-
-                    if character_name in characters_seen:
-                        self._log(
-                            f"Parsed duplicate character '{character_name}'. Retrying... ({retry + 1}/{max_retry})",
-                            LogLevel.WARNING,
-                        )
-                        self._scan_sleep(1)
-                except Exception as e:
-                    self._log(
-                        f"Failed to parse character name. Got error: {e}. Retrying... ({retry + 1}/{max_retry})",
-                        LogLevel.WARNING,
-                    )
-                    character_name = ""
-                    self._scan_sleep(1)
-                retry += 1
-
+            character_name, path = self._read_character_name(
+                char_parser, characters_seen, prev_trailblazer
+            )
             if not character_name:
                 self._log(
                     f"Failed to parse character name. Got '{character_name}' instead. Ending scan early.",
@@ -567,29 +842,8 @@ class HSRScanner(QObject):
                 )
             prev_trailblazer = character_name.startswith("Trailblazer")
 
-            # Get ascension by counting ascension stars
-            ascension_pos = nav_data[ASCENSION_START]
-            ascension = 0
-            for _ in range(6):
-                pixel = pyautogui.pixel(
-                    *self._nav.translate_percent_to_coords(*ascension_pos)
-                )
-                dist = sum([(a - b) ** 2 for a, b in zip(pixel, (255, 222, 152))])
-                if dist > 100:
-                    break
-
-                ascension += 1
-                ascension_pos = (
-                    ascension_pos[0] + nav_data[ASCENSION_OFFSET_X],
-                    ascension_pos[1],
-                )
-
-            res[i] = {
-                "name": character_name,
-                "path": path,
-                "ascension": ascension,
-                "level": self._screenshot.screenshot_character_level(),
-            }
+            self._progress.set_position(IncrementType.CHARACTER_ADD, i + 1)
+            res[i] = self._capture_character_details(character_name, path)
 
             # Check if character satisfies level filter
             min_level = self._config[FILTERS][CHAR_FILTERS].get(MIN_LEVEL, 1)
@@ -616,104 +870,545 @@ class HSRScanner(QObject):
                         f"Reached minimum level filter (got level {character_level} for {character_name}).",
                     )
                     res = res[:i]
+                    self._progress.set_total(IncrementType.CHARACTER_ADD, i)
                     i -= 1
                     self._nav.press_gamepad_lb()
                     self._scan_sleep(0.1)
                     break
 
-            # Update UI count
-            self.update_signal.emit(IncrementType.CHARACTER_ADD.value)
+            known = self._find_unchanged_character(char_parser, res[i])
+            if known:
+                tasks.add(self._reuse_character(known))
+                unchanged.add(i)
+
+            # Update progress
+            self._progress.increment(IncrementType.CHARACTER_ADD)
 
             # Don't go right if we are on the last character
             if i == character_total - 1:
                 break
             i += 1
-            self._nav.press_gamepad_rb()
-            self._scan_sleep(0.3)
-        self._nav.exit_gamepad()
+            self._switch_character(DETAILS_BUTTON)
+
+        # The other tabs are only needed for characters that changed
+        changed = [j for j, stats in enumerate(res) if stats and j not in unchanged]
+        if not changed:
+            self._nav.exit_gamepad()
+            return tasks
 
         # Traces tab
-        self._nav.move_cursor_to(*nav_data[TRACES_BUTTON])
-        time.sleep(0.05)
-        self._nav.click()
-        self._nav_sleep(2)
-        self._nav.enter_gamepad()
+        self._switch_tab(TRACES_BUTTON)
         while i >= 0:
-            if not res[i]:
+            if i not in changed:
                 # Don't go left if we are on the first character
                 if i == 0:
                     break
                 i -= 1
-                self._nav.press_gamepad_lb()
-                self._scan_sleep(0.1)
+                if i in changed:
+                    # the tab has to settle before the next capture
+                    self._switch_character(TRACES_BUTTON, forward=False)
+                else:
+                    self._nav.press_gamepad_lb()
+                    self._scan_sleep(0.1)
                 continue
-            path_key = res[i][CHAR_PATH].split(" ")[-1].lower()
-            traces_dict = self._screenshot.screenshot_character_traces(path_key)
-            res[i][CHAR_TRACES] = {
-                TRACES_LEVELS: traces_dict,
-                TRACES_UNLOCKS: {},
-            }
-            for k, v in nav_data[TRACES][path_key].items():
-                # Trace is unlocked if pixel is white
-                pixel = pyautogui.pixel(*self._nav.translate_percent_to_coords(*v))
-                dist = min(
-                    sum([(a - b) ** 2 for a, b in zip(pixel, (255, 255, 255))]),
-                    sum([(a - b) ** 2 for a, b in zip(pixel, (178, 200, 255))]),
-                )
-                res[i][CHAR_TRACES][TRACES_UNLOCKS][k] = dist < 3000
+            res[i][CHAR_TRACES] = self._capture_character_traces(res[i][CHAR_PATH])
 
-            # Don't go left if we are on the first character
-            if i == 0:
+            # Don't go left past the first changed character
+            if i == changed[0]:
                 break
             i -= 1
-            self._nav.press_gamepad_lb()
-            self._scan_sleep(0.6)
-        self._nav.exit_gamepad()
+            self._switch_character(TRACES_BUTTON, forward=False)
 
         # Eidolons tab
-        self._nav.move_cursor_to(*nav_data[EIDOLONS_BUTTON])
-        time.sleep(0.05)
-        self._nav.click()
-        self._nav_sleep(1.5)
-        self._nav.enter_gamepad()
+        self._switch_tab(EIDOLONS_BUTTON)
         while i < len(res):
-            if not res[i]:
+            if i not in changed:
                 i += 1
-                self._nav.press_gamepad_rb()
-                self._scan_sleep(0.1)
+                if i in changed:
+                    self._switch_character(EIDOLONS_BUTTON)
+                else:
+                    self._nav.press_gamepad_rb()
+                    self._scan_sleep(0.1)
                 continue
             res[i][EIDOLON_IMAGES] = self._screenshot.screenshot_character_eidolons()
+
+            # All tabs are captured, parse while the next character loads
+            tasks.add(self._submit_character(char_parser, res[i]))
+
+            # Don't go right past the last changed character
+            if i == changed[-1]:
+                break
             i += 1
-            self._nav.press_gamepad_rb()
-            self._scan_sleep(0.5)
+            self._switch_character(EIDOLONS_BUTTON)
         self._nav.exit_gamepad()
 
-        # Queue character data for parsing
-        for stats_dict in res:
-            if not stats_dict:
-                continue
-            task = asyncio.to_thread(char_parser.parse, stats_dict)
-            tasks.add(task)
+        return tasks
+
+    def _scan_characters_by_character(
+        self, char_parser: CharacterParser, character_total: int
+    ) -> set[asyncio.Future]:
+        """Scans the characters one at a time, capturing every tab of a
+        character before moving on to the next one. Each character is parsed as
+        soon as its last tab is captured, so parsing overlaps the whole scan.
+
+        :param char_parser: The character parser
+        :param character_total: The number of characters
+        :raises InterruptedScanException: Thrown if the scan is interrupted
+        :return: The parse futures to await
+        """
+        tasks = set()
+        characters_seen = set()
+        min_level = self._config[FILTERS][CHAR_FILTERS].get(MIN_LEVEL, 1)
+
+        current_tab = DETAILS_BUTTON
+        self._switch_tab(current_tab)
+
+        i = 0
+        prev_trailblazer = False  # https://github.com/kel-z/HSR-Scanner/issues/49#issuecomment-1936613741
+        while i < character_total:
+            stats_dict = {}
+            known = None
+            duplicate = skipped = False
+            for tab in character_tab_order(current_tab):
+                if tab != current_tab:
+                    self._switch_tab(tab)
+                    current_tab = tab
+
+                if tab == TRACES_BUTTON:
+                    stats_dict[CHAR_TRACES] = self._capture_character_traces(
+                        stats_dict[CHAR_PATH]
+                    )
+                    continue
+                if tab == EIDOLONS_BUTTON:
+                    stats_dict[EIDOLON_IMAGES] = (
+                        self._screenshot.screenshot_character_eidolons()
+                    )
+                    continue
+
+                character_name, path = self._read_character_name(
+                    char_parser, characters_seen, prev_trailblazer
+                )
+                if not character_name:
+                    self._log(
+                        f"Failed to parse character name. Got '{character_name}' instead. Ending scan early.",
+                        LogLevel.ERROR,
+                    )
+                    self._nav.exit_gamepad()
+                    return tasks
+                if character_name in characters_seen:
+                    self._log(
+                        f"Duplicate character '{path} / {character_name}' scanned (Did you move your mouse during the scan?). Moving onto next character...",
+                        LogLevel.ERROR,
+                    )
+                    duplicate = True
+                    break
+                characters_seen.add(character_name)
+                self._log(
+                    f"Character {i + 1}: {path} / {character_name}", LogLevel.TRACE
+                )
+                prev_trailblazer = character_name.startswith("Trailblazer")
+
+                self._progress.set_position(IncrementType.CHARACTER_ADD, i + 1)
+                stats_dict.update(self._capture_character_details(character_name, path))
+
+                # Check if character satisfies level filter
+                if min_level > 1:
+                    stats_dict[CHAR_LEVEL] = character_level = char_parser.get_level(
+                        stats_dict[CHAR_LEVEL]
+                    )
+                    if character_level < min_level and i < 4:
+                        self._log(
+                            f"{character_name} is below minimum level filter (got level {character_level}). Skipping...",
+                            LogLevel.TRACE,
+                        )
+                        skipped = True
+                        break
+                    elif character_level < min_level:
+                        self._log(
+                            f"Reached minimum level filter (got level {character_level} for {character_name}).",
+                        )
+                        self._progress.set_total(IncrementType.CHARACTER_ADD, i)
+                        self._nav.exit_gamepad()
+                        return tasks
+
+                # The other tabs are only needed if the character changed
+                known = self._find_unchanged_character(char_parser, stats_dict)
+                if known:
+                    break
+
+            if not duplicate and not skipped:
+                self._progress.increment(IncrementType.CHARACTER_ADD)
+                if known:
+                    tasks.add(self._reuse_character(known))
+                else:
+                    # All tabs are captured, parse while the next character loads
+                    tasks.add(self._submit_character(char_parser, stats_dict))
+            if not duplicate:
+                # Don't go right if we are on the last character
+                if i == character_total - 1:
+                    break
+                i += 1
+            self._switch_character(current_tab)
+        self._nav.exit_gamepad()
 
-        self._nav_sleep(1)
-        self._nav.key_tap(Key.esc)
-        self._nav_sleep(2)
-        self._nav.key_tap(Key.esc)
-        self._nav_sleep(1)
         return tasks
 
-    def _log(self, msg: str, level: LogLevel = LogLevel.INFO) -> None:
+    def _switch_tab(self, tab: str) -> None:
+        """Opens a character tab and enters the gamepad controls again
+
+        :param tab: DETAILS_BUTTON, TRACES_BUTTON or EIDOLONS_BUTTON
+        :raises InterruptedScanException: Thrown if the scan is interrupted
+        """
+        start = time.perf_counter()
+        self._nav.exit_gamepad()
+        self._nav.move_cursor_to_point(self._rois.nav_points[CHARACTER][tab])
+        time.sleep(0.05)
+        self._nav.click()
+        self._nav_sleep(TAB_SETTLE_SECONDS[tab])
+        self._nav.enter_gamepad()
+        self._traversal_costs.record_tab_switch(time.perf_counter() - start)
+
+    def _switch_character(self, tab: str, forward: bool = True) -> None:
+        """Shows the next or previous character and waits for the tab to settle
+
+        :param tab: The open tab
+        :param forward: Whether to go right, defaults to True
+        :raises InterruptedScanException: Thrown if the scan is interrupted
+        """
+        start = time.perf_counter()
+        if forward:
+            self._nav.press_gamepad_rb()
+        else:
+            self._nav.press_gamepad_lb()
+        self._scan_sleep(CHARACTER_SETTLE_SECONDS[tab])
+        self._traversal_costs.record_character_switch(time.perf_counter() - start)
+
+    def _read_character_name(
+        self,
+        char_parser: CharacterParser,
+        characters_seen: set[str],
+        prev_trailblazer: bool,
+    ) -> tuple[str, str]:
+        """Reads the name and path of the shown character on the details tab,
+        retrying on errors and on names that were already scanned
+
+        :param char_parser: The character parser
+        :param characters_seen: The names of the characters scanned so far
+        :param prev_trailblazer: Whether the previous character was Trailblazer
+        :raises InterruptedScanException: Thrown if the scan is interrupted
+        :return: The name and path, the name being empty if it could not be read
+        """
+        character_name = ""
+        path = ""
+        retry = 0
+        max_retry = 3
+        while retry < max_retry and (
+            not character_name or character_name in characters_seen
+        ):
+            try:
+                (self._scan_sleep(0.7) if prev_trailblazer else None)
+                character_name = (
+                    # this has a small delay, can basically be treated as a sleep
+                    self._get_character_name()
+                )
+                character_img = self._screenshot.screenshot_character()
+
+                # Trailblazer is the most prone to errors, need to ensure
+                # that all the elements have loaded before taking screenshots
+                # at the cost of small delay on Trailblazer
+                is_trailblazer = char_parser.is_trailblazer(character_img)
+                if is_trailblazer:
+                    self._scan_sleep(0.7)
+
+                path, character_name = map(str.strip, character_name.split("/")[:2])
+                character_name, path = char_parser.get_closest_name_and_path(
+                    character_name, path, is_trailblazer
+                )
+
+                if character_name in characters_seen:
+                    self._log(
+                        f"Parsed duplicate character '{character_name}'. Retrying... ({retry + 1}/{max_retry})",
+                        LogLevel.WARNING,
+                    )
+                    self._scan_sleep(1)
+            except Exception as e:
+                self._log(
+                    f"Failed to parse character name. Got error: {e}. Retrying... ({retry + 1}/{max_retry})",
+                    LogLevel.WARNING,
+                )
+                character_name = ""
+                self._scan_sleep(1)
+            retry += 1
+
+        return character_name, path
+
+    def _capture_character_details(self, character_name: str, path: str) -> dict:
+        """Captures the details tab of the shown character
+
+        :param character_name: The name of the character
+        :param path: The path of the character
+        :return: The stats dict with the name, path, ascension and level image
+        """
+        # Get ascension by counting ascension stars
+        probes = [
+            sum(
+                [(a - b) ** 2 for a, b in zip(pyautogui.pixel(*probe), (255, 222, 152))]
+            )
+            <= 100
+            for probe in self._rois.ascension_probes
+        ]
+        ascension = probes.index(False) if False in probes else len(probes)
+
+        return {
+            "name": character_name,
+            "path": path,
+            "ascension": ascension,
+            "level": self._screenshot.screenshot_character_level(),
+            ASCENSION_PROBES: probes,
+        }
+
+    def _capture_character_traces(self, path: str) -> dict:
+        """Captures the traces tab of the shown character
+
+        :param path: The path of the character
+        :return: The trace level images and unlocked traces
+        """
+        path_key = path.split(" ")[-1].lower()
+        traces = {
+            TRACES_LEVELS: self._screenshot.screenshot_character_traces(path_key),
+            TRACES_UNLOCKS: {},
+        }
+        for k, probe in self._rois.trace_unlock_probes[path_key].items():
+            # Trace is unlocked if pixel is white
+            pixel = pyautogui.pixel(*probe)
+            dist = min(
+                sum([(a - b) ** 2 for a, b in zip(pixel, (255, 255, 255))]),
+                sum([(a - b) ** 2 for a, b in zip(pixel, (178, 200, 255))]),
+            )
+            traces[TRACES_UNLOCKS][k] = dist < 3000
+        return traces
+
+    def _submit_character(
+        self, char_parser: CharacterParser, stats_dict: dict
+    ) -> asyncio.Future:
+        """Starts parsing a character on a worker thread right away
+
+        :param char_parser: The character parser
+        :param stats_dict: The stats dictionary with every tab captured
+        :return: The future of the parsed character
+        """
+        traces = stats_dict[CHAR_TRACES]
+        stats_dict[CHAR_TRACES_HASH] = hash_key(
+            (
+                image_hash(traces[TRACES_LEVELS].values()),
+                sorted(traces[TRACES_UNLOCKS].items()),
+            )
+        )
+        known = self._known_by_name.get(stats_dict[CHAR_NAME])
+        if known and known.get(CHAR_TRACES_HASH) == stats_dict[CHAR_TRACES_HASH]:
+            stats_dict[KNOWN_CHARACTER] = known
+
+        return asyncio.wrap_future(
+            self._scheduler.submit(self._parse_character, char_parser, stats_dict)
+        )
+
+    def _find_unchanged_character(
+        self, char_parser: CharacterParser, stats_dict: dict
+    ) -> dict | None:
+        """Finds the character of a previous scan whose details tab matches the
+        captured one
+
+        :param char_parser: The character parser
+        :param stats_dict: The stats dictionary with the details tab captured
+        :return: The known character, None if the character is new or changed,
+            or skipping unchanged characters is off
+        """
+        if (
+            not self._known_characters
+            or stats_dict[CHAR_NAME] not in self._known_by_name
+        ):
+            return None
+
+        stats_dict[CHAR_LEVEL] = char_parser.get_level(stats_dict[CHAR_LEVEL])
+        known = self._known_characters.get(
+            hash_key(
+                character_details_key(
+                    stats_dict[CHAR_NAME],
+                    stats_dict[CHAR_PATH],
+                    stats_dict[CHAR_LEVEL],
+                    stats_dict[ASCENSION_PROBES],
+                )
+            )
+        )
+        if known:
+            self._log(
+                f"{stats_dict[CHAR_NAME]} is unchanged since the last scan. Skipping traces and eidolons...",
+                LogLevel.TRACE,
+            )
+        return known
+
+    def _reuse_character(self, character: dict) -> asyncio.Future:
+        """Streams a character of a previous scan as the parse result
+
+        :param character: The known character
+        :return: The future of the character, already done
+        """
+        result = dict(character)
+        self._results.push(IncrementType.CHARACTER_ADD, result)
+        self._progress.increment(IncrementType.CHARACTER_SUCCESS)
+
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(result)
+        return future
+
+    def _submit_item(
+        self,
+        strategy: BaseParseStrategy,
+        stats_dict: dict,
+        item_id: int,
+        stats_img: PILImage.Image,
+    ) -> Future:
+        """Starts parsing an inventory item on an OCR worker if any is connected,
+        or on a worker thread
+
+        :param strategy: The strategy to use
+        :param stats_dict: The stats dictionary
+        :param item_id: The position of the item in the inventory
+        :param stats_img: The screenshot of the stats panel, kept for review
+        :return: The future of the parsed item
+        """
+        if self._remote.available:
+            return self._remote.submit(
+                self._parse_item_remotely, strategy, stats_dict, item_id, stats_img
+            )
+        return self._scheduler.submit(
+            self._parse_item, strategy, stats_dict, item_id, stats_img
+        )
+
+    def _parse_item(
+        self,
+        strategy: BaseParseStrategy,
+        stats_dict: dict,
+        item_id: int,
+        stats_img: PILImage.Image,
+    ) -> dict:
+        """Parses an inventory item and streams the result. Runs on a worker thread.
+
+        :param strategy: The strategy to use
+        :param stats_dict: The stats dictionary
+        :param item_id: The position of the item in the inventory
+        :param stats_img: The screenshot of the stats panel, kept for review
+        :return: The parsed item
+        """
+        uid = f"{strategy.UID_PREFIX}_{item_id}"
+        self._crops.put(uid, stats_img)
+
+        result = strategy.parse(stats_dict, item_id)
+        self._push_item(uid, strategy, result)
+        return result
+
+    def _parse_item_remotely(
+        self,
+        strategy: BaseParseStrategy,
+        stats_dict: dict,
+        item_id: int,
+        stats_img: PILImage.Image,
+    ) -> dict:
+        """Parses an inventory item on an OCR worker and streams the result,
+        falling back to a worker thread if no OCR worker answers. Runs on a
+        thread of the remote executor.
+
+        :param strategy: The strategy to use
+        :param stats_dict: The stats dictionary
+        :param item_id: The position of the item in the inventory
+        :param stats_img: The screenshot of the stats panel, kept for review
+        :return: The parsed item
+        """
+        if self._interrupt_event.is_set():
+            return {}
+
+        result = self._remote.parse(strategy, stats_dict, item_id)
+        if result is None:
+            return self._scheduler.submit(
+                self._parse_item, strategy, stats_dict, item_id, stats_img
+            ).result()
+
+        uid = f"{strategy.UID_PREFIX}_{item_id}"
+        self._crops.put(uid, stats_img)
+        self._push_item(uid, strategy, result)
+        return result
+
+    def _push_item(self, uid: str, strategy: BaseParseStrategy, result: dict) -> None:
+        """Streams a parsed inventory item, or flags it if parsing failed
+
+        :param uid: The _uid of the item
+        :param strategy: The strategy the item was parsed with
+        :param result: The parsed item, empty if parsing failed
+        """
+        if result:
+            self._results.push(strategy.SCAN_TYPE, result)
+        elif not self._interrupt_event.is_set():
+            self._results.push_error(uid, "Failed to parse.")
+
+    def _parse_character(self, char_parser: CharacterParser, stats_dict: dict) -> dict:
+        """Parses a character and streams the result. Runs on a worker thread.
+
+        :param char_parser: The character parser
+        :param stats_dict: The stats dictionary
+        :return: The parsed character
+        """
+        start = time.perf_counter()
+        result = char_parser.parse(stats_dict)
+        if result:
+            self._traversal_costs.record_parse(time.perf_counter() - start)
+            result[CHAR_DETAILS_FINGERPRINT] = hash_key(
+                character_details_key(
+                    result[CHAR_NAME],
+                    result[CHAR_PATH],
+                    result[CHAR_LEVEL],
+                    stats_dict[ASCENSION_PROBES],
+                )
+            )
+            result[CHAR_TRACES_HASH] = stats_dict[CHAR_TRACES_HASH]
+            self._results.push(IncrementType.CHARACTER_ADD, result)
+        elif not self._interrupt_event.is_set():
+            self._results.push_error(stats_dict[CHAR_NAME], "Failed to parse.")
+        return result
+
+    def _save_name_indexes(self) -> None:
+        """Save the name crops resolved in this scan for later scans"""
+        for index in self._name_indexes.values():
+            try:
+                index.save()
+            except OSError as e:
+                self._log(f"Failed to save the name index: {e}", LogLevel.WARNING)
+
+    def _validate_relics(self, relics: list[dict]) -> None:
+        """Validates the substats of all parsed relics in one pass and adds their roll counts and quality scores
+
+        :param relics: The parsed relics
+        """
+        validator = RelicValidator()
+        table = build_relic_table(relics)
+
+        for i, msg in validator.validate(table, relics):
+            self._log(msg, LogLevel.ERROR)
+            self._results.push_error(relics[i]["_uid"], msg)
+
+        rolls, quality = validator.score(table)
+        for relic, relic_rolls, relic_quality in zip(relics, rolls, quality):
+            relic["_rolls"] = int(relic_rolls) if relic_rolls >= 0 else None
+            relic["_quality"] = float(relic_quality) if relic_rolls >= 0 else None
+
+    def _log(
+        self, msg: str | Callable[[], str], level: LogLevel = LogLevel.INFO
+    ) -> None:
         """Logs a message
 
-        :param msg: The message to log
+        :param msg: The message to log, or a function building it
         :param level: The log level
         """
-        if self._config[CONFIG_DEBUG] or level in [
-            LogLevel.INFO,
-            LogLevel.WARNING,
-            LogLevel.ERROR,
-        ]:
-            self.log_signal.emit((msg, level))
+        self._log_sink.log(msg, level)
 
     def _get_character_name(self) -> str:
         """Gets the character name
@@ -725,6 +1420,7 @@ class HSRScanner(QObject):
             character_name_img,
             "ABCDEFGHIJKLMNOPQRSTUVWXYZ abcdefghijklmnopqrstuvwxyz/7&",
             7,
+            field=OcrField.CHARACTER_NAME,
         )
 
     def _nav_sleep(self, seconds: float) -> None:
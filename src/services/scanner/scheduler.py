@@ -0,0 +1,291 @@
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+from utils.ocr import lower_tesseract_priority
+
+# Share of the logical cores parsing may use while the game is navigated
+DEFAULT_CPU_BUDGET = 0.5
+
+# Time the load of each core is sampled over to find the cores the game uses
+CORE_SAMPLE_SECONDS = 0.5
+
+
+class WorkerScheduler:
+    """WorkerScheduler class runs the parse jobs of a scan within a CPU budget
+
+    While the game is navigated, the game has to render every item the scanner
+    captures, so only a share of the cores run parse jobs. Their threads and the
+    Tesseract processes they start run below normal priority and, optionally,
+    the scanner is kept off the cores the game is busiest on. Once navigation
+    ends, jobs run on every core at normal priority.
+
+    The time each item takes to settle on screen and the parse throughput in
+    both phases are measured, so the effect of the budget is visible in the
+    timing report.
+    """
+
+    def __init__(
+        self, cpu_budget: float = DEFAULT_CPU_BUDGET, pin_workers: bool = False
+    ) -> None:
+        """Constructor
+
+        :param cpu_budget: The share of the logical cores parse jobs may use
+            while the game is navigated, defaults to DEFAULT_CPU_BUDGET
+        :param pin_workers: Whether to keep the scanner off the cores the game
+            is busiest on while it is navigated, defaults to False
+        """
+        self._cpu_count = os.cpu_count() or 1
+        self._throttled_workers = max(
+            1, min(self._cpu_count, int(self._cpu_count * cpu_budget))
+        )
+        self._pin_workers = pin_workers
+        self._executor = ThreadPoolExecutor(self._cpu_count, thread_name_prefix="parse")
+        self._cond = threading.Condition()
+        self._throttled = False
+        self._limit = self._cpu_count
+        self._active = 0
+        self._affinity = None
+
+        self._settle_seconds = []
+        self._parse_seconds = []
+        self._parsed = {True: 0, False: 0}
+        self._throttle_start = None
+        self._release_time = None
+        self._last_parsed = None
+
+    def throttle(self) -> None:
+        """Limit the parse jobs to the CPU budget while the game is navigated"""
+        with self._cond:
+            if self._throttled:
+                return
+            self._throttled = True
+            self._limit = self._throttled_workers
+            self._throttle_start = time.perf_counter()
+        if self._pin_workers and self._throttled_workers < self._cpu_count:
+            cores = _least_busy_cores(self._throttled_workers)
+            if cores:
+                self._affinity = _set_process_affinity(cores)
+
+    def release(self) -> None:
+        """Run the parse jobs on every core once navigation ends"""
+        with self._cond:
+            if not self._throttled:
+                return
+            self._throttled = False
+            self._limit = self._cpu_count
+            self._release_time = time.perf_counter()
+            self._cond.notify_all()
+        if self._affinity is not None:
+            _restore_process_affinity(self._affinity)
+            self._affinity = None
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """Run a parse job on a worker thread
+
+        :param fn: The parse function
+        :param args: Its arguments
+        :return: The future of its result
+        """
+        return self._executor.submit(self._run, fn, args)
+
+    def record_settle(self, seconds: float) -> None:
+        """Add the time an item took to show on screen after its input was sent
+
+        :param seconds: The time in seconds
+        """
+        with self._cond:
+            self._settle_seconds.append(seconds)
+
+    def settle_p95(self) -> float | None:
+        """Get the 95th percentile of the time items took to show on screen
+
+        :return: The time in seconds, None before any item was recorded
+        """
+        with self._cond:
+            if not self._settle_seconds:
+                return None
+            return _p95(sorted(self._settle_seconds))
+
+    def timing_report(self) -> str:
+        """Summarize the settle latency and parse throughput of the scan
+
+        :return: The report
+        """
+        with self._cond:
+            settle = sorted(self._settle_seconds)
+            parse = list(self._parse_seconds)
+            throttled = self._parsed[True]
+            full = self._parsed[False]
+            end = self._release_time or self._last_parsed
+            throttled_seconds = (
+                end - self._throttle_start if end and self._throttle_start else 0
+            )
+            full_seconds = (
+                self._last_parsed - self._release_time
+                if self._last_parsed and self._release_time
+                else 0
+            )
+
+        report = []
+        if settle:
+            report.append(
+                f"settle {statistics.median(settle) * 1000:.0f} ms median, "
+                f"{_p95(settle) * 1000:.0f} ms p95"
+            )
+        if parse:
+            report.append(f"parse {statistics.median(parse) * 1000:.0f} ms median")
+        if throttled_seconds > 0:
+            report.append(
+                f"{throttled / throttled_seconds:.1f} items/s on "
+                f"{self._throttled_workers} of {self._cpu_count} workers while "
+                "navigating"
+            )
+        if full_seconds > 0:
+            report.append(f"{full / full_seconds:.1f} items/s after")
+        return ", ".join(report) or "nothing parsed"
+
+    def shutdown(self) -> None:
+        """Restore the process and stop the worker threads once every job is
+        done"""
+        self.release()
+        self._executor.shutdown(wait=False)
+
+    def _run(self, fn: Callable, args: tuple):
+        """Run a parse job once a worker is free within the budget
+
+        :param fn: The parse function
+        :param args: Its arguments
+        :return: The result
+        """
+        with self._cond:
+            while self._active >= self._limit:
+                self._cond.wait()
+            self._active += 1
+            throttled = self._throttled
+
+        start = time.perf_counter()
+        try:
+            _set_thread_priority(throttled)
+            lower_tesseract_priority(throttled)
+            return fn(*args)
+        finally:
+            end = time.perf_counter()
+            with self._cond:
+                self._active -= 1
+                self._parse_seconds.append(end - start)
+                self._parsed[self._throttled] += 1
+                self._last_parsed = end
+                self._cond.notify()
+
+
+def _p95(values: list[float]) -> float:
+    """Get the 95th percentile of sorted values
+
+    :param values: The values, sorted
+    :return: The 95th percentile
+    """
+    return values[int(0.95 * (len(values) - 1))]
+
+
+def _set_thread_priority(low_priority: bool) -> None:
+    """Set the priority of the calling thread on Windows
+
+    :param low_priority: True for below normal priority, False for normal
+    """
+    try:
+        # imported here so jobs run without pywin32, at normal priority
+        import win32api
+        import win32con
+        import win32process
+    except ImportError:
+        return
+    try:
+        win32process.SetThreadPriority(
+            win32api.GetCurrentThread(),
+            (
+                win32con.THREAD_PRIORITY_BELOW_NORMAL
+                if low_priority
+                else win32con.THREAD_PRIORITY_NORMAL
+            ),
+        )
+    except Exception:
+        # the job runs at the priority the thread has
+        pass
+
+
+def _least_busy_cores(count: int, seconds: float = CORE_SAMPLE_SECONDS) -> list[int]:
+    """Find the cores with the least load. Sampled while the game renders and
+    before parsing starts, the load is mostly the game's.
+
+    :param count: The number of cores
+    :param seconds: The time the load is sampled over, defaults to
+        CORE_SAMPLE_SECONDS
+    :return: The cores, empty if the load could not be sampled
+    """
+    try:
+        import win32pdh
+    except ImportError:
+        return []
+    # affinity masks cover the first 64 cores of the processor group
+    cpu_count = min(os.cpu_count() or 1, 64)
+    try:
+        query = win32pdh.OpenQuery()
+        try:
+            counters = [
+                win32pdh.AddEnglishCounter(query, f"\\Processor({i})\\% Processor Time")
+                for i in range(cpu_count)
+            ]
+            win32pdh.CollectQueryData(query)
+            time.sleep(seconds)
+            win32pdh.CollectQueryData(query)
+            load = [
+                win32pdh.GetFormattedCounterValue(c, win32pdh.PDH_FMT_DOUBLE)[1]
+                for c in counters
+            ]
+        finally:
+            win32pdh.CloseQuery(query)
+    except Exception:
+        return []
+    return sorted(range(cpu_count), key=lambda i: load[i])[:count]
+
+
+def _set_process_affinity(cores: list[int]) -> int | None:
+    """Run the scanner on some cores. Tesseract processes started afterwards
+    inherit the affinity.
+
+    :param cores: The cores
+    :return: The previous affinity mask, None if it could not be set
+    """
+    try:
+        import win32api
+        import win32process
+    except ImportError:
+        return None
+    try:
+        process = win32api.GetCurrentProcess()
+        previous, _ = win32process.GetProcessAffinityMask(process)
+        mask = sum(1 << i for i in cores) & previous
+        if not mask:
+            return None
+        win32process.SetProcessAffinityMask(process, mask)
+        return previous
+    except Exception:
+        return None
+
+
+def _restore_process_affinity(mask: int) -> None:
+    """Run the scanner on the cores it ran on before it was pinned
+
+    :param mask: The affinity mask returned by _set_process_affinity
+    """
+    try:
+        import win32api
+        import win32process
+
+        win32process.SetProcessAffinityMask(win32api.GetCurrentProcess(), mask)
+    except Exception:
+        pass
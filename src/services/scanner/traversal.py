@@ -0,0 +1,210 @@
+import threading
+
+from PyQt6.QtCore import QSettings
+
+from config.const import DETAILS_BUTTON, EIDOLONS_BUTTON, TRACES_BUTTON
+from enums.traversal_order import TraversalOrder
+from models.const import (
+    CHARACTER_PARSE_SECONDS,
+    CHARACTER_SWITCH_SECONDS,
+    TAB_SWITCH_SECONDS,
+)
+
+# The character tabs in the order their data depends on each other: the path
+# read on the details tab selects the trace rects
+CHARACTER_TABS = (DETAILS_BUTTON, TRACES_BUTTON, EIDOLONS_BUTTON)
+
+# Time for a tab to load after clicking it
+TAB_SETTLE_SECONDS = {
+    DETAILS_BUTTON: 0.5,
+    TRACES_BUTTON: 2,
+    EIDOLONS_BUTTON: 1.5,
+}
+
+# Time for a tab to show the next character after pressing RB or LB
+CHARACTER_SETTLE_SECONDS = {
+    DETAILS_BUTTON: 0.3,
+    TRACES_BUTTON: 0.6,
+    EIDOLONS_BUTTON: 0.5,
+}
+
+# Latencies assumed until they are measured, from the fixed sleeps above and
+# the gamepad handover around each tab click
+DEFAULT_TAB_SWITCH_SECONDS = 1.8
+DEFAULT_CHARACTER_SWITCH_SECONDS = 0.55
+DEFAULT_CHARACTER_PARSE_SECONDS = 1.5
+
+# Weight of the newest measurement in the running averages
+SMOOTHING = 0.2
+
+
+def character_tab_order(current: str) -> list[str]:
+    """Get the order to capture the tabs of a character in, starting from the
+    tab that is open when the character is shown
+
+    The open tab is captured first unless it is the traces tab, which needs the
+    path from the details tab.
+
+    :param current: The open tab
+    :return: The tabs in capture order
+    """
+    order = [current] if current != TRACES_BUTTON else []
+    order.extend(tab for tab in CHARACTER_TABS if tab not in order)
+    return order
+
+
+class TraversalCostModel:
+    """TraversalCostModel class estimates the duration of a character scan in
+    each traversal order from measured latencies
+
+    Tab-major clicks each tab once and switches characters three times per
+    character, but only the last pass overlaps parsing. Character-major clicks
+    two or three tabs per character and overlaps parsing with the whole scan.
+    The averages are kept across scans in QSettings.
+    """
+
+    def __init__(
+        self,
+        tab_switch: float = DEFAULT_TAB_SWITCH_SECONDS,
+        character_switch: float = DEFAULT_CHARACTER_SWITCH_SECONDS,
+        parse: float = DEFAULT_CHARACTER_PARSE_SECONDS,
+    ) -> None:
+        """Constructor
+
+        :param tab_switch: The seconds to switch tabs, defaults to
+            DEFAULT_TAB_SWITCH_SECONDS
+        :param character_switch: The seconds to switch characters, defaults to
+            DEFAULT_CHARACTER_SWITCH_SECONDS
+        :param parse: The seconds to parse a character on one worker, defaults
+            to DEFAULT_CHARACTER_PARSE_SECONDS
+        """
+        self._lock = threading.Lock()
+        self._tab_switch = tab_switch
+        self._character_switch = character_switch
+        self._parse = parse
+        self._changed = False
+
+    @classmethod
+    def from_settings(cls, settings: QSettings) -> "TraversalCostModel":
+        """Load the latencies measured in previous scans
+
+        :param settings: The settings
+        :return: The cost model
+        """
+        return cls(
+            settings.value(TAB_SWITCH_SECONDS, DEFAULT_TAB_SWITCH_SECONDS, type=float),
+            settings.value(
+                CHARACTER_SWITCH_SECONDS, DEFAULT_CHARACTER_SWITCH_SECONDS, type=float
+            ),
+            settings.value(
+                CHARACTER_PARSE_SECONDS, DEFAULT_CHARACTER_PARSE_SECONDS, type=float
+            ),
+        )
+
+    def record_tab_switch(self, seconds: float) -> None:
+        """Add a measured tab switch
+
+        :param seconds: The seconds from leaving the gamepad to entering it
+            again on the new tab
+        """
+        with self._lock:
+            self._tab_switch = _smooth(self._tab_switch, seconds)
+            self._changed = True
+
+    def record_character_switch(self, seconds: float) -> None:
+        """Add a measured character switch
+
+        :param seconds: The seconds from pressing RB or LB until the tab settled
+        """
+        with self._lock:
+            self._character_switch = _smooth(self._character_switch, seconds)
+            self._changed = True
+
+    def record_parse(self, seconds: float) -> None:
+        """Add a measured character parse. Called from the parse workers.
+
+        :param seconds: The seconds CharacterParser.parse took
+        """
+        with self._lock:
+            self._parse = _smooth(self._parse, seconds)
+            self._changed = True
+
+    def estimate(
+        self, order: TraversalOrder, characters: int, workers: int = 1
+    ) -> float:
+        """Estimate the seconds from the first tab click until every character
+        is parsed
+
+        :param order: The traversal order
+        :param characters: The number of characters
+        :param workers: The number of characters parsed at once, defaults to 1
+        :return: The estimated seconds
+        """
+        with self._lock:
+            tab, switch, parse = self._tab_switch, self._character_switch, self._parse
+        if characters <= 0:
+            return 0.0
+
+        if order == TraversalOrder.TAB_MAJOR:
+            navigation = len(CHARACTER_TABS) * (tab + (characters - 1) * switch)
+            # parsing starts during the last pass only
+            overlap = (characters - 1) * switch
+        else:
+            clicks = character_major_tab_switches(characters)
+            navigation = clicks * tab + (characters - 1) * switch
+            # parsing starts once the first character has all tabs captured
+            overlap = navigation - len(CHARACTER_TABS) * tab
+
+        return navigation + max(parse, characters * parse / max(workers, 1) - overlap)
+
+    def choose(self, characters: int, workers: int = 1) -> TraversalOrder:
+        """Choose the traversal order with the lowest estimate
+
+        :param characters: The number of characters
+        :param workers: The number of characters parsed at once, defaults to 1
+        :return: The traversal order, tab-major on a tie
+        """
+        return min(
+            (TraversalOrder.TAB_MAJOR, TraversalOrder.CHARACTER_MAJOR),
+            key=lambda order: self.estimate(order, characters, workers),
+        )
+
+    def save(self, settings: QSettings) -> None:
+        """Write the latencies to the settings if any were measured
+
+        :param settings: The settings
+        """
+        with self._lock:
+            if not self._changed:
+                return
+            settings.setValue(TAB_SWITCH_SECONDS, self._tab_switch)
+            settings.setValue(CHARACTER_SWITCH_SECONDS, self._character_switch)
+            settings.setValue(CHARACTER_PARSE_SECONDS, self._parse)
+            self._changed = False
+
+
+def character_major_tab_switches(characters: int) -> int:
+    """Count the tab clicks of a character-major scan, including the first
+    click on the details tab
+
+    :param characters: The number of characters
+    :return: The number of tab clicks
+    """
+    clicks = 1
+    current = DETAILS_BUTTON
+    for _ in range(characters):
+        for tab in character_tab_order(current):
+            if tab != current:
+                clicks += 1
+                current = tab
+    return clicks
+
+
+def _smooth(average: float, seconds: float) -> float:
+    """Update a running average
+
+    :param average: The current average
+    :param seconds: The new measurement
+    :return: The new average
+    """
+    return (1 - SMOOTHING) * average + SMOOTHING * seconds
@@ -0,0 +1,456 @@
+import datetime
+import json
+import os
+import sqlite3
+
+from enums.scan_mode import ScanMode
+from models.const import (
+    CHAR_ID,
+    CHAR_LEVEL,
+    CHAR_NAME,
+    LC_ID,
+    LC_LEVEL,
+    LC_LOCATION,
+    LC_LOCK,
+    LC_NAME,
+    LC_SUPERIMPOSITION,
+    RELIC_DISCARD,
+    RELIC_LEVEL,
+    RELIC_LOCATION,
+    RELIC_LOCK,
+    RELIC_MAINSTAT,
+    RELIC_RARITY,
+    RELIC_SET_ID,
+    RELIC_SLOT,
+)
+from utils.fingerprint import (
+    fingerprint_items,
+    hash_key,
+    light_cone_key,
+    relic_match_key,
+)
+from utils.merge import RelicIndex, RelicMergeResult, merge_relics
+
+STORE_FILE_NAME = "HSRScanData.db"
+
+LIGHT_CONES = "light_cones"
+RELICS = "relics"
+CHARACTERS = "characters"
+CATEGORIES = (LIGHT_CONES, RELICS, CHARACTERS)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    mode INTEGER NOT NULL,
+    source TEXT,
+    build TEXT,
+    version INTEGER,
+    uid INTEGER,
+    trailblazer TEXT,
+    scanned_light_cones INTEGER NOT NULL DEFAULT 0,
+    scanned_relics INTEGER NOT NULL DEFAULT 0,
+    scanned_characters INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS relics (
+    fingerprint TEXT PRIMARY KEY,
+    set_id TEXT NOT NULL,
+    slot TEXT NOT NULL,
+    rarity INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    mainstat TEXT NOT NULL,
+    location TEXT,
+    lock INTEGER,
+    discard INTEGER,
+    data TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    first_scan_id INTEGER NOT NULL REFERENCES scans(id),
+    last_scan_id INTEGER NOT NULL REFERENCES scans(id)
+);
+CREATE INDEX IF NOT EXISTS idx_relics_set ON relics(set_id);
+CREATE INDEX IF NOT EXISTS idx_relics_slot_mainstat ON relics(slot, mainstat);
+CREATE INDEX IF NOT EXISTS idx_relics_location ON relics(location);
+CREATE INDEX IF NOT EXISTS idx_relics_last_scan ON relics(last_scan_id, position);
+
+CREATE TABLE IF NOT EXISTS light_cones (
+    fingerprint TEXT PRIMARY KEY,
+    id TEXT NOT NULL,
+    name TEXT,
+    level INTEGER NOT NULL,
+    superimposition INTEGER NOT NULL,
+    location TEXT,
+    lock INTEGER,
+    data TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    first_scan_id INTEGER NOT NULL REFERENCES scans(id),
+    last_scan_id INTEGER NOT NULL REFERENCES scans(id)
+);
+CREATE INDEX IF NOT EXISTS idx_light_cones_id ON light_cones(id);
+CREATE INDEX IF NOT EXISTS idx_light_cones_location ON light_cones(location);
+CREATE INDEX IF NOT EXISTS idx_light_cones_last_scan ON light_cones(last_scan_id, position);
+
+CREATE TABLE IF NOT EXISTS characters (
+    fingerprint TEXT PRIMARY KEY,
+    name TEXT,
+    level INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    first_scan_id INTEGER NOT NULL REFERENCES scans(id),
+    last_scan_id INTEGER NOT NULL REFERENCES scans(id)
+);
+CREATE INDEX IF NOT EXISTS idx_characters_last_scan ON characters(last_scan_id, position);
+"""
+
+RELIC_UPSERT = """
+INSERT INTO relics (fingerprint, set_id, slot, rarity, level, mainstat, location,
+    lock, discard, data, position, first_scan_id, last_scan_id)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(fingerprint) DO UPDATE SET
+    level = excluded.level,
+    location = excluded.location,
+    lock = excluded.lock,
+    discard = excluded.discard,
+    data = excluded.data,
+    position = excluded.position,
+    last_scan_id = excluded.last_scan_id
+"""
+
+LIGHT_CONE_UPSERT = """
+INSERT INTO light_cones (fingerprint, id, name, level, superimposition, location,
+    lock, data, position, first_scan_id, last_scan_id)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(fingerprint) DO UPDATE SET
+    location = excluded.location,
+    lock = excluded.lock,
+    data = excluded.data,
+    position = excluded.position,
+    last_scan_id = excluded.last_scan_id
+"""
+
+CHARACTER_UPSERT = """
+INSERT INTO characters (fingerprint, name, level, data, position, first_scan_id,
+    last_scan_id)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(fingerprint) DO UPDATE SET
+    name = excluded.name,
+    level = excluded.level,
+    data = excluded.data,
+    position = excluded.position,
+    last_scan_id = excluded.last_scan_id
+"""
+
+RELIC_FILTER_COLUMNS = {"set_id", "slot", "rarity", "mainstat", "location"}
+
+
+class InventoryStore:
+    """InventoryStore class keeps the scanned inventory in a local SQLite database
+
+    Items are upserted on a stable fingerprint, so rescanning an unchanged item
+    only moves its last seen scan. A relic keeps the fingerprint it was first
+    recorded with: it is matched to the current inventory like a recent relics
+    scan is merged, so an upgraded relic updates its row instead of adding one.
+    The current inventory of a category is every item seen since the last
+    normal scan that included that category.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Constructor
+
+        :param path: The path to the database file
+        """
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    @classmethod
+    def in_output_location(cls, output_location: str) -> "InventoryStore":
+        """Open the store kept next to the scan exports
+
+        :param output_location: The output location
+        :return: The store
+        """
+        return cls(os.path.join(output_location, STORE_FILE_NAME))
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self._conn.close()
+
+    def __enter__(self) -> "InventoryStore":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def record_scan(self, data: dict, scan_mode: int, scanned: dict[str, bool]) -> int:
+        """Write a scan result into the store
+
+        :param data: The scan result in the v4 format
+        :param scan_mode: The scan mode
+        :param scanned: Whether each category was scanned, keyed by category
+        :return: The scan id
+        """
+        metadata = data.get("metadata", {})
+        relics = data.get(RELICS, [])
+        # matched before the scan is added, which would become the baseline
+        relic_fingerprints = self._relic_fingerprints(relics)
+        with self._conn:
+            scan_id = self._conn.execute(
+                """
+                INSERT INTO scans (created_at, mode, source, build, version, uid,
+                    trailblazer, scanned_light_cones, scanned_relics,
+                    scanned_characters)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    datetime.datetime.now().isoformat(timespec="seconds"),
+                    scan_mode,
+                    data.get("source"),
+                    data.get("build"),
+                    data.get("version"),
+                    metadata.get("uid"),
+                    metadata.get("trailblazer"),
+                    *(bool(scanned.get(k)) for k in CATEGORIES),
+                ),
+            ).lastrowid
+
+            self._conn.executemany(
+                RELIC_UPSERT,
+                (
+                    (
+                        fingerprint,
+                        str(relic[RELIC_SET_ID]),
+                        relic[RELIC_SLOT],
+                        relic[RELIC_RARITY],
+                        relic[RELIC_LEVEL],
+                        relic[RELIC_MAINSTAT],
+                        relic[RELIC_LOCATION],
+                        relic[RELIC_LOCK],
+                        relic[RELIC_DISCARD],
+                        json.dumps(relic),
+                        i,
+                        scan_id,
+                        scan_id,
+                    )
+                    for i, (fingerprint, relic) in enumerate(
+                        zip(relic_fingerprints, relics)
+                    )
+                ),
+            )
+
+            light_cones = data.get(LIGHT_CONES, [])
+            self._conn.executemany(
+                LIGHT_CONE_UPSERT,
+                (
+                    (
+                        fingerprint,
+                        str(light_cone[LC_ID]),
+                        light_cone[LC_NAME],
+                        light_cone[LC_LEVEL],
+                        light_cone[LC_SUPERIMPOSITION],
+                        light_cone[LC_LOCATION],
+                        light_cone[LC_LOCK],
+                        json.dumps(light_cone),
+                        i,
+                        scan_id,
+                        scan_id,
+                    )
+                    for i, (fingerprint, light_cone) in enumerate(
+                        zip(
+                            fingerprint_items(light_cones, light_cone_key),
+                            light_cones,
+                        )
+                    )
+                ),
+            )
+
+            self._conn.executemany(
+                CHARACTER_UPSERT,
+                (
+                    (
+                        str(character[CHAR_ID]),
+                        character[CHAR_NAME],
+                        character[CHAR_LEVEL],
+                        json.dumps(character),
+                        i,
+                        scan_id,
+                        scan_id,
+                    )
+                    for i, character in enumerate(data.get(CHARACTERS, []))
+                ),
+            )
+
+        return scan_id
+
+    def record_recent_relics(self, data: dict) -> tuple[int, RelicMergeResult]:
+        """Write a recent relics scan into the store and merge it into the
+        current inventory
+
+        :param data: The scan result in the v4 format
+        :return: The scan id and the merge result
+        """
+        res = merge_relics(self.find_relics(), data.get(RELICS, []))
+        scan_id = self.record_scan(data, ScanMode.RECENT_RELICS.value, {RELICS: True})
+        return scan_id, res
+
+    def export(self, scan_id: int | None = None) -> dict:
+        """Generate a v4 export from the store
+
+        :param scan_id: Only export the items seen in this scan, defaults to
+            the current inventory
+        :return: The export
+        """
+        scan = self.get_scan(scan_id)
+        if scan is None:
+            raise ValueError(f"Scan {scan_id} not found.")
+
+        res = {
+            "source": scan["source"],
+            "build": scan["build"],
+            "version": scan["version"],
+            "metadata": {
+                "uid": scan["uid"],
+                "trailblazer": scan["trailblazer"],
+            },
+        }
+        for category in CATEGORIES:
+            if scan_id is None:
+                since, until = self._baseline_scan_id(category), scan["id"]
+            else:
+                since = until = scan_id
+            res[category] = [
+                json.loads(row[0])
+                for row in self._conn.execute(
+                    f"""
+                    SELECT data FROM {category}
+                    WHERE last_scan_id BETWEEN ? AND ?
+                    ORDER BY last_scan_id, position
+                    """,
+                    (since, until),
+                )
+            ]
+
+        return res
+
+    def get_scan(self, scan_id: int | None = None) -> sqlite3.Row | None:
+        """Get a scan
+
+        :param scan_id: The scan id, defaults to the latest scan
+        :return: The scan or None if it does not exist
+        """
+        if scan_id is None:
+            return self._conn.execute(
+                "SELECT * FROM scans ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+        return self._conn.execute(
+            "SELECT * FROM scans WHERE id = ?", (scan_id,)
+        ).fetchone()
+
+    def get_scans(self) -> list[sqlite3.Row]:
+        """Get the scan history
+
+        :return: All scans, oldest first
+        """
+        return self._conn.execute("SELECT * FROM scans ORDER BY id").fetchall()
+
+    def find_relics(self, current_only: bool = True, **filters) -> list[dict]:
+        """Query relics on the indexed columns
+
+        :param current_only: Whether to only include the current inventory,
+            defaults to True
+        :param filters: Column values to match, any of set_id, slot, rarity,
+            mainstat and location
+        :raises ValueError: Thrown if a filter is not an indexed column
+        :return: The matching relics
+        """
+        unknown = set(filters) - RELIC_FILTER_COLUMNS
+        if unknown:
+            raise ValueError(f"Unsupported relic filter(s): {sorted(unknown)}")
+
+        clauses = [f"{k} = ?" for k in filters]
+        params = list(filters.values())
+        if current_only:
+            clauses.append("last_scan_id >= ?")
+            params.append(self._baseline_scan_id(RELICS))
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return [
+            json.loads(row[0])
+            for row in self._conn.execute(
+                f"SELECT data FROM relics {where} ORDER BY last_scan_id, position",
+                params,
+            )
+        ]
+
+    def find_characters(self) -> list[dict]:
+        """Get the characters of the current inventory
+
+        :return: The characters
+        """
+        return [
+            json.loads(row[0])
+            for row in self._conn.execute(
+                """
+                SELECT data FROM characters WHERE last_scan_id >= ?
+                ORDER BY last_scan_id, position
+                """,
+                (self._baseline_scan_id(CHARACTERS),),
+            )
+        ]
+
+    def _relic_fingerprints(self, relics: list[dict]) -> list[str]:
+        """Get the fingerprint each relic of a scan is recorded under
+
+        Relics are matched to the current inventory, exact matches first so an
+        unchanged relic is not taken as the previous version of another one,
+        then upgrades. A matched relic keeps the fingerprint of its row, any
+        other relic gets a new one from its match key.
+
+        :param relics: The relics of the scan
+        :return: The fingerprints in the same order as the relics
+        """
+        rows = self._conn.execute(
+            "SELECT fingerprint, data FROM relics WHERE last_scan_id >= ?",
+            (self._baseline_scan_id(RELICS),),
+        ).fetchall()
+        index = RelicIndex([json.loads(row[1]) for row in rows])
+
+        res = [None] * len(relics)
+        for upgrades in (False, True):
+            for i, relic in enumerate(relics):
+                if res[i] is not None:
+                    continue
+                match = index.pop_match(relic, upgrades)
+                if match is not None:
+                    res[i] = rows[match[0]][0]
+
+        taken = {row[0] for row in self._conn.execute("SELECT fingerprint FROM relics")}
+        for i, relic in enumerate(relics):
+            if res[i] is not None:
+                continue
+            digest = hash_key(relic_match_key(relic))
+            n = 0
+            while f"{digest}-{n}" in taken:
+                n += 1
+            res[i] = f"{digest}-{n}"
+            taken.add(res[i])
+        return res
+
+    def _baseline_scan_id(self, category: str) -> int:
+        """Get the last normal scan that included a category. Items last seen
+        before it are no longer in the inventory.
+
+        :param category: The category
+        :return: The scan id, or 0 if the category was never fully scanned
+        """
+        row = self._conn.execute(
+            f"""
+            SELECT MAX(id) FROM scans
+            WHERE mode = ? AND scanned_{category} = 1
+            """,
+            (ScanMode.NORMAL.value,),
+        ).fetchone()
+        return row[0] or 0
@@ -0,0 +1,247 @@
+import argparse
+import asyncio
+import os
+import queue
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config.const import LIGHT_CONE, RELIC
+from models.game_data import GameData
+from models.scan_session import ScanSession
+from services.scanner.parsers.light_cone_strategy import LightConeStrategy
+from services.scanner.parsers.relic_strategy import RelicStrategy
+from utils.crop_bundle import decode_bundle, encode_json
+from utils.lexicon import Lexicon
+from utils.log_sink import LogSink
+from utils.name_index import NameIndex
+from utils.ocr import use_lexicon
+from utils.progress import ScanProgress
+
+# Port the worker listens on, and scanners connect to when an address has none
+DEFAULT_WORKER_PORT = 8765
+
+# Address the worker listens on by default, this machine only. The worker runs
+# no authentication, so serving other machines is an explicit --host choice.
+DEFAULT_WORKER_HOST = "127.0.0.1"
+
+# Largest bundle accepted, far above the crops of one item
+MAX_BUNDLE_BYTES = 16 * 1024 * 1024
+
+HEALTH_PATH = "/health"
+PARSE_PATH = "/parse"
+
+
+class VersionMismatchError(Exception):
+    """Exception raised when a bundle was captured with another database
+    version than the worker's"""
+
+    pass
+
+
+class OcrWorker:
+    """OcrWorker class parses the inventory items scanners on other machines
+    capture
+
+    It holds one set of parse strategies per slot, so as many items as there
+    are slots are parsed at a time, each with its own log sink whose records
+    are sent back with the result. Names are resolved through the worker's own
+    name indexes, saved like the scanner's.
+    """
+
+    def __init__(self, game_data: GameData, slots: int | None = None) -> None:
+        """Constructor
+
+        :param game_data: The GameData class instance, of the same version as the
+            scanners'
+        :param slots: The number of items parsed at a time, defaults to the
+            number of logical cores
+        """
+        self._version = str(game_data.version)
+        self._slots = slots or os.cpu_count() or 1
+        self._name_indexes = {
+            kind: NameIndex.for_database(kind, self._version)
+            for kind in (LIGHT_CONE, RELIC)
+        }
+        self._contexts = queue.Queue()
+        for _ in range(self._slots):
+            log_sink = LogSink()
+            args = (
+                game_data,
+                ScanSession(),
+                log_sink,
+                ScanProgress(),
+                asyncio.Event(),
+                False,
+            )
+            strategies = {
+                LIGHT_CONE: LightConeStrategy(*args, self._name_indexes[LIGHT_CONE]),
+                RELIC: RelicStrategy(*args, self._name_indexes[RELIC]),
+            }
+            self._contexts.put((strategies, log_sink))
+
+    def health(self) -> dict:
+        """Describe the worker to scanners
+
+        :return: The database version and the number of slots
+        """
+        return {"version": self._version, "slots": self._slots}
+
+    def parse(self, bundle: bytes) -> dict:
+        """Parse the item of a bundle. Blocks until a slot is free.
+
+        :param bundle: The bundle written by the scanner
+        :raises ValueError: Thrown if the bundle is malformed
+        :raises VersionMismatchError: Thrown if the item was captured with
+            another database version
+        :return: The parse result, empty if parsing failed, and the log records
+            of the parse
+        """
+        header, stats_dict = decode_bundle(bundle)
+        if header.get("version") != self._version:
+            raise VersionMismatchError(
+                f"Database version {header.get('version')} does not match the "
+                f"worker's {self._version}."
+            )
+        if header.get("kind") not in (LIGHT_CONE, RELIC):
+            raise ValueError(f"Unknown kind: {header.get('kind')}")
+
+        strategies, log_sink = self._contexts.get()
+        try:
+            log_sink.set_debug(bool(header.get("debug")))
+            result = strategies[header["kind"]].parse(stats_dict, header["uid"])
+            logs = [[level.value, msg] for level, msg in log_sink.take_records()]
+        finally:
+            self._contexts.put((strategies, log_sink))
+        return {"result": result, "logs": logs}
+
+    def save(self) -> None:
+        """Save the name crops resolved so far for later runs"""
+        for index in self._name_indexes.values():
+            try:
+                index.save()
+            except OSError as e:
+                print(f"Failed to save the name index: {e}")
+
+
+class OcrWorkerHandler(BaseHTTPRequestHandler):
+    """OcrWorkerHandler class answers the health and parse requests of
+    scanners. Connections are kept alive between requests."""
+
+    protocol_version = "HTTP/1.1"
+    server: "OcrWorkerServer"
+
+    def do_GET(self) -> None:
+        """Answer a health request"""
+        if self.path != HEALTH_PATH:
+            self._reply(HTTPStatus.NOT_FOUND, {"error": "Not found."})
+            return
+        self._reply(HTTPStatus.OK, self.server.worker.health())
+
+    def do_POST(self) -> None:
+        """Answer a parse request"""
+        length = int(self.headers.get("Content-Length", 0))
+        if self.path != PARSE_PATH or not 0 < length <= MAX_BUNDLE_BYTES:
+            self.close_connection = True
+            self._reply(HTTPStatus.BAD_REQUEST, {"error": "Bad request."})
+            return
+
+        bundle = self.rfile.read(length)
+        try:
+            self._reply(HTTPStatus.OK, self.server.worker.parse(bundle))
+        except VersionMismatchError as e:
+            self._reply(HTTPStatus.CONFLICT, {"error": str(e)})
+        except ValueError as e:
+            self._reply(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+
+    def log_request(self, code: int | str = "-", size: int | str = "-") -> None:
+        """Log failed requests only, a scan sends thousands
+
+        :param code: The status code
+        :param size: The size of the response
+        """
+        if isinstance(code, int) and code < HTTPStatus.BAD_REQUEST:
+            return
+        super().log_request(code, size)
+
+    def _reply(self, status: HTTPStatus, body: dict) -> None:
+        """Send a JSON response
+
+        :param status: The status
+        :param body: The body
+        """
+        data = encode_json(body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class OcrWorkerServer(ThreadingHTTPServer):
+    """OcrWorkerServer class serves an OcrWorker over HTTP"""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], worker: OcrWorker) -> None:
+        """Constructor
+
+        :param address: The host and port to listen on
+        :param worker: The worker
+        """
+        super().__init__(address, OcrWorkerHandler)
+        self.worker = worker
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Parse the relics and light cones a scanner on another machine "
+        "captures. Run from the src directory with python -m "
+        "services.worker.ocr_worker and add host:port to the OCR workers of the "
+        "scanner."
+    )
+    parser.add_argument(
+        "--host",
+        default=DEFAULT_WORKER_HOST,
+        help=f"The address to listen on, defaults to {DEFAULT_WORKER_HOST} for "
+        "this machine only. Pass the LAN address of this machine, or 0.0.0.0 for "
+        "every interface, to serve a scanner on another machine",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_WORKER_PORT,
+        help=f"The port to listen on, defaults to {DEFAULT_WORKER_PORT}",
+    )
+    parser.add_argument(
+        "--slots",
+        type=int,
+        help="The items parsed at a time, defaults to the number of logical cores",
+    )
+    parser.add_argument(
+        "--lexicon",
+        action="store_true",
+        help="Bias OCR towards the game data lexicon, like a scanner with "
+        "the lexicon setting on",
+    )
+    args = parser.parse_args()
+
+    game_data = GameData()
+    if args.lexicon:
+        use_lexicon(Lexicon(game_data))
+    worker = OcrWorker(game_data, args.slots)
+    server = OcrWorkerServer((args.host, args.port), worker)
+    print(
+        f"Parsing for database version {game_data.version} on "
+        f"{args.host}:{args.port} with {worker.health()['slots']} slots."
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        worker.save()
+
+
+if __name__ == "__main__":
+    main()
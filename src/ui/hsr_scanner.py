@@ -13,14 +13,14 @@ class Ui_MainWindow(object):
     def setupUi(self, MainWindow):
         MainWindow.setObjectName("MainWindow")
         MainWindow.setEnabled(True)
-        MainWindow.resize(700, 560)
+        MainWindow.resize(700, 582)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Fixed, QtWidgets.QSizePolicy.Policy.Fixed)
         sizePolicy.setHorizontalStretch(0)
         sizePolicy.setVerticalStretch(0)
         sizePolicy.setHeightForWidth(MainWindow.sizePolicy().hasHeightForWidth())
         MainWindow.setSizePolicy(sizePolicy)
-        MainWindow.setMinimumSize(QtCore.QSize(700, 560))
-        MainWindow.setMaximumSize(QtCore.QSize(700, 560))
+        MainWindow.setMinimumSize(QtCore.QSize(700, 582))
+        MainWindow.setMaximumSize(QtCore.QSize(700, 582))
         MainWindow.setMouseTracking(False)
         self.centralwidget = QtWidgets.QWidget(parent=MainWindow)
         self.centralwidget.setEnabled(True)
@@ -189,7 +189,7 @@ class Ui_MainWindow(object):
         self.spinBoxRelicMinLevel.setObjectName("spinBoxRelicMinLevel")
         self.formLayout_4.setWidget(1, QtWidgets.QFormLayout.ItemRole.FieldRole, self.spinBoxRelicMinLevel)
         self.formLayoutWidget_5 = QtWidgets.QWidget(parent=self.groupBox_2)
-        self.formLayoutWidget_5.setGeometry(QtCore.QRect(290, 20, 126, 71))
+        self.formLayoutWidget_5.setGeometry(QtCore.QRect(290, 20, 126, 85))
         self.formLayoutWidget_5.setObjectName("formLayoutWidget_5")
         self.formLayout_7 = QtWidgets.QFormLayout(self.formLayoutWidget_5)
         self.formLayout_7.setContentsMargins(0, 0, 0, 0)
@@ -207,6 +207,9 @@ class Ui_MainWindow(object):
         self.spinBoxCharacterMinLevel.setProperty("value", 1)
         self.spinBoxCharacterMinLevel.setObjectName("spinBoxCharacterMinLevel")
         self.formLayout_7.setWidget(1, QtWidgets.QFormLayout.ItemRole.FieldRole, self.spinBoxCharacterMinLevel)
+        self.checkBoxSkipUnchangedChars = QtWidgets.QCheckBox(parent=self.formLayoutWidget_5)
+        self.checkBoxSkipUnchangedChars.setObjectName("checkBoxSkipUnchangedChars")
+        self.formLayout_7.setWidget(2, QtWidgets.QFormLayout.ItemRole.SpanningRole, self.checkBoxSkipUnchangedChars)
         self.groupBox_3 = QtWidgets.QGroupBox(parent=self.Scan)
         self.groupBox_3.setGeometry(QtCore.QRect(10, 230, 411, 81))
         self.groupBox_3.setObjectName("groupBox_3")
@@ -259,7 +262,7 @@ class Ui_MainWindow(object):
         self.Advanced.setEnabled(True)
         self.Advanced.setObjectName("Advanced")
         self.formGroupBox_2 = QtWidgets.QGroupBox(parent=self.Advanced)
-        self.formGroupBox_2.setGeometry(QtCore.QRect(10, 10, 171, 111))
+        self.formGroupBox_2.setGeometry(QtCore.QRect(10, 10, 171, 136))
         self.formGroupBox_2.setObjectName("formGroupBox_2")
         self.formLayout_6 = QtWidgets.QFormLayout(self.formGroupBox_2)
         self.formLayout_6.setObjectName("formLayout_6")
@@ -279,10 +282,14 @@ class Ui_MainWindow(object):
         self.spinBoxRecentRelics.setObjectName("spinBoxRecentRelics")
         self.formLayout_9.setWidget(0, QtWidgets.QFormLayout.ItemRole.FieldRole, self.spinBoxRecentRelics)
         self.formLayout_6.setLayout(0, QtWidgets.QFormLayout.ItemRole.SpanningRole, self.formLayout_9)
+        self.checkBoxRecentRelicsMerge = QtWidgets.QCheckBox(parent=self.formGroupBox_2)
+        self.checkBoxRecentRelicsMerge.setChecked(True)
+        self.checkBoxRecentRelicsMerge.setObjectName("checkBoxRecentRelicsMerge")
+        self.formLayout_6.setWidget(2, QtWidgets.QFormLayout.ItemRole.LabelRole, self.checkBoxRecentRelicsMerge)
         self.pushButtonStartScanRecentRelics = QtWidgets.QPushButton(parent=self.formGroupBox_2)
         self.pushButtonStartScanRecentRelics.setEnabled(False)
         self.pushButtonStartScanRecentRelics.setObjectName("pushButtonStartScanRecentRelics")
-        self.formLayout_6.setWidget(2, QtWidgets.QFormLayout.ItemRole.SpanningRole, self.pushButtonStartScanRecentRelics)
+        self.formLayout_6.setWidget(3, QtWidgets.QFormLayout.ItemRole.SpanningRole, self.pushButtonStartScanRecentRelics)
         self.groupBox_10 = QtWidgets.QGroupBox(parent=self.Advanced)
         self.groupBox_10.setGeometry(QtCore.QRect(430, 10, 231, 491))
         self.groupBox_10.setObjectName("groupBox_10")
@@ -326,6 +333,44 @@ class Ui_MainWindow(object):
         self.lineEditInventoryKey.setClearButtonEnabled(False)
         self.lineEditInventoryKey.setObjectName("lineEditInventoryKey")
         self.formLayout_5.setWidget(0, QtWidgets.QFormLayout.ItemRole.FieldRole, self.lineEditInventoryKey)
+        self.groupBox_12 = QtWidgets.QGroupBox(parent=self.Configure)
+        self.groupBox_12.setGeometry(QtCore.QRect(210, 10, 211, 71))
+        self.groupBox_12.setObjectName("groupBox_12")
+        self.formLayoutWidget_6 = QtWidgets.QWidget(parent=self.groupBox_12)
+        self.formLayoutWidget_6.setGeometry(QtCore.QRect(10, 20, 191, 47))
+        self.formLayoutWidget_6.setObjectName("formLayoutWidget_6")
+        self.formLayout_10 = QtWidgets.QFormLayout(self.formLayoutWidget_6)
+        self.formLayout_10.setContentsMargins(0, 0, 0, 0)
+        self.formLayout_10.setObjectName("formLayout_10")
+        self.label_26 = QtWidgets.QLabel(parent=self.formLayoutWidget_6)
+        self.label_26.setObjectName("label_26")
+        self.formLayout_10.setWidget(0, QtWidgets.QFormLayout.ItemRole.LabelRole, self.label_26)
+        self.spinBoxCpuBudget = QtWidgets.QSpinBox(parent=self.formLayoutWidget_6)
+        self.spinBoxCpuBudget.setCorrectionMode(QtWidgets.QAbstractSpinBox.CorrectionMode.CorrectToNearestValue)
+        self.spinBoxCpuBudget.setMinimum(10)
+        self.spinBoxCpuBudget.setMaximum(100)
+        self.spinBoxCpuBudget.setSingleStep(10)
+        self.spinBoxCpuBudget.setProperty("value", 50)
+        self.spinBoxCpuBudget.setObjectName("spinBoxCpuBudget")
+        self.formLayout_10.setWidget(0, QtWidgets.QFormLayout.ItemRole.FieldRole, self.spinBoxCpuBudget)
+        self.checkBoxPinWorkers = QtWidgets.QCheckBox(parent=self.formLayoutWidget_6)
+        self.checkBoxPinWorkers.setObjectName("checkBoxPinWorkers")
+        self.formLayout_10.setWidget(1, QtWidgets.QFormLayout.ItemRole.SpanningRole, self.checkBoxPinWorkers)
+        self.groupBox_13 = QtWidgets.QGroupBox(parent=self.Configure)
+        self.groupBox_13.setGeometry(QtCore.QRect(210, 90, 211, 81))
+        self.groupBox_13.setObjectName("groupBox_13")
+        self.verticalLayoutWidget_3 = QtWidgets.QWidget(parent=self.groupBox_13)
+        self.verticalLayoutWidget_3.setGeometry(QtCore.QRect(10, 20, 191, 55))
+        self.verticalLayoutWidget_3.setObjectName("verticalLayoutWidget_3")
+        self.verticalLayout_5 = QtWidgets.QVBoxLayout(self.verticalLayoutWidget_3)
+        self.verticalLayout_5.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_5.setObjectName("verticalLayout_5")
+        self.label_27 = QtWidgets.QLabel(parent=self.verticalLayoutWidget_3)
+        self.label_27.setObjectName("label_27")
+        self.verticalLayout_5.addWidget(self.label_27)
+        self.lineEditOcrWorkers = QtWidgets.QLineEdit(parent=self.verticalLayoutWidget_3)
+        self.lineEditOcrWorkers.setObjectName("lineEditOcrWorkers")
+        self.verticalLayout_5.addWidget(self.lineEditOcrWorkers)
         self.groupBox_7 = QtWidgets.QGroupBox(parent=self.Configure)
         self.groupBox_7.setGeometry(QtCore.QRect(10, 10, 191, 71))
         self.groupBox_7.setObjectName("groupBox_7")
@@ -342,10 +387,10 @@ class Ui_MainWindow(object):
         self.checkBoxPlaySound.setObjectName("checkBoxPlaySound")
         self.verticalLayout_4.addWidget(self.checkBoxPlaySound)
         self.groupBox_8 = QtWidgets.QGroupBox(parent=self.Configure)
-        self.groupBox_8.setGeometry(QtCore.QRect(10, 280, 201, 71))
+        self.groupBox_8.setGeometry(QtCore.QRect(10, 280, 201, 91))
         self.groupBox_8.setObjectName("groupBox_8")
         self.verticalLayoutWidget = QtWidgets.QWidget(parent=self.groupBox_8)
-        self.verticalLayoutWidget.setGeometry(QtCore.QRect(10, 20, 216, 55))
+        self.verticalLayoutWidget.setGeometry(QtCore.QRect(10, 20, 216, 75))
         self.verticalLayoutWidget.setObjectName("verticalLayoutWidget")
         self.verticalLayout_2 = QtWidgets.QVBoxLayout(self.verticalLayoutWidget)
         self.verticalLayout_2.setContentsMargins(0, 0, 0, 0)
@@ -356,6 +401,9 @@ class Ui_MainWindow(object):
         self.checkBoxSroFormat = QtWidgets.QCheckBox(parent=self.verticalLayoutWidget)
         self.checkBoxSroFormat.setObjectName("checkBoxSroFormat")
         self.verticalLayout_2.addWidget(self.checkBoxSroFormat)
+        self.checkBoxOcrLexicon = QtWidgets.QCheckBox(parent=self.verticalLayoutWidget)
+        self.checkBoxOcrLexicon.setObjectName("checkBoxOcrLexicon")
+        self.verticalLayout_2.addWidget(self.checkBoxOcrLexicon)
         self.groupBox_9 = QtWidgets.QGroupBox(parent=self.Configure)
         self.groupBox_9.setGeometry(QtCore.QRect(10, 180, 411, 91))
         self.groupBox_9.setObjectName("groupBox_9")
@@ -428,10 +476,19 @@ class Ui_MainWindow(object):
         self.label_16.setOpenExternalLinks(True)
         self.label_16.setObjectName("label_16")
         self.pushButtonRestoreDefaults = QtWidgets.QPushButton(parent=self.Configure)
-        self.pushButtonRestoreDefaults.setGeometry(QtCore.QRect(10, 360, 101, 31))
+        self.pushButtonRestoreDefaults.setGeometry(QtCore.QRect(10, 380, 101, 31))
         self.pushButtonRestoreDefaults.setObjectName("pushButtonRestoreDefaults")
         self.tabWidget.addTab(self.Configure, "")
+        self.Results = QtWidgets.QWidget()
+        self.Results.setObjectName("Results")
+        self.resultsTab = ResultsTab(parent=self.Results)
+        self.resultsTab.setGeometry(QtCore.QRect(10, 10, 655, 491))
+        self.resultsTab.setObjectName("resultsTab")
+        self.tabWidget.addTab(self.Results, "")
         MainWindow.setCentralWidget(self.centralwidget)
+        self.statusbar = QtWidgets.QStatusBar(parent=MainWindow)
+        self.statusbar.setObjectName("statusbar")
+        MainWindow.setStatusBar(self.statusbar)
 
         self.retranslateUi(MainWindow)
         self.tabWidget.setCurrentIndex(0)
@@ -471,6 +528,8 @@ class Ui_MainWindow(object):
         self.label_7.setText(_translate("MainWindow", "Min Level:"))
         self.label_21.setText(_translate("MainWindow", "Character options"))
         self.label_20.setText(_translate("MainWindow", "Min Level:"))
+        self.checkBoxSkipUnchangedChars.setToolTip(_translate("MainWindow", "Reuse the traces and eidolons of characters whose level and ascension did not change since the last scan. New eidolons and trace upgrades are missed."))
+        self.checkBoxSkipUnchangedChars.setText(_translate("MainWindow", "Skip unchanged"))
         self.groupBox_3.setTitle(_translate("MainWindow", "Output location"))
         self.pushButtonOpenLocation.setText(_translate("MainWindow", "Open Folder"))
         self.pushButtonChangeLocation.setText(_translate("MainWindow", "Change"))
@@ -502,6 +561,7 @@ class Ui_MainWindow(object):
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.Scan), _translate("MainWindow", "Scan"))
         self.formGroupBox_2.setTitle(_translate("MainWindow", "Scan most recent relics"))
         self.checkBoxRecentRelicsFiveStar.setText(_translate("MainWindow", "Only count 5-star relics"))
+        self.checkBoxRecentRelicsMerge.setText(_translate("MainWindow", "Merge into inventory"))
         self.label_15.setText(_translate("MainWindow", "Number of relics:"))
         self.pushButtonStartScanRecentRelics.setText(_translate("MainWindow", "Scan"))
         self.groupBox_10.setTitle(_translate("MainWindow", "Info"))
@@ -519,6 +579,15 @@ class Ui_MainWindow(object):
         self.groupBox_6.setTitle(_translate("MainWindow", "Hotkeys"))
         self.label_9.setText(_translate("MainWindow", "Inventory key:"))
         self.label_10.setText(_translate("MainWindow", "Characters key:"))
+        self.groupBox_12.setTitle(_translate("MainWindow", "Performance"))
+        self.label_26.setToolTip(_translate("MainWindow", "Share of the CPU used to read items while the game is being navigated"))
+        self.label_26.setText(_translate("MainWindow", "CPU budget (%):"))
+        self.checkBoxPinWorkers.setToolTip(_translate("MainWindow", "Read items on the cores the game uses least while it is being navigated"))
+        self.checkBoxPinWorkers.setText(_translate("MainWindow", "Avoid busy game cores"))
+        self.groupBox_13.setTitle(_translate("MainWindow", "OCR Workers"))
+        self.label_27.setToolTip(_translate("MainWindow", "Other PCs running the OCR worker read relics and light cones. Items are read on this PC if none respond."))
+        self.label_27.setText(_translate("MainWindow", "Addresses (host:port, ...):"))
+        self.lineEditOcrWorkers.setPlaceholderText(_translate("MainWindow", "192.168.1.2:8765"))
         self.lineEditCharactersKey.setText(_translate("MainWindow", "C"))
         self.lineEditInventoryKey.setText(_translate("MainWindow", "B"))
         self.groupBox_7.setTitle(_translate("MainWindow", "Scan"))
@@ -529,6 +598,8 @@ class Ui_MainWindow(object):
         self.checkBoxDebugMode.setText(_translate("MainWindow", "Debug mode"))
         self.checkBoxSroFormat.setToolTip(_translate("MainWindow", "Star Rail Optimizer"))
         self.checkBoxSroFormat.setText(_translate("MainWindow", "Also export in SRO format"))
+        self.checkBoxOcrLexicon.setToolTip(_translate("MainWindow", "Bias OCR towards the names and stats of the game data. Experimental: its effect on accuracy is not measured yet."))
+        self.checkBoxOcrLexicon.setText(_translate("MainWindow", "Bias OCR to game data"))
         self.groupBox_9.setTitle(_translate("MainWindow", "Additional Delay"))
         self.label_11.setToolTip(_translate("MainWindow", "Navigating between different pages (inventory, character details, etc.)"))
         self.label_11.setText(_translate("MainWindow", "Navigation speed (ms):"))
@@ -551,4 +622,6 @@ class Ui_MainWindow(object):
         self.label_16.setText(_translate("MainWindow", "<html><head/><body><p><a href=\"https://github.com/kel-z/HSR-Scanner/tree/main\"><span style=\" text-decoration: underline; color:#0000ff;\">GitHub</span></a></p></body></html>"))
         self.pushButtonRestoreDefaults.setText(_translate("MainWindow", "Restore Defaults"))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.Configure), _translate("MainWindow", "Configure"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.Results), _translate("MainWindow", "Results"))
 from ui.key_capture_line_edit import KeyCaptureLineEdit
+from ui.results_tab import ResultsTab
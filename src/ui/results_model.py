@@ -0,0 +1,232 @@
+from typing import Any, Callable
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from models.const import (
+    CHAR_ASCENSION,
+    CHAR_EIDOLON,
+    CHAR_LEVEL,
+    CHAR_NAME,
+    CHAR_PATH,
+    LC_LEVEL,
+    LC_LOCATION,
+    LC_LOCK,
+    LC_NAME,
+    LC_SUPERIMPOSITION,
+    RELIC_DISCARD,
+    RELIC_LEVEL,
+    RELIC_LOCATION,
+    RELIC_LOCK,
+    RELIC_MAINSTAT,
+    RELIC_NAME,
+    RELIC_RARITY,
+    RELIC_SLOT,
+    RELIC_SUBSTAT_NAME,
+    RELIC_SUBSTAT_VALUE,
+    RELIC_SUBSTATS,
+)
+
+# Rows handed to the view per fetchMore, the rest are only exposed once the
+# view is scrolled to them
+FETCH_BATCH_SIZE = 256
+
+# Role returning the raw value of a cell, used for sorting
+SORT_ROLE = Qt.ItemDataRole.UserRole
+
+
+class ResultColumn:
+    """ResultColumn class describes how a column of the results table is read
+    from a parsed item"""
+
+    def __init__(
+        self,
+        header: str,
+        value: Callable[[dict], Any],
+        display: Callable[[Any], str] = str,
+    ) -> None:
+        """Constructor
+
+        :param header: The header text
+        :param value: The function reading the raw value from an item
+        :param display: The function formatting the raw value, only called for
+            visible cells
+        """
+        self.header = header
+        self.value = value
+        self.display = display
+
+
+def _uid_number(item: dict) -> int:
+    """Get the inventory position from the _uid of an item
+
+    :param item: The item
+    :return: The position
+    """
+    return int(str(item["_uid"]).split("_")[-1])
+
+
+def _display_flag(value: bool) -> str:
+    """Format a boolean flag
+
+    :param value: The flag
+    :return: The formatted flag
+    """
+    return "Yes" if value else ""
+
+
+LIGHT_CONE_COLUMNS = [
+    ResultColumn("UID", _uid_number),
+    ResultColumn("Name", lambda lc: lc[LC_NAME]),
+    ResultColumn("Level", lambda lc: lc[LC_LEVEL]),
+    ResultColumn("S", lambda lc: lc[LC_SUPERIMPOSITION]),
+    ResultColumn("Location", lambda lc: lc[LC_LOCATION]),
+    ResultColumn("Lock", lambda lc: lc[LC_LOCK], _display_flag),
+]
+
+RELIC_COLUMNS = [
+    ResultColumn("UID", _uid_number),
+    ResultColumn("Set", lambda r: r[RELIC_NAME]),
+    ResultColumn("Slot", lambda r: r[RELIC_SLOT]),
+    ResultColumn("Rarity", lambda r: r[RELIC_RARITY]),
+    ResultColumn("Level", lambda r: r[RELIC_LEVEL]),
+    ResultColumn("Main Stat", lambda r: r[RELIC_MAINSTAT]),
+    ResultColumn(
+        "Substats",
+        lambda r: ", ".join(
+            f"{s[RELIC_SUBSTAT_NAME]} {s[RELIC_SUBSTAT_VALUE]}"
+            for s in r[RELIC_SUBSTATS]
+        ),
+    ),
+    ResultColumn("Location", lambda r: r[RELIC_LOCATION]),
+    ResultColumn("Lock", lambda r: r[RELIC_LOCK], _display_flag),
+    ResultColumn("Discard", lambda r: r[RELIC_DISCARD], _display_flag),
+]
+
+CHARACTER_COLUMNS = [
+    ResultColumn("Name", lambda c: c[CHAR_NAME]),
+    ResultColumn("Path", lambda c: c[CHAR_PATH]),
+    ResultColumn("Level", lambda c: c[CHAR_LEVEL]),
+    ResultColumn("Ascension", lambda c: c[CHAR_ASCENSION]),
+    ResultColumn("Eidolon", lambda c: c[CHAR_EIDOLON]),
+]
+
+ERROR_COLUMNS = [
+    ResultColumn("UID", lambda e: e["_uid"]),
+    ResultColumn("Error", lambda e: e["message"]),
+]
+
+
+class ResultsTableModel(QAbstractTableModel):
+    """ResultsTableModel class is a table model over parsed items stored column
+    by column
+
+    Appending only extracts the raw cell values, display strings are built when
+    the view asks for a visible cell. Rows are exposed to the view in batches
+    through fetchMore, so thousands of items can stream in without the view
+    laying out rows that are never scrolled to.
+    """
+
+    def __init__(
+        self,
+        columns: list[ResultColumn],
+        key: Callable[[dict], str] = lambda item: item["_uid"],
+        parent=None,
+    ) -> None:
+        """Constructor
+
+        :param columns: The columns of the table
+        :param key: The function reading the crop key of an item, defaults to its _uid
+        :param parent: The parent object
+        """
+        super().__init__(parent)
+        self._columns = columns
+        self._key = key
+        self._keys = []
+        self._values = [[] for _ in columns]
+        self._fetched = 0
+
+    def append(self, items: list[dict]) -> None:
+        """Append parsed items
+
+        :param items: The items
+        """
+        if not items:
+            return
+
+        fully_fetched = self._fetched == len(self._keys)
+        self._keys.extend(self._key(item) for item in items)
+        for values, column in zip(self._values, self._columns):
+            values.extend(column.value(item) for item in items)
+
+        if fully_fetched:
+            self.fetchMore(QModelIndex())
+
+    def clear(self) -> None:
+        """Remove all items"""
+        self.beginResetModel()
+        self._keys = []
+        self._values = [[] for _ in self._columns]
+        self._fetched = 0
+        self.endResetModel()
+
+    def fetch_all(self) -> None:
+        """Expose all rows to the view, e.g. before filtering or sorting"""
+        if self._fetched < len(self._keys):
+            self.beginInsertRows(QModelIndex(), self._fetched, len(self._keys) - 1)
+            self._fetched = len(self._keys)
+            self.endInsertRows()
+
+    def total_count(self) -> int:
+        """Get the number of items, including the ones not fetched yet
+
+        :return: The number of items
+        """
+        return len(self._keys)
+
+    def key(self, row: int) -> str:
+        """Get the crop key of a row
+
+        :param row: The row
+        :return: The key
+        """
+        return self._keys[row]
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._fetched
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._columns)
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        return not parent.isValid() and self._fetched < len(self._keys)
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        n = min(FETCH_BATCH_SIZE, len(self._keys) - self._fetched)
+        if parent.isValid() or n <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._fetched, self._fetched + n - 1)
+        self._fetched += n
+        self.endInsertRows()
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        value = self._values[index.column()][index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._columns[index.column()].display(value)
+        if role == SORT_ROLE:
+            return value
+        return None
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+        ):
+            return self._columns[section].header
+        return None
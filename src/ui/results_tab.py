@@ -0,0 +1,203 @@
+from PyQt6.QtCore import QItemSelection, QSortFilterProxyModel, Qt
+from PyQt6.QtGui import QPixmap
+from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QComboBox,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QLineEdit,
+    QTableView,
+    QVBoxLayout,
+    QWidget,
+)
+
+from enums.increment_type import IncrementType
+from models.const import CHAR_NAME
+from ui.results_model import (
+    CHARACTER_COLUMNS,
+    ERROR_COLUMNS,
+    LIGHT_CONE_COLUMNS,
+    RELIC_COLUMNS,
+    SORT_ROLE,
+    ResultsTableModel,
+)
+from utils.crop_store import CropStore
+
+ERRORS = "errors"
+
+CROP_PREVIEW_WIDTH = 200
+
+
+class ResultsTab(QWidget):
+    """ResultsTab is a QWidget that shows the parsed items of the running scan as
+    they come in, with the source screenshot of the selected item"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._crops = None
+        self._models = {
+            IncrementType.RELIC_ADD: ResultsTableModel(RELIC_COLUMNS, parent=self),
+            IncrementType.LIGHT_CONE_ADD: ResultsTableModel(
+                LIGHT_CONE_COLUMNS, parent=self
+            ),
+            IncrementType.CHARACTER_ADD: ResultsTableModel(
+                CHARACTER_COLUMNS, key=lambda c: c[CHAR_NAME], parent=self
+            ),
+            ERRORS: ResultsTableModel(ERROR_COLUMNS, parent=self),
+        }
+
+        self.comboBoxCategory = QComboBox(self)
+        for text, key in (
+            ("Relics", IncrementType.RELIC_ADD),
+            ("Light Cones", IncrementType.LIGHT_CONE_ADD),
+            ("Characters", IncrementType.CHARACTER_ADD),
+            ("Errors", ERRORS),
+        ):
+            self.comboBoxCategory.addItem(text, key)
+
+        self.lineEditFilter = QLineEdit(self)
+        self.lineEditFilter.setPlaceholderText("Filter")
+        self.lineEditFilter.setClearButtonEnabled(True)
+        self.labelCount = QLabel(self)
+
+        # the proxy sorts and filters rows incrementally as they are inserted
+        self._proxy = QSortFilterProxyModel(self)
+        self._proxy.setSortRole(SORT_ROLE)
+        self._proxy.setDynamicSortFilter(True)
+        self._proxy.setFilterKeyColumn(-1)
+        self._proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+
+        self.tableView = QTableView(self)
+        self.tableView.setModel(self._proxy)
+        self.tableView.setSortingEnabled(True)
+        self.tableView.setSelectionBehavior(
+            QAbstractItemView.SelectionBehavior.SelectRows
+        )
+        self.tableView.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.tableView.setWordWrap(False)
+        self.tableView.verticalHeader().setVisible(False)
+        # fixed row heights so the view never measures rows it does not draw
+        self.tableView.verticalHeader().setSectionResizeMode(
+            QHeaderView.ResizeMode.Fixed
+        )
+        self.tableView.verticalHeader().setDefaultSectionSize(20)
+        self.tableView.horizontalHeader().setStretchLastSection(True)
+
+        self.labelCrop = QLabel(self)
+        self.labelCrop.setFixedWidth(CROP_PREVIEW_WIDTH)
+        self.labelCrop.setAlignment(
+            Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop
+        )
+        self.labelCrop.setWordWrap(True)
+
+        toolbar = QHBoxLayout()
+        toolbar.addWidget(self.comboBoxCategory)
+        toolbar.addWidget(self.lineEditFilter)
+        toolbar.addWidget(self.labelCount)
+        body = QHBoxLayout()
+        body.addWidget(self.tableView)
+        body.addWidget(self.labelCrop)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(toolbar)
+        layout.addLayout(body)
+
+        self.comboBoxCategory.currentIndexChanged.connect(self._show_category)
+        self.lineEditFilter.textChanged.connect(self._set_filter)
+        self.tableView.selectionModel().selectionChanged.connect(
+            self._on_selection_changed
+        )
+        self.tableView.horizontalHeader().sortIndicatorChanged.connect(
+            lambda *_: self._source_model().fetch_all()
+        )
+        self._show_category()
+
+    def set_crop_store(self, crops: CropStore | None) -> None:
+        """Set the store the source screenshots are read from
+
+        :param crops: The crop store
+        """
+        self._crops = crops
+
+    def add_results(self, items: dict, errors: list[dict]) -> None:
+        """Append newly parsed items and errors
+
+        :param items: The new items per scan type
+        :param errors: The new errors
+        """
+        for scan_type, new_items in items.items():
+            self._models[scan_type].append(new_items)
+        self._models[ERRORS].append(errors)
+        if any(items.values()) or errors:
+            self._update_count()
+
+    def clear(self) -> None:
+        """Remove all results"""
+        for model in self._models.values():
+            model.clear()
+        self._update_count()
+        self._show_crop(None)
+
+    def _source_model(self) -> ResultsTableModel:
+        """Get the model of the selected category
+
+        :return: The model
+        """
+        return self._models[self.comboBoxCategory.currentData()]
+
+    def _show_category(self) -> None:
+        """Show the model of the selected category"""
+        model = self._source_model()
+        if self.lineEditFilter.text():
+            model.fetch_all()
+        self._proxy.setSourceModel(model)
+        self._update_count()
+        self._show_crop(None)
+
+    def _set_filter(self, text: str) -> None:
+        """Filter the rows on any column
+
+        :param text: The filter text
+        """
+        # rows that are not fetched yet would be invisible to the filter
+        if text:
+            self._source_model().fetch_all()
+        self._proxy.setFilterFixedString(text)
+        self._update_count()
+
+    def _update_count(self) -> None:
+        """Update the row count label"""
+        self.labelCount.setText(f"{self._source_model().total_count()} items")
+
+    def _on_selection_changed(self, selected: QItemSelection, _) -> None:
+        """Show the source screenshot of the selected row
+
+        :param selected: The selection
+        """
+        indexes = selected.indexes()
+        if not indexes:
+            return
+        row = self._proxy.mapToSource(indexes[0]).row()
+        self._show_crop(self._source_model().key(row))
+
+    def _show_crop(self, key: str | None) -> None:
+        """Decode and show a crop
+
+        :param key: The key of the crop, None to clear the preview
+        """
+        data = (
+            self._crops.get(key)
+            if self._crops is not None and key is not None
+            else None
+        )
+        pixmap = QPixmap()
+        if data is None or not pixmap.loadFromData(data, "JPG"):
+            self.labelCrop.setPixmap(QPixmap())
+            self.labelCrop.setText("No screenshot" if key is not None else "")
+            return
+        self.labelCrop.setPixmap(
+            pixmap.scaledToWidth(
+                CROP_PREVIEW_WIDTH, Qt.TransformationMode.SmoothTransformation
+            )
+        )
@@ -0,0 +1,75 @@
+from PIL import ImageGrab
+from PIL.Image import Image
+
+
+class ScreenCapture:
+    """ScreenCapture class grabs regions of the game window from the screen"""
+
+    def __init__(self, hwnd: int) -> None:
+        """Constructor
+
+        :param hwnd: The window handle of the game window
+        """
+        # imported here so the replay capture works without pywin32
+        import win32gui
+
+        width, height = win32gui.GetClientRect(hwnd)[2:]
+        left, top = win32gui.ClientToScreen(hwnd, (0, 0))
+        self._geometry = (left, top, width, height)
+
+    @property
+    def geometry(self) -> tuple[int, int, int, int]:
+        """The screen x, y, width and height of the client area"""
+        return self._geometry
+
+    def grab(self, rect: tuple[int, int, int, int]) -> Image:
+        """Grab a region of the screen at native resolution
+
+        :param rect: The screen rect to grab
+        :return: The grabbed image
+        """
+        return ImageGrab.grab(bbox=rect, all_screens=True)
+
+
+class ReplayCapture:
+    """ReplayCapture class serves grabs from recorded or synthetic frames of the
+    client area instead of the screen, so the capture and parse pipeline can run
+    without the game
+    """
+
+    def __init__(self, width: int = 1920, height: int = 1080) -> None:
+        """Constructor
+
+        :param width: The width of the frames, defaults to 1920
+        :param height: The height of the frames, defaults to 1080
+        """
+        self._geometry = (0, 0, width, height)
+        self._frame = None
+
+    @property
+    def geometry(self) -> tuple[int, int, int, int]:
+        """The screen x, y, width and height of the client area"""
+        return self._geometry
+
+    def show(self, frame: Image) -> None:
+        """Replace the frame that is grabbed from
+
+        :param frame: The frame of the whole client area
+        :raises ValueError: Thrown if the frame size does not match the geometry
+        """
+        if frame.size != self._geometry[2:]:
+            raise ValueError(
+                f"Frame size {frame.size} does not match {self._geometry[2:]}."
+            )
+        self._frame = frame
+
+    def grab(self, rect: tuple[int, int, int, int]) -> Image:
+        """Grab a region of the current frame
+
+        :param rect: The screen rect to grab
+        :raises ValueError: Thrown if no frame is shown
+        :return: The grabbed image
+        """
+        if self._frame is None:
+            raise ValueError("No frame to grab from.")
+        return self._frame.crop(rect)
@@ -1,4 +1,4 @@
-from typing import Callable
+from typing import TYPE_CHECKING
 
 from models.const import (
     ABILITY_1,
@@ -42,7 +42,11 @@ from models.const import (
     TALENT,
     ULT,
 )
-from models.game_data import GameData
+
+# models.game_data pulls in cv2, Levenshtein and requests, which main does not
+# import before the window is shown
+if TYPE_CHECKING:
+    from models.game_data import GameData
 
 SRO_SLOT_MAP = {
     "Head": "head",
@@ -73,6 +77,27 @@ SRO_MAIN_STAT_MAP = {
     "CRIT DMG": "crit_dmg",
 }
 
+SRO_HEADER = {
+    "format": "SRO",
+    "source": "HSR-Scanner",
+    "version": 1,
+}
+
+# Traces in the order of the numbered bonusAbilities and statBoosts
+SRO_ABILITY_KEYS = (ABILITY_1, ABILITY_2, ABILITY_3)
+SRO_STAT_KEYS = (
+    STAT_1,
+    STAT_2,
+    STAT_3,
+    STAT_4,
+    STAT_5,
+    STAT_6,
+    STAT_7,
+    STAT_8,
+    STAT_9,
+    STAT_10,
+)
+
 SRO_SUB_STAT_MAP = {
     "HP": "hp",
     "ATK": "atk",
@@ -89,163 +114,136 @@ SRO_SUB_STAT_MAP = {
 }
 
 
-def convert_to_sro(data: dict, game_data: GameData) -> dict:
-    """Reformat data to SRO format
+class SroKeyMap:
+    """SroKeyMap class converts scanned items to SRO format
 
-    :param data: The data to reformat
-    :param game_data: The GameData class instance
-    :return: The reformatted data
+    The SRO mappings and the slot, main stat and substat maps are compiled into
+    flat lookup tables once, so converting an item is a few dict lookups. Build
+    one per GameData and reuse it for every export.
     """
-    res = {
-        "format": "SRO",
-        "source": "HSR-Scanner",
-        "version": 1,
-    }
-
-    sro_mappings = game_data.get_sro_mappings()
-    get_sro_character_key = lambda key: _get_sro_character_key(key, sro_mappings)
 
-    if data["characters"]:
-        res["characters"] = _convert_characters_sro(
-            data["characters"], get_sro_character_key
-        )
-
-    if data["relics"]:
-        res["relics"] = _convert_relics_sro(
-            data["relics"], sro_mappings, get_sro_character_key
-        )
-
-    if data["light_cones"]:
-        res["lightCones"] = _convert_light_cones_sro(
-            data["light_cones"], sro_mappings, get_sro_character_key
-        )
-    return res
-
-
-def _convert_characters_sro(
-    characters: list[dict], character_key_fn: Callable
-) -> list[dict]:
-    """Convert characters to SRO format
+    def __init__(self, sro_mappings: dict) -> None:
+        """Constructor
+
+        :param sro_mappings: The SRO key mappings, see GameData.get_sro_mappings
+        """
+        self._characters = {"": "", **sro_mappings["characters"]}
+        self._relic_sets = sro_mappings["relic_sets"]
+        self._light_cones = sro_mappings["light_cones"]
+        # flat HP and ATK are the fixed main stats of the head and hands, and
+        # SPD is the only other flat main stat
+        self._main_stats = {
+            (slot, stat): (
+                key if slot in ("Head", "Hands") or stat == "SPD" else key + "_"
+            )
+            for slot in SRO_SLOT_MAP
+            for stat, key in SRO_MAIN_STAT_MAP.items()
+        }
+        # percentages are stored as fractions
+        self._sub_stats = {
+            name: (key, name.endswith("_")) for name, key in SRO_SUB_STAT_MAP.items()
+        }
 
-    :param characters: The characters to convert
-    :param character_key_fn: The function to get the SRO character key
-    :return: The converted characters
-    """
-    formatted_characters = []
-    for character in characters:
-        res = {
-            "key": character_key_fn(character[CHAR_ID]),
+    @classmethod
+    def from_game_data(cls, game_data: "GameData") -> "SroKeyMap":
+        """Compile the SRO mappings of the game data, fetching them if needed
+
+        :param game_data: The GameData class instance
+        :raises Exception: Thrown if the SRO mappings can not be fetched
+        :return: The key map
+        """
+        return cls(game_data.get_sro_mappings())
+
+    def convert_character(self, character: dict) -> dict:
+        """Convert a character to SRO format
+
+        :param character: The character
+        :return: The converted character
+        """
+        skills = character[CHAR_SKILLS]
+        traces = character[CHAR_TRACES]
+        return {
+            "key": self._characters[character[CHAR_ID]],
             "level": character[CHAR_LEVEL],
             "eidolon": character[CHAR_EIDOLON],
             "ascension": character[CHAR_ASCENSION],
-            "basic": character[CHAR_SKILLS][BASIC],
-            "skill": character[CHAR_SKILLS][SKILL],
-            "ult": character[CHAR_SKILLS][ULT],
-            "talent": character[CHAR_SKILLS][TALENT],
+            "basic": skills[BASIC],
+            "skill": skills[SKILL],
+            "ult": skills[ULT],
+            "talent": skills[TALENT],
             "bonusAbilities": {
-                1: character[CHAR_TRACES][ABILITY_1],
-                2: character[CHAR_TRACES][ABILITY_2],
-                3: character[CHAR_TRACES][ABILITY_3],
-            },
-            "statBoosts": {
-                1: character[CHAR_TRACES][STAT_1],
-                2: character[CHAR_TRACES][STAT_2],
-                3: character[CHAR_TRACES][STAT_3],
-                4: character[CHAR_TRACES][STAT_4],
-                5: character[CHAR_TRACES][STAT_5],
-                6: character[CHAR_TRACES][STAT_6],
-                7: character[CHAR_TRACES][STAT_7],
-                8: character[CHAR_TRACES][STAT_8],
-                9: character[CHAR_TRACES][STAT_9],
-                10: character[CHAR_TRACES][STAT_10],
+                i: traces[key] for i, key in enumerate(SRO_ABILITY_KEYS, 1)
             },
+            "statBoosts": {i: traces[key] for i, key in enumerate(SRO_STAT_KEYS, 1)},
         }
-        formatted_characters.append(res)
-
-    return formatted_characters
 
+    def convert_relic(self, relic: dict) -> dict:
+        """Convert a relic to SRO format
 
-def _convert_relics_sro(
-    relics: list[dict], sro_mappings: dict, character_key_fn: Callable
-) -> list[dict]:
-    """Convert relics to SRO format
-
-    :param relics: The relics to convert
-    :param sro_mappings: The SRO key mappings
-    :param character_key_fn: The function to get the SRO character key
-    :return: The converted relics
-    """
-    formatted_relics = []
-    for relic in relics:
-        mainstat = SRO_MAIN_STAT_MAP[relic[RELIC_MAINSTAT]]
-        if relic[RELIC_SLOT] not in ["Head", "Hands"] and relic["mainstat"] != "SPD":
-            mainstat += "_"
-
+        :param relic: The relic
+        :return: The converted relic
+        """
         substats = []
         for substat in relic[RELIC_SUBSTATS]:
-            try:
-                value = (
-                    round(substat[RELIC_SUBSTAT_VALUE] / 100, 3)
-                    if substat[RELIC_SUBSTAT_NAME].endswith("_")
-                    else substat[RELIC_SUBSTAT_VALUE]
-                )
-                substats.append(
-                    {
-                        "key": SRO_SUB_STAT_MAP[substat[RELIC_SUBSTAT_NAME]],
-                        "value": value,
-                    }
-                )
-            except KeyError:
-                pass
-
-        res = {
-            "setKey": sro_mappings["relic_sets"][relic[RELIC_NAME]],
+            entry = self._sub_stats.get(substat.get(RELIC_SUBSTAT_NAME))
+            if entry is None or RELIC_SUBSTAT_VALUE not in substat:
+                continue
+            key, is_percent = entry
+            value = substat[RELIC_SUBSTAT_VALUE]
+            substats.append(
+                {"key": key, "value": round(value / 100, 3) if is_percent else value}
+            )
+
+        return {
+            "setKey": self._relic_sets[relic[RELIC_NAME]],
             "slotKey": SRO_SLOT_MAP[relic[RELIC_SLOT]],
             "level": relic[RELIC_LEVEL],
             "rarity": relic[RELIC_RARITY],
-            "mainstat": mainstat,
-            "location": character_key_fn(relic[RELIC_LOCATION]),
+            "mainstat": self._main_stats[relic[RELIC_SLOT], relic[RELIC_MAINSTAT]],
+            "location": self._characters[relic[RELIC_LOCATION]],
             "lock": relic[RELIC_LOCK],
             "discard": relic[RELIC_DISCARD],
             "substats": substats,
         }
-        formatted_relics.append(res)
 
-    return formatted_relics
+    def convert_light_cone(self, light_cone: dict) -> dict:
+        """Convert a light cone to SRO format
 
-
-def _convert_light_cones_sro(
-    light_cones: list[dict], sro_mappings: dict, character_key_fn: Callable
-) -> list[dict]:
-    """Convert light cones to SRO format
-
-    :param light_cones: The light cones to convert
-    :param sro_mappings: The SRO key mappings
-    :param character_key_fn: The function to get the SRO character key
-    :return: The converted light cones
-    """
-    formatted_light_cones = []
-    for light_cone in light_cones:
-        res = {
-            "key": sro_mappings["light_cones"][light_cone[LC_NAME]],
+        :param light_cone: The light cone
+        :return: The converted light cone
+        """
+        return {
+            "key": self._light_cones[light_cone[LC_NAME]],
             "level": light_cone[LC_LEVEL],
             "ascension": light_cone[LC_ASCENSION],
             "superimpose": light_cone[LC_SUPERIMPOSITION],
-            "location": character_key_fn(light_cone[LC_LOCATION]),
+            "location": self._characters[light_cone[LC_LOCATION]],
             "lock": light_cone[LC_LOCK],
         }
-        formatted_light_cones.append(res)
 
-    return formatted_light_cones
 
+def convert_to_sro(
+    data: dict, game_data: "GameData", key_map: SroKeyMap | None = None
+) -> dict:
+    """Reformat data to SRO format
 
-def _get_sro_character_key(key: str, sro_mappings: dict) -> str:
-    """Get the SRO character key
-
-    :param key: The character key
-    :param sro_mappings: The SRO key mappings
-    :return: The SRO character key
+    :param data: The data to reformat
+    :param game_data: The GameData class instance
+    :param key_map: The compiled SRO key map, defaults to None to compile it
+        from the game data
+    :return: The reformatted data
     """
-    if not key:
-        return ""
-    return sro_mappings["characters"][key]
+    key_map = key_map or SroKeyMap.from_game_data(game_data)
+    res = dict(SRO_HEADER)
+
+    if data["characters"]:
+        res["characters"] = [key_map.convert_character(c) for c in data["characters"]]
+
+    if data["relics"]:
+        res["relics"] = [key_map.convert_relic(r) for r in data["relics"]]
+
+    if data["light_cones"]:
+        res["lightCones"] = [
+            key_map.convert_light_cone(lc) for lc in data["light_cones"]
+        ]
+    return res
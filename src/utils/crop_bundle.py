@@ -0,0 +1,88 @@
+import io
+import json
+import struct
+
+import numpy as np
+from PIL import Image as PILImage
+from PIL.Image import Image
+
+# zlib level of the PNG encoded crops. The crops are small and sent over a
+# local network, so encoding speed matters more than size.
+BUNDLE_PNG_COMPRESS_LEVEL = 1
+
+# Byte order and size of the header length that starts each bundle
+_HEADER_LENGTH = struct.Struct(">I")
+
+
+def encode_bundle(header: dict, stats_dict: dict) -> bytes:
+    """Pack the crops and values of a stats dict into one message
+
+    Crops are PNG encoded, so they are decoded to the same pixels and OCR reads
+    them like the original. Other values are kept in the JSON header.
+
+    :param header: The JSON serializable fields that describe the bundle
+    :param stats_dict: The stats dict, its values being crops or JSON
+        serializable values
+    :return: The bundle
+    """
+    values = {}
+    crops = {}
+    blobs = []
+    offset = 0
+    for key, value in stats_dict.items():
+        if isinstance(value, Image):
+            buffer = io.BytesIO()
+            value.save(buffer, "PNG", compress_level=BUNDLE_PNG_COMPRESS_LEVEL)
+            blob = buffer.getvalue()
+            crops[key] = [offset, len(blob)]
+            blobs.append(blob)
+            offset += len(blob)
+        else:
+            values[key] = value
+
+    encoded_header = encode_json({**header, "values": values, "crops": crops})
+    return b"".join([_HEADER_LENGTH.pack(len(encoded_header)), encoded_header, *blobs])
+
+
+def decode_bundle(bundle: bytes) -> tuple[dict, dict]:
+    """Unpack a bundle written by encode_bundle
+
+    :param bundle: The bundle
+    :raises ValueError: Thrown if the bundle is malformed
+    :return: The header and the stats dict
+    """
+    try:
+        (length,) = _HEADER_LENGTH.unpack_from(bundle)
+        start = _HEADER_LENGTH.size + length
+        header = json.loads(bundle[_HEADER_LENGTH.size : start])
+        stats_dict = header.pop("values")
+        for key, (offset, size) in header.pop("crops").items():
+            blob = bundle[start + offset : start + offset + size]
+            img = PILImage.open(io.BytesIO(blob))
+            img.load()
+            stats_dict[key] = img
+    except (struct.error, KeyError, TypeError, OSError) as e:
+        raise ValueError(f"Malformed bundle: {e}") from e
+    return header, stats_dict
+
+
+def encode_json(obj) -> bytes:
+    """Encode a parse result or header as JSON, numpy scalars included
+
+    :param obj: The object
+    :return: The UTF-8 encoded JSON
+    """
+    return json.dumps(obj, default=_json_default, separators=(",", ":")).encode()
+
+
+def _json_default(obj):
+    """Convert the numpy scalars parsers return, e.g. icon matches, to Python
+    values
+
+    :param obj: The object json can not encode
+    :raises TypeError: Thrown if the object is not a numpy scalar
+    :return: The Python value
+    """
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,77 @@
+import io
+import threading
+from collections import OrderedDict
+
+from PIL.Image import Image
+
+# Memory budget of the encoded crops, the least recently used ones are evicted
+CROP_STORE_MAX_BYTES = 64 * 1024 * 1024
+
+# Crops are downscaled to fit this size before they are encoded
+CROP_MAX_SIZE = (360, 480)
+
+CROP_JPEG_QUALITY = 80
+
+
+class CropStore:
+    """CropStore class keeps the source screenshot of each parsed item for
+    reviewing the results
+
+    Crops are downscaled and JPEG encoded when they are put, so a full inventory
+    fits in a fixed memory budget. The UI only decodes the crop of the selected
+    row.
+    """
+
+    def __init__(self, max_bytes: int = CROP_STORE_MAX_BYTES) -> None:
+        """Constructor
+
+        :param max_bytes: The memory budget of the encoded crops, defaults to
+            CROP_STORE_MAX_BYTES
+        """
+        self._lock = threading.Lock()
+        self._crops = OrderedDict()
+        self._max_bytes = max_bytes
+        self._bytes = 0
+
+    def put(self, key: str, img: Image) -> None:
+        """Encode and store a crop. Safe to call from any thread.
+
+        :param key: The key of the crop, i.e. the _uid of the item
+        :param img: The crop
+        """
+        img = img.convert("RGB")
+        img.thumbnail(CROP_MAX_SIZE)
+        buffer = io.BytesIO()
+        img.save(buffer, "JPEG", quality=CROP_JPEG_QUALITY)
+        data = buffer.getvalue()
+
+        with self._lock:
+            old = self._crops.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._crops[key] = data
+            self._bytes += len(data)
+            while self._bytes > self._max_bytes and len(self._crops) > 1:
+                _, evicted = self._crops.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def get(self, key: str) -> bytes | None:
+        """Get an encoded crop
+
+        :param key: The key of the crop
+        :return: The JPEG encoded crop, or None if it is not stored
+        """
+        with self._lock:
+            data = self._crops.get(key)
+            if data is not None:
+                self._crops.move_to_end(key)
+            return data
+
+    def clear(self) -> None:
+        """Remove all crops"""
+        with self._lock:
+            self._crops.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._crops)
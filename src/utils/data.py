@@ -33,16 +33,16 @@ def executable_path(path: str) -> str:
     return os.path.join(os.path.dirname(sys.executable), path)
 
 
-def create_debug_folder(output_location: str) -> str:
-    """Create a debug folder
+def get_debug_folder_path(output_location: str) -> str:
+    """Get the path of a new debug folder, without creating it
 
     :param output_location: The output location
+    :return: The debug folder path
     """
-    debug_folder_path = os.path.join(
+    return os.path.join(
         output_location, "debug", datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     )
-    os.makedirs(debug_folder_path, exist_ok=True)
-    return debug_folder_path
+
 
 
 def save_to_json(data: dict, output_location: str, file_name: str) -> None:
@@ -83,6 +83,15 @@ def get_json_data(file_path: str) -> dict:
         return json.load(json_file)
 
 
+def safe_file_name(text: str) -> str:
+    """Make a text safe to use as a file name
+
+    :param text: The text, e.g. the database version
+    :return: The file name
+    """
+    return "".join(c if c.isalnum() or c in "._-" else "_" for c in text)
+
+
 def filter_images_from_dict(d):
     """Filter images from dictionary
 
@@ -0,0 +1,308 @@
+import argparse
+import json
+
+from models.const import (
+    CHAR_ASCENSION,
+    CHAR_EIDOLON,
+    CHAR_ID,
+    CHAR_LEVEL,
+    CHAR_NAME,
+    CHAR_SKILLS,
+    CHAR_TRACES,
+    LC_ID,
+    LC_LEVEL,
+    LC_LOCATION,
+    LC_NAME,
+    LC_SUPERIMPOSITION,
+    LEVEL,
+    RELIC_LEVEL,
+    RELIC_LOCATION,
+    RELIC_MAINSTAT,
+    RELIC_NAME,
+    RELIC_RARITY,
+    RELIC_SLOT,
+)
+from utils.data import get_json_data
+from utils.fingerprint import hash_key, light_cone_key, relic_content_key
+from utils.merge import RelicIndex
+
+ADDED = "added"
+REMOVED = "removed"
+UPGRADED = "upgraded"
+REEQUIPPED = "reequipped"
+
+
+def diff_exports(old: dict, new: dict) -> dict:
+    """Diff two v4 exports
+
+    Relics are matched on their content fingerprint, light cones on their id,
+    level and superimposition, and characters on their id. Unmatched items that
+    are an upgraded version of each other are reported as upgraded instead of
+    removed and added.
+
+    :param old: The older export
+    :param new: The newer export
+    :return: The added, removed, upgraded and re-equipped items per category
+    """
+    return {
+        "relics": _diff_relics(old.get("relics", []), new.get("relics", [])),
+        "light_cones": _diff_light_cones(
+            old.get("light_cones", []), new.get("light_cones", [])
+        ),
+        "characters": _diff_characters(
+            old.get("characters", []), new.get("characters", [])
+        ),
+    }
+
+
+def _empty_diff() -> dict:
+    """Get an empty diff for a category
+
+    :return: The empty diff
+    """
+    return {ADDED: [], REMOVED: [], UPGRADED: [], REEQUIPPED: []}
+
+
+def _match_multiset(
+    old_items: list[dict], new_items: list[dict], key_fn, location_key: str
+) -> tuple[list[dict], list[dict], list[dict]]:
+    """Match identical items between two lists. Items with the same key are
+    paired on their location first, so that only the surplus counts as moved.
+
+    :param old_items: The older items
+    :param new_items: The newer items
+    :param key_fn: The function returning the key of an item
+    :param location_key: The location key of the items
+    :return: The unmatched old items, the unmatched new items and the re-equipped items
+    """
+    index = {}
+    for item in old_items:
+        index.setdefault(key_fn(item), {}).setdefault(item[location_key], []).append(
+            item
+        )
+
+    unmatched_new = []
+    for item in new_items:
+        locations = index.get(key_fn(item))
+        same = locations.get(item[location_key]) if locations else None
+        if same:
+            same.pop()
+        else:
+            unmatched_new.append(item)
+
+    reequipped = []
+    still_unmatched = []
+    for item in unmatched_new:
+        locations = index.get(key_fn(item), {})
+        old_item = next((v.pop() for v in locations.values() if v), None)
+        if old_item is None:
+            still_unmatched.append(item)
+        else:
+            reequipped.append(
+                {
+                    "item": item,
+                    "from": old_item[location_key],
+                    "to": item[location_key],
+                }
+            )
+
+    unmatched_old = [
+        item for locations in index.values() for v in locations.values() for item in v
+    ]
+    return unmatched_old, still_unmatched, reequipped
+
+
+def _diff_relics(old_relics: list[dict], new_relics: list[dict]) -> dict:
+    """Diff two lists of relics
+
+    :param old_relics: The older relics
+    :param new_relics: The newer relics
+    :return: The relic diff
+    """
+    res = _empty_diff()
+    unmatched_old, unmatched_new, res[REEQUIPPED] = _match_multiset(
+        old_relics,
+        new_relics,
+        lambda relic: hash_key(relic_content_key(relic)),
+        RELIC_LOCATION,
+    )
+
+    index = RelicIndex(unmatched_old)
+    matched = set()
+    for relic in unmatched_new:
+        match = index.pop_match(relic)
+        if match is None:
+            res[ADDED].append(relic)
+        else:
+            matched.add(match[0])
+            res[UPGRADED].append({"old": unmatched_old[match[0]], "new": relic})
+    res[REMOVED] = [r for i, r in enumerate(unmatched_old) if i not in matched]
+
+    return res
+
+
+def _diff_light_cones(old_light_cones: list[dict], new_light_cones: list[dict]) -> dict:
+    """Diff two lists of light cones
+
+    :param old_light_cones: The older light cones
+    :param new_light_cones: The newer light cones
+    :return: The light cone diff
+    """
+    res = _empty_diff()
+    unmatched_old, unmatched_new, res[REEQUIPPED] = _match_multiset(
+        old_light_cones, new_light_cones, light_cone_key, LC_LOCATION
+    )
+
+    by_id = {}
+    for light_cone in unmatched_old:
+        by_id.setdefault(str(light_cone[LC_ID]), []).append(light_cone)
+
+    for light_cone in unmatched_new:
+        candidates = [
+            old
+            for old in by_id.get(str(light_cone[LC_ID]), [])
+            if old[LC_LEVEL] <= light_cone[LC_LEVEL]
+            and old[LC_SUPERIMPOSITION] <= light_cone[LC_SUPERIMPOSITION]
+        ]
+        if not candidates:
+            res[ADDED].append(light_cone)
+            continue
+        old = max(candidates, key=lambda lc: (lc[LC_LEVEL], lc[LC_SUPERIMPOSITION]))
+        by_id[str(light_cone[LC_ID])].remove(old)
+        res[UPGRADED].append({"old": old, "new": light_cone})
+
+    res[REMOVED] = [lc for v in by_id.values() for lc in v]
+    return res
+
+
+def _diff_characters(old_characters: list[dict], new_characters: list[dict]) -> dict:
+    """Diff two lists of characters
+
+    :param old_characters: The older characters
+    :param new_characters: The newer characters
+    :return: The character diff, upgraded characters include the changed fields
+    """
+    res = _empty_diff()
+    old_by_id = {str(c[CHAR_ID]): c for c in old_characters}
+
+    for character in new_characters:
+        old = old_by_id.pop(str(character[CHAR_ID]), None)
+        if old is None:
+            res[ADDED].append(character)
+            continue
+        changes = {
+            k: [old_v, new_v]
+            for k, (old_v, new_v) in _flatten_character(old, character).items()
+            if old_v != new_v
+        }
+        if changes:
+            res[UPGRADED].append({"old": old, "new": character, "changes": changes})
+
+    res[REMOVED] = list(old_by_id.values())
+    return res
+
+
+def _flatten_character(old: dict, new: dict) -> dict[str, tuple]:
+    """Pair up the comparable fields of two versions of a character
+
+    :param old: The older character
+    :param new: The newer character
+    :return: The old and new value of each field
+    """
+    res = {
+        k: (old.get(k), new.get(k)) for k in (CHAR_LEVEL, CHAR_ASCENSION, CHAR_EIDOLON)
+    }
+    for group in (CHAR_SKILLS, CHAR_TRACES):
+        old_group, new_group = old.get(group, {}), new.get(group, {})
+        for k in {**old_group, **new_group}:
+            res[f"{group}.{k}"] = (old_group.get(k), new_group.get(k))
+    return res
+
+
+def format_diff(diff: dict) -> str:
+    """Format a diff for reading
+
+    :param diff: The diff from diff_exports
+    :return: The formatted diff
+    """
+    lines = []
+    for category, describe in (
+        ("relics", _describe_relic),
+        ("light_cones", _describe_light_cone),
+        ("characters", _describe_character),
+    ):
+        d = diff[category]
+        lines.append(
+            f"{category.replace('_', ' ').title()}: {len(d[ADDED])} added, "
+            f"{len(d[REMOVED])} removed, {len(d[UPGRADED])} upgraded, "
+            f"{len(d[REEQUIPPED])} re-equipped"
+        )
+        lines += [f"  + {describe(item)}" for item in d[ADDED]]
+        lines += [f"  - {describe(item)}" for item in d[REMOVED]]
+        for item in d[UPGRADED]:
+            if "changes" in item:
+                changes = ", ".join(
+                    f"{k} {old} -> {new}" for k, (old, new) in item["changes"].items()
+                )
+                lines.append(f"  ^ {describe(item['new'])}: {changes}")
+            else:
+                lines.append(
+                    f"  ^ {describe(item['new'])}: level {item['old'][LEVEL]} -> {item['new'][LEVEL]}"
+                )
+        lines += [
+            f"  > {describe(item['item'])}: {item['from'] or 'unequipped'} -> {item['to'] or 'unequipped'}"
+            for item in d[REEQUIPPED]
+        ]
+    return "\n".join(lines)
+
+
+def _describe_relic(relic: dict) -> str:
+    """Describe a relic in one line
+
+    :param relic: The relic
+    :return: The description
+    """
+    return (
+        f"{relic[RELIC_NAME]} {relic[RELIC_SLOT]} {relic[RELIC_RARITY]}* "
+        f"+{relic[RELIC_LEVEL]} {relic[RELIC_MAINSTAT]} [{relic.get('_uid', '')}]"
+    )
+
+
+def _describe_light_cone(light_cone: dict) -> str:
+    """Describe a light cone in one line
+
+    :param light_cone: The light cone
+    :return: The description
+    """
+    return (
+        f"{light_cone[LC_NAME]} Lv{light_cone[LC_LEVEL]} "
+        f"S{light_cone[LC_SUPERIMPOSITION]} [{light_cone.get('_uid', '')}]"
+    )
+
+
+def _describe_character(character: dict) -> str:
+    """Describe a character in one line
+
+    :param character: The character
+    :return: The description
+    """
+    return (
+        f"{character[CHAR_NAME]} Lv{character[CHAR_LEVEL]} E{character[CHAR_EIDOLON]}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff two scan exports.")
+    parser.add_argument("old", help="The older export")
+    parser.add_argument("new", help="The newer export")
+    parser.add_argument(
+        "--json", action="store_true", help="Print the diff as JSON instead of text"
+    )
+    args = parser.parse_args()
+
+    diff = diff_exports(get_json_data(args.old), get_json_data(args.new))
+    print(json.dumps(diff, indent=4) if args.json else format_diff(diff))
+
+
+if __name__ == "__main__":
+    main()
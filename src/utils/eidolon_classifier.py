@@ -0,0 +1,57 @@
+import cv2
+import numpy as np
+
+from config.character_scan import EIDOLON_CALIBRATION
+from config.const import MAX_ORANGE_PIXELS, MIN_SHARPNESS, ORANGE_LOWER, ORANGE_UPPER
+
+
+def eidolon_metrics(
+    crops: np.ndarray, calibration: dict = EIDOLON_CALIBRATION
+) -> tuple[np.ndarray, np.ndarray]:
+    """Compute the sharpness and orange pixel count of stacked eidolon crops
+
+    :param crops: The masked eidolon crops as an (n, h, w, 3) array
+    :param calibration: The calibration table, defaults to EIDOLON_CALIBRATION
+    :return: The variance of the Laplacian and the number of orange pixels of
+        each crop
+    """
+    n, h, w, _ = crops.shape
+    rows = np.ascontiguousarray(crops).reshape(n * h, w, 3)
+
+    # the crops are RGB, but the thresholds were tuned on BGR to gray weights
+    gray = cv2.cvtColor(rows, cv2.COLOR_BGR2GRAY).reshape(n, h, w)  # type: ignore
+
+    # pad each crop like the reflect-101 border of cv2.Laplacian, so a single
+    # Laplacian over the stacked crops equals one per crop
+    padded = np.pad(gray, ((0, 0), (1, 1), (1, 1)), mode="reflect")
+    laplacian = cv2.Laplacian(  # type: ignore
+        padded.reshape(n * (h + 2), w + 2), cv2.CV_64F
+    ).reshape(n, h + 2, w + 2)[:, 1:-1, 1:-1]
+    sharpness = laplacian.reshape(n, -1).var(axis=1)
+
+    mask = cv2.inRange(  # type: ignore
+        rows,
+        np.array(calibration[ORANGE_LOWER]),
+        np.array(calibration[ORANGE_UPPER]),
+    )
+    orange = np.count_nonzero(mask.reshape(n, -1), axis=1)
+
+    return sharpness, orange
+
+
+def count_eidolons(crops: np.ndarray, calibration: dict = EIDOLON_CALIBRATION) -> int:
+    """Count the activated eidolons from the stacked eidolon crops
+
+    An eidolon is activated if its crop is sharp enough to not be locked and
+    not so orange that it is only unlocked. Eidolons are activated in order, so
+    the count stops at the first one that is not.
+
+    :param crops: The masked eidolon crops as an (n, h, w, 3) array
+    :param calibration: The calibration table, defaults to EIDOLON_CALIBRATION
+    :return: The number of activated eidolons
+    """
+    sharpness, orange = eidolon_metrics(crops, calibration)
+    activated = (sharpness >= calibration[MIN_SHARPNESS]) & (
+        orange <= calibration[MAX_ORANGE_PIXELS]
+    )
+    return int(np.cumprod(activated).sum())
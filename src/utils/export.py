@@ -0,0 +1,330 @@
+import datetime
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import TextIO
+
+from utils.conversion import SRO_HEADER, SroKeyMap
+
+# Indentation of the export files, as written by save_to_json
+EXPORT_INDENT = 4
+
+# Converted items encoded at a time. Encoding a list is faster than encoding
+# its items one by one, and a chunk bounds the memory of an export.
+EXPORT_CHUNK_ITEMS = 256
+
+
+class ExportFormat(ABC):
+    """ExportFormat class converts the scan results to one export file
+
+    The results are walked once for all formats: each format writes its header,
+    then converts the items of each list of the results one at a time, so
+    nothing is converted ahead of being written.
+    """
+
+    NAME: str
+    FILE_PREFIX: str
+
+    @abstractmethod
+    def header(self, data: dict) -> dict:
+        """Get the fields written before the item lists
+
+        :param data: The scan results
+        :return: The fields
+        """
+        pass
+
+    @abstractmethod
+    def section(self, key: str, items: list[dict]) -> str | None:
+        """Get the key a list of the results is written under
+
+        :param key: The key of the list in the results
+        :param items: The items of the list
+        :return: The key in the file, or None to leave the list out
+        """
+        pass
+
+    @abstractmethod
+    def convert(self, key: str, item: dict) -> dict:
+        """Convert an item of a list of the results
+
+        :param key: The key of the list in the results
+        :param item: The item
+        :return: The converted item
+        """
+        pass
+
+
+class ScanFormat(ExportFormat):
+    """ScanFormat class writes the results as they are, the HSR-Scanner
+    format"""
+
+    NAME = "HSR-Scanner"
+    FILE_PREFIX = "HSRScanData"
+
+    def header(self, data: dict) -> dict:
+        """Get the fields written before the item lists
+
+        :param data: The scan results
+        :return: The fields of the results that are not lists
+        """
+        return {k: v for k, v in data.items() if not isinstance(v, list)}
+
+    def section(self, key: str, items: list[dict]) -> str | None:
+        """Get the key a list of the results is written under
+
+        :param key: The key of the list in the results
+        :param items: The items of the list
+        :return: The same key
+        """
+        return key
+
+    def convert(self, key: str, item: dict) -> dict:
+        """Convert an item of a list of the results
+
+        :param key: The key of the list in the results
+        :param item: The item
+        :return: The item as is
+        """
+        return item
+
+
+class SroFormat(ExportFormat):
+    """SroFormat class writes the results in Star Rail Optimizer format"""
+
+    NAME = "SRO"
+    FILE_PREFIX = "HSRScanData_SRO"
+
+    # SRO key of each list of the results, empty lists are left out
+    SECTIONS = {
+        "characters": "characters",
+        "relics": "relics",
+        "light_cones": "lightCones",
+    }
+
+    def __init__(self, key_map: SroKeyMap) -> None:
+        """Constructor
+
+        :param key_map: The compiled SRO key map
+        """
+        self._converters = {
+            "characters": key_map.convert_character,
+            "relics": key_map.convert_relic,
+            "light_cones": key_map.convert_light_cone,
+        }
+
+    def header(self, data: dict) -> dict:
+        """Get the fields written before the item lists
+
+        :param data: The scan results
+        :return: The SRO format and version
+        """
+        return SRO_HEADER
+
+    def section(self, key: str, items: list[dict]) -> str | None:
+        """Get the key a list of the results is written under
+
+        :param key: The key of the list in the results
+        :param items: The items of the list
+        :return: The SRO key, or None if the list is empty or has no SRO key
+        """
+        return self.SECTIONS.get(key) if items else None
+
+    def convert(self, key: str, item: dict) -> dict:
+        """Convert an item of a list of the results
+
+        :param key: The key of the list in the results
+        :param item: The item
+        :return: The converted item
+        """
+        return self._converters[key](item)
+
+
+def export(
+    data: dict,
+    formats: list[ExportFormat],
+    output_location: str,
+    time: datetime.datetime | None = None,
+) -> tuple[list[str], list[tuple[ExportFormat, Exception]]]:
+    """Write the scan results in several formats in one pass
+
+    Each item is converted to every format before the next item is read, and
+    the converted items are streamed to their files in chunks. A format that
+    fails is dropped without leaving a partial file, and the other formats are
+    still written.
+
+    :param data: The scan results
+    :param formats: The formats to write
+    :param output_location: The output location
+    :param time: The time in the file names, defaults to None for now
+    :return: The paths of the files written, and each format that failed with
+        its exception
+    """
+    os.makedirs(output_location, exist_ok=True)
+    suffix = (time or datetime.datetime.now()).strftime("%Y%m%d_%H%M%S")
+    writers = {}
+    errors = []
+
+    def drop(fmt: ExportFormat, e: Exception) -> None:
+        writers.pop(fmt).discard()
+        errors.append((fmt, e))
+
+    for fmt in formats:
+        path = os.path.join(output_location, f"{fmt.FILE_PREFIX}_{suffix}.json")
+        writers[fmt] = writer = _JsonStreamWriter(path)
+        try:
+            for key, value in fmt.header(data).items():
+                writer.write_field(key, value)
+        except Exception as e:
+            drop(fmt, e)
+
+    for key, items in data.items():
+        if not isinstance(items, list):
+            continue
+        sections = {}
+        for fmt in list(writers):
+            try:
+                sections[fmt] = fmt.section(key, items)
+                if sections[fmt] is not None:
+                    writers[fmt].begin_list(sections[fmt])
+            except Exception as e:
+                drop(fmt, e)
+
+        for item in items:
+            for fmt in list(writers):
+                if sections[fmt] is None:
+                    continue
+                try:
+                    writers[fmt].write_item(fmt.convert(key, item))
+                except Exception as e:
+                    drop(fmt, e)
+
+        for fmt in list(writers):
+            if sections[fmt] is None:
+                continue
+            try:
+                writers[fmt].end_list()
+            except Exception as e:
+                drop(fmt, e)
+
+    paths = []
+    for fmt, writer in writers.items():
+        try:
+            paths.append(writer.close())
+        except OSError as e:
+            writer.discard()
+            errors.append((fmt, e))
+    return paths, errors
+
+
+class _JsonStreamWriter:
+    """_JsonStreamWriter class writes a JSON object field by field and list
+    item by list item, byte for byte like json.dump with EXPORT_INDENT
+
+    The file is written under a temporary name and only replaces the path once
+    it is complete.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Constructor
+
+        :param path: The path of the file
+        """
+        self._path = path
+        self._tmp_path = f"{path}.tmp{os.getpid()}"
+        self._file: TextIO = open(self._tmp_path, "w")
+        self._file.write("{")
+        self._fields = 0
+        self._items = 0
+        self._pending = []
+
+    def write_field(self, key: str, value) -> None:
+        """Write a field of the object
+
+        :param key: The key
+        :param value: The value
+        """
+        self._begin_field(key)
+        self._file.write(_dumps(value, 1))
+
+    def begin_list(self, key: str) -> None:
+        """Start a list field whose items are written in chunks
+
+        :param key: The key
+        """
+        self._begin_field(key)
+        self._file.write("[")
+        self._items = 0
+
+    def write_item(self, item) -> None:
+        """Add an item to the current list, writing it with the next chunk
+
+        :param item: The item
+        """
+        self._pending.append(item)
+        if len(self._pending) >= EXPORT_CHUNK_ITEMS:
+            self._flush()
+
+    def end_list(self) -> None:
+        """Write the pending items and end the current list"""
+        self._flush()
+        self._file.write(("\n" + _indent(1)) if self._items else "")
+        self._file.write("]")
+
+    def close(self) -> str:
+        """End the object and move the file to its path
+
+        :return: The path
+        """
+        self._file.write("\n}" if self._fields else "}")
+        self._file.close()
+        os.replace(self._tmp_path, self._path)
+        return self._path
+
+    def discard(self) -> None:
+        """Stop writing and remove the file"""
+        self._file.close()
+        try:
+            os.remove(self._tmp_path)
+        except OSError:
+            pass
+
+    def _flush(self) -> None:
+        """Write the pending items of the current list"""
+        if not self._pending:
+            return
+        # encoded at the depth of the list, the chunk is the list without its
+        # brackets, and the closing one is on a line of its own
+        closing = "\n" + _indent(1) + "]"
+        encoded = _dumps(self._pending, 1)[1 : -len(closing)]
+        self._file.write(("," if self._items else "") + encoded)
+        self._items += len(self._pending)
+        self._pending.clear()
+
+    def _begin_field(self, key: str) -> None:
+        """Write the separator and key of a field
+
+        :param key: The key
+        """
+        self._file.write(("," if self._fields else "") + "\n" + _indent(1))
+        self._file.write(json.dumps(key) + ": ")
+        self._fields += 1
+
+
+def _dumps(value, depth: int) -> str:
+    """Encode a value nested in the object
+
+    :param value: The value
+    :param depth: The nesting depth of the value
+    :return: The JSON, its lines after the first indented to the depth
+    """
+    return json.dumps(value, indent=EXPORT_INDENT).replace("\n", "\n" + _indent(depth))
+
+
+def _indent(depth: int) -> str:
+    """Get the indentation of a nesting depth
+
+    :param depth: The nesting depth
+    :return: The indentation
+    """
+    return " " * (EXPORT_INDENT * depth)
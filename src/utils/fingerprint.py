@@ -0,0 +1,134 @@
+import hashlib
+import json
+from typing import Iterable
+
+import numpy as np
+from PIL import Image as PILImage
+from PIL.Image import Image
+
+from models.const import (
+    LC_ID,
+    LC_LEVEL,
+    LC_SUPERIMPOSITION,
+    RELIC_LEVEL,
+    RELIC_MAINSTAT,
+    RELIC_RARITY,
+    RELIC_SET_ID,
+    RELIC_SLOT,
+    RELIC_SUBSTAT_NAME,
+    RELIC_SUBSTAT_VALUE,
+    RELIC_SUBSTATS,
+)
+
+# Width and height of the grayscale thumbnail a crop is reduced to before
+# hashing, fine enough to tell trace level digits apart
+IMAGE_HASH_SIZE = (32, 16)
+
+
+def relic_match_key(relic: dict) -> tuple:
+    """Get the part of a relic that does not change when it is upgraded, except
+    for a substat being added on a level multiple of 3
+
+    :param relic: The relic
+    :return: The set, slot, rarity, main stat and sorted substat keys
+    """
+    return (
+        str(relic[RELIC_SET_ID]),
+        relic[RELIC_SLOT],
+        relic[RELIC_RARITY],
+        relic[RELIC_MAINSTAT],
+        tuple(sorted(s[RELIC_SUBSTAT_NAME] for s in relic[RELIC_SUBSTATS])),
+    )
+
+
+def relic_content_key(relic: dict) -> tuple:
+    """Get everything that identifies a relic's current state
+
+    :param relic: The relic
+    :return: The match key extended with the level and substat values
+    """
+    return relic_match_key(relic) + (
+        relic[RELIC_LEVEL],
+        tuple(
+            sorted(
+                (s[RELIC_SUBSTAT_NAME], s[RELIC_SUBSTAT_VALUE])
+                for s in relic[RELIC_SUBSTATS]
+            )
+        ),
+    )
+
+
+def light_cone_key(light_cone: dict) -> tuple:
+    """Get the key light cones are counted by. Light cones have no distinguishing
+    content beyond this, so identical copies are told apart by occurrence.
+
+    :param light_cone: The light cone
+    :return: The id, level and superimposition
+    """
+    return (
+        str(light_cone[LC_ID]),
+        light_cone[LC_LEVEL],
+        light_cone[LC_SUPERIMPOSITION],
+    )
+
+
+def character_details_key(
+    name: str, path: str, level: int, ascension_probes: list[bool]
+) -> tuple:
+    """Get the part of a character that is shown on the details tab
+
+    :param name: The name
+    :param path: The path
+    :param level: The level
+    :param ascension_probes: Whether each ascension star is lit
+    :return: The name, path, level and ascension stars
+    """
+    return (name, path, level, [bool(p) for p in ascension_probes])
+
+
+def image_hash(images: Iterable[Image], size: tuple[int, int] = IMAGE_HASH_SIZE) -> str:
+    """Hash crops by their appearance. Each crop is reduced to a thumbnail and
+    thresholded at its mean, so capture noise does not change the hash.
+
+    :param images: The crops
+    :param size: The size of the thumbnails, defaults to IMAGE_HASH_SIZE
+    :return: The digest
+    """
+    bits = []
+    for img in images:
+        thumb = np.asarray(
+            img.convert("L").resize(size, PILImage.BILINEAR),
+            dtype=np.float32,
+        )
+        bits.append(np.packbits(thumb > thumb.mean()))
+    return hashlib.sha1(b"".join(b.tobytes() for b in bits)).hexdigest()[:16]
+
+
+def hash_key(key: tuple) -> str:
+    """Hash a key into a short, stable hex digest
+
+    :param key: The key
+    :return: The digest
+    """
+    return hashlib.sha1(
+        json.dumps(key, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()[:16]
+
+
+def fingerprint_items(items: list[dict], key_fn) -> list[str]:
+    """Fingerprint a list of items. Identical items get the same digest with an
+    increasing occurrence suffix, so rescanning the same inventory produces the
+    same fingerprints.
+
+    :param items: The items
+    :param key_fn: The function returning the key of an item
+    :return: The fingerprints in the same order as the items
+    """
+    seen = {}
+    res = []
+    for item in items:
+        digest = hash_key(key_fn(item))
+        n = seen.get(digest, 0)
+        seen[digest] = n + 1
+        res.append(f"{digest}-{n}")
+    return res
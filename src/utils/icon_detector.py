@@ -0,0 +1,73 @@
+import cv2
+import numpy as np
+from PIL.Image import Image
+
+# Match thresholds, a crop contains the icon if its best match scores above them
+LOCK_CONFIDENCE = 0.3
+LIGHT_CONE_LOCK_CONFIDENCE = 0.1
+DISCARD_CONFIDENCE = 0.3
+TRAILBLAZER_CONFIDENCE = 0.8
+
+
+class IconDetector:
+    """IconDetector class matches an icon template against screenshot crops
+
+    The template is resized and converted to a NumPy array once per crop size
+    and cached, and crops are matched with cv2.matchTemplate directly. Scores
+    and decisions are the same as pyautogui.locate with a confidence, which
+    resized and converted the template on every call.
+    """
+
+    def __init__(self, icon: Image, square: bool = False) -> None:
+        """Constructor
+
+        :param icon: The icon template
+        :param square: Whether the template is resized to a square of the
+            smallest crop dimension instead of the crop size, defaults to False
+        """
+        self._icon = icon
+        self._square = square
+        self._templates = {}
+
+    def score(self, img: Image) -> float:
+        """Get the best match score of the icon in a crop
+
+        :param img: The crop
+        :return: The normalized correlation coefficient in [-1, 1], NaN if the
+            crop or template has no contrast
+        """
+        size = (min(img.size),) * 2 if self._square else img.size
+        res = cv2.matchTemplate(
+            _to_array(img), self._get_template(size), cv2.TM_CCOEFF_NORMED
+        )
+        return float(res.max())
+
+    def detect(self, img: Image, confidence: float) -> bool:
+        """Check whether a crop contains the icon
+
+        :param img: The crop
+        :param confidence: The score the match has to exceed
+        :return: True if the icon is found
+        """
+        return self.score(img) > confidence
+
+    def _get_template(self, size: tuple[int, int]) -> np.ndarray:
+        """Get the template resized to a size, preparing it on first use
+
+        :param size: The template size
+        :return: The template as an RGB array
+        """
+        template = self._templates.get(size)
+        if template is None:
+            template = _to_array(self._icon.resize(size))
+            self._templates[size] = template
+        return template
+
+
+def _to_array(img: Image) -> np.ndarray:
+    """Convert an image to an RGB array without copying RGB images
+
+    :param img: The image
+    :return: The RGB array
+    """
+    return np.asarray(img if img.mode == "RGB" else img.convert("RGB"))
@@ -0,0 +1,227 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable
+
+import cv2
+import numpy as np
+from PIL import Image as PILImage
+from PIL.Image import Image
+
+# Coarse pyramid levels are added while the template keeps at least this many
+# pixels on its shortest side
+PYRAMID_MIN_TEMPLATE_DIM = 16
+
+# Pixels around a coarse hit that are searched again on the next finer level
+REFINE_MARGIN = 2
+
+# Pixels around the last found position that are searched to verify it
+VERIFY_MARGIN = 4
+
+
+@dataclass(frozen=True)
+class LocatorMatch:
+    """The best match of a template on screen"""
+
+    # The screen coordinates of the center of the match
+    point: tuple[int, int]
+    # The normalized correlation coefficient of the match at full resolution
+    confidence: float
+    # The screen rect of the match
+    rect: tuple[int, int, int, int]
+
+
+class ImageLocator:
+    """ImageLocator class finds a template inside a window region of the screen
+
+    The region is searched coarse-to-fine on an image pyramid, so the full
+    resolution match only runs on a few pixels around the coarse hit. The last
+    position found with enough confidence is kept per window geometry and
+    verified with a small grab first, which skips the search entirely while the
+    window does not move.
+    """
+
+    def __init__(self, template: Image, size: tuple[float, float]) -> None:
+        """Constructor
+
+        :param template: The template image
+        :param size: The width and height of the template in % of the window
+        """
+        self._template = template
+        self._size = size
+        self._templates = {}
+        self._last_found = {}
+
+    def locate(
+        self,
+        grab: Callable[[tuple[int, int, int, int]], Image],
+        geometry: tuple[int, int, int, int],
+        search_rects: list[tuple[int, int, int, int]],
+        min_confidence: float,
+    ) -> LocatorMatch | None:
+        """Locate the template on screen
+
+        :param grab: The function that grabs a screen rect as an image
+        :param geometry: The left, top, width and height of the client area
+        :param search_rects: The screen rects to search in order until one has a
+            match with enough confidence
+        :param min_confidence: The confidence a match needs to be accepted
+        :return: The accepted match, else the best rejected match, None if the
+            template does not fit in any search rect
+        """
+        template = self._get_template(geometry[2:])
+
+        last_found = self._last_found.get(geometry)
+        if last_found is not None:
+            match = self._match(grab, _expand(last_found, VERIFY_MARGIN), template)
+            if match is not None and match.confidence >= min_confidence:
+                return match
+            del self._last_found[geometry]
+
+        best = None
+        for rect in search_rects:
+            match = self._search(grab, rect, template)
+            if match is None:
+                continue
+            if match.confidence >= min_confidence:
+                self._last_found[geometry] = match.rect
+                return match
+            if best is None or match.confidence > best.confidence:
+                best = match
+        return best
+
+    def _search(
+        self,
+        grab: Callable[[tuple[int, int, int, int]], Image],
+        rect: tuple[int, int, int, int],
+        template: list,
+    ) -> LocatorMatch | None:
+        """Search a screen rect coarse-to-fine
+
+        :param grab: The function that grabs a screen rect as an image
+        :param rect: The screen rect to search
+        :param template: The template pyramid, full resolution first
+        :return: The best match, None if the template does not fit in the rect
+        """
+        haystack = _to_array(grab(rect))
+        h, w = template[0].shape[:2]
+        if haystack.shape[0] < h or haystack.shape[1] < w:
+            return None
+
+        pyramid = [haystack]
+        for level in template[1:]:
+            down = cv2.pyrDown(pyramid[-1])  # type: ignore
+            if down.shape[0] < level.shape[0] or down.shape[1] < level.shape[1]:
+                break
+            pyramid.append(down)
+
+        # best match on the coarsest level, then refine it level by level
+        level = len(pyramid) - 1
+        x, y = _best(pyramid[level], template[level])[1]
+        while level > 0:
+            level -= 1
+            th, tw = template[level].shape[:2]
+            img = pyramid[level]
+            left = max(2 * x - REFINE_MARGIN, 0)
+            top = max(2 * y - REFINE_MARGIN, 0)
+            right = min(2 * x + tw + REFINE_MARGIN, img.shape[1])
+            bottom = min(2 * y + th + REFINE_MARGIN, img.shape[0])
+            dx, dy = _best(img[top:bottom, left:right], template[level])[1]
+            x, y = left + dx, top + dy
+
+        confidence = _best(haystack[y : y + h, x : x + w], template[0])[0]
+        return _to_match(rect[0] + x, rect[1] + y, w, h, confidence)
+
+    def _match(
+        self,
+        grab: Callable[[tuple[int, int, int, int]], Image],
+        rect: tuple[int, int, int, int],
+        template: list,
+    ) -> LocatorMatch | None:
+        """Match the template at full resolution only, for small rects
+
+        :param grab: The function that grabs a screen rect as an image
+        :param rect: The screen rect to match in
+        :param template: The template pyramid, full resolution first
+        :return: The best match, None if the template does not fit in the rect
+        """
+        haystack = _to_array(grab(rect))
+        h, w = template[0].shape[:2]
+        if haystack.shape[0] < h or haystack.shape[1] < w:
+            return None
+        confidence, (x, y) = _best(haystack, template[0])
+        return _to_match(rect[0] + x, rect[1] + y, w, h, confidence)
+
+    def _get_template(self, window_size: tuple[int, int]) -> list[np.ndarray]:
+        """Get the template pyramid for a window size, building it on first use
+
+        :param window_size: The width and height of the client area
+        :return: The template pyramid, full resolution first
+        """
+        template = self._templates.get(window_size)
+        if template is None:
+            size = (
+                int(window_size[0] * self._size[0]),
+                int(window_size[1] * self._size[1]),
+            )
+            template = [_to_array(self._template.resize(size))]
+            while min(template[-1].shape[:2]) // 2 >= PYRAMID_MIN_TEMPLATE_DIM:
+                template.append(cv2.pyrDown(template[-1]))  # type: ignore
+            self._templates[window_size] = template
+        return template
+
+
+@lru_cache(maxsize=8)
+def get_image_locator(path: str, size: tuple[float, float]) -> ImageLocator:
+    """Get the locator of a template image. Cached, so found positions are kept
+    across scans.
+
+    :param path: The path of the template image
+    :param size: The width and height of the template in % of the window
+    :return: The locator
+    """
+    return ImageLocator(PILImage.open(path), size)
+
+
+def _best(haystack: np.ndarray, needle: np.ndarray) -> tuple[float, tuple[int, int]]:
+    """Match a needle in a haystack
+
+    :param haystack: The haystack
+    :param needle: The needle
+    :return: The best score and its top left position
+    """
+    res = cv2.matchTemplate(haystack, needle, cv2.TM_CCOEFF_NORMED)  # type: ignore
+    _, max_val, _, max_loc = cv2.minMaxLoc(res)  # type: ignore
+    # flat regions score NaN, which must never pass a confidence check
+    return (max_val if np.isfinite(max_val) else -1.0), max_loc
+
+
+def _to_match(x: int, y: int, w: int, h: int, confidence: float) -> LocatorMatch:
+    """Build a match from its screen position
+
+    :param x: The screen x coordinate of the top left corner
+    :param y: The screen y coordinate of the top left corner
+    :param w: The width
+    :param h: The height
+    :param confidence: The confidence
+    :return: The match
+    """
+    return LocatorMatch((x + w // 2, y + h // 2), confidence, (x, y, x + w, y + h))
+
+
+def _expand(rect: tuple[int, int, int, int], margin: int) -> tuple[int, int, int, int]:
+    """Grow a rect on all sides
+
+    :param rect: The rect
+    :param margin: The number of pixels to grow by
+    :return: The grown rect
+    """
+    return rect[0] - margin, rect[1] - margin, rect[2] + margin, rect[3] + margin
+
+
+def _to_array(img: Image) -> np.ndarray:
+    """Convert an image to an RGB array
+
+    :param img: The image
+    :return: The RGB array
+    """
+    return np.asarray(img if img.mode == "RGB" else img.convert("RGB"))
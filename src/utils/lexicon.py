@@ -0,0 +1,142 @@
+import os
+import tempfile
+from typing import TYPE_CHECKING, Iterable
+
+from enums.ocr_field import OcrField
+from utils.data import safe_file_name
+
+if TYPE_CHECKING:
+    from models.game_data import GameData
+
+LEXICON_DIR = os.path.join(tempfile.gettempdir(), "HSR-Scanner", "lexicon")
+
+# Tesseract user patterns of the numeric fields, \d being any digit
+SUB_STAT_VALUE_PATTERNS = (
+    "\\d",
+    "\\d\\d",
+    "\\d\\d\\d",
+    "\\d.\\d",
+    "\\d.\\d%",
+    "\\d\\d.\\d%",
+)
+FIELD_PATTERNS = {
+    OcrField.RELIC_LEVEL: ("\\d", "\\d\\d"),
+    OcrField.RELIC_SUB_STAT_VALUES: SUB_STAT_VALUE_PATTERNS,
+    # one name and value per line
+    OcrField.RELIC_SUB_STATS: SUB_STAT_VALUE_PATTERNS,
+    OcrField.LIGHT_CONE_LEVEL: ("\\d/\\d\\d", "\\d\\d/\\d\\d"),
+    OcrField.CHARACTER_LEVEL: ("\\d", "\\d\\d"),
+    OcrField.TRACE_LEVEL: ("\\d/\\d", "\\d/\\d\\d", "\\d\\d/\\d\\d"),
+}
+
+
+class Lexicon:
+    """Lexicon class writes the user words and user patterns Tesseract is
+    biased towards for each OCR field
+
+    The words come from the closed vocabularies in GameData, so names and stats
+    are more often read exactly and fuzzy matching has less to fix. The files
+    are written once per database version and kept in LEXICON_DIR.
+    """
+
+    def __init__(self, game_data: "GameData", directory: str = LEXICON_DIR) -> None:
+        """Constructor
+
+        :param game_data: The GameData class instance
+        :param directory: The directory the files are kept in, defaults to
+            LEXICON_DIR
+        """
+        directory = os.path.join(directory, safe_file_name(str(game_data.version)))
+        os.makedirs(directory, exist_ok=True)
+        directory = _short_path(directory)
+
+        self._configs = {}
+        # pytesseract splits the config on whitespace, so a path with spaces
+        # can not be passed
+        if any(c.isspace() for c in directory):
+            return
+
+        words = field_words(game_data)
+        for field in OcrField:
+            config = []
+            if field in words:
+                path = os.path.join(directory, f"{field.value}.user-words")
+                _write_lines(path, words[field])
+                config.append(f"--user-words {path}")
+            if field in FIELD_PATTERNS:
+                path = os.path.join(directory, f"{field.value}.user-patterns")
+                _write_lines(path, FIELD_PATTERNS[field])
+                config.append(f"--user-patterns {path}")
+            if config:
+                self._configs[field] = " ".join(config)
+
+    def config(self, field: OcrField) -> str:
+        """Get the Tesseract options of a field
+
+        :param field: The field
+        :return: The options, empty if there is no lexicon for the field
+        """
+        return self._configs.get(field, "")
+
+
+def field_words(game_data: "GameData") -> dict[OcrField, list[str]]:
+    """Get the words each OCR field can contain
+
+    :param game_data: The GameData class instance
+    :return: The sorted words of each field that has a vocabulary
+    """
+    # imported with the game data, which is loaded by now
+    from models.game_data import PATHS, RELIC_MAIN_STATS, RELIC_SUB_STATS
+
+    character_names = [
+        name.split("#")[-1] for name in game_data.CHARACTER_META_DATA
+    ] + ["Trailblazer"]
+    return {
+        OcrField.RELIC_NAME: _words(game_data.RELIC_META_DATA),
+        OcrField.RELIC_MAIN_STAT: _words(RELIC_MAIN_STATS),
+        OcrField.RELIC_SUB_STAT_NAMES: _words(RELIC_SUB_STATS),
+        OcrField.RELIC_SUB_STATS: _words(RELIC_SUB_STATS),
+        OcrField.LIGHT_CONE_NAME: _words(game_data.LIGHT_CONE_META_DATA),
+        # read as "Path / Name"
+        OcrField.CHARACTER_NAME: _words([*character_names, *PATHS, "/"]),
+    }
+
+
+def _words(names: Iterable[str]) -> list[str]:
+    """Split names into the words Tesseract matches one at a time
+
+    :param names: The names
+    :return: The sorted distinct words
+    """
+    return sorted({word for name in names for word in name.split()})
+
+
+def _write_lines(path: str, lines: Iterable[str]) -> None:
+    """Write a file once, lines being the same for the same database version
+
+    :param path: The path
+    :param lines: The lines
+    """
+    if os.path.isfile(path):
+        return
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, path)
+
+
+def _short_path(path: str) -> str:
+    """Get the 8.3 form of a path on Windows, which has no spaces
+
+    :param path: The existing path
+    :return: The short path, or the path as is where it has no short form
+    """
+    try:
+        # imported here so the lexicon works without pywin32
+        import win32api
+    except ImportError:
+        return path
+    try:
+        return win32api.GetShortPathName(path)
+    except Exception:
+        return path
@@ -0,0 +1,146 @@
+import datetime
+import os
+from collections import deque
+from typing import Callable
+
+from enums.log_level import LogLevel
+
+# Records buffered between two drains before new ones are dropped
+MAX_BUFFERED_RECORDS = 10000
+
+# Interval at which the UI appends the buffered lines to the log box
+LOG_FLUSH_INTERVAL_MS = 100
+
+# Lines kept in the log box, the log file always has the full log
+MAX_LOG_LINES = 5000
+
+# Levels that are only recorded in debug mode
+DEBUG_LEVELS = {LogLevel.DEBUG, LogLevel.TRACE}
+
+
+class LogSink:
+    """LogSink class collects log records from any thread and hands them to the
+    UI thread in batches
+
+    Producers only append to a deque, which is atomic and never blocks. Once the
+    buffer is full, new records are counted and dropped until the next drain.
+    The UI thread drains it on a timer and streams the lines to the log file if
+    one is open.
+    """
+
+    def __init__(self, capacity: int = MAX_BUFFERED_RECORDS) -> None:
+        """Constructor
+
+        :param capacity: The maximum number of buffered records, defaults to
+            MAX_BUFFERED_RECORDS
+        """
+        self._buffer = deque()
+        self._capacity = capacity
+        self._dropped = 0
+        self._debug = False
+        self._file = None
+
+    def set_debug(self, debug: bool) -> None:
+        """Set whether DEBUG and TRACE records are kept
+
+        :param debug: The debug flag
+        """
+        self._debug = debug
+
+    def is_enabled(self, level: LogLevel) -> bool:
+        """Check whether records of a level are kept
+
+        :param level: The log level
+        :return: True if the level is enabled
+        """
+        return self._debug or level not in DEBUG_LEVELS
+
+    def log(
+        self,
+        msg: str | Exception | Callable[[], str],
+        level: LogLevel = LogLevel.INFO,
+    ) -> None:
+        """Record a log message. Safe to call from any thread.
+
+        :param msg: The message, or a function building it that is only called if
+            the level is enabled
+        :param level: The log level, defaults to LogLevel.INFO
+        """
+        if not self.is_enabled(level):
+            return
+        if len(self._buffer) >= self._capacity:
+            self._dropped += 1
+            return
+        if callable(msg):
+            msg = msg()
+        self._buffer.append((datetime.datetime.now(), level, str(msg)))
+
+    def drain(self) -> list[str]:
+        """Take all buffered records and format them. Must only be called from a
+        single thread.
+
+        :return: The formatted log lines
+        """
+        lines = []
+        while True:
+            try:
+                lines.append(_format_record(*self._buffer.popleft()))
+            except IndexError:
+                break
+
+        if self._dropped:
+            dropped, self._dropped = self._dropped, 0
+            lines.append(
+                _format_record(
+                    datetime.datetime.now(),
+                    LogLevel.WARNING,
+                    f"{dropped} log line(s) dropped, the log is being written faster than it can be displayed.",
+                )
+            )
+
+        if self._file and lines:
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+
+        return lines
+
+    def take_records(self) -> list[tuple[LogLevel, str]]:
+        """Take all buffered records unformatted, e.g. to relay them to the sink
+        of another process. Must only be called from a single thread.
+
+        :return: The level and message of each record
+        """
+        records = []
+        while True:
+            try:
+                _, level, msg = self._buffer.popleft()
+            except IndexError:
+                return records
+            records.append((level, msg))
+
+    def open_file(self, path: str) -> None:
+        """Stream all further log lines to a file
+
+        :param path: The path to the log file
+        """
+        self.close_file()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def close_file(self) -> None:
+        """Stop streaming to the log file"""
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+def _format_record(time: datetime.datetime, level: LogLevel, msg: str) -> str:
+    """Format a log record as a log line
+
+    :param time: The time of the record
+    :param level: The log level
+    :param msg: The message
+    :return: The log line
+    """
+    return f"[{time.strftime('%H:%M:%S')}] [{level.value}] > {msg}"
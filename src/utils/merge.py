@@ -0,0 +1,202 @@
+import argparse
+import datetime
+import os
+
+from models.const import (
+    RELIC_DISCARD,
+    RELIC_LEVEL,
+    RELIC_LOCATION,
+    RELIC_LOCK,
+    RELIC_SUBSTAT_NAME,
+    RELIC_SUBSTAT_VALUE,
+    RELIC_SUBSTATS,
+)
+from utils.data import get_json_data, save_to_json
+from utils.fingerprint import relic_content_key, relic_match_key
+
+MUTABLE_RELIC_KEYS = (RELIC_LOCATION, RELIC_LOCK, RELIC_DISCARD)
+
+
+class RelicMergeResult:
+    """RelicMergeResult class holds the outcome of merging recent relics into
+    a previous inventory"""
+
+    def __init__(self) -> None:
+        """Constructor"""
+        self.relics = []
+        self.added = []
+        self.upgraded = []
+        self.unchanged = []
+
+    def summary(self) -> str:
+        """Get a one line summary of the merge
+
+        :return: The summary
+        """
+        return (
+            f"{len(self.added)} added, {len(self.upgraded)} upgraded, "
+            f"{len(self.unchanged)} unchanged, {len(self.relics)} relics in total."
+        )
+
+
+class RelicIndex:
+    """RelicIndex class is a hash index of relics on their match key
+
+    A relic keeps its match key when it is upgraded, unless a fourth substat is
+    added, so an upgraded relic is looked up under its own key and under every
+    key with one of its substats removed.
+    """
+
+    def __init__(self, relics: list[dict]) -> None:
+        """Constructor
+
+        :param relics: The relics to index
+        """
+        self._index = {}
+        for i, relic in enumerate(relics):
+            self._index.setdefault(relic_match_key(relic), []).append(i)
+        self._relics = relics
+
+    def pop_match(self, relic: dict, upgrades: bool = True) -> tuple[int, bool] | None:
+        """Find and remove the indexed relic that a relic is the same as, or an
+        upgraded version of
+
+        :param relic: The relic
+        :param upgrades: Whether to match a relic the relic is an upgraded
+            version of, defaults to True
+        :return: The position of the match and whether it is unchanged, or None
+        """
+        key = relic_match_key(relic)
+        content_key = relic_content_key(relic)
+
+        candidates = self._index.get(key, [])
+        for i in candidates:
+            if relic_content_key(self._relics[i]) == content_key:
+                candidates.remove(i)
+                return i, True
+        if not upgrades:
+            return None
+
+        keys = [key]
+        substat_keys = key[-1]
+        keys += [
+            key[:-1] + (substat_keys[:j] + substat_keys[j + 1 :],)
+            for j in range(len(substat_keys))
+        ]
+
+        best = None
+        for k in keys:
+            for i in self._index.get(k, []):
+                old = self._relics[i]
+                if not _is_upgrade(old, relic):
+                    continue
+                if (
+                    best is None
+                    or old[RELIC_LEVEL] > self._relics[best[1]][RELIC_LEVEL]
+                ):
+                    best = (k, i)
+
+        if best is None:
+            return None
+        self._index[best[0]].remove(best[1])
+        return best[1], False
+
+
+def _is_upgrade(old: dict, new: dict) -> bool:
+    """Check whether a relic could have been upgraded into another. Assumes the
+    match keys were already compared.
+
+    :param old: The previous relic
+    :param new: The upgraded relic
+    :return: True if new is an upgrade of old
+    """
+    if old[RELIC_LEVEL] >= new[RELIC_LEVEL]:
+        return False
+
+    new_values = {
+        s[RELIC_SUBSTAT_NAME]: s[RELIC_SUBSTAT_VALUE] for s in new[RELIC_SUBSTATS]
+    }
+    return all(
+        s[RELIC_SUBSTAT_NAME] in new_values
+        and s[RELIC_SUBSTAT_VALUE] <= new_values[s[RELIC_SUBSTAT_NAME]]
+        for s in old[RELIC_SUBSTATS]
+    )
+
+
+def merge_relics(relics: list[dict], recent_relics: list[dict]) -> RelicMergeResult:
+    """Merge a recent relics scan into a previous list of relics
+
+    Relics that are already known only get their location, lock and discard
+    updated. Upgraded relics replace their previous version in place, and new
+    relics are appended.
+
+    :param relics: The previous relics
+    :param recent_relics: The relics from the recent relics scan
+    :return: The merge result
+    """
+    res = RelicMergeResult()
+    res.relics = list(relics)
+    index = RelicIndex(relics)
+
+    for relic in recent_relics:
+        match = index.pop_match(relic)
+        if match is None:
+            res.relics.append(relic)
+            res.added.append(relic)
+            continue
+
+        i, unchanged = match
+        if unchanged:
+            merged = dict(relics[i])
+            merged.update({k: relic[k] for k in MUTABLE_RELIC_KEYS})
+            res.unchanged.append(merged)
+        else:
+            merged = relic
+            res.upgraded.append((relics[i], relic))
+        res.relics[i] = merged
+
+    return res
+
+
+def merge_export(export: dict, recent: dict) -> tuple[dict, RelicMergeResult]:
+    """Merge a recent relics scan export into a previous full export
+
+    :param export: The previous full export
+    :param recent: The recent relics scan export
+    :return: The merged export and the merge result
+    """
+    res = merge_relics(export.get("relics", []), recent.get("relics", []))
+    merged = dict(export)
+    merged["relics"] = res.relics
+    if recent.get("metadata", {}).get("uid"):
+        merged["metadata"] = recent["metadata"]
+    return merged, res
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Merge a recent relics scan into a previous full scan export."
+    )
+    parser.add_argument("export", help="The previous full scan export")
+    parser.add_argument("recent", help="The recent relics scan export")
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="The output file, defaults to a new HSRScanData file next to the export",
+    )
+    args = parser.parse_args()
+
+    merged, res = merge_export(get_json_data(args.export), get_json_data(args.recent))
+
+    output = args.output or os.path.join(
+        os.path.dirname(os.path.abspath(args.export)),
+        f"HSRScanData_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+    )
+    save_to_json(
+        merged, os.path.dirname(os.path.abspath(output)), os.path.basename(output)
+    )
+    print(f"Merged: {res.summary()} Saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
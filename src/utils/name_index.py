@@ -0,0 +1,189 @@
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image as PILImage
+from PIL.Image import Image
+
+from utils.data import safe_file_name
+
+NAME_INDEX_DIR = os.path.join(tempfile.gettempdir(), "HSR-Scanner", "name_index")
+
+# Width and height of the grayscale thumbnail a name crop is reduced to before
+# it is binarized, fine enough to tell names that differ by one word apart
+NAME_EMBEDDING_SIZE = (128, 16)
+
+# Pixels that differ from the median of a crop by more than this are text, the
+# rest is background. Rows and columns with a smaller share of text pixels are
+# capture noise and left out of the bounding box of the text.
+NAME_INK_CONTRAST = 48
+NAME_INK_MIN_SHARE = 0.02
+
+# Share of the embedding bits two crops of the same name may differ by
+NAME_MATCH_MAX_DISTANCE = 0.06
+
+# Edit distance from its OCR'd text to the name it resolved to, up to which a
+# crop is added to the index. A looser match may be a misread resolved to the
+# wrong name, which the index would repeat for every crop that looks like it.
+NAME_INDEX_MAX_OCR_DISTANCE = 2
+
+# Number of embeddings kept per index, the least recently matched are evicted
+NAME_INDEX_MAX_ENTRIES = 4096
+
+# Number of set bits of each byte value
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+
+class NameIndex:
+    """NameIndex class recognizes name crops that look like crops resolved
+    before, so they do not have to be read by OCR
+
+    Each resolved crop is kept as a binarized thumbnail with the name it
+    resolved to. A new crop is matched to its nearest thumbnail by Hamming
+    distance, and only a match that is close enough and not shared with a
+    different name is a hit. The index is bounded by NAME_INDEX_MAX_ENTRIES and
+    can be saved to a file per database version, so it carries over to later
+    scans.
+    """
+
+    def __init__(
+        self, path: str | None = None, max_entries: int = NAME_INDEX_MAX_ENTRIES
+    ) -> None:
+        """Constructor
+
+        :param path: The file the index is saved to, defaults to None for an
+            index that is not saved
+        :param max_entries: The number of embeddings kept, defaults to
+            NAME_INDEX_MAX_ENTRIES
+        """
+        self._path = path
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._matrix = None
+        self._names = []
+        self._changed = False
+
+    @classmethod
+    def for_database(
+        cls, kind: str, version: str, directory: str = NAME_INDEX_DIR
+    ) -> "NameIndex":
+        """Load the index of a kind of name saved by earlier scans
+
+        :param kind: The kind of name, e.g. RELIC or LIGHT_CONE
+        :param version: The database version, names resolve differently across
+            versions
+        :param directory: The directory the files are kept in, defaults to
+            NAME_INDEX_DIR
+        :return: The index, empty if no readable file was saved
+        """
+        index = cls(os.path.join(directory, safe_file_name(version), f"{kind}.json"))
+        try:
+            with open(index._path, encoding="utf-8") as f:  # type: ignore
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return index
+        for embedding, name in entries[-index._max_entries :]:
+            index._entries[bytes.fromhex(embedding)] = name
+        return index
+
+    def lookup(self, img: Image) -> str | None:
+        """Recognize a name crop
+
+        :param img: The name crop
+        :return: The name, or None if no resolved crop is close enough
+        """
+        embedding = _embed(img)
+        with self._lock:
+            name = self._entries.get(embedding)
+            if name is None:
+                return self._nearest(embedding)
+            self._entries.move_to_end(embedding)
+            return name
+
+    def add(self, img: Image, name: str) -> None:
+        """Add a resolved name crop. Safe to call from any thread.
+
+        :param img: The name crop
+        :param name: The name it resolved to
+        """
+        embedding = _embed(img)
+        with self._lock:
+            if self._entries.get(embedding) == name:
+                self._entries.move_to_end(embedding)
+                return
+            self._entries[embedding] = name
+            self._entries.move_to_end(embedding)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            self._matrix = None
+            self._changed = True
+
+    def save(self) -> None:
+        """Write the index to its file if anything was added"""
+        with self._lock:
+            if not self._changed or self._path is None:
+                return
+            entries = [[e.hex(), name] for e, name in self._entries.items()]
+            self._changed = False
+
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        tmp_path = f"{self._path}.tmp{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, separators=(",", ":"))
+        os.replace(tmp_path, self._path)
+
+    def _nearest(self, embedding: bytes) -> str | None:
+        """Find the name of the nearest embedding. The lock must be held.
+
+        :param embedding: The embedding
+        :return: The name, or None if the nearest embedding is too far or an
+            embedding of another name is as close
+        """
+        if not self._entries:
+            return None
+        if self._matrix is None:
+            self._matrix = np.frombuffer(
+                b"".join(self._entries), dtype=np.uint8
+            ).reshape(len(self._entries), -1)
+            self._names = list(self._entries.values())
+
+        query = np.frombuffer(embedding, dtype=np.uint8)
+        distances = _POPCOUNT[self._matrix ^ query].sum(axis=1)
+        max_distance = NAME_MATCH_MAX_DISTANCE * len(embedding) * 8
+        close = np.flatnonzero(distances <= max_distance)
+        if not len(close):
+            return None
+        names = {self._names[i] for i in close}
+        if len(names) > 1:
+            return None
+
+        nearest = int(close[np.argmin(distances[close])])
+        # moving an entry does not change the rows of the matrix
+        self._entries.move_to_end(bytes(self._matrix[nearest]))
+        return self._names[nearest]
+
+
+def _embed(img: Image) -> bytes:
+    """Reduce a name crop to a thumbnail of its text thresholded at its mean.
+    The crop is first cut to the bounding box of the text, so a name that is
+    captured a few pixels off, or over a brighter background, changes few bits.
+
+    :param img: The name crop
+    :return: The packed bits of the thumbnail
+    """
+    gray = img.convert("L")
+    pixels = np.asarray(gray, dtype=np.int16)
+    ink = np.abs(pixels - int(np.median(pixels))) > NAME_INK_CONTRAST
+    rows = np.flatnonzero(ink.mean(axis=1) > NAME_INK_MIN_SHARE)
+    cols = np.flatnonzero(ink.mean(axis=0) > NAME_INK_MIN_SHARE)
+    if len(rows) and len(cols):
+        gray = gray.crop((cols[0], rows[0], cols[-1] + 1, rows[-1] + 1))
+
+    thumb = np.asarray(
+        gray.resize(NAME_EMBEDDING_SIZE, PILImage.BILINEAR), dtype=np.float32
+    )
+    return np.packbits(thumb > thumb.mean()).tobytes()
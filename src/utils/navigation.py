@@ -1,9 +1,6 @@
 import time
 
-import cv2
-import numpy as np
 import pyautogui
-import vgamepad as vg
 import win32gui
 from pynput import keyboard, mouse
 
@@ -28,10 +25,21 @@ class Navigation:
 
         self._mouse = mouse.Controller()
         self._keyboard = keyboard.Controller()
-        self._gamepad = vg.VX360Gamepad()
+        self._gamepad = None
+
+    def connect_gamepad(self) -> None:
+        """Plug in the virtual gamepad if it is not plugged in yet. Only the
+        character scan needs it, so vgamepad is imported here instead of at
+        startup.
+        """
+        if self._gamepad is None:
+            import vgamepad as vg
+
+            self._gamepad = vg.VX360Gamepad()
 
     def enter_gamepad(self) -> None:
         """Perform a minimal gamepad operation to ensure gamepad controls are enabled"""
+        self.connect_gamepad()
         self._gamepad.right_joystick_float(0, 0.5)
         self._gamepad.update()
         time.sleep(0.1)
@@ -46,6 +54,9 @@ class Navigation:
 
     def press_gamepad_rb(self) -> None:
         """Press the right button on the gamepad"""
+        import vgamepad as vg
+
+        self.connect_gamepad()
         self._gamepad.press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_RIGHT_SHOULDER)
         self._gamepad.update()
         time.sleep(0.1)  # Ensure the button press is registered
@@ -54,6 +65,9 @@ class Navigation:
 
     def press_gamepad_lb(self) -> None:
         """Press the left button on the gamepad"""
+        import vgamepad as vg
+
+        self.connect_gamepad()
         self._gamepad.press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_LEFT_SHOULDER)
         self._gamepad.update()
         time.sleep(0.1)
@@ -84,27 +98,12 @@ class Navigation:
 
         self._mouse.position = (x, y)
 
-    def move_cursor_to_image(self, haystack: object, needle: object) -> None:
-        """Move the cursor to the center of the needle image in the haystack image
+    def move_cursor_to_point(self, point: tuple[int, int]) -> None:
+        """Move the cursor to precompiled screen coordinates
 
-        :param haystack: The haystack image
-        :param needle: The needle image
+        :param point: The screen coordinates
         """
-        haystack = np.array(haystack)
-        needle = np.array(needle)
-
-        pos = cv2.matchTemplate(haystack, needle, cv2.TM_CCOEFF_NORMED)  # type: ignore
-        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(pos)  # type: ignore
-
-        offset_x = 0.5 * needle.shape[1] / haystack.shape[1]
-        offset_y = 0.5 * needle.shape[0] / haystack.shape[0]
-
-        pos = (
-            max_loc[0] / haystack.shape[1] + offset_x,
-            max_loc[1] / haystack.shape[0] + offset_y,
-        )
-
-        self.move_cursor_to(*pos)
+        self._mouse.position = point
 
     def key_tap(self, key: keyboard.Key | keyboard.KeyCode | str) -> None:
         """Tap a key
@@ -1,4 +1,7 @@
 import os
+import subprocess
+import threading
+from typing import TYPE_CHECKING
 
 import cv2
 import numpy as np
@@ -6,11 +9,68 @@ import pytesseract
 from PIL import Image as PILImage
 from PIL.Image import Image
 
+from enums.ocr_field import OcrField
 from utils.data import resource_path
 
-# set environment variables for Tesseract
-os.environ["TESSDATA_PREFIX"] = resource_path("assets/tesseract/tessdata")
-pytesseract.pytesseract.tesseract_cmd = resource_path("assets/tesseract/tesseract.exe")
+if TYPE_CHECKING:
+    from utils.lexicon import Lexicon
+
+TESSERACT_CMD = resource_path("assets/tesseract/tesseract.exe")
+TESSDATA_DIR = resource_path("assets/tesseract/tessdata")
+
+# set environment variables for Tesseract, falling back to the Tesseract on the
+# PATH where it is not bundled, e.g. when benchmarking on Linux
+if os.path.isdir(TESSDATA_DIR):
+    os.environ["TESSDATA_PREFIX"] = TESSDATA_DIR
+if os.path.isfile(TESSERACT_CMD):
+    pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+
+# Priority class Tesseract is started with by threads that lower it, 0 where
+# processes have no priority class
+TESSERACT_LOW_PRIORITY_CLASS = getattr(subprocess, "BELOW_NORMAL_PRIORITY_CLASS", 0)
+
+# The lexicon recognition is biased towards, see use_lexicon
+_lexicon = None
+
+# Whether each thread starts Tesseract below normal priority, see
+# lower_tesseract_priority
+_thread_state = threading.local()
+_pytesseract_subprocess_args = pytesseract.pytesseract.subprocess_args
+
+
+def _tesseract_subprocess_args(include_stdout=True) -> dict:
+    """Get the arguments pytesseract starts Tesseract with, adding the priority
+    class of the calling thread
+
+    :param include_stdout: Whether stdout is piped, defaults to True
+    :return: The subprocess.Popen arguments
+    """
+    kwargs = _pytesseract_subprocess_args(include_stdout)
+    if TESSERACT_LOW_PRIORITY_CLASS and getattr(_thread_state, "low_priority", False):
+        kwargs["creationflags"] = TESSERACT_LOW_PRIORITY_CLASS
+    return kwargs
+
+
+pytesseract.pytesseract.subprocess_args = _tesseract_subprocess_args
+
+
+def lower_tesseract_priority(low_priority: bool) -> None:
+    """Start the Tesseract processes of the calling thread below normal
+    priority, so they do not compete with the game for the CPU
+
+    :param low_priority: True to lower the priority, False to restore it
+    """
+    _thread_state.low_priority = low_priority
+
+
+def use_lexicon(lexicon: "Lexicon | None") -> None:
+    """Bias the recognition of the fields passed to image_to_string towards a
+    lexicon
+
+    :param lexicon: The lexicon, None to read with the whitelists only
+    """
+    global _lexicon
+    _lexicon = lexicon
 
 
 def preprocess_img(img: Image) -> Image:
@@ -30,6 +90,7 @@ def image_to_string(
     force_preprocess=False,
     preprocess_func=preprocess_img,
     remove_newline=True,
+    field: OcrField | None = None,
 ) -> str:
     """Convert image to string
 
@@ -39,9 +100,14 @@ def image_to_string(
     :param force_preprocess: The flag to force preprocessing, defaults to False
     :param preprocess_func: The preprocessing function to use, defaults to None
     :param strip_text: The flag to strip text, defaults to True
+    :param field: The field that is read, to bias recognition towards its
+        lexicon, defaults to None
     :return: The string representation of the image
     """
     config = f'-c tessedit_char_whitelist="{whitelist}" --psm {psm} -l DIN-Alternate'
+    lexicon = _lexicon
+    if field and lexicon:
+        config = f"{config} {lexicon.config(field)}".rstrip()
 
     res = ""
     if not force_preprocess:
@@ -0,0 +1,188 @@
+import threading
+import time
+from collections import deque
+
+from enums.increment_type import IncrementType
+
+# Interval at which the UI samples the progress counters
+PROGRESS_REFRESH_INTERVAL_MS = 250
+
+# Time window the throughput is averaged over
+RATE_WINDOW_SECONDS = 5
+
+# Offset between the ADD and SUCCESS values of an IncrementType
+SUCCESS_OFFSET = 100
+
+SCAN_TYPES = (
+    IncrementType.LIGHT_CONE_ADD,
+    IncrementType.RELIC_ADD,
+    IncrementType.CHARACTER_ADD,
+)
+
+
+class ScanProgress:
+    """ScanProgress class holds the progress counters of a scan
+
+    Workers increment the counters from any thread without notifying anyone,
+    and the UI samples them at a fixed rate. Counters are keyed by the ADD
+    IncrementType of their scan type.
+    """
+
+    def __init__(self) -> None:
+        """Constructor"""
+        self._lock = threading.Lock()
+        self._captured = dict.fromkeys(SCAN_TYPES, 0)
+        self._parsed = dict.fromkeys(SCAN_TYPES, 0)
+        self._positions = dict.fromkeys(SCAN_TYPES, 0)
+        self._totals = dict.fromkeys(SCAN_TYPES, None)
+        self._dropped_inputs = dict.fromkeys(SCAN_TYPES, 0)
+
+    def increment(self, increment_type: IncrementType) -> None:
+        """Count a captured (ADD) or parsed (SUCCESS) item
+
+        :param increment_type: The increment type
+        """
+        with self._lock:
+            if increment_type in self._captured:
+                self._captured[increment_type] += 1
+            else:
+                self._parsed[IncrementType(increment_type.value - SUCCESS_OFFSET)] += 1
+
+    def set_total(self, scan_type: IncrementType, total: int) -> None:
+        """Set the number of items that will be visited
+
+        :param scan_type: The ADD increment type of the scan type
+        :param total: The total, e.g. the inventory quantity or character count
+        """
+        with self._lock:
+            self._totals[scan_type] = total
+
+    def set_position(self, scan_type: IncrementType, position: int) -> None:
+        """Set the number of items visited so far, including filtered ones
+
+        :param scan_type: The ADD increment type of the scan type
+        :param position: The position
+        """
+        with self._lock:
+            self._positions[scan_type] = position
+
+    def record_dropped_input(self, scan_type: IncrementType) -> None:
+        """Count an input the game dropped and that was sent again
+
+        :param scan_type: The ADD increment type of the scan type
+        """
+        with self._lock:
+            self._dropped_inputs[scan_type] += 1
+
+    def dropped_inputs(self, scan_type: IncrementType) -> int:
+        """Get the number of inputs the game dropped
+
+        :param scan_type: The ADD increment type of the scan type
+        :return: The number of dropped inputs
+        """
+        with self._lock:
+            return self._dropped_inputs[scan_type]
+
+    def snapshot(self) -> dict[IncrementType, tuple[int, int, int, int | None]]:
+        """Take a consistent copy of the counters
+
+        :return: The captured, parsed, position and total count per scan type
+        """
+        with self._lock:
+            return {
+                k: (
+                    self._captured[k],
+                    self._parsed[k],
+                    max(self._positions[k], self._captured[k]),
+                    self._totals[k],
+                )
+                for k in SCAN_TYPES
+            }
+
+
+class ScanTypeProgress:
+    """ScanTypeProgress class holds the sampled progress of one scan type"""
+
+    def __init__(
+        self,
+        captured: int,
+        parsed: int,
+        capture_rate: float,
+        parse_rate: float,
+        eta: float | None,
+    ) -> None:
+        """Constructor
+
+        :param captured: The number of captured items
+        :param parsed: The number of parsed items
+        :param capture_rate: The captured items per second
+        :param parse_rate: The parsed items per second
+        :param eta: The estimated seconds left, None if unknown
+        """
+        self.captured = captured
+        self.parsed = parsed
+        self.queue = captured - parsed
+        self.capture_rate = capture_rate
+        self.parse_rate = parse_rate
+        self.eta = eta
+
+    def __str__(self) -> str:
+        eta = "--:--" if self.eta is None else "%d:%02d" % divmod(int(self.eta), 60)
+        return (
+            f"capture {self.capture_rate:.1f}/s, parse {self.parse_rate:.1f}/s, "
+            f"queue {self.queue}, ETA {eta}"
+        )
+
+
+class ProgressSampler:
+    """ProgressSampler class turns ScanProgress samples into throughput, queue
+    depth and ETA"""
+
+    def __init__(
+        self, progress: ScanProgress, window: float = RATE_WINDOW_SECONDS
+    ) -> None:
+        """Constructor
+
+        :param progress: The progress counters to sample
+        :param window: The time window in seconds to average the throughput over
+        """
+        self._progress = progress
+        self._window = window
+        self._samples = deque()
+
+    def sample(self) -> dict[IncrementType, ScanTypeProgress]:
+        """Sample the progress counters
+
+        While a scan type is still being captured, the ETA is the time left to
+        visit the remaining items. Once capture is done, it is the time left to
+        parse the queued items.
+
+        :return: The progress per scan type
+        """
+        now = time.monotonic()
+        snapshot = self._progress.snapshot()
+        self._samples.append((now, snapshot))
+        while now - self._samples[0][0] > self._window:
+            self._samples.popleft()
+        then, old = self._samples[0]
+        elapsed = now - then
+
+        res = {}
+        for k, (captured, parsed, position, total) in snapshot.items():
+            old_captured, old_parsed, old_position, _ = old[k]
+            capture_rate = (captured - old_captured) / elapsed if elapsed else 0
+            parse_rate = (parsed - old_parsed) / elapsed if elapsed else 0
+            visit_rate = (position - old_position) / elapsed if elapsed else 0
+
+            remaining = max(total - position, 0) if total is not None else None
+            eta = None
+            if remaining and visit_rate:
+                eta = remaining / visit_rate
+            elif remaining == 0 and captured == parsed:
+                eta = 0
+            elif remaining == 0 and parse_rate:
+                eta = (captured - parsed) / parse_rate
+
+            res[k] = ScanTypeProgress(captured, parsed, capture_rate, parse_rate, eta)
+
+        return res
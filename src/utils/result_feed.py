@@ -0,0 +1,56 @@
+from collections import deque
+
+from enums.increment_type import IncrementType
+from utils.progress import SCAN_TYPES
+
+
+class ResultFeed:
+    """ResultFeed class streams parsed items and validation errors from the
+    parse workers to the UI thread
+
+    Like the log sink, producers only append to deques and the UI thread drains
+    them on a timer. Items are keyed by the ADD IncrementType of their scan type.
+    """
+
+    def __init__(self) -> None:
+        """Constructor"""
+        self._items = {k: deque() for k in SCAN_TYPES}
+        self._errors = deque()
+
+    def push(self, scan_type: IncrementType, item: dict) -> None:
+        """Add a parsed item. Safe to call from any thread.
+
+        :param scan_type: The ADD increment type of the scan type
+        :param item: The parsed item
+        """
+        self._items[scan_type].append(item)
+
+    def push_error(self, uid: str, message: str) -> None:
+        """Flag an item. Safe to call from any thread.
+
+        :param uid: The _uid of the item, or the name for characters
+        :param message: The error message
+        """
+        self._errors.append({"_uid": uid, "message": message})
+
+    def drain(self) -> tuple[dict[IncrementType, list[dict]], list[dict]]:
+        """Take all pending items and errors. Must only be called from a single
+        thread.
+
+        :return: The new items per scan type and the new errors
+        """
+        return {k: _drain(v) for k, v in self._items.items()}, _drain(self._errors)
+
+
+def _drain(queue: deque) -> list:
+    """Pop all items of a deque without racing the producers
+
+    :param queue: The deque
+    :return: The popped items
+    """
+    res = []
+    while True:
+        try:
+            res.append(queue.popleft())
+        except IndexError:
+            return res
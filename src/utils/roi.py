@@ -0,0 +1,214 @@
+from functools import lru_cache
+
+from config.character_scan import CHARACTER_NAV_DATA
+from config.const import (
+    ASCENSION_OFFSET_X,
+    ASCENSION_START,
+    CHAR_EIDOLONS,
+    CHARACTER,
+    CHEST,
+    COUNT,
+    DATABANK,
+    EQUIPPED_AVATAR,
+    EQUIPPED_AVATAR_OFFSET,
+    LIGHT_CONE,
+    LOCK,
+    QUANTITY,
+    RELIC,
+    SORT,
+    STATS,
+    TRACES,
+    UID,
+)
+from config.light_cone_scan import LIGHT_CONE_NAV_DATA
+from config.relic_scan import RELIC_NAV_DATA
+from config.screenshot import SCREENSHOT_COORDS
+from models.const import CHAR_LEVEL, CHAR_NAME, RELIC_DISCARD, RELIC_RARITY
+
+REFERENCE_WIDTH = 1920
+REFERENCE_HEIGHT = 1080
+
+# Stats crops that are consumed at native resolution. Everything else goes to OCR
+# and has to be rescaled to the 1920x1080 reference the preprocessing was tuned for.
+NATIVE_STATS_CROPS = {
+    LOCK,
+    RELIC_DISCARD,
+    RELIC_RARITY,
+    EQUIPPED_AVATAR,
+    EQUIPPED_AVATAR_OFFSET,
+}
+
+# Fixed crop sizes in % of the window for point-based coordinates
+EIDOLON_SIZE = (0.042, 0.075)
+TRACE_LEVEL_SIZE = (0.04, 0.028)
+DATABANK_BUTTON_SIZE = (0.0296875, 0.05625)
+
+NAV_DATA = {
+    LIGHT_CONE: LIGHT_CONE_NAV_DATA,
+    RELIC: RELIC_NAV_DATA,
+    CHARACTER: CHARACTER_NAV_DATA,
+}
+
+
+class CompiledROIs:
+    """Integer pixel rects and points compiled from the percentage-based
+    coordinates in `config` for a single window geometry.
+
+    All rects are (left, top, right, bottom). Window rects and points are in
+    screen coordinates, stats rects are relative to the stats panel.
+    """
+
+    def __init__(
+        self, aspect_ratio: str, left: int, top: int, width: int, height: int
+    ) -> None:
+        """Constructor
+
+        :param aspect_ratio: The aspect ratio of the game window
+        :param left: The screen x coordinate of the client area
+        :param top: The screen y coordinate of the client area
+        :param width: The width of the client area
+        :param height: The height of the client area
+        """
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+        self.x_scaling_factor = width / REFERENCE_WIDTH
+        self.y_scaling_factor = height / REFERENCE_HEIGHT
+        self.is_reference_size = width == REFERENCE_WIDTH and height == REFERENCE_HEIGHT
+        self.geometry = (left, top, width, height)
+        self.window_rect = (left, top, left + width, top + height)
+
+        coords = SCREENSHOT_COORDS[aspect_ratio]
+
+        self.rects = {
+            k: self._window_rect(*coords[k]) for k in (QUANTITY, SORT, UID, STATS)
+        }
+        self.character_rects = {
+            k: self._window_rect(*coords[CHARACTER][k])
+            for k in (COUNT, CHEST, CHAR_NAME, CHAR_LEVEL, DATABANK)
+        }
+        self.eidolon_rects = [
+            self._window_rect(x, y, *EIDOLON_SIZE)
+            for x, y in coords[CHARACTER][CHAR_EIDOLONS]
+        ]
+        self.trace_level_rects = {
+            path: {k: self._window_rect(*v, *TRACE_LEVEL_SIZE) for k, v in d.items()}
+            for path, d in coords[CHARACTER][TRACES].items()
+        }
+
+        stats_left, stats_top, stats_right, stats_bottom = self.rects[STATS]
+        self.stats_size = (stats_right - stats_left, stats_bottom - stats_top)
+        # The inventory grid left of the stats panel, where the selected item is
+        # highlighted
+        self.inventory_rect = (left, stats_top, stats_left, stats_bottom)
+        reference_stats_size = self._reference_stats_size(coords)
+        self.stats_rects = {}
+        self.stats_reference_sizes = {}
+        for key in (LIGHT_CONE, RELIC):
+            self.stats_rects[key] = {
+                k: self._panel_rect(v, *self.stats_size) for k, v in coords[key].items()
+            }
+            self.stats_reference_sizes[key] = {}
+            for k, v in coords[key].items():
+                if k in NATIVE_STATS_CROPS:
+                    continue
+                left, top, right, bottom = self._panel_rect(v, *reference_stats_size)
+                self.stats_reference_sizes[key][k] = (right - left, bottom - top)
+
+        self.nav_points = {}
+        for key, nav_data in NAV_DATA.items():
+            self.nav_points[key] = {
+                k: self._point(*v)
+                for k, v in nav_data[aspect_ratio].items()
+                if isinstance(v, tuple)
+            }
+
+        character_nav = CHARACTER_NAV_DATA[aspect_ratio]
+        start_x, start_y = character_nav[ASCENSION_START]
+        self.ascension_probes = [
+            self._point(start_x + i * character_nav[ASCENSION_OFFSET_X], start_y)
+            for i in range(6)
+        ]
+        self.trace_unlock_probes = {
+            path: {k: self._point(*v) for k, v in d.items()}
+            for path, d in character_nav[TRACES].items()
+        }
+
+    def reference_size(self, rect: tuple[int, int, int, int]) -> tuple[int, int]:
+        """Get the size of a window rect when normalized to 1920x1080
+
+        :param rect: The window rect
+        :return: The normalized width and height
+        """
+        left, top, right, bottom = rect
+        return (
+            int((right - left) / self.x_scaling_factor),
+            int((bottom - top) / self.y_scaling_factor),
+        )
+
+    def _point(self, x: float, y: float) -> tuple[int, int]:
+        """Compile a percentage point into screen coordinates
+
+        :param x: The x percent coordinate
+        :param y: The y percent coordinate
+        :return: The screen coordinates
+        """
+        return self.left + int(self.width * x), self.top + int(self.height * y)
+
+    def _window_rect(
+        self, x: float, y: float, w: float, h: float
+    ) -> tuple[int, int, int, int]:
+        """Compile an (x, y, w, h) percentage rect into a screen rect
+
+        :param x: The x percent coordinate of the top left corner
+        :param y: The y percent coordinate of the top left corner
+        :param w: The width in percent of the window
+        :param h: The height in percent of the window
+        :return: The screen rect
+        """
+        left, top = self._point(x, y)
+        return left, top, left + int(self.width * w), top + int(self.height * h)
+
+    def _reference_stats_size(self, coords: dict) -> tuple[int, int]:
+        """Get the size of the stats panel at 1920x1080
+
+        :param coords: The screenshot coordinates for the aspect ratio
+        :return: The width and height of the stats panel
+        """
+        _, _, w, h = coords[STATS]
+        return int(REFERENCE_WIDTH * w), int(REFERENCE_HEIGHT * h)
+
+    @staticmethod
+    def _panel_rect(
+        rect: tuple[float, float, float, float], width: int, height: int
+    ) -> tuple[int, int, int, int]:
+        """Compile an (x0, y0, x1, y1) percentage rect relative to a panel
+
+        :param rect: The percentage rect
+        :param width: The panel width
+        :param height: The panel height
+        :return: The pixel rect relative to the panel
+        """
+        return (
+            int(rect[0] * width),
+            int(rect[1] * height),
+            int(rect[2] * width),
+            int(rect[3] * height),
+        )
+
+
+@lru_cache(maxsize=8)
+def compile_rois(
+    aspect_ratio: str, left: int, top: int, width: int, height: int
+) -> CompiledROIs:
+    """Compile all regions of interest for a window geometry. Cached per geometry.
+
+    :param aspect_ratio: The aspect ratio of the game window
+    :param left: The screen x coordinate of the client area
+    :param top: The screen y coordinate of the client area
+    :param width: The width of the client area
+    :param height: The height of the client area
+    :return: The compiled regions of interest
+    """
+    return CompiledROIs(aspect_ratio, left, top, width, height)
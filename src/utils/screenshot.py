@@ -1,29 +1,31 @@
 import datetime
 import os
+from typing import Iterable
 
 import cv2
 import numpy as np
-import win32gui
 from PIL import Image as PILImage
-from PIL import ImageGrab
 from PIL.Image import Image
-from PyQt6.QtCore import pyqtBoundSignal
 
 from config.const import (
     ASPECT_16_9,
-    CHARACTER,
-    CHAR_EIDOLONS,
     CHEST,
     COUNT,
+    LIGHT_CONE,
     QUANTITY,
+    RELIC,
     SORT,
     STATS,
-    TRACES,
     UID,
 )
-from config.screenshot import SCREENSHOT_COORDS
 from enums.increment_type import IncrementType
 from models.const import CHAR_LEVEL, CHAR_NAME
+from utils.capture import ReplayCapture, ScreenCapture
+from utils.log_sink import LogSink
+from utils.roi import CompiledROIs, compile_rois
+
+# Eidolon crops are resized to this size before they are classified
+EIDOLON_DIM = 81
 
 
 class Screenshot:
@@ -31,134 +33,152 @@ class Screenshot:
 
     def __init__(
         self,
-        hwnd: int,
-        log_signal: pyqtBoundSignal,
+        capture: ScreenCapture | ReplayCapture,
+        log_sink: LogSink,
         aspect_ratio: str = ASPECT_16_9,
         debug: bool = False,
         debug_output_location: str = "",
     ) -> None:
         """Constructor
 
-        :param hwnd: The window handle of the game window
+        :param capture: The capture that grabs the game window
         :param aspect_ratio: The aspect ratio of the game window, defaults to "16:9"
         :param debug_mode: Whether to save screenshots, default False
         :param debug_output_location: Output location of saved screenshots
         """
+        self._capture = capture
         self._aspect_ratio = aspect_ratio
-        self._log_signal = log_signal
-
-        self._window_width, self._window_height = win32gui.GetClientRect(hwnd)[2:]
-        self._window_x, self._window_y = win32gui.ClientToScreen(hwnd, (0, 0))
+        self._log_sink = log_sink
 
-        self._x_scaling_factor = self._window_width / 1920
-        self._y_scaling_factor = self._window_height / 1080
+        # pixel rects are compiled once per window geometry
+        self._rois = compile_rois(aspect_ratio, *capture.geometry)
 
         self._debug = debug
         self._debug_output_location = debug_output_location
 
+        # Circle mask of the eidolon crops
+        mask = np.zeros((EIDOLON_DIM, EIDOLON_DIM), dtype="uint8")
+        cv2.circle(mask, (int(EIDOLON_DIM / 2), int(EIDOLON_DIM / 2)), int(EIDOLON_DIM / 2), 255, -1)  # type: ignore
+        self._eidolon_mask = (mask > 0)[:, :, None]
+
+        # Bounding rects of all eidolons and of the trace levels of each path,
+        # each grabbed in one capture
+        self._eidolons_rect = _bounding_rect(self._rois.eidolon_rects)
+        self._trace_levels_rects = {
+            path: _bounding_rect(rects.values())
+            for path, rects in self._rois.trace_level_rects.items()
+        }
+
+    @property
+    def rois(self) -> CompiledROIs:
+        """The regions of interest compiled for the game window geometry"""
+        return self._rois
+
     def screenshot_screen(self) -> Image:
         """Takes a screenshot of the entire screen
 
         :return: The screenshot
         """
         do_not_save = True  # so users don't unintentionally reveal their UID when naively sharing debug folder
-        return self._take_screenshot(0, 0, 1, 1, do_not_save)
+        return self._take_screenshot(self._rois.window_rect, do_not_save, rescale=False)
+
+    def screenshot_region(self, rect: tuple[int, int, int, int]) -> Image:
+        """Takes a screenshot of a screen rect at native resolution. Never saved
+        in debug mode, since the rect can be anywhere on the screen.
 
-    def screenshot_stats(self, scan_type: IncrementType) -> dict:
+        :param rect: The screen rect
+        :return: The screenshot
+        """
+        return self._take_screenshot(rect, do_not_save=True, rescale=False)
+
+    def screenshot_stats(self, scan_type: IncrementType) -> tuple[dict, Image]:
         """Takes a screenshot of the stats. Requires an item to be selected in the inventory.
 
         :param scan_type: The scan type
         :raises ValueError: Thrown if the scan type is invalid
-        :return: A dict of the stats with the key being the stat name and the value being the screenshot
+        :return: A dict of the stats with the key being the stat name and the value being the screenshot,
+            and the screenshot of the whole stats panel
         """
         match IncrementType(scan_type):
             case IncrementType.LIGHT_CONE_ADD:
-                return self._screenshot_stats("light_cone")
+                return self._screenshot_stats(LIGHT_CONE)
             case IncrementType.RELIC_ADD:
-                return self._screenshot_stats("relic")
+                return self._screenshot_stats(RELIC)
             case _:
                 raise ValueError(f"Invalid scan type: {scan_type.name}.")
 
+    def screenshot_inventory(self) -> Image:
+        """Takes a screenshot of the inventory grid at native resolution. Never
+        saved in debug mode.
+
+        :return: The screenshot
+        """
+        return self._take_screenshot(
+            self._rois.inventory_rect, do_not_save=True, rescale=False
+        )
+
     def screenshot_sort(self) -> Image:
         """Takes a screenshot of the current sort option. Requires inventory to be open.
 
         :return: The screenshot
         """
-        coords = SCREENSHOT_COORDS[self._aspect_ratio][SORT]
-        return self._take_screenshot(*coords)
+        return self._take_screenshot(self._rois.rects[SORT])
 
     def screenshot_quantity(self) -> Image:
         """Takes a screenshot of the quantity. Requires inventory to be open.
 
         :return: The screenshot
         """
-        return self._take_screenshot(*SCREENSHOT_COORDS[self._aspect_ratio][QUANTITY])
+        return self._take_screenshot(self._rois.rects[QUANTITY])
 
     def screenshot_character_count(self) -> Image:
         """Takes a screenshot of the character count. Requires
 
         :return: The screenshot
         """
-        return self._take_screenshot(
-            *SCREENSHOT_COORDS[self._aspect_ratio][CHARACTER][COUNT]
-        )
+        return self._take_screenshot(self._rois.character_rects[COUNT])
 
     def screenshot_character_name(self) -> Image:
         """Takes a screenshot of the character name
 
         :return: The screenshot
         """
-        return self._take_screenshot(
-            *SCREENSHOT_COORDS[self._aspect_ratio][CHARACTER][CHAR_NAME]
-        )
+        return self._take_screenshot(self._rois.character_rects[CHAR_NAME])
 
     def screenshot_character_level(self) -> Image:
         """Takes a screenshot of the character level
 
         :return: The screenshot
         """
-        return self._take_screenshot(
-            *SCREENSHOT_COORDS[self._aspect_ratio][CHARACTER][CHAR_LEVEL]
-        )
+        return self._take_screenshot(self._rois.character_rects[CHAR_LEVEL])
 
     def screenshot_character(self) -> Image:
         """Takes a screenshot of the character
 
         :return: The screenshot
         """
-        return self._take_screenshot(
-            *SCREENSHOT_COORDS[self._aspect_ratio][CHARACTER][CHEST]
-        )
+        return self._take_screenshot(self._rois.character_rects[CHEST])
 
-    def screenshot_character_eidolons(self) -> list[np.ndarray]:
+    def screenshot_character_eidolons(self) -> np.ndarray:
         """Takes a screenshot of the character eidolons
 
-        :return: A list of the screenshots
+        :return: The masked screenshots stacked into one (6, 81, 81, 3) array
         """
-        res = []
-
-        screenshot = ImageGrab.grab(all_screens=True)
-        offset, _, _ = PILImage.core.grabscreen_win32(False, True)  # type: ignore
-        x0, y0 = offset
-        dim = 81
-
-        # Circle mask
-        mask = np.zeros((dim, dim), dtype="uint8")
-        cv2.circle(mask, (int(dim / 2), int(dim / 2)), int(dim / 2), 255, -1)  # type: ignore
-
-        for c in SCREENSHOT_COORDS[self._aspect_ratio][CHARACTER][CHAR_EIDOLONS]:
-            left = self._window_x + int(self._window_width * c[0])
-            upper = self._window_y + int(self._window_height * c[1])
-            right = left + self._window_width * 0.042
-            lower = upper + self._window_height * 0.075
-            img = screenshot.crop((left - x0, upper - y0, right - x0, lower - y0))
-
-            # Apply circle mask
-            img = np.array(img)
-            img = cv2.resize(img, (dim, dim))  # type: ignore
-            img = cv2.bitwise_and(img, img, mask=mask)  # type: ignore
+        x0, y0 = self._eidolons_rect[:2]
+        screenshot = np.asarray(self._grab(self._eidolons_rect))
+
+        res = np.stack(
+            [
+                cv2.resize(  # type: ignore
+                    screenshot[upper - y0 : lower - y0, left - x0 : right - x0],
+                    (EIDOLON_DIM, EIDOLON_DIM),
+                )
+                for left, upper, right, lower in self._rois.eidolon_rects
+            ]
+        )
 
-            res.append(img)
+        # Apply circle mask
+        res *= self._eidolon_mask
 
         if self._debug:
             for img in res:
@@ -179,61 +199,60 @@ class Screenshot:
 
         :return: The screenshot
         """
-        return self._take_screenshot(*SCREENSHOT_COORDS[self._aspect_ratio][UID])
+        return self._take_screenshot(self._rois.rects[UID])
 
     def _take_screenshot(
-        self, x: float, y: float, width: float, height: float, do_not_save: bool = False
+        self,
+        rect: tuple[int, int, int, int],
+        do_not_save: bool = False,
+        rescale: bool = True,
     ) -> Image:
         """Takes a screenshot of the game window
 
-        :param x: The x percent coordinate of the top left corner of the screenshot
-        :param y: The y percent coordinate of the top left corner of the screenshot
-        :param width: The width of the screenshot
-        :param height: The height of the screenshot
-        :return: The screenshot normalized to 1920x1080
+        :param rect: The compiled screen rect to capture
+        :param do_not_save: Whether to skip saving the screenshot in debug mode
+        :param rescale: Whether to normalize the screenshot to 1920x1080, defaults to True
+        :return: The screenshot
         """
-        # adjust coordinates to window
-        x = self._window_x + int(self._window_width * x)
-        y = self._window_y + int(self._window_height * y)
-        width = int(self._window_width * width)
-        height = int(self._window_height * height)
-
-        screenshot = ImageGrab.grab(
-            bbox=(int(x), int(y), int(x + width), int(y + height)), all_screens=True
-        )
+        screenshot = self._grab(rect)
 
-        screenshot = screenshot.resize(
-            (int(width / self._x_scaling_factor), int(height / self._y_scaling_factor))
-        )
+        if rescale and not self._rois.is_reference_size:
+            screenshot = screenshot.resize(self._rois.reference_size(rect))
 
         if self._debug and not do_not_save:
             self._save_image(screenshot)
 
         return screenshot
 
-    def _screenshot_stats(self, key: str) -> dict:
+    def _grab(self, rect: tuple[int, int, int, int]) -> Image:
+        """Grabs a region of the screen at native resolution
+
+        :param rect: The screen rect to grab
+        :return: The grabbed image
+        """
+        return self._capture.grab(rect)
+
+    def _screenshot_stats(self, key: str) -> tuple[dict, Image]:
         """Takes a screenshot of the stats
 
+        Only the crops that go through OCR are normalized to 1920x1080, the
+        rest are left at native resolution.
+
         :param key: The key of the stats to screenshot
-        :return: A dict of the stats with the key being the stat name and the value being the screenshot
+        :return: A dict of the stats with the key being the stat name and the value being the screenshot,
+            and the screenshot of the whole stats panel
         """
-        coords = SCREENSHOT_COORDS[self._aspect_ratio]
-
-        img = self._take_screenshot(*coords[STATS])
-
-        adjusted_stat_coords = {
-            k: (
-                int(v[0] * img.width),
-                int(v[1] * img.height),
-                int(v[2] * img.width),
-                int(v[3] * img.height),
-            )
-            for k, v in coords[key].items()
-        }
+        img = self._take_screenshot(self._rois.rects[STATS], rescale=False)
 
-        res = {k: img.crop(v) for k, v in adjusted_stat_coords.items()}
+        reference_sizes = self._rois.stats_reference_sizes[key]
+        res = {}
+        for k, rect in self._rois.stats_rects[key].items():
+            crop = img.crop(rect)
+            if k in reference_sizes and not self._rois.is_reference_size:
+                crop = crop.resize(reference_sizes[k])
+            res[k] = crop
 
-        return res
+        return res, img
 
     def _screenshot_traces(self, key: str) -> dict:
         """Takes a screenshot of the trace levels
@@ -241,20 +260,12 @@ class Screenshot:
         :param key: The key of the traces to screenshot
         :return: A dict of the traces with the key being the trace name and the value being the screenshot
         """
-        coords = SCREENSHOT_COORDS[self._aspect_ratio]
-
         res = {}
 
-        screenshot = ImageGrab.grab(all_screens=True)
-        offset, _, _ = PILImage.core.grabscreen_win32(False, True)  # type: ignore
-        x0, y0 = offset
-
-        for k, v in coords[CHARACTER][TRACES][key].items():
-            left = self._window_x + int(self._window_width * v[0])
-            upper = self._window_y + int(self._window_height * v[1])
-            right = left + int(self._window_width * 0.04)
-            lower = upper + int(self._window_height * 0.028)
+        x0, y0 = self._trace_levels_rects[key][:2]
+        screenshot = self._grab(self._trace_levels_rects[key])
 
+        for k, (left, upper, right, lower) in self._rois.trace_level_rects[key].items():
             res[k] = screenshot.crop((left - x0, upper - y0, right - x0, lower - y0))
 
         if self._debug:
@@ -271,4 +282,21 @@ class Screenshot:
         file_name = f"{datetime.datetime.now().strftime('%H%M%S%f')}.png"
         output_location = os.path.join(self._debug_output_location, file_name)
         img.save(output_location)
-        self._log_signal.emit((f"Saving {file_name}."))
+        self._log_sink.log(f"Saving {file_name}.")
+
+
+def _bounding_rect(
+    rects: Iterable[tuple[int, int, int, int]],
+) -> tuple[int, int, int, int]:
+    """Get the bounding rect of screen rects
+
+    :param rects: The screen rects
+    :return: The bounding rect
+    """
+    rects = list(rects)
+    return (
+        min(rect[0] for rect in rects),
+        min(rect[1] for rect in rects),
+        max(rect[2] for rect in rects),
+        max(rect[3] for rect in rects),
+    )
@@ -0,0 +1,125 @@
+import numpy as np
+from PIL import Image as PILImage
+from PIL.Image import Image
+
+from enums.ocr_field import OcrField
+from utils.ocr import image_to_string, preprocess_sub_stat_img
+
+# Characters of the substat names and values
+SUBSTAT_WHITELIST = " ABCDEFGHIKMPRSTacefikrt0123456789.%,"
+
+# Pixel rows with less ink than this share of the inkiest row are background
+ROW_INK_THRESHOLD = 0.05
+
+# Runs of inked pixel rows shorter than this are noise, and runs separated by
+# fewer blank rows belong to the same line of text
+MIN_ROW_HEIGHT = 6
+MIN_ROW_GAP = 3
+
+# Blank pixels kept around each row, and between the rows and the name and
+# value columns of the image that is read
+ROW_PADDING = 4
+ROW_SPACING = 12
+COLUMN_SPACING = 48
+
+
+def read_substats(names_img: Image, values_img: Image) -> list[tuple[str, str]]:
+    """Read the substat block of a relic one row at a time
+
+    The rows are found once in both crops, and each row of the name crop is
+    placed next to the same row of the value crop. All rows are read in one
+    OCR call, so every line of text holds a name and its value, and a missed
+    or extra line can not shift the values of the following substats.
+
+    :param names_img: The crop of the substat names
+    :param values_img: The crop of the substat values, as high as the names
+    :return: The name and value of each row, the value being empty if it could
+        not be read
+    """
+    names = preprocess_sub_stat_img(names_img).convert("L")
+    values = preprocess_sub_stat_img(values_img).convert("L")
+    rows = find_text_rows([names, values])
+    if not rows:
+        return []
+
+    width = names.width + COLUMN_SPACING + values.width
+    height = sum(bottom - top for top, bottom in rows) + ROW_SPACING * (len(rows) + 1)
+    block = PILImage.new("L", (width, height), 255)
+    y = ROW_SPACING
+    for top, bottom in rows:
+        block.paste(names.crop((0, top, names.width, bottom)), (0, y))
+        block.paste(
+            values.crop((0, top, values.width, bottom)),
+            (names.width + COLUMN_SPACING, y),
+        )
+        y += bottom - top + ROW_SPACING
+
+    text = image_to_string(
+        block,
+        SUBSTAT_WHITELIST,
+        6,
+        True,
+        _already_preprocessed,
+        False,
+        OcrField.RELIC_SUB_STATS,
+    )
+    return [_split_row(line) for line in text.split("\n") if line.strip()]
+
+
+def find_text_rows(imgs: list[Image]) -> list[tuple[int, int]]:
+    """Find the rows of text in crops of the same height from their horizontal
+    projection profile
+
+    :param imgs: The preprocessed crops, dark text on a light background
+    :return: The top and bottom of each row
+    """
+    ink = sum((255 - np.asarray(img, dtype=np.float32)).sum(axis=1) for img in imgs)
+    if not ink.max():
+        return []
+    inked = ink > ink.max() * ROW_INK_THRESHOLD
+
+    runs = []
+    start = None
+    for y, is_inked in enumerate(inked):
+        if is_inked and start is None:
+            start = y
+        elif not is_inked and start is not None:
+            runs.append([start, y])
+            start = None
+    if start is not None:
+        runs.append([start, len(inked)])
+
+    rows = []
+    for run in runs:
+        if rows and run[0] - rows[-1][1] < MIN_ROW_GAP:
+            rows[-1][1] = run[1]
+        else:
+            rows.append(run)
+
+    return [
+        (max(0, top - ROW_PADDING), min(len(inked), bottom + ROW_PADDING))
+        for top, bottom in rows
+        if bottom - top >= MIN_ROW_HEIGHT
+    ]
+
+
+def _split_row(line: str) -> tuple[str, str]:
+    """Split a line of text into the substat name and value
+
+    :param line: The line
+    :return: The name and value, the value being empty if the line has none
+    """
+    words = line.split()
+    if len(words) > 1 and any(c.isdigit() for c in words[-1]):
+        value = words[-1].replace("S", "5").replace(",", ".").replace("..", ".")
+        return " ".join(words[:-1]), value
+    return " ".join(words), ""
+
+
+def _already_preprocessed(img: Image) -> Image:
+    """Leave the block as is, its rows are preprocessed before they are placed
+
+    :param img: The block
+    :return: The block
+    """
+    return img